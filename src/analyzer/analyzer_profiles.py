@@ -0,0 +1,136 @@
+"""
+Analyzer Profiles Module
+-----------------------
+
+This module defines which Backtrader analyzers are attached to a backtest. Optimization
+trials only need the objective (net profit), while the final best-trial rerun needs the
+complete metric set that ends up in the result JSON. Attaching all analyzers to every trial
+costs a per-bar Python call for each of them plus the conversion of their results, so the
+optimizer picks a profile per run:
+
+- "search": only NetProfit, enough for the objective
+- "full": every analyzer of the result JSON (returns, drawdown, sqn, sharpe, ... )
+
+Optionally every analyzer is wrapped so that the time spent in its hooks is measured,
+which shows what each analyzer costs per backtest.
+
+Main Features:
+- Named analyzer profiles with their constructor arguments
+- Per-analyzer hook timing (opt-in, no wrapper when disabled)
+
+Functions:
+- add_analyzers: Attach the analyzers of a profile to a Cerebro instance
+"""
+
+import time
+from typing import Dict, Optional
+
+import backtrader as bt
+from src.analyzer.bt_analyzers import (CAGR, CalmarRatio,
+                                       ConsecutiveWinsLosses, NetProfit,
+                                       PortfolioVolatility, ProfitFactor,
+                                       SortinoRatio, WinRate)
+
+PROFILE_SEARCH = "search"
+PROFILE_FULL = "full"
+
+
+def _analyzer_specs(risk_free_rate: float) -> Dict[str, tuple]:
+    """Analyzer name -> (class, kwargs)"""
+    return {
+        "returns": (bt.analyzers.Returns, {}),
+        "drawdown": (bt.analyzers.DrawDown, {}),
+        "sqn": (bt.analyzers.SQN, {}),
+        "time_drawdown": (bt.analyzers.TimeDrawDown, {}),
+        "vwr": (bt.analyzers.VWR, {}),
+        "trades": (bt.analyzers.TradeAnalyzer, {}),
+        "sharpe": (bt.analyzers.SharpeRatio, {"riskfreerate": risk_free_rate}),
+        "profit_factor": (ProfitFactor, {}),
+        "winrate": (WinRate, {}),
+        "calmar": (CalmarRatio, {"riskfreerate": risk_free_rate}),
+        "cagr": (CAGR, {"timeframe": bt.TimeFrame.Years}),
+        "sortino": (SortinoRatio, {"riskfreerate": risk_free_rate}),
+        "consecutivewinslosses": (ConsecutiveWinsLosses, {}),
+        "portfoliovolatility": (PortfolioVolatility, {}),
+        "pnl": (NetProfit, {}),
+    }
+
+
+ANALYZER_PROFILES = {
+    PROFILE_SEARCH: ["pnl"],
+    PROFILE_FULL: [
+        "returns",
+        "drawdown",
+        "sqn",
+        "time_drawdown",
+        "vwr",
+        "trades",
+        "sharpe",
+        "profit_factor",
+        "winrate",
+        "calmar",
+        "cagr",
+        "sortino",
+        "consecutivewinslosses",
+        "portfoliovolatility",
+    ],
+}
+
+_TIMED_HOOKS = (
+    "_start",
+    "_prenext",
+    "_nextstart",
+    "_next",
+    "_notify_cashvalue",
+    "_notify_fund",
+    "_notify_trade",
+    "_notify_order",
+    "_stop",
+)
+
+
+def _make_timed_hook(base_hook, name: str, timings: Dict[str, float]):
+    def hook(self, *args):
+        started = time.perf_counter()
+        try:
+            return base_hook(self, *args)
+        finally:
+            timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started)
+
+    return hook
+
+
+def _timed_class(analyzer_class: type, name: str, timings: Dict[str, float]) -> type:
+    """Subclass of an analyzer adding the time spent in its Backtrader hooks to timings[name]"""
+    namespace = {
+        hook_name: _make_timed_hook(getattr(analyzer_class, hook_name), name, timings)
+        for hook_name in _TIMED_HOOKS
+    }
+    return type(analyzer_class)(f"Timed{analyzer_class.__name__}", (analyzer_class,), namespace)
+
+
+def add_analyzers(
+    cerebro: bt.Cerebro,
+    profile: str = PROFILE_FULL,
+    risk_free_rate: float = 0.0,
+    timings: Optional[Dict[str, float]] = None,
+):
+    """
+    Attach the analyzers of a profile to a Cerebro instance
+
+    Args:
+        cerebro: Cerebro instance
+        profile: "search" or "full"
+        risk_free_rate: Risk free rate for Sharpe/Calmar/Sortino
+        timings: When given, analyzers are wrapped and the seconds spent in each analyzer's
+            hooks are accumulated into this dict by analyzer name
+    """
+    if profile not in ANALYZER_PROFILES:
+        raise ValueError(f"Unknown analyzer profile: {profile}")
+
+    specs = _analyzer_specs(risk_free_rate)
+    for name in ANALYZER_PROFILES[profile]:
+        analyzer_class, kwargs = specs[name]
+        if timings is not None:
+            analyzer_class = _timed_class(analyzer_class, name, timings)
+        cerebro.addanalyzer(analyzer_class, _name=name, **kwargs)
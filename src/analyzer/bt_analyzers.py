@@ -205,3 +205,29 @@ class PortfolioVolatility(bt.Analyzer):
 
     def get_analysis(self):
         return self.rets
+
+
+class NetProfit(bt.Analyzer):
+    """Closed-trade gross/net PnL totals (same values as TradeAnalyzer's pnl section)"""
+
+    def start(self):
+        self.gross = 0.0
+        self.net = 0.0
+        self.closed = 0
+
+    def notify_trade(self, trade):
+        if trade.status == trade.Closed:
+            self.closed += 1
+            self.gross += trade.pnl
+            self.net += trade.pnlcomm
+
+    def stop(self):
+        self.rets = {
+            "gross": self.gross,
+            "net": self.net,
+            "commission": self.gross - self.net,
+            "closed": self.closed,
+        }
+
+    def get_analysis(self):
+        return self.rets
@@ -0,0 +1,155 @@
+"""
+Bar Buffer Module
+----------------
+
+This module provides a fixed-capacity ring buffer of OHLCV bars for the live data feeds.
+All memory is allocated up front: a datetime64[ns] timestamp array and a float64
+OHLCV matrix. Appending a bar and updating a bar in place are O(1), no matter how long
+the session runs. Once the buffer is full, the oldest bar is overwritten.
+
+Every bar is written twice, at ``i`` and ``i + capacity``. That way the latest ``n`` bars are
+always one contiguous slice. ``arrays``/``values``/``timestamps`` return NumPy views of
+that slice without copying. A view is only valid until the next ``append``: once the buffer
+is full, the next bar is written over the first row of the current slice (and an update
+changes a row in place). ``frame`` returns a copy, a snapshot that later appends do not
+touch.
+
+Main Features:
+- Preallocated storage, O(1) append and in-place update of the forming bar
+- Zero-copy array views of the latest bars, DataFrame snapshots on demand
+- Timezone of the incoming timestamps preserved in the DataFrames
+
+Classes:
+- BarRingBuffer: Fixed-capacity ring buffer of timestamped OHLCV bars
+"""
+
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class BarRingBuffer:
+    """
+    Fixed-capacity ring buffer of OHLCV bars ordered by timestamp.
+
+    Parameters:
+    -----------
+    capacity : int
+        Maximum number of bars kept (the oldest bars are dropped beyond it)
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype="datetime64[ns]")
+        self._values = np.zeros((2 * capacity, len(BAR_COLUMNS)), dtype=np.float64)
+        self._count = 0
+        self._tz = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def _slice(self) -> slice:
+        """Slice of the storage holding the buffered bars, oldest first"""
+        if self._count == 0:
+            return slice(0, 0)
+        end = (self._count - 1) % self.capacity + self.capacity + 1
+        return slice(end - len(self), end)
+
+    def _write(self, logical: int, timestamp: np.datetime64, row):
+        pos = logical % self.capacity
+        self._timestamps[pos] = self._timestamps[pos + self.capacity] = timestamp
+        self._values[pos] = self._values[pos + self.capacity] = row
+
+    def append(self, timestamp, open, high, low, close, volume) -> Optional[str]:
+        """
+        Add a bar or update the stored bar with the same timestamp.
+
+        Returns:
+            str: "new" for a new latest bar, "update" when a stored bar was replaced,
+                 None for a bar older than the buffer (ignored)
+        """
+        ts = pd.Timestamp(timestamp)
+        if self._tz is None and self._count == 0:
+            self._tz = ts.tz
+        value = np.datetime64(ts.value, "ns")
+        row = (open, high, low, close, volume)
+        with self._lock:
+            if self._count == 0 or value > self._timestamps[self._slice()][-1]:
+                self._write(self._count, value, row)
+                self._count += 1
+                return "new"
+            stored = self._timestamps[self._slice()]
+            index = int(np.searchsorted(stored, value))
+            if index == len(stored) or stored[index] != value:
+                return None
+            self._write(self._count - len(stored) + index, value, row)
+            return "update"
+
+    def extend(self, df: pd.DataFrame) -> int:
+        """
+        Append the bars of a DataFrame indexed by time (OHLCV columns).
+
+        Returns:
+            int: Number of new bars
+        """
+        added = 0
+        columns = [df[column].to_numpy(dtype=np.float64) for column in BAR_COLUMNS]
+        for i, timestamp in enumerate(df.index):
+            if self.append(timestamp, *(column[i] for column in columns)) == "new":
+                added += 1
+        return added
+
+    def _index(self, timestamps: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(timestamps)
+        return index.tz_localize("UTC").tz_convert(self._tz) if self._tz is not None else index
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """Timestamp of the latest bar (None when empty)"""
+        with self._lock:
+            if self._count == 0:
+                return None
+            timestamp = self._timestamps[self._slice()][-1:].copy()
+        return self._index(timestamp)[0]
+
+    def last(self) -> Optional[Dict[str, float]]:
+        """OHLCV of the latest bar as a dict (None when empty)"""
+        with self._lock:
+            if self._count == 0:
+                return None
+            row = self._values[self._slice()][-1].copy()
+        return {column: float(value) for column, value in zip(BAR_COLUMNS, row)}
+
+    def timestamps(self) -> np.ndarray:
+        """View of the bar timestamps (datetime64[ns], UTC for tz-aware input), valid until the next append"""
+        with self._lock:
+            return self._timestamps[self._slice()]
+
+    def values(self) -> np.ndarray:
+        """View of the OHLCV matrix (one row per bar, columns in BAR_COLUMNS order), valid until the next append"""
+        with self._lock:
+            return self._values[self._slice()]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Views of the timestamp and OHLCV columns, valid until the next append"""
+        with self._lock:
+            window = self._slice()
+            values = self._values[window]
+            arrays = {"timestamp": self._timestamps[window]}
+        arrays.update({column: values[:, i] for i, column in enumerate(BAR_COLUMNS)})
+        return arrays
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame copy of the buffered bars, unaffected by later appends"""
+        with self._lock:
+            window = self._slice()
+            values = self._values[window].copy()
+            timestamps = self._timestamps[window].copy()
+        return pd.DataFrame(values, index=self._index(timestamps), columns=list(BAR_COLUMNS), copy=False)
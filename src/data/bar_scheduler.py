@@ -0,0 +1,226 @@
+"""
+Bar Scheduler Module
+-------------------
+
+This module wakes polling live feeds when their bars close instead of polling on fixed
+sleeps. Before, a 1h feed polled every 60s, and a signal could still arrive up to one
+polling interval after the close. A 1d feed polled every hour.
+
+The scheduler computes the next bar close of every registered feed and sleeps until the
+earliest one plus a small grace delay (the exchange needs a moment to publish the bar).
+Bar closes follow the interval grid in UTC (minutes and hours from the epoch, days at
+midnight, weeks on Monday, months on the 1st), shifted to the open time of the feed's
+latest bar when it has one, so hourly stock bars opening at :30 are polled at :30. All feeds due at the same
+instant are polled together, one batch per source, through the feed class's
+``poll_batch``, so a source can serve them with one request.
+
+A feed whose bar is not available yet is polled again after ``retry_delay`` seconds, up
+to ``max_retries`` times, and then waits for its next close.
+
+Main Features:
+- Next bar close per interval on the UTC grid or on the grid of the feed's bars
+- One scheduler thread for all polling feeds of a process
+- Coalescing of due feeds into one batch per source
+- Short retries for bars published late
+
+Classes:
+- BarCloseScheduler: Wakes registered feeds at their bar closes
+
+Functions:
+- next_bar_close: Close time of the bar open at a given time
+- bar_open: Open time of the bar open at a given time
+- get_bar_scheduler: Process-wide scheduler
+"""
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from src.data.market_data_store import interval_ms
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+# 1970-01-01 was a Thursday: weekly bars open on Monday, 4 days later
+_WEEK_OFFSET_MS = 4 * 24 * 3600 * 1000
+
+_scheduler: Optional["BarCloseScheduler"] = None
+_scheduler_lock = threading.Lock()
+
+
+def next_bar_close(interval: str, now: float, anchor: Optional[float] = None) -> float:
+    """
+    Close time of the bar open at ``now``
+
+    Args:
+        interval: Bar interval ('1m', '15m', '1h', '4h', '1d', '1w', '1mo' ...)
+        now: Epoch seconds
+        anchor: Epoch seconds of any bar open, for bars off the UTC grid (e.g. hourly
+                stock bars opening at 9:30 New York time)
+
+    Returns:
+        float: Epoch seconds of the next bar close (strictly after ``now``)
+    """
+    step = interval_ms(interval)
+    now_ms = int(now * 1000)
+    if step is None:
+        # Calendar months: the bar closes when the next month starts
+        ts = pd.Timestamp(now_ms, unit="ms", tz="UTC")
+        return (ts.normalize().replace(day=1) + pd.DateOffset(months=1)).value / 1e9
+    if anchor is not None:
+        offset = int(anchor * 1000) % step
+    else:
+        offset = _WEEK_OFFSET_MS if interval.endswith(("w", "wk")) else 0
+    return (((now_ms - offset) // step + 1) * step + offset) / 1000
+
+
+def bar_open(interval: str, now: float, anchor: Optional[float] = None) -> float:
+    """
+    Open time of the bar open at ``now`` (the same grid as ``next_bar_close``)
+
+    Returns:
+        float: Epoch seconds of the bar open (at or before ``now``)
+    """
+    step = interval_ms(interval)
+    if step is None:
+        ts = pd.Timestamp(int(now * 1000), unit="ms", tz="UTC")
+        return ts.normalize().replace(day=1).value / 1e9
+    return (int(round(next_bar_close(interval, now, anchor) * 1000)) - step) / 1000
+
+
+class _Entry:
+    """Schedule of one registered feed"""
+
+    __slots__ = ("feed", "due", "attempts", "in_flight")
+
+    def __init__(self, feed, due: float):
+        self.feed = feed
+        self.due = due
+        self.attempts = 0
+        self.in_flight = False
+
+
+class BarCloseScheduler:
+    """
+    Polls registered feeds at their bar closes, batched per source.
+
+    A registered feed provides ``poll_source`` (batch key), ``next_bar_close(now)`` and a
+    class method ``poll_batch(feeds)`` returning ``{feed: True if a new bar arrived}``.
+
+    Parameters:
+    -----------
+    grace : float
+        Seconds after the bar close before polling
+    retry_delay : float
+        Seconds before polling again a feed whose new bar was not available yet
+    max_retries : int
+        Retries per bar before waiting for the next close
+    """
+
+    def __init__(
+        self,
+        grace: float = 2.0,
+        retry_delay: float = 10.0,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.time,
+        executor=None,
+    ):
+        self.grace = grace
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self._clock = clock
+        self._executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="bar-poll")
+        self._entries: Dict[int, _Entry] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def _next_due(self, feed, now: float) -> float:
+        return feed.next_bar_close(now) + self.grace
+
+    def start(self):
+        """Start the scheduler thread (polls are otherwise dispatched by run_pending only)"""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="bar-scheduler", daemon=True)
+                self._thread.start()
+
+    def register(self, feed):
+        """Poll ``feed`` at each of its bar closes"""
+        with self._cond:
+            self._entries[id(feed)] = _Entry(feed, self._next_due(feed, self._clock()))
+            self._cond.notify()
+
+    def unregister(self, feed):
+        with self._cond:
+            self._entries.pop(id(feed), None)
+            self._cond.notify()
+
+    def next_due(self) -> Optional[float]:
+        """Epoch seconds of the next scheduled poll (None when nothing is scheduled)"""
+        with self._cond:
+            dues = [entry.due for entry in self._entries.values() if not entry.in_flight]
+            return min(dues) if dues else None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """
+        Dispatch the batches of all feeds due at ``now``.
+
+        Returns:
+            int: Number of batches dispatched
+        """
+        now = self._clock() if now is None else now
+        batches: Dict[Any, List[_Entry]] = defaultdict(list)
+        with self._cond:
+            for entry in self._entries.values():
+                if not entry.in_flight and entry.due <= now:
+                    entry.in_flight = True
+                    batches[(type(entry.feed), entry.feed.poll_source)].append(entry)
+        for (feed_class, source), entries in batches.items():
+            _logger.debug(f"Polling {len(entries)} {source} feed(s)")
+            self._executor.submit(self._poll_batch, feed_class, entries)
+        return len(batches)
+
+    def _poll_batch(self, feed_class, entries: List[_Entry]):
+        try:
+            results = feed_class.poll_batch([entry.feed for entry in entries])
+        except Exception as e:
+            _logger.error(f"Error polling {feed_class.__name__} feeds: {str(e)}")
+            results = {}
+        now = self._clock()
+        with self._cond:
+            for entry in entries:
+                entry.in_flight = False
+                if results.get(entry.feed) or entry.attempts >= self.max_retries:
+                    entry.attempts = 0
+                    entry.due = self._next_due(entry.feed, now)
+                else:
+                    # The bar is published late: try again shortly
+                    entry.attempts += 1
+                    entry.due = now + self.retry_delay
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._entries:
+                    self._cond.wait()
+                    continue
+                due = self.next_due()
+                delay = None if due is None else due - self._clock()
+                if delay is None or delay > 0:
+                    self._cond.wait(delay)
+                    continue
+            self.run_pending()
+
+
+def get_bar_scheduler() -> BarCloseScheduler:
+    """Process-wide bar close scheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BarCloseScheduler()
+            _scheduler.start()
+        return _scheduler
@@ -2,30 +2,74 @@ import datetime
 import os
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
+from src.data.bar_scheduler import bar_open
+from src.data.concurrent_downloader import ConcurrentDownloader
+from src.data.market_data_store import (MarketDataStore, data_key,
+                                        get_market_data_store, interval_ms,
+                                        to_arrays)
+from src.notification.logger import _logger
 
 """
 Base Data Downloader Module
 --------------------------
 
-This module provides the BaseDataDownloader class, which implements common logic for saving, loading, and managing historical market data files. It is designed to be inherited by specific data downloader classes (e.g., BinanceDataDownloader, YahooDataDownloader) to ensure consistent file handling and batch operations.
+This module provides the BaseDataDownloader class, which implements common logic for saving, loading, and managing historical market data. It is designed to be inherited by specific data downloader classes (e.g., BinanceDataDownloader, YahooDataDownloader) to ensure consistent storage and batch operations.
+
+Downloaded bars are merged into the local market data store (see market_data_store),
+partitioned by source/symbol/interval/month. CSV files are only used to exchange data:
+``export_csv`` writes the standard ``symbol_interval_start_end.csv`` file and
+``import_csv``/``load_data`` read one.
+
+``sync`` downloads incrementally: it asks the store which parts of the requested range are
+missing (head, tail and interior gaps, minus ranges already fetched without bars), fetches
+only those with the subclass' ``fetch_range`` and merges them in one write. Bars that are
+still open (the current candle) are not stored, so the next sync fetches them again.
 
 Main Features:
-- Save pandas DataFrames to CSV files with standardized naming
-- Load data from CSV files and parse timestamps
+- Save pandas DataFrames to the market data store (append with de-duplication)
+- Export to / import from CSV files with standardized naming
+- Incremental, gap-aware download of the missing parts of a range
+- Concurrent, resumable sync of many symbols (see concurrent_downloader)
 - Download and save data for multiple symbols using a provided download function
 
 Classes:
 - BaseDataDownloader: Abstract base class for data downloaders
 """
 
-
 class BaseDataDownloader:
-    def __init__(self, data_dir: Optional[str] = None, interval: Optional[str] = None):
+    """
+    Base class of the historical data downloaders.
+
+    Parameters:
+    -----------
+    data_dir : str
+        Directory for exported CSV files
+    interval : str
+        Default bar interval
+    store : MarketDataStore
+        Store receiving the downloaded bars (default: the process-wide store in data/store)
+    """
+
+    # Source name of the series in the market data store
+    source = "local"
+    # Missing ranges less than this many bars apart are fetched as one range
+    merge_gap_bars = 0
+    # Symbols downloaded in parallel by sync_multiple_symbols
+    download_workers = 1
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        interval: Optional[str] = None,
+        store: Optional[MarketDataStore] = None,
+    ):
         self.data_dir = data_dir or os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "dataset"
         )
         self.interval = interval or "1d"
+        self.store = store or get_market_data_store()
         os.makedirs(self.data_dir, exist_ok=True)
 
     def save_data(
@@ -34,21 +78,70 @@ class BaseDataDownloader:
         symbol: str,
         start_date: str = None,
         end_date: str = None,
+        interval: Optional[str] = None,
     ) -> str:
         """
-        Save downloaded data to a CSV file.
+        Merge downloaded data into the market data store.
+
+        Args:
+            df: Bars with a ``timestamp`` column and OHLCV columns
+            symbol: Symbol
+            start_date: Start of the requested range (default: first bar)
+            end_date: End of the requested range, inclusive like the downloaders' end_date (default: last bar)
+            interval: Bar interval (default: the downloader's interval)
+
+        Returns:
+            str: Data key (symbol_interval_start_end) of the saved range, registered in the store
         """
+        interval = interval or self.interval
+        timestamps, values = to_arrays(df)
+        self.store.write_arrays(self.source, symbol, interval, timestamps, values)
         if start_date is None:
-            start_date = df["timestamp"].min().strftime("%Y-%m-%d")
+            start_date = pd.Timestamp(int(timestamps.min()), unit="ms")
         if end_date is None:
-            end_date = df["timestamp"].max().strftime("%Y-%m-%d")
-        filename = f"{symbol}_{self.interval}_{start_date.replace('-', '')}"
-        if end_date:
-            filename += f"_{end_date.replace('-', '')}"
-        filename += ".csv"
+            end_date = pd.Timestamp(int(timestamps.max()), unit="ms")
+        key = data_key(symbol, interval, start_date, end_date)
+        self.store.register_keys({key: self.source})
+        return key
+
+    def export_csv(
+        self,
+        symbol: str,
+        start_date: str = None,
+        end_date: str = None,
+        interval: Optional[str] = None,
+    ) -> str:
+        """
+        Export stored bars to a CSV file in data_dir (symbol_interval_start_end.csv).
+
+        Args:
+            start_date: First day to export (default: first stored bar)
+            end_date: Last day to export, inclusive (default: last stored bar)
+
+        Returns:
+            str: Path of the CSV file
+        """
+        interval = interval or self.interval
+        end = pd.Timestamp(end_date) + pd.Timedelta(days=1) if end_date else None
+        df = self.store.read(self.source, symbol, interval, start_date, end)
+        if df.empty:
+            raise ValueError(f"No stored {symbol} {interval} bars to export")
+        filename = data_key(
+            symbol, interval, start_date or df.index[0], end_date or df.index[-1]
+        ) + ".csv"
         filepath = os.path.join(self.data_dir, filename)
-        df.to_csv(filepath, index=False)
-        return filepath
+        return self.store.export_csv(self.source, symbol, interval, filepath, start_date, end)
+
+    def import_csv(
+        self, filepath: str, symbol: Optional[str] = None, interval: Optional[str] = None
+    ) -> int:
+        """
+        Import a CSV file into the store (symbol/interval default to the file name).
+
+        Returns:
+            int: Number of bars that were not stored before
+        """
+        return self.store.import_csv(filepath, self.source, symbol, interval)
 
     def load_data(self, filepath: str) -> pd.DataFrame:
         """
@@ -59,25 +152,166 @@ class BaseDataDownloader:
             df["timestamp"] = pd.to_datetime(df["timestamp"])
         return df
 
+    def fetch_range(
+        self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Download the bars opening in [start, end) from the data source.
+
+        Implemented by the subclasses; used by ``sync``.
+
+        Returns:
+            pd.DataFrame: Bars with a ``timestamp`` column and OHLCV columns
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement fetch_range")
+
+    def sync(
+        self,
+        symbol: str,
+        start_date,
+        end_date=None,
+        interval: Optional[str] = None,
+        register_key: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Download only the parts of [start_date, end_date) missing from the store.
+
+        All missing ranges are fetched first and then merged into the store in one write,
+        so a failed request leaves the stored series unchanged.
+
+        Args:
+            symbol: Symbol
+            start_date: Start of the range (date string or timestamp, UTC)
+            end_date: End of the range, exclusive (default: now)
+            interval: Bar interval (default: the downloader's interval)
+            register_key: Register the data key of the range in the store (False for the
+                          chunks of a larger range)
+
+        Returns:
+            dict: key (data key of the range), missing (fetched ranges), requests, bars
+                  (downloaded bars) and added (bars new to the store)
+        """
+        interval = interval or self.interval
+        step = interval_ms(interval)
+        start = self._utc(start_date)
+        now = pd.Timestamp.now(tz="UTC")
+        requested_end = self._utc(end_date) if end_date is not None else now
+        # Do not store or mark the candle that is still open
+        closed_until = self._open_bar_start(interval, now)
+        end = min(requested_end, closed_until)
+
+        merge_within = self.merge_gap_bars * step if step and self.merge_gap_bars else None
+        missing = self.store.missing_ranges(self.source, symbol, interval, start, end, merge_within)
+
+        frames = []
+        for range_start, range_end in missing:
+            df = self.fetch_range(symbol, interval, range_start, range_end)
+            if df is not None and not df.empty:
+                frames.append(to_arrays(df))
+
+        bars = added = 0
+        if frames:
+            timestamps = np.concatenate([frame[0] for frame in frames])
+            closed = timestamps < closed_until.value // 1_000_000
+            values = {
+                column: np.concatenate([frame[1][column] for frame in frames])[closed]
+                for column in frames[0][1]
+            }
+            bars = int(closed.sum())
+            added = self.store.write_arrays(self.source, symbol, interval, timestamps[closed], values)
+        for range_start, range_end in missing:
+            self.store.mark_fetched(self.source, symbol, interval, range_start, range_end)
+
+        if missing:
+            _logger.info(
+                f"Synced {symbol} {interval}: {len(missing)} missing range(s), {bars} bars downloaded, {added} new"
+            )
+        else:
+            _logger.debug(f"{symbol} {interval} is up to date for {start} - {end}")
+        # The end date of a data key is the last day of the range
+        key = data_key(symbol, interval, start, requested_end - pd.Timedelta(milliseconds=1))
+        if register_key:
+            self.store.register_keys({key: self.source})
+        return {
+            "key": key,
+            "missing": missing,
+            "requests": len(missing),
+            "bars": bars,
+            "added": added,
+        }
+
+    @staticmethod
+    def _open_bar_start(interval: str, now: pd.Timestamp) -> pd.Timestamp:
+        """Open time of the bar that is still forming at ``now`` (weeks open on Monday, months on the 1st)"""
+        return pd.Timestamp(round(bar_open(interval, now.timestamp()) * 1000), unit="ms", tz="UTC")
+
+    @staticmethod
+    def _utc(value) -> pd.Timestamp:
+        ts = pd.Timestamp(value)
+        return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+    def stored_frame(self, symbol: str, interval: str, start_date=None, end_date=None) -> pd.DataFrame:
+        """Stored bars in [start_date, end_date) with a (naive UTC) ``timestamp`` column and OHLCV columns"""
+        start = self._utc(start_date) if start_date is not None else None
+        end = self._utc(end_date) if end_date is not None else None
+        df = self.store.read(self.source, symbol, interval, start, end)
+        df.index = df.index.tz_localize(None)
+        return df.rename_axis("timestamp").reset_index()
+
+    def sync_multiple_symbols(
+        self,
+        symbols: List[str],
+        start_date,
+        end_date=None,
+        interval: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        on_progress=None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        ``sync`` every symbol on a thread pool (see ConcurrentDownloader); symbols that fail
+        are logged and left out.
+
+        Args:
+            max_workers: Symbols downloaded at the same time (default: download_workers)
+            checkpoint_path: JSON checkpoint to resume an interrupted run from
+            on_progress: Called as ``on_progress(symbol, state)`` while downloading
+
+        Returns:
+            Dict[str, Dict]: Final state by symbol (key, requests, bars, added, ...)
+        """
+        runner = ConcurrentDownloader(
+            self,
+            max_workers=max_workers or self.download_workers,
+            checkpoint_path=checkpoint_path,
+            on_progress=on_progress,
+        )
+        results = runner.run(symbols, start_date, end_date, interval=interval)
+        return {symbol: state for symbol, state in results.items() if state["status"] == "done"}
+
     def download_multiple_symbols(
         self, symbols: List[str], download_func, *args, **kwargs
     ) -> Dict[str, str]:
         """
         Download data for multiple symbols using the provided download_func.
+
+        ``interval``, ``start_date`` and ``end_date`` keyword arguments are passed to
+        download_func and name the saved range.
+
+        Returns:
+            Dict[str, str]: Data key of the saved range by symbol
         """
         results = {}
         for symbol in symbols:
             try:
                 df = download_func(symbol, *args, **kwargs)
-                # Assume start_date and end_date are in kwargs or args
-                start_date = kwargs.get("start_date") or args[0] if args else ""
-                end_date = kwargs.get("end_date") or (
-                    args[1] if len(args) > 1 else None
-                )
-                filepath = self.save_data(
-                    df, symbol, str(start_date), str(end_date) if end_date else None
+                results[symbol] = self.save_data(
+                    df,
+                    symbol,
+                    kwargs.get("start_date"),
+                    kwargs.get("end_date"),
+                    interval=kwargs.get("interval"),
                 )
-                results[symbol] = filepath
             except Exception as e:
                 print(f"Error processing {symbol}: {str(e)}")
                 continue
@@ -8,7 +8,9 @@ All specific data feed implementations (Binance, Yahoo, IBKR) inherit from this
 Main Features:
 - Common interface for all live data feeds
 - Historical data loading with configurable lookback
+- Fixed-capacity ring buffer of the received bars (O(1) per bar for long sessions)
 - Real-time data updates via WebSocket/polling
+- Polls aligned to bar closes through the shared bar scheduler (polling feeds)
 - Automatic error handling and reconnection
 - Backtrader integration
 
@@ -19,11 +21,13 @@ Classes:
 import time
 import threading
 from abc import ABC, abstractmethod
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List
 from datetime import datetime, timedelta
 
 import backtrader as bt
 import pandas as pd
+from src.data.bar_buffer import BarRingBuffer
+from src.data.bar_scheduler import get_bar_scheduler, next_bar_close
 from src.notification.logger import setup_logger
 
 _logger = setup_logger(__name__)
@@ -50,12 +54,18 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
         ("openinterest", None),
     )
     
+    # Polling feeds set a source name: they are polled at their bar closes by the shared
+    # bar scheduler, batched with the due feeds of the same source, instead of sleeping
+    # in their own update thread
+    poll_source: Optional[str] = None
+    
     def __init__(self, 
                  symbol: str,
                  interval: str,
                  lookback_bars: int = 1000,
                  retry_interval: int = 60,
                  on_new_bar: Optional[Callable] = None,
+                 buffer_margin: int = 500,
                  **kwargs):
         """
         Initialize the live data feed.
@@ -66,16 +76,22 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
             lookback_bars: Number of historical bars to load initially
             retry_interval: Seconds to wait before retrying on connection failure
             on_new_bar: Optional callback function when new data arrives
-            **kwargs: Additional arguments passed to PandasData
+            buffer_margin: Bars kept in the ring buffer beyond lookback_bars
+            **kwargs: PandasData params (name, timeframe, ...); Backtrader's metaclass
+                      takes them before __init__ runs, so only unknown arguments arrive here
         """
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} got unexpected arguments: {', '.join(kwargs)}")
         self.symbol = symbol
         self.interval = interval
         self.lookback_bars = lookback_bars
         self.retry_interval = retry_interval
         self.on_new_bar = on_new_bar
         
-        # Initialize data storage
-        self.df = None
+        # Preallocated bar storage: history plus the bars received live
+        self.bars = BarRingBuffer(lookback_bars + buffer_margin)
+        # Called as listener(timestamp, bar, status) for new ("new") and revised ("update") bars
+        self.bar_listeners: List[Callable] = []
         self.last_update = None
         self.is_connected = False
         self.should_stop = False
@@ -86,9 +102,12 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
         
         if historical_data is None or historical_data.empty:
             raise ValueError(f"Failed to load historical data for {symbol}")
+        self.bars.extend(historical_data)
         
-        # Initialize PandasData with historical data
-        super().__init__(dataname=historical_data, **kwargs)
+        # Backtrader sets params before __init__; the history only exists now, so it is
+        # set as the dataname param here (PandasData.__init__ reads its columns)
+        self.p.dataname = self._dataname = historical_data
+        super().__init__()
         
         # Start real-time updates
         self._start_realtime_updates()
@@ -129,7 +148,11 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
         pass
     
     def _start_realtime_updates(self):
-        """Start the real-time update thread."""
+        """Start the real-time update thread (or schedule the polls at bar closes)."""
+        if self.poll_source is not None:
+            get_bar_scheduler().register(self)
+            _logger.info(f"Scheduled {self.poll_source} polls at {self.interval} bar closes for {self.symbol}")
+            return
         self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
         self.update_thread.start()
         _logger.info(f"Started real-time updates for {self.symbol}")
@@ -161,45 +184,123 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
                 self.is_connected = False
                 time.sleep(self.retry_interval)
     
+    def poll(self) -> bool:
+        """
+        Connect if needed, then get and process the latest data once.
+        
+        Returns:
+            True if a new bar was appended
+        """
+        if self.should_stop:
+            return False
+        if not self.is_connected:
+            if not self._connect_realtime():
+                _logger.warning(f"Failed to connect to real-time data for {self.symbol}")
+                return False
+            self.is_connected = True
+            _logger.info(f"Connected to real-time data for {self.symbol}")
+        latest_data = self._get_latest_data()
+        if latest_data is None or latest_data.empty:
+            return False
+        return self._process_new_data(latest_data) == "new"
+    
+    def next_bar_close(self, now: float) -> float:
+        """
+        Close time of the bar open at ``now``, on the time grid of the buffered bars.
+        
+        Args:
+            now: Epoch seconds
+            
+        Returns:
+            Epoch seconds of the next bar close
+        """
+        anchor = self.bars.last_timestamp
+        if anchor is not None:
+            anchor = pd.Timestamp(anchor).timestamp()
+        return next_bar_close(self.interval, now, anchor=anchor)
+    
+    @classmethod
+    def poll_batch(cls, feeds: List["BaseLiveDataFeed"]) -> Dict["BaseLiveDataFeed", bool]:
+        """
+        Poll feeds of this class that are due at the same bar close.
+        
+        Sources that can serve several symbols with one request override this; the
+        default polls each feed on its own.
+        
+        Returns:
+            Dictionary of feed -> True if a new bar was appended
+        """
+        results = {}
+        for feed in feeds:
+            try:
+                results[feed] = feed.poll()
+            except Exception as e:
+                _logger.error(f"Error polling {feed.symbol}: {str(e)}")
+                feed.is_connected = False
+                results[feed] = False
+        return results
+    
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """
+        DataFrame of the buffered bars, built on demand (a copy: later bars do not change
+        it).
+        """
+        return self.bars.frame() if len(self.bars) else None
+
     def _process_new_data(self, new_data: pd.DataFrame):
         """
         Process new data and update Backtrader lines.
         
+        Bars newer than the latest one are appended to the ring buffer; a bar with the
+        timestamp of a buffered bar updates it in place (e.g. the forming candle).
+        
         Args:
             new_data: DataFrame with new bar(s)
+            
+        Returns:
+            "new" or "update" for the latest bar, None if nothing changed
         """
+        latest_status = None
         try:
-            # Check if we have new data
-            if self.df is None or new_data.index[-1] not in self.df.index:
-                # Add new data to DataFrame
-                if self.df is None:
-                    self.df = new_data
-                else:
-                    self.df = pd.concat([self.df, new_data])
-                
-                # Update Backtrader lines
-                latest = self.df.iloc[-1]
-                self.lines.datetime[0] = bt.date2num(self.df.index[-1])
-                self.lines.open[0] = latest["open"]
-                self.lines.high[0] = latest["high"]
-                self.lines.low[0] = latest["low"]
-                self.lines.close[0] = latest["close"]
-                self.lines.volume[0] = latest["volume"]
-                self.lines.openinterest[0] = 0
+            for timestamp, row in zip(new_data.index, new_data[["open", "high", "low", "close", "volume"]].to_numpy(dtype=float)):
+                status = self.bars.append(timestamp, *row)
+                if status is not None and timestamp == self.bars.last_timestamp:
+                    latest_status = status
+            
+            if latest_status is not None:
+                latest = self.bars.last()
+                timestamp = self.bars.last_timestamp
+                # Update Backtrader lines (only once Backtrader has loaded a bar into them)
+                if len(self.lines.datetime.array):
+                    self.lines.datetime[0] = bt.date2num(timestamp)
+                    self.lines.open[0] = latest["open"]
+                    self.lines.high[0] = latest["high"]
+                    self.lines.low[0] = latest["low"]
+                    self.lines.close[0] = latest["close"]
+                    self.lines.volume[0] = latest["volume"]
+                    self.lines.openinterest[0] = 0
                 
                 self.last_update = datetime.now()
                 
                 # Call callback if provided
-                if self.on_new_bar:
+                if latest_status == "new" and self.on_new_bar:
                     try:
-                        self.on_new_bar(self.symbol, self.df.index[-1], latest.to_dict())
+                        self.on_new_bar(self.symbol, timestamp, latest)
                     except Exception as e:
                         _logger.error(f"Error in on_new_bar callback: {str(e)}")
                 
-                _logger.debug(f"Updated {self.symbol} with new bar at {self.df.index[-1]}")
+                for listener in list(self.bar_listeners):
+                    try:
+                        listener(timestamp, latest, latest_status)
+                    except Exception as e:
+                        _logger.error(f"Error in bar listener: {str(e)}")
+                
+                _logger.debug(f"Updated {self.symbol} with {latest_status} bar at {timestamp}")
         
         except Exception as e:
             _logger.error(f"Error processing new data for {self.symbol}: {str(e)}")
+        return latest_status
     
     def _get_update_interval(self) -> int:
         """
@@ -233,6 +334,8 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
         """Stop the real-time updates and disconnect."""
         _logger.info(f"Stopping real-time updates for {self.symbol}")
         self.should_stop = True
+        if self.poll_source is not None:
+            get_bar_scheduler().unregister(self)
         self._disconnect_realtime()
         if hasattr(self, 'update_thread'):
             self.update_thread.join(timeout=5)
@@ -249,6 +352,6 @@ class BaseLiveDataFeed(bt.feeds.PandasData):
             'interval': self.interval,
             'is_connected': self.is_connected,
             'last_update': self.last_update,
-            'data_points': len(self.df) if self.df is not None else 0,
+            'data_points': len(self.bars),
             'should_stop': self.should_stop
         } 
\ No newline at end of file
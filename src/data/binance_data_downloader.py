@@ -2,38 +2,180 @@
 Binance Data Downloader Module
 -----------------------------
 
-This module provides the BinanceDataDownloader class for downloading historical OHLCV (Open, High, Low, Close, Volume) data from the Binance exchange. It supports fetching data for single or multiple symbols and saving the results as CSV files for use in backtesting and analysis workflows.
+This module provides the BinanceDataDownloader class for downloading historical OHLCV (Open, High, Low, Close, Volume) data from the Binance exchange. It supports fetching data for single or multiple symbols and saving the results in the local market data store for use in backtesting and analysis workflows.
 
 Main Features:
 - Download historical candlestick data for any Binance trading pair and interval
-- Save data to CSV files in a structured format
-- Download data for multiple symbols in batch
+- Save data to the market data store (source "binance"); CSV export on demand
+- Incremental downloads: only the klines missing from the store are requested
+- Download data for multiple symbols concurrently within Binance's request-weight limit
 - Inherits common logic from BaseDataDownloader for file management
 
 Classes:
+- BinanceKlinesClient: Klines REST client with weight budget, backoff and retries
 - BinanceDataDownloader: Main class for interacting with the Binance API and managing data downloads
 """
 
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
+import requests
 from binance.client import Client
 
 from .base_data_downloader import BaseDataDownloader
+from .concurrent_downloader import RateLimitError, WeightBudget
+from .market_data_store import MarketDataStore
+
+# Request budget shared by all Binance REST clients of the process (limits apply per IP)
+_shared_budget = WeightBudget()
+
+
+class BinanceKlinesClient:
+    """
+    Klines REST client paced by a request-weight budget.
+
+    Every request takes its weight from the budget first, and the used weight reported by
+    Binance is merged back into it. On 429 (rate limit) or 418 (IP ban) the whole budget is
+    paused for ``Retry-After`` seconds (or an exponential backoff without the header) and
+    the request is retried. 5xx responses and connection errors are retried with the same
+    backoff.
+
+    Parameters:
+    -----------
+    base_url : str
+        REST endpoint (default: https://api.binance.com)
+    budget : WeightBudget
+        Request-weight budget (default: the process-wide Binance budget)
+    page_size : int
+        Klines per request (at most 1000)
+    max_retries : int
+        Retries of a request before the error is raised
+    backoff : float
+        First backoff delay in seconds, doubled on every retry up to max_backoff
+    """
+
+    BASE_URL = "https://api.binance.com"
+    KLINES_PATH = "/api/v3/klines"
+    # Request weight of GET /api/v3/klines
+    KLINES_WEIGHT = 2
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        budget: Optional[WeightBudget] = None,
+        page_size: int = 1000,
+        timeout: float = 10.0,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.budget = budget or _shared_budget
+        self.page_size = page_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        # requests.Session is not thread-safe: one per worker thread
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def get(self, path: str, params: Dict[str, Any], weight: int = 1) -> Any:
+        """GET a REST endpoint within the weight budget and return the decoded JSON."""
+        attempt = 0
+        while True:
+            self.budget.acquire(weight)
+            status = retry_after = None
+            try:
+                response = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                error: Exception = e
+            else:
+                used = response.headers.get("X-MBX-USED-WEIGHT-1M")
+                if used is not None:
+                    self.budget.update_used(int(used))
+                status = response.status_code
+                if status < 400:
+                    return response.json()
+                if status not in (418, 429) and status < 500:
+                    response.raise_for_status()
+                if response.headers.get("Retry-After") is not None:
+                    retry_after = float(response.headers["Retry-After"])
+                if status in (418, 429):
+                    error = RateLimitError(status, retry_after)
+                else:
+                    error = requests.HTTPError(f"HTTP {status} from {path}", response=response)
+
+            if attempt >= self.max_retries:
+                raise error
+            delay = retry_after if retry_after is not None else min(self.backoff * 2**attempt, self.max_backoff)
+            if status in (418, 429):
+                # Hold every worker on the budget, not only this request
+                self.budget.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def klines(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List[Any]]:
+        """Raw klines opening in [start_ms, end_ms), fetched page by page."""
+        klines: List[List[Any]] = []
+        while start_ms < end_ms:
+            page = self.get(
+                self.KLINES_PATH,
+                {
+                    "symbol": symbol,
+                    "interval": interval,
+                    "startTime": start_ms,
+                    "endTime": end_ms - 1,
+                    "limit": self.page_size,
+                },
+                weight=self.KLINES_WEIGHT,
+            )
+            klines.extend(page)
+            if len(page) < self.page_size:
+                break
+            start_ms = int(page[-1][0]) + 1
+        return klines
 
 
 class BinanceDataDownloader(BaseDataDownloader):
+    source = "binance"
+    download_workers = 4
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
         data_dir: Optional[str] = None,
         interval: Optional[str] = None,
+        store: Optional[MarketDataStore] = None,
+        rest: Optional[BinanceKlinesClient] = None,
     ):
-        super().__init__(data_dir=data_dir, interval=interval)
-        self.client = Client(api_key, api_secret)
+        super().__init__(data_dir=data_dir, interval=interval, store=store)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.rest = rest or BinanceKlinesClient()
+        self._client: Optional[Client] = None
+
+    @property
+    def client(self) -> Client:
+        # Created on first use: the python-binance client pings the API when constructed
+        if self._client is None:
+            self._client = Client(self.api_key, self.api_secret)
+        return self._client
+
+    # Binance returns up to 1000 klines per request: gaps closer than that cost no extra requests
+    merge_gap_bars = 1000
 
     def download_historical_data(
         self,
@@ -41,21 +183,31 @@ class BinanceDataDownloader(BaseDataDownloader):
         interval: str,
         start_date: str,
         end_date: str,
-        save_to_csv: bool = True,
+        save: bool = True,
+        incremental: bool = True,
     ) -> pd.DataFrame:
         """
         Download historical klines/candlestick data from Binance.
 
+        With ``save`` and ``incremental`` only the parts of the range missing from the
+        market data store are downloaded (see ``BaseDataDownloader.sync``) and the stored
+        bars of the range are returned.
+
         Args:
             symbol: Trading pair symbol (e.g., 'BTCUSDT')
             interval: Kline interval (e.g., '1h', '4h', '1d')
             start_date: Start date in format 'YYYY-MM-DD'
             end_date: End date in format 'YYYY-MM-DD'
-            save_to_csv: Whether to save the data to a CSV file
+            save: Whether to save the data to the market data store
+            incremental: Download only the bars missing from the store
 
         Returns:
             DataFrame containing the historical data
         """
+        if save and incremental:
+            self.sync(symbol, start_date, end_date, interval=interval)
+            return self.stored_frame(symbol, interval, start_date, end_date)
+
         # Convert dates to timestamps
         start_timestamp = int(
             datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000
@@ -66,8 +218,24 @@ class BinanceDataDownloader(BaseDataDownloader):
         klines = self.client.get_historical_klines(
             symbol, interval, start_timestamp, end_timestamp
         )
+        df = self._klines_frame(klines)
 
-        # Convert to DataFrame
+        # Save to the store if requested
+        if save:
+            self.save_data(df, symbol, start_date, end_date, interval=interval)
+
+        return df
+
+    def fetch_range(
+        self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp
+    ) -> pd.DataFrame:
+        """Download the klines opening in [start, end)."""
+        klines = self.rest.klines(symbol, interval, start.value // 1_000_000, end.value // 1_000_000)
+        return self._klines_frame(klines)
+
+    @staticmethod
+    def _klines_frame(klines: List[List[Any]]) -> pd.DataFrame:
+        """Convert raw klines to a DataFrame with a timestamp column and float OHLCV."""
         df = pd.DataFrame(
             klines,
             columns=[
@@ -93,31 +261,48 @@ class BinanceDataDownloader(BaseDataDownloader):
         for col in ["open", "high", "low", "close", "volume"]:
             df[col] = df[col].astype(float)
 
-        # Save to CSV if requested
-        if save_to_csv:
-            self.save_data(df, symbol, start_date, end_date)
-
         return df
 
     def download_multiple_symbols(
-        self, symbols: List[str], interval: str, start_date: str, end_date: str
-    ):
-        """Download historical data for multiple symbols."""
+        self,
+        symbols: List[str],
+        interval: str,
+        start_date: str,
+        end_date: str,
+        incremental: bool = True,
+        max_workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Download historical data for multiple symbols.
+
+        Incremental downloads run concurrently (``max_workers`` symbols at a time, default
+        download_workers) within the shared request-weight budget; with ``checkpoint_path``
+        an interrupted run resumes where it stopped.
+
+        Returns:
+            Dict[str, str]: Data key of the downloaded range by symbol
+        """
+        if incremental:
+            results = self.sync_multiple_symbols(
+                symbols,
+                start_date,
+                end_date,
+                interval=interval,
+                max_workers=max_workers,
+                checkpoint_path=checkpoint_path,
+            )
+            return {symbol: result["key"] for symbol, result in results.items()}
 
         def download_func(symbol, interval, start_date, end_date):
             return self.download_historical_data(
-                symbol, interval, start_date, end_date, save_to_csv=False
+                symbol, interval, start_date, end_date, save=False
             )
 
         return super().download_multiple_symbols(
-            symbols, download_func, interval, start_date, end_date
+            symbols,
+            download_func,
+            interval=interval,
+            start_date=start_date,
+            end_date=end_date,
         )
-
-    def save_data(
-        self,
-        df: pd.DataFrame,
-        symbol: str,
-        start_date: str = None,
-        end_date: str = None,
-    ) -> str:
-        return super().save_data(df, symbol, start_date, end_date)
@@ -4,10 +4,12 @@ Binance Live Data Feed Module
 
 This module provides a live data feed for Binance using WebSocket connections.
 It loads historical data via REST API and provides real-time updates via WebSocket.
+The kline streams of all feeds share the combined-stream connections of the process-wide
+BinanceStreamManager; each feed reads its closed klines from an in-process queue.
 
 Features:
 - Historical data loading via Binance REST API
-- Real-time updates via WebSocket streams
+- Real-time updates via shared WebSocket combined streams
 - Automatic reconnection on connection loss
 - Error handling and rate limiting
 - Backtrader integration
@@ -16,9 +18,7 @@ Classes:
 - BinanceLiveDataFeed: Live data feed for Binance
 """
 
-import time
-import json
-import websocket
+import queue
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
@@ -27,6 +27,7 @@ from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
 from src.data.base_live_data_feed import BaseLiveDataFeed
+from src.data.binance_stream_manager import BinanceStreamManager, get_binance_stream_manager
 from src.notification.logger import setup_logger
 
 _logger = setup_logger(__name__)
@@ -38,7 +39,7 @@ class BinanceLiveDataFeed(BaseLiveDataFeed):
     
     Features:
     - Loads historical data via REST API
-    - Real-time updates via WebSocket kline streams
+    - Real-time updates via kline streams multiplexed by BinanceStreamManager
     - Automatic reconnection on connection loss
     - Error handling and rate limiting
     """
@@ -49,6 +50,7 @@ class BinanceLiveDataFeed(BaseLiveDataFeed):
                  api_key: Optional[str] = None,
                  api_secret: Optional[str] = None,
                  testnet: bool = False,
+                 stream_manager: Optional[BinanceStreamManager] = None,
                  **kwargs):
         """
         Initialize Binance live data feed.
@@ -59,6 +61,7 @@ class BinanceLiveDataFeed(BaseLiveDataFeed):
             api_key: Binance API key (optional for public data)
             api_secret: Binance API secret (optional for public data)
             testnet: Use Binance testnet
+            stream_manager: Shared stream connections (default: the process-wide manager)
             **kwargs: Additional arguments passed to BaseLiveDataFeed
         """
         self.api_key = api_key
@@ -68,9 +71,9 @@ class BinanceLiveDataFeed(BaseLiveDataFeed):
         # Initialize Binance client
         self.client = Client(api_key, api_secret, testnet=testnet)
         
-        # WebSocket connection
-        self.ws = None
-        self.ws_url = None
+        # Shared WebSocket connections; klines arrive on self.events
+        self.stream_manager = stream_manager or get_binance_stream_manager(testnet)
+        self.events: Optional[queue.Queue] = None
         
         # Convert interval to Binance format
         self.binance_interval = self._convert_interval(interval)
@@ -174,95 +177,67 @@ class BinanceLiveDataFeed(BaseLiveDataFeed):
     
     def _connect_realtime(self) -> bool:
         """
-        Connect to Binance WebSocket for real-time data.
+        Subscribe to the kline stream on the shared stream connections.
         
         Returns:
-            True if connection successful, False otherwise
+            True if the subscription was registered, False otherwise
         """
         try:
-            # Create WebSocket URL
-            stream_name = f"{self.symbol.lower()}@kline_{self.binance_interval}"
-            self.ws_url = f"wss://stream.binance.com:9443/ws/{stream_name}"
-            
-            # Create WebSocket connection
-            self.ws = websocket.WebSocketApp(
-                self.ws_url,
-                on_message=self._on_ws_message,
-                on_error=self._on_ws_error,
-                on_close=self._on_ws_close,
-                on_open=self._on_ws_open
-            )
-            
-            # Start WebSocket in a separate thread
-            import threading
-            self.ws_thread = threading.Thread(target=self.ws.run_forever, daemon=True)
-            self.ws_thread.start()
-            
-            # Wait for connection to establish
-            time.sleep(2)
-            
-            return self.ws.sock is not None and self.ws.sock.connected
+            if self.events is None:
+                self.events = self.stream_manager.subscribe(self.symbol, self.binance_interval)
+            return True
             
         except Exception as e:
-            _logger.error(f"Error connecting to Binance WebSocket: {str(e)}")
+            _logger.error(f"Error subscribing to Binance klines for {self.symbol}: {str(e)}")
             return False
     
     def _disconnect_realtime(self):
-        """Disconnect from Binance WebSocket."""
-        if self.ws:
-            self.ws.close()
-            self.ws = None
-    
-    def _on_ws_open(self, ws):
-        """WebSocket connection opened."""
-        _logger.info(f"Binance WebSocket connected for {self.symbol}")
+        """Unsubscribe from the kline stream."""
+        if self.events is not None:
+            self.stream_manager.unsubscribe(self.symbol, self.binance_interval, self.events)
+            # Wake up the update thread waiting on the queue
+            self.events.put(None)
+            self.events = None
     
-    def _on_ws_close(self, ws, close_status_code, close_msg):
-        """WebSocket connection closed."""
-        _logger.warning(f"Binance WebSocket disconnected for {self.symbol}: {close_msg}")
-        self.is_connected = False
-    
-    def _on_ws_error(self, ws, error):
-        """WebSocket error occurred."""
-        _logger.error(f"Binance WebSocket error for {self.symbol}: {str(error)}")
-        self.is_connected = False
-    
-    def _on_ws_message(self, ws, message):
-        """WebSocket message received."""
+    def _get_latest_data(self) -> Optional[pd.DataFrame]:
+        """
+        Wait for klines from the stream and return the closed ones.
+        
+        Blocks up to one update interval for the first event, then takes whatever else is
+        queued.
+        
+        Returns:
+            DataFrame with the closed klines, or None if none arrived
+        """
+        events_queue = self.events
+        if events_queue is None:
+            return None
         try:
-            data = json.loads(message)
-            
-            # Extract kline data
-            if 'k' in data:
-                kline = data['k']
-                
-                # Check if this is a completed kline
-                if kline['x']:  # kline is closed
-                    new_data = pd.DataFrame([{
-                        'open': float(kline['o']),
-                        'high': float(kline['h']),
-                        'low': float(kline['l']),
-                        'close': float(kline['c']),
-                        'volume': float(kline['v'])
-                    }], index=[pd.to_datetime(kline['t'], unit='ms')])
-                    
-                    self._process_new_data(new_data)
-            
-        except json.JSONDecodeError as e:
-            _logger.error(f"Error decoding WebSocket message: {str(e)}")
-        except Exception as e:
-            _logger.error(f"Error processing WebSocket message: {str(e)}")
+            events = [events_queue.get(timeout=super()._get_update_interval())]
+        except queue.Empty:
+            return None
+        while True:
+            try:
+                events.append(events_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        closed = [event for event in events if event is not None and event["closed"]]
+        if not closed:
+            return None
+        return pd.DataFrame(
+            [{column: event[column] for column in ("open", "high", "low", "close", "volume")} for event in closed],
+            index=[event["timestamp"] for event in closed],
+        )
     
-    def _get_latest_data(self) -> Optional[pd.DataFrame]:
+    def _get_update_interval(self) -> int:
         """
-        Get latest data from Binance.
-        For WebSocket feeds, this is handled by the WebSocket callback.
+        No sleep between updates: _get_latest_data waits on the event queue.
         
         Returns:
-            None (data is processed via WebSocket callbacks)
+            0
         """
-        # For WebSocket feeds, data is processed via _on_ws_message
-        return None
+        return 0
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -273,8 +248,8 @@ class BinanceLiveDataFeed(BaseLiveDataFeed):
         """
         status = super().get_status()
         status.update({
-            'ws_connected': self.ws is not None and self.ws.sock is not None and self.ws.sock.connected,
-            'ws_url': self.ws_url,
+            'ws_connected': self.stream_manager.is_connected(self.symbol, self.binance_interval),
+            'ws_url': self.stream_manager.base_url,
             'binance_interval': self.binance_interval,
             'testnet': self.testnet
         })
@@ -0,0 +1,308 @@
+"""
+Binance Stream Manager Module
+----------------------------
+
+This module multiplexes the Binance kline streams of all live feeds of a process over a
+few combined-stream WebSocket connections (``/stream``). Without it, every
+BinanceLiveDataFeed opened its own socket, and 40 pairs meant 40 connections, which runs
+into Binance's per-IP connection limits.
+
+Streams (``<symbol>@kline_<interval>``) are subscribed at runtime with SUBSCRIBE /
+UNSUBSCRIBE messages. A connection takes up to ``max_streams_per_connection`` streams (Binance
+allows 1024), and new connections are opened only when all the others are full. Control
+messages are spaced to stay below Binance's 5 incoming messages per second per
+connection, and pending subscriptions are batched into one message. A dropped connection
+is reopened and resubscribes its streams.
+
+Each message is parsed once into a kline event dict and put on the in-process queue of
+every subscriber of its stream. Subscriptions are reference counted, so a stream is
+unsubscribed only when its last queue is removed.
+
+Main Features:
+- Combined-stream connections shared by all feeds, filled before new ones are opened
+- Runtime subscribe/unsubscribe with reference counting per stream
+- Message throttling, batching and automatic reconnection with resubscription
+- Parsed kline events routed to per-subscriber queues
+
+Classes:
+- BinanceStreamManager: Shared kline stream connections of a process
+
+Functions:
+- get_binance_stream_manager: Process-wide manager (mainnet or testnet)
+- kline_stream: Stream name of a symbol and interval
+- parse_kline: Kline event of a combined-stream message
+"""
+
+import itertools
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import websocket
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+STREAM_URL = "wss://stream.binance.com:9443"
+TESTNET_STREAM_URL = "wss://testnet.binance.vision"
+
+_managers: Dict[str, "BinanceStreamManager"] = {}
+_managers_lock = threading.Lock()
+
+
+def kline_stream(symbol: str, interval: str) -> str:
+    """Stream name ``<symbol>@kline_<interval>`` (symbol in lower case)"""
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+def parse_kline(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Kline event of a combined-stream message
+
+    Returns:
+        dict: stream, symbol, interval, timestamp (bar open time, naive UTC), open, high,
+              low, close, volume and closed; None for other messages
+    """
+    data = message.get("data")
+    if not isinstance(data, dict) or "k" not in data:
+        return None
+    kline = data["k"]
+    return {
+        "stream": message.get("stream"),
+        "symbol": kline["s"],
+        "interval": kline["i"],
+        "timestamp": pd.to_datetime(kline["t"], unit="ms"),
+        "open": float(kline["o"]),
+        "high": float(kline["h"]),
+        "low": float(kline["l"]),
+        "close": float(kline["c"]),
+        "volume": float(kline["v"]),
+        "closed": bool(kline["x"]),
+    }
+
+
+class _StreamConnection:
+    """One combined-stream WebSocket and the streams subscribed on it"""
+
+    def __init__(self, manager: "BinanceStreamManager", number: int):
+        self.manager = manager
+        self.number = number
+        self.streams: set = set()
+        self.is_open = False
+        self.should_stop = False
+        self.ws: Optional[websocket.WebSocketApp] = None
+        self._lock = threading.RLock()
+        self._last_send = 0.0
+        self._ids = itertools.count(1)
+        self.thread = threading.Thread(
+            target=self._run, name=f"binance-streams-{number}", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        while not self.should_stop:
+            self.ws = websocket.WebSocketApp(
+                f"{self.manager.base_url}/stream",
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self.ws.run_forever(ping_interval=self.manager.ping_interval, ping_timeout=self.manager.ping_timeout)
+            except Exception as e:
+                _logger.error(f"Binance stream connection {self.number} failed: {str(e)}")
+            with self._lock:
+                self.is_open = False
+            if not self.should_stop:
+                time.sleep(self.manager.reconnect_delay)
+
+    def _send(self, method: str, params: List[str]):
+        """Send a control message, spaced to stay below Binance's message rate limit"""
+        with self._lock:
+            delay = self._last_send + self.manager.min_message_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.ws.send(json.dumps({"method": method, "params": sorted(params), "id": next(self._ids)}))
+            except websocket.WebSocketException as e:
+                # The streams are subscribed again when the connection is reopened
+                _logger.warning(f"Binance stream connection {self.number}: {method} not sent: {str(e)}")
+            self._last_send = time.monotonic()
+
+    def subscribe(self, streams: List[str]):
+        with self._lock:
+            self.streams.update(streams)
+            if self.is_open:
+                self._send("SUBSCRIBE", streams)
+
+    def unsubscribe(self, streams: List[str]):
+        with self._lock:
+            self.streams.difference_update(streams)
+            if self.is_open:
+                self._send("UNSUBSCRIBE", streams)
+
+    def close(self):
+        self.should_stop = True
+        if self.ws is not None:
+            self.ws.close()
+
+    def _on_open(self, ws):
+        with self._lock:
+            self.is_open = True
+            if self.streams:
+                # Fresh connection or reconnect: (re)subscribe everything in one message
+                self._send("SUBSCRIBE", list(self.streams))
+        _logger.info(f"Binance stream connection {self.number} open with {len(self.streams)} streams")
+
+    def _on_message(self, ws, message):
+        try:
+            self.manager._dispatch(json.loads(message))
+        except Exception as e:
+            _logger.error(f"Error processing Binance stream message: {str(e)}")
+
+    def _on_error(self, ws, error):
+        _logger.error(f"Binance stream connection {self.number} error: {str(error)}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        with self._lock:
+            self.is_open = False
+        if not self.should_stop:
+            _logger.warning(f"Binance stream connection {self.number} closed: {close_msg}")
+
+
+class BinanceStreamManager:
+    """
+    Kline streams of many symbols over shared combined-stream connections.
+
+    Parameters:
+    -----------
+    base_url : str
+        WebSocket endpoint (``/stream`` is appended)
+    max_streams_per_connection : int
+        Streams per connection before another connection is opened
+    min_message_interval : float
+        Seconds between control messages on a connection (Binance: at most 5 per second)
+    reconnect_delay : float
+        Seconds to wait before reopening a dropped connection
+    """
+
+    def __init__(
+        self,
+        base_url: str = STREAM_URL,
+        max_streams_per_connection: int = 200,
+        min_message_interval: float = 0.25,
+        reconnect_delay: float = 5.0,
+        ping_interval: float = 60.0,
+        ping_timeout: float = 20.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_streams_per_connection = max_streams_per_connection
+        self.min_message_interval = min_message_interval
+        self.reconnect_delay = reconnect_delay
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self._lock = threading.Lock()
+        self._connections: List[_StreamConnection] = []
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._assigned: Dict[str, _StreamConnection] = {}
+
+    def subscribe(self, symbol: str, interval: str, events: Optional[queue.Queue] = None) -> queue.Queue:
+        """
+        Receive the kline events of a symbol and interval on a queue.
+
+        Args:
+            events: Queue to put the events on (default: a new queue)
+
+        Returns:
+            queue.Queue: Queue receiving the parsed kline events (see ``parse_kline``)
+        """
+        stream = kline_stream(symbol, interval)
+        events = events if events is not None else queue.Queue()
+        with self._lock:
+            subscribers = self._subscribers.setdefault(stream, [])
+            subscribers.append(events)
+            if len(subscribers) > 1:
+                return events
+            connection = self._connection_with_room()
+            self._assigned[stream] = connection
+        connection.subscribe([stream])
+        return events
+
+    def unsubscribe(self, symbol: str, interval: str, events: queue.Queue):
+        """Stop putting events on a queue; the stream is unsubscribed with its last queue"""
+        stream = kline_stream(symbol, interval)
+        with self._lock:
+            subscribers = self._subscribers.get(stream, [])
+            if events in subscribers:
+                subscribers.remove(events)
+            if subscribers or stream not in self._assigned:
+                return
+            del self._subscribers[stream]
+            connection = self._assigned.pop(stream)
+        connection.unsubscribe([stream])
+
+    def _connection_with_room(self) -> _StreamConnection:
+        """Fullest connection that still has room, or a new one (called with the lock held)"""
+        load = {id(connection): 0 for connection in self._connections}
+        for connection in self._assigned.values():
+            load[id(connection)] += 1
+        candidates = [
+            connection
+            for connection in self._connections
+            if load[id(connection)] < self.max_streams_per_connection
+        ]
+        if candidates:
+            return max(candidates, key=lambda connection: load[id(connection)])
+        connection = _StreamConnection(self, len(self._connections) + 1)
+        self._connections.append(connection)
+        return connection
+
+    def _dispatch(self, message: Dict[str, Any]):
+        event = parse_kline(message)
+        if event is None:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(event["stream"], ()))
+        for events in subscribers:
+            events.put(event)
+
+    def is_connected(self, symbol: str, interval: str) -> bool:
+        """Whether the connection carrying the stream is open"""
+        with self._lock:
+            connection = self._assigned.get(kline_stream(symbol, interval))
+        return connection is not None and connection.is_open
+
+    def get_status(self) -> Dict[str, Any]:
+        """Streams and connection state"""
+        with self._lock:
+            return {
+                "connections": [
+                    {"open": connection.is_open, "streams": sorted(connection.streams)}
+                    for connection in self._connections
+                ],
+                "streams": len(self._subscribers),
+                "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            }
+
+    def close(self):
+        """Close all connections"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._subscribers.clear()
+            self._assigned.clear()
+        for connection in connections:
+            connection.close()
+
+
+def get_binance_stream_manager(testnet: bool = False) -> BinanceStreamManager:
+    """Process-wide stream manager of Binance mainnet or testnet"""
+    url = TESTNET_STREAM_URL if testnet else STREAM_URL
+    with _managers_lock:
+        manager = _managers.get(url)
+        if manager is None:
+            manager = _managers[url] = BinanceStreamManager(url)
+        return manager
@@ -0,0 +1,284 @@
+"""
+Concurrent Downloader Module
+---------------------------
+
+This module downloads the history of many symbols in parallel. Symbols are synced on a
+bounded thread pool (``BaseDataDownloader.sync`` on every worker), and each symbol's range
+is split into chunks of ``chunk_bars`` bars. Each chunk is merged into the market data
+store as soon as it is downloaded, so an interrupted run loses at most one chunk per
+symbol.
+
+Requests of all workers (and of every downloader sharing the budget) are paced by a
+``WeightBudget``. It models exchange request-weight limits such as Binance's 6000 weight
+per minute. A request waits until its weight fits into the current window. The used
+weight the exchange reports (``X-MBX-USED-WEIGHT-1M``) is merged into the local count, so
+other processes using the same IP are accounted for. A 429/418 response pauses every
+request on the budget for the ``Retry-After`` time.
+
+Progress is kept per symbol (status, requests, bars, synced_until). With a checkpoint file
+it is written after every chunk. A later run with the same interval and range skips what
+was already synced, and failed symbols can be retried by running again.
+
+Main Features:
+- Bounded thread pool over symbols, chunked per symbol
+- Shared per-window request-weight budget with pause on rate-limit responses
+- Per-symbol progress callback and snapshot
+- Resumable JSON checkpoints
+
+Classes:
+- WeightBudget: Thread-safe request-weight budget of a fixed time window
+- RateLimitError: Raised when rate-limit responses persist after all retries
+- ConcurrentDownloader: Sync many symbols in parallel with checkpoints
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from src.data.market_data_store import data_key, interval_ms
+from src.notification.logger import _logger
+
+# Binance spot REQUEST_WEIGHT limit per minute
+BINANCE_WEIGHT_LIMIT = 6000
+
+
+class RateLimitError(RuntimeError):
+    """The exchange kept answering 429 (rate limit) or 418 (IP ban) after all retries"""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"Rate limited (HTTP {status}), retry after {retry_after}s")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class WeightBudget:
+    """
+    Request-weight budget of a fixed time window shared by threads.
+
+    Parameters:
+    -----------
+    limit : int
+        Weight available per window
+    window : float
+        Window length in seconds (windows start at multiples of ``window`` on the clock,
+        like the exchange's per-minute counters)
+    clock : callable
+        Time source in seconds
+    """
+
+    def __init__(
+        self,
+        limit: int = BINANCE_WEIGHT_LIMIT,
+        window: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._window_id: Optional[int] = None
+        self._used = 0
+        self._paused_until = 0.0
+
+    def _roll(self, now: float):
+        window_id = int(now // self.window)
+        if window_id != self._window_id:
+            self._window_id, self._used = window_id, 0
+
+    def acquire(self, weight: int = 1):
+        """Block until ``weight`` fits into the current window (and no pause is active), then use it"""
+        if weight > self.limit:
+            raise ValueError(f"Request weight {weight} exceeds the budget limit {self.limit}")
+        with self._cond:
+            while True:
+                now = self._clock()
+                self._roll(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._used + weight > self.limit:
+                    delay = (self._window_id + 1) * self.window - now
+                else:
+                    self._used += weight
+                    return
+                self._cond.wait(delay)
+
+    def update_used(self, used: int):
+        """Merge the used weight reported by the exchange for the current window"""
+        with self._cond:
+            self._roll(self._clock())
+            self._used = max(self._used, int(used))
+
+    def pause(self, seconds: float):
+        """Hold every request on this budget for ``seconds`` (rate-limit response)"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    @property
+    def used(self) -> int:
+        """Weight used in the current window"""
+        with self._cond:
+            self._roll(self._clock())
+            return self._used
+
+
+class ConcurrentDownloader:
+    """
+    Sync the history of many symbols in parallel.
+
+    Parameters:
+    -----------
+    downloader : BaseDataDownloader
+        Downloader whose ``sync`` runs on the workers (its ``fetch_range`` must be thread-safe)
+    max_workers : int
+        Number of symbols downloaded at the same time
+    chunk_bars : int
+        Bars per chunk; every chunk is stored (and checkpointed) when it is downloaded
+    checkpoint_path : str
+        JSON file with the progress of the run (None: no checkpoint)
+    on_progress : callable
+        Called as ``on_progress(symbol, state)`` after every chunk and status change
+    """
+
+    def __init__(
+        self,
+        downloader,
+        max_workers: int = 4,
+        chunk_bars: int = 10_000,
+        checkpoint_path: Optional[str] = None,
+        on_progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        self.downloader = downloader
+        self.max_workers = max(1, max_workers)
+        self.chunk_bars = chunk_bars
+        self.checkpoint_path = checkpoint_path
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._run: Dict[str, Any] = {}
+        self._states: Dict[str, Dict[str, Any]] = {}
+
+    def run(
+        self, symbols: List[str], start_date, end_date=None, interval: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Sync [start_date, end_date) of every symbol.
+
+        Symbols that fail are logged and reported with status "failed"; they do not stop
+        the other downloads.
+
+        Returns:
+            Dict[str, Dict]: Final state by symbol (status, key, requests, bars, added,
+                             synced_until, error)
+        """
+        interval = interval or self.downloader.interval
+        self._run = {
+            "source": self.downloader.source,
+            "interval": interval,
+            "start": str(pd.Timestamp(start_date)),
+            "end": None if end_date is None else str(pd.Timestamp(end_date)),
+        }
+        resumed = self._load_checkpoint()
+        with self._lock:
+            self._states = {
+                symbol: {
+                    "status": "pending",
+                    "key": None,
+                    "requests": 0,
+                    "bars": 0,
+                    "added": 0,
+                    "synced_until": resumed.get(symbol, {}).get("synced_until"),
+                    "error": None,
+                }
+                for symbol in symbols
+            }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for future in [pool.submit(self._sync_symbol, symbol, start_date, end_date, interval) for symbol in symbols]:
+                future.result()
+        return self.progress()
+
+    def progress(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of the per-symbol state"""
+        with self._lock:
+            return {symbol: dict(state) for symbol, state in self._states.items()}
+
+    def _chunks(self, start: pd.Timestamp, end: pd.Timestamp, step: Optional[int]):
+        if not step or not self.chunk_bars:
+            return [(start, end)]
+        size = pd.Timedelta(milliseconds=step * self.chunk_bars)
+        chunks = []
+        while start < end:
+            chunks.append((start, min(start + size, end)))
+            start += size
+        return chunks
+
+    def _sync_symbol(self, symbol: str, start_date, end_date, interval: str):
+        downloader = self.downloader
+        start = downloader._utc(start_date)
+        now = pd.Timestamp.now(tz="UTC")
+        end = downloader._utc(end_date) if end_date is not None else now
+        step = interval_ms(interval)
+        closed_until = downloader._open_bar_start(interval, now)
+
+        synced_until = self._states[symbol]["synced_until"]
+        if synced_until is not None:
+            start = max(start, pd.Timestamp(synced_until, unit="ms", tz="UTC"))
+        self._update(symbol, status="running")
+        try:
+            for chunk_start, chunk_end in self._chunks(start, end, step):
+                result = downloader.sync(symbol, chunk_start, chunk_end, interval=interval, register_key=False)
+                state = self._states[symbol]
+                self._update(
+                    symbol,
+                    requests=state["requests"] + result["requests"],
+                    bars=state["bars"] + result["bars"],
+                    added=state["added"] + result["added"],
+                    # The open candle is synced again on the next run
+                    synced_until=int(min(chunk_end, closed_until).value // 1_000_000),
+                )
+        except Exception as e:
+            _logger.error(f"Error downloading {symbol}: {str(e)}", exc_info=e)
+            self._update(symbol, status="failed", error=str(e))
+            return
+        key_end = (downloader._utc(end_date) if end_date is not None else now) - pd.Timedelta(milliseconds=1)
+        key = data_key(symbol, interval, downloader._utc(start_date), key_end)
+        downloader.store.register_keys({key: downloader.source})
+        self._update(symbol, status="done", key=key)
+
+    def _update(self, symbol: str, **changes):
+        with self._lock:
+            self._states[symbol].update(changes)
+            state = dict(self._states[symbol])
+            self._save_checkpoint()
+        if self.on_progress is not None:
+            self.on_progress(symbol, state)
+
+    def _load_checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        """Symbol states of a checkpoint of the same run (same source, interval and range)"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            _logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return {}
+        if checkpoint.get("run") != self._run:
+            return {}
+        return checkpoint.get("symbols", {})
+
+    def _save_checkpoint(self):
+        """Write the checkpoint atomically (called with the lock held)"""
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"run": self._run, "symbols": self._states}, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
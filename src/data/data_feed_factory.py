@@ -4,6 +4,8 @@ Data Feed Factory Module
 
 This module provides a factory for creating live data feeds based on configuration.
 It helps determine which data feed implementation to use based on the data source.
+By default feeds are shared through the market data hub: bots on the same source,
+symbol and interval get their own Backtrader feed over one upstream live feed.
 
 Classes:
 - DataFeedFactory: Factory for creating live data feeds
@@ -14,6 +16,7 @@ from src.data.base_live_data_feed import BaseLiveDataFeed
 from src.data.binance_live_feed import BinanceLiveDataFeed
 from src.data.yahoo_live_feed import YahooLiveDataFeed
 from src.data.ibkr_live_feed import IBKRLiveDataFeed
+from src.data.market_data_hub import get_market_data_hub
 from src.notification.logger import setup_logger
 
 _logger = setup_logger(__name__)
@@ -46,6 +49,7 @@ class DataFeedFactory:
             "lookback_bars": 1000,
             "retry_interval": 60,
             "on_new_bar": callback_function,
+            "shared": true,  # share one upstream feed per source/symbol/interval
             
             # Binance specific
             "api_key": "your_api_key",
@@ -54,6 +58,7 @@ class DataFeedFactory:
             
             # Yahoo specific
             "polling_interval": 60,
+            "align_to_bar_close": true,  # poll at bar closes instead of every polling_interval
             
             # IBKR specific
             "host": "127.0.0.1",
@@ -61,6 +66,26 @@ class DataFeedFactory:
             "client_id": 1
         }
         """
+        try:
+            if config.get("shared", True):
+                return get_market_data_hub().subscribe(config, DataFeedFactory.create_direct_feed)
+            return DataFeedFactory.create_direct_feed(config)
+                
+        except Exception as e:
+            _logger.error(f"Error creating data feed: {str(e)}")
+            return None
+    
+    @staticmethod
+    def create_direct_feed(config: Dict[str, Any]) -> Optional[BaseLiveDataFeed]:
+        """
+        Create a live data feed with its own history download and realtime connection.
+        
+        Args:
+            config: Configuration dictionary with data feed parameters
+            
+        Returns:
+            Live data feed instance, or None if creation fails
+        """
         try:
             data_source = config.get("data_source", "").lower()
             
@@ -101,7 +126,8 @@ class DataFeedFactory:
             lookback_bars=config.get("lookback_bars", 1000),
             retry_interval=config.get("retry_interval", 60),
             on_new_bar=config.get("on_new_bar"),
-            polling_interval=config.get("polling_interval", 60)
+            polling_interval=config.get("polling_interval", 60),
+            align_to_bar_close=config.get("align_to_bar_close", True)
         )
     
     @staticmethod
@@ -0,0 +1,321 @@
+"""
+Dataset Cache Module
+-------------------
+
+This module provides a process-wide in-memory cache of parsed OHLCV datasets. The optimizer
+runs hundreds of trials against the same data; instead of re-reading it for every trial,
+each range of the market data store (or CSV file) is loaded once and kept as read-only
+NumPy column arrays. Every trial then gets its own lightweight Backtrader feed that reads directly
+from the shared arrays without copying them.
+
+Main Features:
+- Cache keyed by (store range or CSV path, partition/file version, column set), so
+  updated data is loaded again
+- Read-only float64 column arrays shared between threads
+- Backtrader date numbers precomputed once per dataset
+- Per-trial PandasData compatible feed with an array based _load
+- Lazily built vectorized Bars view for the NumPy backtest engine
+- Content fingerprint identifying the data independent of file name and location
+- Zero-copy windows (e.g. walk-forward train/test slices) that remember their parent
+
+Classes:
+- OHLCVDataset: Parsed, immutable OHLCV dataset
+- DatasetFeed: Backtrader feed reading from an OHLCVDataset
+
+Functions:
+- get_dataset: Return the cached dataset for a CSV file, parsing it on first use
+- get_store_dataset: Return the cached dataset for a range of the market data store
+- frame_fingerprint: Content fingerprint of an OHLCV DataFrame
+- clear_dataset_cache: Drop all cached datasets
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+from src.data.market_data_store import MarketDataStore, get_market_data_store
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+_cache: Dict[Tuple[str, int, Tuple[str, ...]], "OHLCVDataset"] = {}
+_cache_lock = threading.Lock()
+
+
+class OHLCVDataset:
+    """
+    Immutable OHLCV dataset backed by read-only NumPy arrays.
+
+    Parameters:
+    -----------
+    index : pandas.DatetimeIndex
+        UTC bar timestamps, sorted ascending
+    columns : dict
+        Column name -> float64 array, all of the same length as the index
+    path : str
+        Source file the dataset was parsed from
+    datenums : numpy.ndarray, optional
+        Precomputed Backtrader date numbers of the index
+    parent : OHLCVDataset, optional
+        Dataset this one is a window of (see ``window``)
+    offset : int
+        Position of the first bar within the parent
+    """
+
+    def __init__(
+        self,
+        index: pd.DatetimeIndex,
+        columns: Dict[str, np.ndarray],
+        path: str = "",
+        datenums: Optional[np.ndarray] = None,
+        parent: Optional["OHLCVDataset"] = None,
+        offset: int = 0,
+    ):
+        self.path = path
+        self.index = index
+        self.parent = parent
+        self.offset = offset
+        self.columns = {}
+        for name, values in columns.items():
+            array = np.ascontiguousarray(values, dtype=np.float64)
+            array.flags.writeable = False
+            self.columns[name] = array
+
+        if datenums is None:
+            naive = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+            datenums = np.array([bt.date2num(ts) for ts in naive.to_pydatetime()])
+        self.datenums = datenums
+        self.datenums.flags.writeable = False
+
+        self._frame: Optional[pd.DataFrame] = None
+        self._bars = {}
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def window(self, start: int, stop: int) -> "OHLCVDataset":
+        """
+        Dataset of the bars [start, stop) sharing this dataset's arrays (no copy)
+
+        Windows of a window refer to the outermost dataset, so indicators computed on the
+        full history can be sliced for any window.
+        """
+        root = self.parent if self.parent is not None else self
+        offset = self.offset + start
+        stop = min(stop, len(self))
+        return OHLCVDataset(
+            self.index[start:stop],
+            {name: values[start:stop] for name, values in self.columns.items()},
+            path=self.path,
+            datenums=self.datenums[start:stop],
+            parent=root,
+            offset=offset,
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the timestamps and column values, stable across processes and runs"""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            digest.update(np.ascontiguousarray(self.index.asi8).tobytes())
+            for name in sorted(self.columns):
+                digest.update(name.encode("utf-8"))
+                digest.update(self.columns[name].tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """DataFrame wrapping the shared column arrays (no copy)"""
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._frame = pd.DataFrame(self.columns, index=self.index, copy=False)
+        return self._frame
+
+    def bars(self, name: str = "UNKNOWN"):
+        """Vectorized backtester view of the dataset sharing the column arrays"""
+        from src.optimizer.vectorized_backtester import Bars
+
+        bars = self._bars.get(name)
+        if bars is None:
+            if self.parent is not None:
+                bars = Bars(self, name=name, parent=self.parent.bars(name), offset=self.offset)
+            else:
+                bars = Bars(self, name=name)
+            bars = self._bars.setdefault(name, bars)
+        return bars
+
+    def feed(self, name: str = "UNKNOWN") -> "DatasetFeed":
+        """Create a new Backtrader feed over the dataset; feeds are cheap but not shareable"""
+        return DatasetFeed(dataname=self.frame, dataset=self, name=name)
+
+
+class DatasetFeed(bt.feeds.PandasData):
+    """
+    PandasData feed that loads bars from an OHLCVDataset's arrays.
+
+    ``p.dataname`` is still the (shared) DataFrame so code expecting a PandasData keeps
+    working, but ``_load`` reads plain array slots instead of ``DataFrame.iloc`` cells.
+    """
+
+    params = (
+        ("dataset", None),
+        ("datetime", None),
+        ("openinterest", None),
+    )
+
+    def start(self):
+        super().start()
+        dataset = self.p.dataset
+        self._arrays = [
+            (getattr(self.lines, name), dataset[name]) for name in OHLCV_COLUMNS if name in dataset.columns
+        ]
+        self._datenums = dataset.datenums
+        self._size = len(dataset)
+
+    def _load(self):
+        self._idx += 1
+        if self._idx >= self._size:
+            return False
+
+        idx = self._idx
+        for line, values in self._arrays:
+            line[0] = values[idx]
+        self.lines.datetime[0] = self._datenums[idx]
+        return True
+
+
+def _parse_csv(path: str, columns: Tuple[str, ...]) -> OHLCVDataset:
+    df = pd.read_csv(path, usecols=["timestamp", *columns])
+    df["datetime"] = pd.to_datetime(df["timestamp"], utc=True)
+    df = df.sort_values("datetime", ascending=True)
+    df.set_index("datetime", inplace=True)
+    df = df[list(columns)]
+
+    for col in columns:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df = df.ffill().bfill()
+    return OHLCVDataset(
+        pd.DatetimeIndex(df.index), {col: df[col].to_numpy(dtype=np.float64) for col in columns}, path=path
+    )
+
+
+def get_dataset(path: str, columns: Sequence[str] = OHLCV_COLUMNS) -> OHLCVDataset:
+    """
+    Return the cached dataset for a CSV file, parsing it on first use
+
+    The cache key includes the file's mtime, so a rewritten file is parsed again and the
+    stale entry for the same path is dropped.
+
+    Args:
+        path: Path to a CSV file with a ``timestamp`` column and the requested columns
+        columns: Columns to load
+
+    Returns:
+        OHLCVDataset: Shared, read-only dataset
+    """
+    abs_path = os.path.abspath(path)
+    columns = tuple(columns)
+    key = (abs_path, os.stat(abs_path).st_mtime_ns, columns)
+
+    dataset = _cache.get(key)
+    if dataset is not None:
+        return dataset
+
+    with _cache_lock:
+        dataset = _cache.get(key)
+        if dataset is None:
+            for stale in [k for k in _cache if k[0] == abs_path and k[2] == columns]:
+                del _cache[stale]
+            _logger.debug(f"Parsing dataset {abs_path}")
+            dataset = _parse_csv(abs_path, columns)
+            _cache[key] = dataset
+    return dataset
+
+
+def get_store_dataset(
+    symbol: str,
+    interval: str,
+    start=None,
+    end=None,
+    source: Optional[str] = None,
+    store: Optional[MarketDataStore] = None,
+    columns: Sequence[str] = OHLCV_COLUMNS,
+) -> OHLCVDataset:
+    """
+    Return the cached dataset for a range of a series in the market data store
+
+    The cache key includes the version of the partitions in the range, so appended bars
+    load the range again.
+
+    Args:
+        symbol: Symbol
+        interval: Bar interval
+        start: First bar time (inclusive), None for the first stored bar
+        end: End time (exclusive), None for the last stored bar
+        source: Data source (None: the store's first source holding the series)
+        store: Store to read (default: the process-wide store in data/store)
+        columns: Columns to load
+
+    Returns:
+        OHLCVDataset: Shared, read-only dataset
+    """
+    store = store or get_market_data_store()
+    source = source or store.resolve_source(symbol, interval)
+    columns = tuple(columns)
+    identifier = f"store:{store.series_dir(source, symbol, interval)}|{start}|{end}"
+    key = (identifier, store.version(source, symbol, interval, start, end), columns)
+
+    dataset = _cache.get(key)
+    if dataset is not None:
+        return dataset
+
+    with _cache_lock:
+        dataset = _cache.get(key)
+        if dataset is None:
+            for stale in [k for k in _cache if k[0] == identifier and k[2] == columns]:
+                del _cache[stale]
+            _logger.debug(f"Loading dataset {identifier}")
+            timestamps, values = store.read_arrays(source, symbol, interval, start, end, columns)
+            if not len(timestamps):
+                raise ValueError(f"No {symbol} {interval} bars in the store between {start} and {end}")
+            index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit="ms", utc=True))
+            if any(np.isnan(array).any() for array in values.values()):
+                frame = pd.DataFrame(values, index=index).ffill().bfill()
+                values = {col: frame[col].to_numpy(dtype=np.float64) for col in columns}
+            dataset = OHLCVDataset(index, values, path=identifier)
+            _cache[key] = dataset
+    return dataset
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of an OHLCV DataFrame, equal to OHLCVDataset.fingerprint for the same data"""
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    columns = {name: df[name].to_numpy(dtype=np.float64) for name in OHLCV_COLUMNS if name in df.columns}
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(index.tz_convert("UTC").asi8).tobytes())
+    for name in sorted(columns):
+        digest.update(name.encode("utf-8"))
+        digest.update(np.ascontiguousarray(columns[name]).tobytes())
+    return digest.hexdigest()
+
+
+def clear_dataset_cache():
+    """Drop all cached datasets"""
+    with _cache_lock:
+        _cache.clear()
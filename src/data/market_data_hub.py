@@ -0,0 +1,308 @@
+"""
+Market Data Hub Module
+---------------------
+
+This module shares live market data between the bots of a process. Feeds are keyed by
+source, symbol, interval and the connection settings of the source (Binance testnet and
+credentials, IBKR host/port/client id, Yahoo polling), so bots on different accounts or
+gateways never share a feed. The first subscriber of a key creates the upstream live feed
+(BinanceLiveDataFeed, YahooLiveDataFeed, ...), which loads the history over REST once and
+holds the only realtime connection. Every subscriber gets its own HubDataFeed, a
+Backtrader feed that starts from the upstream's buffered bars. Each new or updated
+upstream bar is published to the queue of every subscribed HubDataFeed.
+
+The upstream is created outside the hub lock, so a slow history download only holds up
+the subscribers of its own key. A subscriber requesting more history than the upstream
+holds gets a larger upstream, which replaces the current one for all subscribers.
+
+Subscriptions are reference counted. Stopping a HubDataFeed releases it, and the
+upstream feed is stopped when its last subscriber is gone. Two bots on BTCUSDT 15m thus
+cost one history download and one socket instead of two of each.
+
+Main Features:
+- One upstream live feed per source, symbol, interval and connection, created on first use
+- Upstream sized to the largest requested lookback
+- Per-subscriber Backtrader feeds seeded from the shared history (no REST per bot)
+- Fan-out of new and updated bars through in-process queues
+- Reference counting with upstream shutdown on the last release
+
+Classes:
+- MarketDataHub: Upstream feeds and their subscribers
+- HubDataFeed: Backtrader feed of one subscriber
+
+Functions:
+- get_market_data_hub: Process-wide hub
+"""
+
+import hashlib
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from src.data.base_live_data_feed import BaseLiveDataFeed
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+_hub: Optional["MarketDataHub"] = None
+_hub_lock = threading.Lock()
+
+HubKey = Tuple[str, str, str, Tuple[Tuple[str, Any], ...]]
+
+# Configuration fields selecting the upstream connection of a source, with the defaults of
+# DataFeedFactory
+CONNECTION_FIELDS: Dict[str, Dict[str, Any]] = {
+    "binance": {"testnet": False, "api_key": None, "api_secret": None},
+    "ibkr": {"host": "127.0.0.1", "port": 7497, "client_id": 1},
+    "yahoo": {"polling_interval": 60, "align_to_bar_close": True},
+}
+# Kept in keys (and logs) as a digest only
+_SECRET_FIELDS = ("api_key", "api_secret")
+
+
+class _HubChannel:
+    """Upstream feed of one key and the event queues of its subscribers"""
+
+    def __init__(self, key: HubKey):
+        self.key = key
+        self.upstream: Optional[BaseLiveDataFeed] = None
+        self.queues: List[queue.Queue] = []
+        self.lock = threading.Lock()
+        # Held while the upstream is created or replaced (never under the hub lock)
+        self.upstream_lock = threading.Lock()
+
+    def set_upstream(self, upstream: BaseLiveDataFeed) -> Optional[BaseLiveDataFeed]:
+        """Publish the bars of ``upstream`` from now on; returns the replaced upstream"""
+        with self.lock:
+            previous, self.upstream = self.upstream, upstream
+            if previous is not None:
+                previous.bar_listeners.remove(self.publish)
+            upstream.bar_listeners.append(self.publish)
+        return previous
+
+    def attach(self) -> queue.Queue:
+        events: queue.Queue = queue.Queue()
+        with self.lock:
+            self.queues.append(events)
+        return events
+
+    def detach(self, events: queue.Queue) -> int:
+        """Remove a subscriber queue; returns the number of subscribers left"""
+        with self.lock:
+            if events in self.queues:
+                self.queues.remove(events)
+            return len(self.queues)
+
+    def publish(self, timestamp, bar: Dict[str, float], status: str):
+        with self.lock:
+            queues = list(self.queues)
+        for events in queues:
+            events.put((timestamp, bar))
+
+
+class HubDataFeed(BaseLiveDataFeed):
+    """
+    Backtrader feed of one hub subscriber.
+
+    The history is taken from the upstream feed's buffered bars and realtime bars arrive on
+    a queue filled by the hub; the feed opens no connection of its own.
+    """
+
+    def __init__(self, hub: "MarketDataHub", channel: _HubChannel, events: queue.Queue, **kwargs):
+        self.hub = hub
+        self.channel = channel
+        # Attached before the history is taken, so no bar published in between is missed
+        self.events: Optional[queue.Queue] = events
+        upstream = channel.upstream
+        super().__init__(symbol=upstream.symbol, interval=upstream.interval, **kwargs)
+
+    def _load_historical_data(self) -> Optional[pd.DataFrame]:
+        """Copy of the upstream feed's latest ``lookback_bars`` bars."""
+        history = self.channel.upstream.df
+        if history is None:
+            return None
+        if len(history) < self.lookback_bars:
+            _logger.warning(
+                f"Shared feed {self.channel.key} has {len(history)} bars, {self.lookback_bars} requested"
+            )
+        return history.tail(self.lookback_bars).copy()
+
+    def _connect_realtime(self) -> bool:
+        """Bars are published by the hub: connected as long as the feed is subscribed."""
+        return self.events is not None
+
+    def _disconnect_realtime(self):
+        """Release the subscription (the upstream feed stops with its last subscriber)."""
+        events, self.events = self.events, None
+        if events is not None:
+            self.hub._release(self.channel, events)
+            # Wake up the update thread waiting on the queue
+            events.put(None)
+
+    def _get_latest_data(self) -> Optional[pd.DataFrame]:
+        """
+        Wait for bars published by the hub.
+
+        Returns:
+            DataFrame with the new or updated bars, or None if none arrived
+        """
+        events_queue = self.events
+        if events_queue is None:
+            return None
+        try:
+            events = [events_queue.get(timeout=60)]
+        except queue.Empty:
+            return None
+        while True:
+            try:
+                events.append(events_queue.get_nowait())
+            except queue.Empty:
+                break
+        events = [event for event in events if event is not None]
+        if not events:
+            return None
+        return pd.DataFrame([bar for _, bar in events], index=[timestamp for timestamp, _ in events])
+
+    def _get_update_interval(self) -> int:
+        """No sleep between updates: _get_latest_data waits on the event queue."""
+        return 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Status of the subscriber feed and of the shared upstream feed."""
+        status = super().get_status()
+        status.update({
+            "shared_key": self.channel.key,
+            "upstream_connected": self.channel.upstream.is_connected,
+            "subscribers": len(self.channel.queues),
+        })
+        return status
+
+
+class MarketDataHub:
+    """
+    Upstream live feeds shared by source, symbol, interval and connection with reference counting.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: Dict[HubKey, _HubChannel] = {}
+
+    @staticmethod
+    def key(config: Dict[str, Any]) -> HubKey:
+        source = config.get("data_source", "").lower()
+        connection = []
+        for field, default in CONNECTION_FIELDS.get(source, {}).items():
+            value = config.get(field, default)
+            if field in _SECRET_FIELDS and value:
+                value = hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:16]
+            connection.append((field, value))
+        return (source, config["symbol"], config["interval"], tuple(connection))
+
+    def subscribe(
+        self, config: Dict[str, Any], create_upstream: Callable[[Dict[str, Any]], Optional[BaseLiveDataFeed]]
+    ) -> Optional[HubDataFeed]:
+        """
+        Backtrader feed for a data feed configuration (see DataFeedFactory).
+
+        Args:
+            config: Data feed configuration; on_new_bar, lookback_bars and retry_interval
+                    apply to the returned feed
+            create_upstream: Creates the upstream live feed from the configuration when the
+                             key has no subscribers yet, or when it needs more history
+
+        Returns:
+            HubDataFeed, or None if the upstream feed could not be created
+        """
+        key = self.key(config)
+        lookback_bars = config.get("lookback_bars", 1000)
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = self._channels[key] = _HubChannel(key)
+            # Attached before the upstream exists, so the channel is not released meanwhile
+            events = channel.attach()
+        try:
+            if self._ensure_upstream(channel, config, lookback_bars, create_upstream) is None:
+                self._release(channel, events)
+                return None
+            return HubDataFeed(
+                self,
+                channel,
+                events,
+                lookback_bars=lookback_bars,
+                retry_interval=config.get("retry_interval", 60),
+                on_new_bar=config.get("on_new_bar"),
+            )
+        except Exception:
+            self._release(channel, events)
+            raise
+
+    def _ensure_upstream(
+        self,
+        channel: _HubChannel,
+        config: Dict[str, Any],
+        lookback_bars: int,
+        create_upstream: Callable[[Dict[str, Any]], Optional[BaseLiveDataFeed]],
+    ) -> Optional[BaseLiveDataFeed]:
+        """
+        Upstream of a channel holding at least ``lookback_bars`` bars
+
+        Creates the upstream, or replaces it with a larger one, outside the hub lock; other
+        subscribers of the channel wait for it.
+
+        Returns:
+            The upstream feed (the current one if a larger one could not be created), or
+            None if there is none
+        """
+        with channel.upstream_lock:
+            upstream = channel.upstream
+            if upstream is not None and upstream.lookback_bars >= lookback_bars:
+                _logger.info(f"Reusing shared live feed for {channel.key}")
+                return upstream
+            if upstream is None:
+                _logger.info(f"Creating shared live feed for {channel.key}")
+            else:
+                _logger.info(
+                    f"Replacing shared live feed for {channel.key}: {lookback_bars} bars requested, "
+                    f"{upstream.lookback_bars} held"
+                )
+            created = create_upstream(dict(config, on_new_bar=None, lookback_bars=lookback_bars))
+            if created is None:
+                return upstream
+            previous = channel.set_upstream(created)
+        if previous is not None:
+            previous.stop()
+        return created
+
+    def _release(self, channel: _HubChannel, events: queue.Queue):
+        with self._lock:
+            if channel.detach(events) > 0 or self._channels.get(channel.key) is not channel:
+                return
+            del self._channels[channel.key]
+        upstream = channel.upstream
+        if upstream is None:
+            return
+        _logger.info(f"Stopping shared live feed for {channel.key}, no subscribers left")
+        upstream.stop()
+
+    def get_status(self) -> Dict[HubKey, Dict[str, Any]]:
+        """Subscribers and upstream status by key"""
+        with self._lock:
+            channels = list(self._channels.values())
+        return {
+            channel.key: {
+                "subscribers": len(channel.queues),
+                "upstream": channel.upstream.get_status() if channel.upstream is not None else None,
+            }
+            for channel in channels
+        }
+
+
+def get_market_data_hub() -> MarketDataHub:
+    """Process-wide market data hub"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = MarketDataHub()
+        return _hub
@@ -0,0 +1,652 @@
+"""
+Market Data Store Module
+-----------------------
+
+This module implements the local store for historical OHLCV bars. Bars are kept per
+source/symbol/interval and partitioned by calendar month (UTC):
+
+    <root>/<source>/<symbol>/<interval>/<YYYY-MM>.npz
+
+Every partition holds one array per column: ``timestamp`` as int64 epoch milliseconds
+(UTC, bar open time) and ``open``/``high``/``low``/``close``/``volume`` as float64, sorted
+by timestamp without duplicates. Loading a partition is a binary read of these arrays,
+no text parsing, and a range read only opens the months it overlaps.
+
+Writes merge the new bars into the affected partitions: rows with a timestamp already in
+the store are replaced (the newest download wins), everything else is appended. A
+partition is written to a temporary file and moved into place, so readers never see a
+half-written month.
+
+CSV files are only an exchange format: ``import_csv``/``import_directory`` load the
+``symbol_interval_start_end.csv`` files of the data directory into the store and
+``export_csv`` writes a range back to that layout. The optimizer, walk-forward runs and the
+plotter address data by key (``data_key``: ``symbol_interval_YYYYMMDD_YYYYMMDD``), which is
+resolved against the store.
+
+The store keeps a registry of the keys it was given (the file names of imported CSV files
+and the ranges saved by the downloaders) with the source of each. Registered keys never
+change when bars are appended, and several ranges of one series stay separate keys, so
+results and studies recorded under a key can be found again by later runs.
+
+Main Features:
+- Binary columnar partitions (int64 epoch ms, float64 OHLCV) by source/symbol/interval/month
+- Range reads as DataFrame or arrays, touching only the overlapping partitions
+- Append with de-duplication by timestamp and atomic partition replacement
+- Inventory of the stored series and their coverage
+- Registry of stable data keys and their source
+- Missing ranges (head, tail and interior gaps) for incremental downloads
+- CSV import/export
+
+Classes:
+- MarketDataStore: Read and write the partitioned bars
+
+Functions:
+- get_market_data_store: Process-wide store for a root directory
+- data_key: Data key for a symbol, interval and date range
+- parse_data_key: Symbol, interval and date range of a data key (or legacy CSV file name)
+- interval_ms: Bar length of an interval in milliseconds
+"""
+
+import json
+import os
+import re
+import threading
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+DEFAULT_STORE_DIR = os.path.join("data", "store")
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+_IMPORT_LEDGER = "imports.json"
+_FETCHED_LEDGER = "fetched.json"
+_KEY_REGISTRY = "keys.json"
+
+_INTERVAL_UNITS_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000, "wk": 604_800_000}
+
+_stores: Dict[str, "MarketDataStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def _to_ms(value) -> Optional[int]:
+    """Epoch milliseconds (UTC) of a date string, datetime, Timestamp or epoch ms int"""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tz is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value // 1_000_000)
+
+
+def to_arrays(df: pd.DataFrame, columns: Sequence[str] = OHLCV_COLUMNS) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Timestamps (int64 epoch ms) and float64 columns of an OHLCV DataFrame
+
+    The timestamps come from a ``timestamp`` column or the index. Naive times are taken as
+    UTC; numeric timestamps as epoch milliseconds. Column names are case-insensitive.
+
+    Raises:
+        ValueError: If a column is missing
+    """
+    lower = {str(column).lower(): column for column in df.columns}
+    missing = [column for column in columns if column not in lower]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    raw = df[lower["timestamp"]] if "timestamp" in lower else df.index.to_series()
+    if pd.api.types.is_numeric_dtype(raw):
+        timestamps = pd.Series(raw).to_numpy(dtype=np.int64)
+        valid = np.ones(len(timestamps), dtype=bool)
+    else:
+        times = pd.DatetimeIndex(pd.to_datetime(raw, utc=True))
+        valid = ~times.isna()
+        timestamps = times[valid].as_unit("ms").asi8
+    return timestamps, {column: df[lower[column]].to_numpy(dtype=np.float64)[valid] for column in columns}
+
+
+def interval_ms(interval: str) -> Optional[int]:
+    """Bar length in milliseconds ('15m', '1h', '1d', '1wk' ...), None for calendar months"""
+    match = re.fullmatch(r"(\d+)(m|h|d|w|wk)", interval)
+    if match is None:
+        return None
+    return int(match.group(1)) * _INTERVAL_UNITS_MS[match.group(2)]
+
+
+def _merge_ranges(ranges, within: float = 0) -> List[Tuple[int, int]]:
+    """Union of [start, end) ranges; ranges less than ``within`` apart are joined"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start - merged[-1][1] <= within:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def _subtract_ranges(start: int, end: int, covered: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Parts of [start, end) outside the (merged, sorted) covered ranges"""
+    missing = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > cursor:
+            missing.append((cursor, cov_start))
+        cursor = max(cursor, cov_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+def data_key(symbol: str, interval: str, start, end) -> str:
+    """Data key ``symbol_interval_YYYYMMDD_YYYYMMDD`` (the legacy CSV file name without extension)"""
+    return f"{symbol}_{interval}_{pd.Timestamp(start):%Y%m%d}_{pd.Timestamp(end):%Y%m%d}"
+
+
+def _key_name(key: str) -> str:
+    """Data key of a key or legacy CSV file name (path and ``.csv`` extension removed)"""
+    name = os.path.basename(key)
+    return name[: -len(".csv")] if name.endswith(".csv") else name
+
+
+def parse_data_key(key: str) -> Tuple[str, str, Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """
+    Symbol, interval and date range of a data key or legacy CSV file name
+
+    Returns:
+        tuple: (symbol, interval, start, end); ``end`` is exclusive (the day after the end
+               date of the key) and both are None when the key has no dates
+
+    Raises:
+        ValueError: If the key has no symbol and interval part
+    """
+    parts = _key_name(key).split("_")
+    if len(parts) < 2:
+        raise ValueError(f"Data key '{key}' is not symbol_interval[_start_end]")
+    start = end = None
+    if len(parts) >= 4:
+        start = pd.Timestamp(parts[2], tz="UTC")
+        end = pd.Timestamp(parts[3], tz="UTC") + pd.Timedelta(days=1)
+    return parts[0], parts[1], start, end
+
+
+class MarketDataStore:
+    """
+    Local store of OHLCV bars partitioned by source/symbol/interval/month.
+
+    Parameters:
+    -----------
+    root : str
+        Directory of the store (created on first write)
+
+    Example:
+        store = MarketDataStore("data/store")
+        store.write("binance", "BTCUSDT", "1h", df)
+        df = store.read("binance", "BTCUSDT", "1h", start="2024-01-01", end="2024-07-01")
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = os.path.abspath(root)
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._keys_lock = threading.Lock()
+
+    # ------------------------------------------------------------------ layout
+
+    def series_dir(self, source: str, symbol: str, interval: str) -> str:
+        """Directory holding the partitions of a series"""
+        return os.path.join(self.root, source, symbol, interval)
+
+    def partition_path(self, source: str, symbol: str, interval: str, month: str) -> str:
+        """File of one month (``YYYY-MM``) of a series"""
+        return os.path.join(self.series_dir(source, symbol, interval), f"{month}.npz")
+
+    def partitions(self, source: str, symbol: str, interval: str) -> List[str]:
+        """Months (``YYYY-MM``) stored for a series, oldest first"""
+        directory = self.series_dir(source, symbol, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npz"))
+
+    def _lock(self, source: str, symbol: str, interval: str) -> threading.Lock:
+        key = (source, symbol, interval)
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    # ------------------------------------------------------------------ inventory
+
+    def series(self, source: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """(source, symbol, interval) of every stored series"""
+        result = []
+        sources = [source] if source else self._subdirs(self.root)
+        for src in sources:
+            for symbol in self._subdirs(os.path.join(self.root, src)):
+                for interval in self._subdirs(os.path.join(self.root, src, symbol)):
+                    if self.partitions(src, symbol, interval):
+                        result.append((src, symbol, interval))
+        return result
+
+    @staticmethod
+    def _subdirs(path: str) -> List[str]:
+        if not os.path.isdir(path):
+            return []
+        return sorted(entry.name for entry in os.scandir(path) if entry.is_dir() and not entry.name.startswith("."))
+
+    def resolve_source(self, symbol: str, interval: str) -> str:
+        """
+        Source holding a symbol/interval (the first in name order if several do)
+
+        Raises:
+            FileNotFoundError: If no source has the series
+        """
+        for source in self._subdirs(self.root):
+            if self.partitions(source, symbol, interval):
+                return source
+        raise FileNotFoundError(f"No stored data for {symbol} {interval} in {self.root}")
+
+    def coverage(self, source: Optional[str], symbol: str, interval: str) -> Optional[Dict[str, object]]:
+        """
+        First and last bar and number of bars of a series
+
+        Returns:
+            dict: start/end (UTC Timestamps) and rows, or None if nothing is stored
+        """
+        source = source or self.resolve_source(symbol, interval)
+        months = self.partitions(source, symbol, interval)
+        if not months:
+            return None
+        rows = 0
+        first = last = None
+        for month in months:
+            with np.load(self.partition_path(source, symbol, interval, month)) as npz:
+                timestamps = npz["timestamp"]
+            if len(timestamps):
+                first = timestamps[0] if first is None else first
+                last = timestamps[-1]
+                rows += len(timestamps)
+        if first is None:
+            return None
+        return {
+            "start": pd.Timestamp(int(first), unit="ms", tz="UTC"),
+            "end": pd.Timestamp(int(last), unit="ms", tz="UTC"),
+            "rows": rows,
+        }
+
+    def _read_json(self, name: str) -> dict:
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _write_json(self, name: str, data: dict):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, name)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def register_keys(self, keys: Dict[str, str]):
+        """
+        Record data keys and their source
+
+        Args:
+            keys: Source by data key (a legacy ``.csv`` file name is registered without extension)
+        """
+        keys = {_key_name(key): source for key, source in keys.items()}
+        with self._keys_lock:
+            registry = self._read_json(_KEY_REGISTRY)
+            if all(registry.get(key) == source for key, source in keys.items()):
+                return
+            registry.update(keys)
+            self._write_json(_KEY_REGISTRY, registry)
+
+    def data_keys(self) -> List[str]:
+        """Registered data keys (imported CSV files and saved downloads), independent of later appends"""
+        with self._keys_lock:
+            return sorted(self._read_json(_KEY_REGISTRY))
+
+    def key_source(self, key: str) -> Optional[str]:
+        """Source a data key (or legacy ``.csv`` file name) was registered with, None if unknown"""
+        with self._keys_lock:
+            return self._read_json(_KEY_REGISTRY).get(_key_name(key))
+
+    def version(self, source: str, symbol: str, interval: str, start=None, end=None) -> int:
+        """Changes whenever a partition overlapping [start, end) is written"""
+        state = []
+        for month in self._months_in_range(source, symbol, interval, _to_ms(start), _to_ms(end)):
+            stat = os.stat(self.partition_path(source, symbol, interval, month))
+            state.append((month, stat.st_mtime_ns, stat.st_size))
+        return hash(tuple(state))
+
+    # ------------------------------------------------------------------ gaps
+
+    def fetched_ranges(self, source: str, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """[start, end) epoch ms ranges already downloaded, including those without bars"""
+        path = os.path.join(self.series_dir(source, symbol, interval), _FETCHED_LEDGER)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as f:
+            return [tuple(item) for item in json.load(f)]
+
+    def mark_fetched(self, source: str, symbol: str, interval: str, start, end):
+        """
+        Record that [start, end) has been downloaded
+
+        Ranges without bars (weekends, holidays, exchange downtime) then no longer count as
+        missing in ``missing_ranges``.
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        if end_ms <= start_ms:
+            return
+        with self._lock(source, symbol, interval):
+            ranges = _merge_ranges(self.fetched_ranges(source, symbol, interval) + [(start_ms, end_ms)])
+            directory = self.series_dir(source, symbol, interval)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, _FETCHED_LEDGER)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump([list(item) for item in ranges], f)
+            os.replace(tmp_path, path)
+
+    def missing_ranges(
+        self, source: str, symbol: str, interval: str, start, end, merge_within: Optional[float] = None
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Parts of [start, end) that are neither stored nor recorded as fetched
+
+        A stored bar covers [open time, open time + interval), so interior gaps between
+        bars are missing as well as the head and tail of the range. For intervals of
+        variable length (months) only the stored span and the fetched ranges count.
+
+        Args:
+            merge_within: Join missing ranges less than this many milliseconds apart
+                          (one larger download instead of several small ones)
+
+        Returns:
+            list: (start, end) UTC Timestamps of the missing ranges, oldest first
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        if end_ms <= start_ms:
+            return []
+        step = interval_ms(interval)
+        covered = list(self.fetched_ranges(source, symbol, interval))
+        timestamps = self.timestamps(source, symbol, interval, start_ms - (step or 0), end_ms)
+        if len(timestamps):
+            if step:
+                breaks = np.flatnonzero(np.diff(timestamps) > step)
+                firsts = np.concatenate([[0], breaks + 1])
+                lasts = np.concatenate([breaks, [len(timestamps) - 1]])
+                covered += [(int(timestamps[a]), int(timestamps[b]) + step) for a, b in zip(firsts, lasts)]
+            else:
+                covered.append((int(timestamps[0]), int(timestamps[-1]) + 1))
+
+        missing = _subtract_ranges(start_ms, end_ms, _merge_ranges(covered))
+        if merge_within:
+            missing = _merge_ranges(missing, within=merge_within)
+        return [(pd.Timestamp(a, unit="ms", tz="UTC"), pd.Timestamp(b, unit="ms", tz="UTC")) for a, b in missing]
+
+    # ------------------------------------------------------------------ read
+
+    def _months_in_range(
+        self, source: str, symbol: str, interval: str, start_ms: Optional[int], end_ms: Optional[int]
+    ) -> List[str]:
+        months = self.partitions(source, symbol, interval)
+        if start_ms is not None:
+            first = str(np.datetime64(start_ms, "ms").astype("datetime64[M]"))
+            months = [month for month in months if month >= first]
+        if end_ms is not None:
+            # end is exclusive: a range ending at a month boundary does not need that month
+            last = str(np.datetime64(end_ms - 1, "ms").astype("datetime64[M]"))
+            months = [month for month in months if month <= last]
+        return months
+
+    def _load(self, path: str, columns: Sequence[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        with np.load(path) as npz:
+            return npz["timestamp"], {column: npz[column] for column in columns}
+
+    def read_arrays(
+        self,
+        source: Optional[str],
+        symbol: str,
+        interval: str,
+        start=None,
+        end=None,
+        columns: Sequence[str] = OHLCV_COLUMNS,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Bars in [start, end) as arrays
+
+        Args:
+            source: Data source (None: see ``resolve_source``)
+            symbol: Symbol, e.g. 'BTCUSDT'
+            interval: Bar interval, e.g. '1h'
+            start: First bar time (inclusive), None for the first stored bar
+            end: End time (exclusive), None for the last stored bar
+            columns: Columns to load
+
+        Returns:
+            tuple: (int64 epoch ms timestamps, {column: float64 array})
+        """
+        source = source or self.resolve_source(symbol, interval)
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        parts = [
+            self._load(self.partition_path(source, symbol, interval, month), columns)
+            for month in self._months_in_range(source, symbol, interval, start_ms, end_ms)
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.int64), {column: np.empty(0, dtype=np.float64) for column in columns}
+
+        timestamps = np.concatenate([part[0] for part in parts])
+        values = {column: np.concatenate([part[1][column] for part in parts]) for column in columns}
+        lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side="left"))
+        hi = len(timestamps) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side="left"))
+        return timestamps[lo:hi], {column: array[lo:hi] for column, array in values.items()}
+
+    def read(
+        self,
+        source: Optional[str],
+        symbol: str,
+        interval: str,
+        start=None,
+        end=None,
+        columns: Sequence[str] = OHLCV_COLUMNS,
+    ) -> pd.DataFrame:
+        """Bars in [start, end) as DataFrame indexed by UTC ``datetime`` (see ``read_arrays``)"""
+        timestamps, values = self.read_arrays(source, symbol, interval, start, end, columns)
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, unit="ms", utc=True), name="datetime")
+        return pd.DataFrame(values, index=index, columns=list(columns))
+
+    def timestamps(self, source: Optional[str], symbol: str, interval: str, start=None, end=None) -> np.ndarray:
+        """Stored bar times (int64 epoch ms) in [start, end)"""
+        return self.read_arrays(source, symbol, interval, start, end, columns=())[0]
+
+    # ------------------------------------------------------------------ write
+
+    def write(self, source: str, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Merge bars into the store
+
+        Bars whose timestamp is already stored replace the stored values; the others are
+        added. Only the months present in ``df`` are rewritten.
+
+        Args:
+            source: Data source, e.g. 'binance' or 'yahoo'
+            symbol: Symbol
+            interval: Bar interval
+            df: Bars with a ``timestamp`` column (or datetime index) and OHLCV columns
+
+        Returns:
+            int: Number of bars that were not stored before
+        """
+        timestamps, values = to_arrays(df)
+        return self.write_arrays(source, symbol, interval, timestamps, values)
+
+    def write_arrays(
+        self, source: str, symbol: str, interval: str, timestamps: np.ndarray, values: Dict[str, np.ndarray]
+    ) -> int:
+        """Merge bars given as int64 epoch ms timestamps and OHLCV arrays (see ``write``)"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not len(timestamps):
+            return 0
+        months = timestamps.astype("datetime64[ms]").astype("datetime64[M]")
+        added = 0
+        with self._lock(source, symbol, interval):
+            os.makedirs(self.series_dir(source, symbol, interval), exist_ok=True)
+            for month in np.unique(months):
+                mask = months == month
+                path = self.partition_path(source, symbol, interval, str(month))
+                new_ts = timestamps[mask]
+                new_values = {column: np.asarray(values[column], dtype=np.float64)[mask] for column in OHLCV_COLUMNS}
+                stored = 0
+                if os.path.exists(path):
+                    old_ts, old_values = self._load(path, OHLCV_COLUMNS)
+                    stored = len(old_ts)
+                    new_ts = np.concatenate([old_ts, new_ts])
+                    new_values = {column: np.concatenate([old_values[column], new_values[column]]) for column in OHLCV_COLUMNS}
+                merged_ts, merged_values = self._dedup(new_ts, new_values)
+                added += len(merged_ts) - stored
+                self._save(path, merged_ts, merged_values)
+        return added
+
+    @staticmethod
+    def _dedup(timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        # Stable sort keeps equal timestamps in input order, so the last one (newest) is kept
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        return timestamps[keep], {column: array[order][keep] for column, array in values.items()}
+
+    @staticmethod
+    def _save(path: str, timestamps: np.ndarray, values: Dict[str, np.ndarray]):
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, timestamp=timestamps, **values)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def delete(self, source: str, symbol: str, interval: str, start=None, end=None) -> int:
+        """
+        Remove the bars in [start, end) of a series
+
+        Returns:
+            int: Number of removed bars
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        removed = 0
+        with self._lock(source, symbol, interval):
+            for month in self._months_in_range(source, symbol, interval, start_ms, end_ms):
+                path = self.partition_path(source, symbol, interval, month)
+                timestamps, values = self._load(path, OHLCV_COLUMNS)
+                keep = np.zeros(len(timestamps), dtype=bool)
+                if start_ms is not None:
+                    keep |= timestamps < start_ms
+                if end_ms is not None:
+                    keep |= timestamps >= end_ms
+                removed += int((~keep).sum())
+                if keep.any():
+                    self._save(path, timestamps[keep], {column: array[keep] for column, array in values.items()})
+                else:
+                    os.remove(path)
+        return removed
+
+    # ------------------------------------------------------------------ CSV import/export
+
+    def import_csv(self, path: str, source: str, symbol: Optional[str] = None, interval: Optional[str] = None) -> int:
+        """
+        Merge a CSV file (``timestamp`` + OHLCV columns) into the store
+
+        Symbol and interval default to the ``symbol_interval_...csv`` file name.
+
+        Returns:
+            int: Number of bars that were not stored before
+        """
+        if symbol is None or interval is None:
+            name_symbol, name_interval, _, _ = parse_data_key(path)
+            symbol = symbol or name_symbol
+            interval = interval or name_interval
+        df = pd.read_csv(path)
+        added = self.write(source, symbol, interval, df)
+        self.register_keys({os.path.basename(path): source})
+        _logger.info(f"Imported {path} into {source}/{symbol}/{interval}: {added} new bars")
+        return added
+
+    def import_directory(self, directory: str, source: str = "import") -> Dict[str, int]:
+        """
+        Import the ``symbol_interval_start_end.csv`` files of a directory
+
+        Files already imported with the same size and modification time are skipped, so
+        this is cheap to call before every run. Every file name is registered as data key.
+
+        Returns:
+            dict: New bars per imported file name
+        """
+        if not os.path.isdir(directory):
+            return {}
+        ledger = self._read_json(_IMPORT_LEDGER)
+
+        imported = {}
+        keys = {}
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".csv") or name.startswith("."):
+                continue
+            path = os.path.abspath(os.path.join(directory, name))
+            stat = os.stat(path)
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if ledger.get(path) == signature:
+                keys[name] = source
+                continue
+            try:
+                imported[name] = self.import_csv(path, source)
+                ledger[path] = signature
+            except Exception as e:
+                _logger.error(f"Could not import {path}: {e}", exc_info=e)
+
+        if imported:
+            self._write_json(_IMPORT_LEDGER, ledger)
+        if keys:
+            # Files imported before the key registry existed
+            self.register_keys(keys)
+        return imported
+
+    def export_csv(
+        self, source: Optional[str], symbol: str, interval: str, path: str, start=None, end=None
+    ) -> str:
+        """
+        Write the bars in [start, end) as CSV with ``timestamp`` and OHLCV columns
+
+        Returns:
+            str: ``path``
+        """
+        df = self.read(source, symbol, interval, start, end)
+        df.index = df.index.tz_localize(None)
+        df.rename_axis("timestamp").reset_index().to_csv(path, index=False)
+        return path
+
+
+def get_market_data_store(root: str = DEFAULT_STORE_DIR) -> MarketDataStore:
+    """Process-wide store for ``root`` (shares the per-series write locks)"""
+    key = os.path.abspath(root)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = MarketDataStore(root)
+        return store
@@ -8,6 +8,7 @@ import yfinance as yf
 from src.notification.logger import _logger
 
 from .base_data_downloader import BaseDataDownloader
+from .market_data_store import MarketDataStore, data_key
 
 """
 Yahoo Data Downloader Module
@@ -17,8 +18,8 @@ This module provides the YahooDataDownloader class for downloading historical OH
 
 Main Features:
 - Download historical data for any stock or ticker from Yahoo Finance
-- Save and load data as CSV files
-- Update existing data files with new data
+- Save data to the market data store (source "yahoo"); CSV export/import on demand
+- Update stored data with new bars; incremental downloads fetch only missing ranges
 - Download data for multiple symbols in batch
 - Inherits common logic from BaseDataDownloader for file management
 
@@ -33,18 +34,31 @@ class YahooDataDownloader(BaseDataDownloader):
 
     This class provides methods to:
     1. Download historical OHLCV data for a given symbol
-    2. Save data to CSV files
+    2. Save data to the market data store
     3. Load data from CSV files
-    4. Update existing data files with new data
+    4. Update stored data with new bars
 
     Parameters:
     -----------
     data_dir : str
-        Directory to store downloaded data files
+        Directory for exported CSV files
+    interval : str
+        Default data interval
+    store : MarketDataStore
+        Store receiving the downloaded bars (default: the process-wide store)
     """
 
-    def __init__(self, data_dir: str = "data"):
-        super().__init__(data_dir=data_dir)
+    source = "yahoo"
+    # One history request returns the whole range: fetch all missing ranges of a sync at once
+    merge_gap_bars = 10**6
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        interval: Optional[str] = None,
+        store: Optional[MarketDataStore] = None,
+    ):
+        super().__init__(data_dir=data_dir, interval=interval, store=store)
 
         # Set up logging
         logging.basicConfig(
@@ -52,7 +66,12 @@ class YahooDataDownloader(BaseDataDownloader):
         )
 
     def download_data(
-        self, symbol: str, interval: str, start_date: str, end_date: str
+        self,
+        symbol: str,
+        interval: str,
+        start_date: str,
+        end_date: str,
+        incremental: bool = False,
     ) -> pd.DataFrame:
         """
         Download historical data for a given symbol.
@@ -62,13 +81,27 @@ class YahooDataDownloader(BaseDataDownloader):
             interval: Data interval
             start_date: Start date for historical data
             end_date: End date for historical data
+            incremental: Download only the bars missing from the market data store, save
+                         them and return the stored bars of the range
 
         Returns:
             pd.DataFrame: Historical OHLCV data
         """
+        if incremental:
+            self.sync(symbol, start_date, end_date, interval=interval)
+            return self.stored_frame(symbol, interval, start_date, end_date)
+        return self.fetch_range(symbol, interval, start_date, end_date)
+
+    def fetch_range(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """
+        Download the bars of [start, end) from Yahoo Finance.
+
+        Returns:
+            pd.DataFrame: Bars with a timestamp column and OHLCV columns
+        """
         try:
             ticker = yf.Ticker(symbol)
-            df = ticker.history(start=start_date, end=end_date, interval=interval)
+            df = ticker.history(start=start, end=end, interval=interval)
 
             # Rename columns to match standard format
             df = df.rename(
@@ -105,26 +138,23 @@ class YahooDataDownloader(BaseDataDownloader):
         symbol: str,
         start_date: str = None,
         end_date: str = None,
+        interval: Optional[str] = None,
     ) -> str:
         """
-        Save downloaded data to a CSV file.
+        Save downloaded data to the market data store.
 
         Args:
             df: DataFrame containing historical data
             symbol: Stock symbol
             start_date: Start date for historical data
             end_date: End date for historical data
+            interval: Data interval (default: the downloader's interval)
 
         Returns:
-            str: Path to the saved file
+            str: Data key of the saved range
         """
         try:
-            # If start_date or end_date are not provided, extract from df
-            if start_date is None:
-                start_date = df["timestamp"].min().strftime("%Y-%m-%d")
-            if end_date is None:
-                end_date = df["timestamp"].max().strftime("%Y-%m-%d")
-            return super().save_data(df, symbol, start_date, end_date)
+            return super().save_data(df, symbol, start_date, end_date, interval=interval)
 
         except Exception as e:
             _logger.error(f"Error saving data for {symbol}: {str(e)}")
@@ -149,63 +179,41 @@ class YahooDataDownloader(BaseDataDownloader):
 
     def update_data(self, symbol: str, interval: str) -> str:
         """
-        Update existing data file with new data.
+        Update the stored data of a symbol with new bars.
+
+        Downloads the bars after the last stored one and any gaps in the stored history.
 
         Args:
             symbol: Stock symbol
             interval: Data interval
 
         Returns:
-            str: Path to the updated file
+            str: Data key covering all stored bars
         """
         try:
-            # Find existing data file
-            existing_files = [
-                f
-                for f in os.listdir(self.data_dir)
-                if f.startswith(f"{symbol}_{interval}_")
-            ]
-            if not existing_files:
-                # If no existing file, download new data
-                df = self.download_data(
-                    symbol,
-                    interval,
-                    "2000-01-01",
-                    pd.Timestamp.today().strftime("%Y-%m-%d"),
-                )
-                return self.save_data(df, symbol)
-
-            # Load existing data
-            latest_file = max(existing_files)
-            filepath = os.path.join(self.data_dir, latest_file)
-            existing_df = self.load_data(filepath)
-
-            # Get last date in existing data
-            last_date = existing_df["timestamp"].max()
-
-            # Download new data from last date
-            new_start = (last_date + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
-            new_end = pd.Timestamp.today().strftime("%Y-%m-%d")
-            new_df = self.download_data(symbol, interval, new_start, new_end)
-
-            if new_df.empty:
+            coverage = self.store.coverage(self.source, symbol, interval)
+            # Nothing stored yet: download the full history
+            start = coverage["start"] if coverage is not None else "2000-01-01"
+            result = self.sync(symbol, start, interval=interval)
+            if result["added"] == 0:
                 _logger.info(f"No new data available for {symbol}")
-                return filepath
-
-            # Combine existing and new data
-            combined_df = pd.concat([existing_df, new_df])
-            combined_df = combined_df.drop_duplicates(subset=["timestamp"])
-            combined_df = combined_df.sort_values("timestamp")
 
-            # Save updated data
-            return self.save_data(combined_df, symbol)
+            coverage = self.store.coverage(self.source, symbol, interval)
+            if coverage is None:
+                raise ValueError(f"No data available for {symbol}")
+            return data_key(symbol, interval, coverage["start"], coverage["end"])
 
         except Exception as e:
             _logger.error(f"Error updating data for {symbol}: {str(e)}")
             raise
 
     def download_multiple_symbols(
-        self, symbols: List[str], interval: str, start_date: str, end_date: str
+        self,
+        symbols: List[str],
+        interval: str,
+        start_date: str,
+        end_date: str,
+        incremental: bool = True,
     ) -> Dict[str, str]:
         """
         Download data for multiple symbols.
@@ -215,16 +223,24 @@ class YahooDataDownloader(BaseDataDownloader):
             interval: Data interval
             start_date: Start date for historical data
             end_date: End date for historical data
+            incremental: Download only the bars missing from the market data store
 
         Returns:
-            Dict[str, str]: Dictionary mapping symbols to file paths
+            Dict[str, str]: Dictionary mapping symbols to data keys
         """
+        if incremental:
+            results = self.sync_multiple_symbols(symbols, start_date, end_date, interval=interval)
+            return {symbol: result["key"] for symbol, result in results.items()}
 
         def download_func(symbol, interval, start_date, end_date):
             return self.download_data(symbol, interval, start_date, end_date)
 
         return super().download_multiple_symbols(
-            symbols, download_func, interval, start_date, end_date
+            symbols,
+            download_func,
+            interval=interval,
+            start_date=start_date,
+            end_date=end_date,
         )
 
 
@@ -238,8 +254,8 @@ if __name__ == "__main__":
     start_date = "2020-01-01"
     end_date = pd.Timestamp.today().strftime("%Y-%m-%d")
     df = downloader.download_data(symbol, interval, start_date, end_date)
-    filepath = downloader.save_data(df, symbol)
-    print(f"Data saved to {filepath}")
+    key = downloader.save_data(df, symbol, interval=interval)
+    print(f"Data saved as {key}, exported to {downloader.export_csv(symbol, interval=interval)}")
 
     # Download data for multiple symbols
     symbols = ["AAPL", "MSFT", "GOOGL"]
@@ -249,4 +265,4 @@ if __name__ == "__main__":
     results = downloader.download_multiple_symbols(
         symbols, interval, start_date, end_date
     )
-    print("Downloaded files:", results)
+    print("Downloaded series:", results)
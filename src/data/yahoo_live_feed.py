@@ -4,12 +4,13 @@ Yahoo Finance Live Data Feed Module
 
 This module provides a live data feed for Yahoo Finance using polling.
 Since Yahoo Finance doesn't provide WebSocket streams, this implementation
-uses periodic polling to simulate real-time updates.
+polls for each bar when it closes (see src/data/bar_scheduler.py).
 
 Features:
 - Historical data loading via yfinance
-- Real-time updates via polling
-- Configurable polling intervals
+- Real-time updates via polls aligned to bar closes
+- One multi-ticker request per interval for all feeds due together (src/data/yahoo_poller.py)
+- Only closed intraday bars are published
 - Error handling and rate limiting
 - Backtrader integration
 
@@ -18,13 +19,15 @@ Classes:
 """
 
 import time
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
 import pandas as pd
 import yfinance as yf
 
 from src.data.base_live_data_feed import BaseLiveDataFeed
+from src.data.yahoo_poller import get_yahoo_poller
 from src.notification.logger import setup_logger
 
 _logger = setup_logger(__name__)
@@ -36,15 +39,17 @@ class YahooLiveDataFeed(BaseLiveDataFeed):
     
     Features:
     - Loads historical data via yfinance
-    - Real-time updates via periodic polling
-    - Configurable polling intervals
+    - Real-time updates via polls aligned to bar closes
     - Error handling and rate limiting
     """
     
+    poll_source = "yahoo"
+    
     def __init__(self, 
                  symbol: str,
                  interval: str,
                  polling_interval: int = 60,
+                 align_to_bar_close: bool = True,
                  **kwargs):
         """
         Initialize Yahoo Finance live data feed.
@@ -52,10 +57,14 @@ class YahooLiveDataFeed(BaseLiveDataFeed):
         Args:
             symbol: Trading symbol (e.g., 'AAPL', 'MSFT')
             interval: Data interval (e.g., '1m', '1h', '1d')
-            polling_interval: Seconds between polling attempts
+            polling_interval: Seconds between polling attempts when not aligned to bar closes
+            align_to_bar_close: Poll at each bar close through the shared bar scheduler
+                                (False: poll every polling_interval seconds)
             **kwargs: Additional arguments passed to BaseLiveDataFeed
         """
         self.polling_interval = polling_interval
+        if not align_to_bar_close:
+            self.poll_source = None
         self.ticker = None
         self.last_poll_time = None
         
@@ -212,7 +221,7 @@ class YahooLiveDataFeed(BaseLiveDataFeed):
     
     def _get_latest_data(self) -> Optional[pd.DataFrame]:
         """
-        Get latest data from Yahoo Finance via polling.
+        Get latest data from Yahoo Finance via the shared poller.
         
         Returns:
             DataFrame with latest bar(s), or None if no new data
@@ -221,40 +230,82 @@ class YahooLiveDataFeed(BaseLiveDataFeed):
             if self.ticker is None:
                 return None
             
-            # Get recent data (last few bars to ensure we have the latest)
-            recent_data = self.ticker.history(
-                period='1d',
-                interval=self.yahoo_interval,
-                prepost=True
-            )
+            recent_data = get_yahoo_poller().bars([self.symbol], self.yahoo_interval).get(self.symbol)
+            self.last_poll_time = datetime.now()
+            return self._select_new_bars(recent_data)
+            
+        except Exception as e:
+            _logger.error(f"Error getting latest data for {self.symbol}: {str(e)}")
+            return None
+    
+    def _select_new_bars(self, recent_data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """
+        Closed bars of a polled response that are newer than the buffered ones.
+        
+        Args:
+            recent_data: Recent OHLCV bars of the symbol
             
+        Returns:
+            DataFrame with the new bar(s), or None if there are none
+        """
+        if recent_data is None or recent_data.empty:
+            return None
+        
+        # The last intraday bar is still forming until its interval has passed
+        interval = pd.Timedelta(minutes=self._get_interval_minutes())
+        if interval < pd.Timedelta(days=1):
+            now = pd.Timestamp.now(tz=recent_data.index.tz)
+            recent_data = recent_data[recent_data.index + interval <= now]
             if recent_data.empty:
                 return None
+        
+        # Check if we have new data
+        if len(self.bars):
+            last_known_time = self.bars.last_timestamp
+            new_data = recent_data[recent_data.index > last_known_time]
             
-            # Rename columns to match expected format
-            recent_data.columns = [col.lower() for col in recent_data.columns]
-            
-            # Select only required columns
-            required_columns = ['open', 'high', 'low', 'close', 'volume']
-            recent_data = recent_data[required_columns]
-            
-            # Check if we have new data
-            if self.df is not None and not self.df.empty:
-                last_known_time = self.df.index[-1]
-                new_data = recent_data[recent_data.index > last_known_time]
-                
-                if not new_data.empty:
-                    _logger.debug(f"Found {len(new_data)} new bars for {self.symbol}")
-                    return new_data
-                else:
-                    return None
+            if not new_data.empty:
+                _logger.debug(f"Found {len(new_data)} new bars for {self.symbol}")
+                return new_data
             else:
-                # First time getting data
-                return recent_data.tail(1)
-            
-        except Exception as e:
-            _logger.error(f"Error getting latest data for {self.symbol}: {str(e)}")
-            return None
+                return None
+        else:
+            # First time getting data
+            return recent_data.tail(1)
+    
+    @classmethod
+    def poll_batch(cls, feeds: List["YahooLiveDataFeed"]) -> Dict["YahooLiveDataFeed", bool]:
+        """
+        Poll feeds due at the same bar close with one multi-ticker download per interval.
+        
+        A symbol present in the response counts as connected, so the per-symbol ticker
+        check of _connect_realtime is skipped.
+        
+        Returns:
+            Dictionary of feed -> True if a new bar was appended
+        """
+        results = {feed: False for feed in feeds}
+        buckets = defaultdict(list)
+        for feed in feeds:
+            if not feed.should_stop:
+                buckets[feed.yahoo_interval].append(feed)
+        
+        poller = get_yahoo_poller()
+        for yahoo_interval, bucket in buckets.items():
+            frames = poller.bars([feed.symbol for feed in bucket], yahoo_interval)
+            for feed in bucket:
+                recent_data = frames.get(feed.symbol)
+                if recent_data is None:
+                    continue
+                try:
+                    feed.is_connected = True
+                    feed.last_poll_time = datetime.now()
+                    new_data = feed._select_new_bars(recent_data)
+                    if new_data is not None:
+                        results[feed] = feed._process_new_data(new_data) == "new"
+                except Exception as e:
+                    _logger.error(f"Error processing polled data for {feed.symbol}: {str(e)}")
+        return results
     
     def _get_update_interval(self) -> int:
         """
@@ -276,6 +327,7 @@ class YahooLiveDataFeed(BaseLiveDataFeed):
         status = super().get_status()
         status.update({
             'polling_interval': self.polling_interval,
+            'align_to_bar_close': self.poll_source is not None,
             'yahoo_interval': self.yahoo_interval,
             'last_poll_time': self.last_poll_time,
             'ticker_valid': self.ticker is not None
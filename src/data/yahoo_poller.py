@@ -0,0 +1,226 @@
+"""
+Yahoo Poller Module
+------------------
+
+This module polls Yahoo Finance for many tickers at once. Each YahooLiveDataFeed used to
+call ``yf.Ticker(symbol).history`` on its own, so a 150-stock universe cost 150 HTTP
+requests per poll and quickly ran into Yahoo's rate limits. The shared poller fetches all
+symbols of an interval with one multi-ticker ``yf.download`` call (in chunks of
+``max_tickers``) and splits the result into one OHLCV frame per symbol.
+
+Responses are cached per (interval, symbol) for ``cache_ttl`` seconds, so feeds polled
+again within that time (e.g. several bots on one symbol) cost no request. When Yahoo
+rate limits the poller, it stops requesting for a backoff period. The period doubles
+with each consecutive rate limit, up to ``max_backoff``, and symbols that are not cached
+are left out of the result until it ends.
+
+Main Features:
+- One multi-ticker download per interval bucket, split into per-symbol frames
+- Short-lived response cache shared by all feeds of the process
+- Exponential backoff on rate limits
+- Injectable download function (recorded responses in tests)
+
+Classes:
+- YahooBatchPoller: Batched, cached and rate-limited Yahoo polling
+
+Functions:
+- yahoo_download: One yf.download call for several tickers
+- split_by_symbol: Per-symbol OHLCV frames of a multi-ticker download
+- get_yahoo_poller: Process-wide poller
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import yfinance as yf
+from src.data.concurrent_downloader import RateLimitError
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+_poller: Optional["YahooBatchPoller"] = None
+_poller_lock = threading.Lock()
+
+
+def _is_rate_limit(error) -> bool:
+    text = f"{type(error).__name__} {error}"
+    return "RateLimit" in text or "Too Many Requests" in text or "Rate limited" in text
+
+
+def yahoo_download(symbols: Sequence[str], interval: str, period: str) -> pd.DataFrame:
+    """
+    One yf.download call for several tickers
+
+    Returns:
+        DataFrame with columns grouped by ticker
+
+    Raises:
+        RateLimitError: Yahoo rate limited the request
+    """
+    try:
+        data = yf.download(
+            tickers=list(symbols),
+            interval=interval,
+            period=period,
+            prepost=True,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=False,
+            progress=False,
+        )
+    except Exception as e:
+        if _is_rate_limit(e):
+            raise RateLimitError(429) from e
+        raise
+    # yf.download logs failed tickers instead of raising
+    errors = getattr(getattr(yf, "shared", None), "_ERRORS", None) or {}
+    failed = [errors[symbol] for symbol in symbols if symbol in errors]
+    if failed and len(failed) == len(symbols) and all(_is_rate_limit(error) for error in failed):
+        raise RateLimitError(429)
+    return data
+
+
+def split_by_symbol(data: Optional[pd.DataFrame], symbols: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Per-symbol OHLCV frames of a multi-ticker download
+
+    Rows without a close (sessions of other tickers) are dropped, and symbols without data
+    are left out.
+    """
+    frames = {}
+    if data is None or data.empty:
+        return frames
+    multi = isinstance(data.columns, pd.MultiIndex)
+    tickers = set(data.columns.get_level_values(0)) if multi else set()
+    for symbol in symbols:
+        if multi and symbol in tickers:
+            frame = data[symbol]
+        elif not multi and len(symbols) == 1:
+            frame = data
+        else:
+            continue
+        frame = frame.rename(columns=lambda column: str(column).lower())
+        if not set(OHLCV_COLUMNS) <= set(frame.columns):
+            continue
+        frame = frame[OHLCV_COLUMNS].dropna(subset=["close"])
+        if not frame.empty:
+            frames[symbol] = frame
+    return frames
+
+
+class YahooBatchPoller:
+    """
+    Latest bars of many Yahoo symbols with batched requests.
+
+    Parameters:
+    -----------
+    download : callable
+        ``download(symbols, interval, period)`` returning a multi-ticker frame
+        (default: yahoo_download)
+    max_tickers : int
+        Symbols per request
+    cache_ttl : float
+        Seconds a response is served from the cache
+    backoff : float
+        Seconds without requests after a first rate limit (doubles on each consecutive one)
+    max_backoff : float
+        Longest backoff in seconds
+    """
+
+    def __init__(
+        self,
+        download: Callable[[Sequence[str], str, str], pd.DataFrame] = yahoo_download,
+        max_tickers: int = 100,
+        cache_ttl: float = 5.0,
+        backoff: float = 30.0,
+        max_backoff: float = 600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._download = download
+        self.max_tickers = max_tickers
+        self.cache_ttl = cache_ttl
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
+        self._blocked_until = 0.0
+        self._rate_limits = 0
+        self.requests = 0
+
+    def bars(self, symbols: Sequence[str], interval: str, period: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        Recent bars of several symbols.
+
+        Args:
+            symbols: Yahoo tickers
+            interval: yfinance interval ('1m', '15m', '1h', '1d' ...)
+            period: yfinance period of the request
+
+        Returns:
+            Dictionary of symbol -> OHLCV DataFrame; symbols without data (or not cached
+            during a rate-limit backoff) are left out
+        """
+        now = self._clock()
+        result = {}
+        missing: List[str] = []
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                cached = self._cache.get((interval, symbol))
+                if cached is not None and now - cached[0] < self.cache_ttl:
+                    result[symbol] = cached[1]
+                else:
+                    missing.append(symbol)
+            blocked = now < self._blocked_until
+        if missing and blocked:
+            _logger.debug(f"Yahoo polling paused by rate limit, {len(missing)} symbol(s) skipped")
+            return result
+
+        for i in range(0, len(missing), self.max_tickers):
+            chunk = missing[i:i + self.max_tickers]
+            try:
+                data = self._download(chunk, interval, period)
+            except RateLimitError as e:
+                self._back_off(e.retry_after)
+                break
+            except Exception as e:
+                _logger.error(f"Error polling {len(chunk)} Yahoo symbol(s) at {interval}: {str(e)}")
+                continue
+            frames = split_by_symbol(data, chunk)
+            fetched = self._clock()
+            with self._lock:
+                self.requests += 1
+                self._rate_limits = 0
+                for symbol, frame in frames.items():
+                    self._cache[(interval, symbol)] = (fetched, frame)
+            result.update(frames)
+        return result
+
+    def _back_off(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self._rate_limits += 1
+            delay = retry_after or min(self.backoff * 2 ** (self._rate_limits - 1), self.max_backoff)
+            self._blocked_until = self._clock() + delay
+        _logger.warning(f"Rate limited by Yahoo, pausing polls for {delay:.0f}s")
+
+    def get_status(self) -> Dict[str, float]:
+        """Request count, cached symbols and remaining backoff"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cached": len(self._cache),
+                "backoff_remaining": max(0.0, self._blocked_until - self._clock()),
+            }
+
+
+def get_yahoo_poller() -> YahooBatchPoller:
+    """Process-wide Yahoo poller"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = YahooBatchPoller()
+        return _poller
@@ -27,6 +27,7 @@ from typing import Any, Dict, Optional
 
 import backtrader as bt
 from src.entry.base_entry_mixin import BaseEntryMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.indicator.super_trend import SuperTrend
 from src.notification.logger import setup_logger
 
@@ -94,24 +95,43 @@ class BBVolumeSupertrendEntryMixin(BaseEntryMixin):
                     self.strategy.data.volume, timeperiod=sma_period
                 )
             else:
-                self.bb = bt.indicators.BollingerBands(
-                    self.strategy.data.close, period=bb_period, devfactor=bb_dev_factor
+                self.bb = cached_indicator(
+                    self.strategy,
+                    "bollinger_bands",
+                    lambda: bt.indicators.BollingerBands(
+                        self.strategy.data.close, period=bb_period, devfactor=bb_dev_factor
+                    ),
+                    period=bb_period,
+                    devfactor=bb_dev_factor,
                 )
                 self.bb_top = self.bb.top
                 self.bb_mid = self.bb.mid
                 self.bb_bot = self.bb.bot
-                self.sma = bt.indicators.SMA(
-                    self.strategy.data.volume, period=sma_period
+                self.sma = cached_indicator(
+                    self.strategy,
+                    "sma",
+                    lambda: bt.indicators.SMA(self.strategy.data.volume, period=sma_period),
+                    period=sma_period,
+                    source="volume",
                 )
 
             self.register_indicator(self.bb_name, self.bb)
             self.register_indicator(self.volume_ma_name, self.sma)
 
             # Create Supertrend indicator (same for both TA-Lib and Backtrader)
-            supertrend = SuperTrend(
-                self.strategy.data,
-                period=self.get_param("e_st_period"),
-                multiplier=self.get_param("e_st_multiplier"),
+            st_period = self.get_param("e_st_period")
+            st_multiplier = self.get_param("e_st_multiplier")
+            supertrend = cached_indicator(
+                self.strategy,
+                "supertrend",
+                lambda: SuperTrend(
+                    self.strategy.data,
+                    period=st_period,
+                    multiplier=st_multiplier,
+                    use_talib=self.strategy.use_talib,
+                ),
+                period=st_period,
+                multiplier=st_multiplier,
             )
             self.register_indicator(self.supertrend_name, supertrend)
         except Exception as e:
@@ -155,12 +175,12 @@ class BBVolumeSupertrendEntryMixin(BaseEntryMixin):
             )
 
             # Check Supertrend
-            supertrend_condition = supertrend[0] == 1  # 1 means uptrend
+            supertrend_condition = supertrend.direction[0] == 1  # 1 means uptrend
 
             return_value = bb_condition and volume_condition and supertrend_condition
             if return_value:
                 logger.debug(
-                    f"ENTRY: Price: {current_price}, BB Lower: {bb.bb_lower[0] if self.strategy.use_talib else bb.lines.bot[0]}, Volume: {current_volume}, Volume MA: {vol_ma[0]}, Supertrend: {supertrend[0]}"
+                    f"ENTRY: Price: {current_price}, BB Lower: {bb.bb_lower[0] if self.strategy.use_talib else bb.lines.bot[0]}, Volume: {current_volume}, Volume MA: {vol_ma[0]}, Supertrend: {supertrend.super_trend[0]}"
                 )
             return return_value
         except Exception as e:
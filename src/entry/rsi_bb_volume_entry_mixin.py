@@ -27,6 +27,7 @@ from typing import Any, Dict, Optional
 
 import backtrader as bt
 from src.entry.base_entry_mixin import BaseEntryMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.notification.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -92,17 +93,30 @@ class RSIBBVolumeEntryMixin(BaseEntryMixin):
                 self.bb_bot = self.bb.lowerband
                 self.sma = bt.talib.SMA(self.strategy.data.volume, sma_period)
             else:
-                self.rsi = bt.indicators.RSI(
-                    self.strategy.data.close, period=rsi_period
+                self.rsi = cached_indicator(
+                    self.strategy,
+                    "rsi",
+                    lambda: bt.indicators.RSI(self.strategy.data.close, period=rsi_period),
+                    period=rsi_period,
                 )
-                self.bb = bt.indicators.BollingerBands(
-                    self.strategy.data.close, period=bb_period, devfactor=bb_dev_factor
+                self.bb = cached_indicator(
+                    self.strategy,
+                    "bollinger_bands",
+                    lambda: bt.indicators.BollingerBands(
+                        self.strategy.data.close, period=bb_period, devfactor=bb_dev_factor
+                    ),
+                    period=bb_period,
+                    devfactor=bb_dev_factor,
                 )
                 self.bb_top = self.bb.top
                 self.bb_mid = self.bb.mid
                 self.bb_bot = self.bb.bot
-                self.sma = bt.indicators.SMA(
-                    self.strategy.data.volume, period=sma_period
+                self.sma = cached_indicator(
+                    self.strategy,
+                    "sma",
+                    lambda: bt.indicators.SMA(self.strategy.data.volume, period=sma_period),
+                    period=sma_period,
+                    source="volume",
                 )
 
             self.register_indicator(self.rsi_name, self.rsi)
@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional
 
 import backtrader as bt
 from src.entry.base_entry_mixin import BaseEntryMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.notification.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -68,19 +69,27 @@ class RSIIchimokuEntryMixin(BaseEntryMixin):
             if self.strategy.use_talib:
                 self.rsi = bt.talib.RSI(self.strategy.data.close, timeperiod=rsi_period)
             else:
-                self.rsi = bt.indicators.RSI(
-                    self.strategy.data.close, period=rsi_period
+                self.rsi = cached_indicator(
+                    self.strategy,
+                    "rsi",
+                    lambda: bt.indicators.RSI(self.strategy.data.close, period=rsi_period),
+                    period=rsi_period,
                 )
 
             self.register_indicator(self.rsi_name, self.rsi)
 
-            self.ichimoku = bt.indicators.Ichimoku(
-                self.strategy.data,
-                tenkan=self.get_param("e_tenkan"),
-                kijun=self.get_param("e_kijun"),
-                senkou=self.get_param("e_senkou"),
-                senkou_lead=self.get_param("e_senkou_lead"),
-                chikou=self.get_param("e_chikou"),
+            ichimoku_params = {
+                "tenkan": self.get_param("e_tenkan"),
+                "kijun": self.get_param("e_kijun"),
+                "senkou": self.get_param("e_senkou"),
+                "senkou_lead": self.get_param("e_senkou_lead"),
+                "chikou": self.get_param("e_chikou"),
+            }
+            self.ichimoku = cached_indicator(
+                self.strategy,
+                "ichimoku",
+                lambda: bt.indicators.Ichimoku(self.strategy.data, **ichimoku_params),
+                **ichimoku_params,
             )
             self.register_indicator(self.ichimoku_name, self.ichimoku)
         except Exception as e:
@@ -26,6 +26,7 @@ from typing import Any, Dict, Optional
 
 import backtrader as bt
 from src.entry.base_entry_mixin import BaseEntryMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.indicator.super_trend import SuperTrend
 from src.notification.logger import setup_logger
 
@@ -79,21 +80,37 @@ class RSIVolumeSupertrendEntryMixin(BaseEntryMixin):
                     self.strategy.data.volume, timeperiod=sma_period
                 )
             else:
-                self.rsi = bt.indicators.RSI(
-                    self.strategy.data.close, period=rsi_period
+                self.rsi = cached_indicator(
+                    self.strategy,
+                    "rsi",
+                    lambda: bt.indicators.RSI(self.strategy.data.close, period=rsi_period),
+                    period=rsi_period,
                 )
-                self.sma = bt.indicators.SMA(
-                    self.strategy.data.volume, period=sma_period
+                self.sma = cached_indicator(
+                    self.strategy,
+                    "sma",
+                    lambda: bt.indicators.SMA(self.strategy.data.volume, period=sma_period),
+                    period=sma_period,
+                    source="volume",
                 )
 
             self.register_indicator(self.rsi_name, self.rsi)
             self.register_indicator(self.vol_ma_name, self.sma)
 
             # Create Supertrend indicator (same for both TA-Lib and Backtrader)
-            supertrend = SuperTrend(
-                self.strategy.data,
-                period=self.get_param("e_st_period"),
-                multiplier=self.get_param("e_st_multiplier"),
+            st_period = self.get_param("e_st_period")
+            st_multiplier = self.get_param("e_st_multiplier")
+            supertrend = cached_indicator(
+                self.strategy,
+                "supertrend",
+                lambda: SuperTrend(
+                    self.strategy.data,
+                    period=st_period,
+                    multiplier=st_multiplier,
+                    use_talib=self.strategy.use_talib,
+                ),
+                period=st_period,
+                multiplier=st_multiplier,
             )
             self.register_indicator(self.supertrend_name, supertrend)
         except Exception as e:
@@ -126,12 +143,12 @@ class RSIVolumeSupertrendEntryMixin(BaseEntryMixin):
             )
 
             # Check Supertrend
-            supertrend_condition = supertrend[0] == 1  # 1 means uptrend
+            supertrend_condition = supertrend.direction[0] == 1  # 1 means uptrend
 
             return_value = rsi_condition and volume_condition and supertrend_condition
             if return_value:
                 logger.debug(
-                    f"ENTRY: Price: {current_price}, RSI: {rsi[0]}, Volume: {current_volume}, Volume MA: {vol_ma[0]}, Supertrend: {supertrend[0]}"
+                    f"ENTRY: Price: {current_price}, RSI: {rsi[0]}, Volume: {current_volume}, Volume MA: {vol_ma[0]}, Supertrend: {supertrend.super_trend[0]}"
                 )
             return return_value
         except Exception as e:
@@ -38,6 +38,7 @@ from typing import Any, Dict, Optional
 
 import backtrader as bt
 from src.exit.base_exit_mixin import BaseExitMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.notification.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -101,8 +102,11 @@ class ATRExitMixin(BaseExitMixin):
                     timeperiod=atr_period,
                 )
             else:
-                self.atr = bt.indicators.AverageTrueRange(
-                    self.strategy.data, period=atr_period
+                self.atr = cached_indicator(
+                    self.strategy,
+                    "atr",
+                    lambda: bt.indicators.AverageTrueRange(self.strategy.data, period=atr_period),
+                    period=atr_period,
                 )
             self.register_indicator(self.atr_name, self.atr)
         except Exception as e:
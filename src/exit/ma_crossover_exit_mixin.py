@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional
 import backtrader as bt
 import numpy as np
 from src.exit.base_exit_mixin import BaseExitMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.notification.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -70,11 +71,19 @@ class MACrossoverExitMixin(BaseExitMixin):
                 self.fast_ma = bt.talib.SMA(self.strategy.data.volume, fast_period)
                 self.slow_ma = bt.talib.SMA(self.strategy.data.volume, slow_period)
             else:
-                self.fast_ma = bt.indicators.SMA(
-                    self.strategy.data.volume, period=fast_period
+                self.fast_ma = cached_indicator(
+                    self.strategy,
+                    "sma",
+                    lambda: bt.indicators.SMA(self.strategy.data.volume, period=fast_period),
+                    period=fast_period,
+                    source="volume",
                 )
-                self.slow_ma = bt.indicators.SMA(
-                    self.strategy.data.volume, period=slow_period
+                self.slow_ma = cached_indicator(
+                    self.strategy,
+                    "sma",
+                    lambda: bt.indicators.SMA(self.strategy.data.volume, period=slow_period),
+                    period=slow_period,
+                    source="volume",
                 )
 
             self.register_indicator(self.fast_ma_name, self.fast_ma)
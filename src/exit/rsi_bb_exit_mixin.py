@@ -24,6 +24,7 @@ from typing import Any, Dict, Optional
 
 import backtrader as bt
 from src.exit.base_exit_mixin import BaseExitMixin
+from src.indicator.indicator_cache import cached_indicator
 from src.notification.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -82,11 +83,20 @@ class RSIBBExitMixin(BaseExitMixin):
                 self.bb_mid = self.bb.middleband
                 self.bb_bot = self.bb.lowerband
             else:
-                self.rsi = bt.indicators.RSI(
-                    self.strategy.data.close, period=rsi_period
+                self.rsi = cached_indicator(
+                    self.strategy,
+                    "rsi",
+                    lambda: bt.indicators.RSI(self.strategy.data.close, period=rsi_period),
+                    period=rsi_period,
                 )
-                self.bb = bt.indicators.BollingerBands(
-                    self.strategy.data.close, period=bb_period, devfactor=bb_dev_factor
+                self.bb = cached_indicator(
+                    self.strategy,
+                    "bollinger_bands",
+                    lambda: bt.indicators.BollingerBands(
+                        self.strategy.data.close, period=bb_period, devfactor=bb_dev_factor
+                    ),
+                    period=bb_period,
+                    devfactor=bb_dev_factor,
                 )
                 self.bb_top = self.bb.top
                 self.bb_mid = self.bb.mid
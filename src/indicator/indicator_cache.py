@@ -0,0 +1,333 @@
+"""
+Indicator Cache Module
+---------------------
+
+This module keeps computed indicator arrays across optimizer trials. Within a study every
+trial runs on the same data, and most trials repeat indicator settings an earlier trial has
+already used (all trials that only differ in exit parameters, every repeated
+``e_rsi_period`` ...). Instead of building and running a fresh Backtrader indicator graph
+for each trial, the mixins ask this cache for the lines; the first request computes them
+with ``numpy_indicators`` and later requests reuse the stored arrays.
+
+Entries are keyed by (data fingerprint, indicator name, parameters) and evicted in least
+recently used order once the configured memory budget is exceeded. Cached lines are fed to
+the strategy through ``PrecomputedIndicator``, a Backtrader indicator that copies the
+arrays into its line buffers, so mixins keep accessing ``indicator[0]`` and named lines as
+before.
+
+Main Features:
+- Process-wide LRU cache with a memory budget, safe for threaded Optuna workers
+- Indicator lines computed once per data/parameter combination
+- Backtrader adapter for precomputed arrays (runonce and next mode)
+- Fallback to regular indicators when the data is not preloaded
+
+Classes:
+- IndicatorCache: LRU cache of indicator arrays
+- PrecomputedIndicator: Backtrader indicator backed by precomputed arrays
+
+Functions:
+- get_indicator_cache: Process-wide IndicatorCache
+- precomputed_class: PrecomputedIndicator subclass for a set of line names
+- configure_indicator_cache: Set the memory budget of the process-wide cache
+- data_columns: OHLCV arrays and fingerprint of a preloaded data feed
+- cached_indicator: Cached indicator for a strategy's data, with a regular indicator as fallback
+"""
+
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import backtrader as bt
+import numpy as np
+from src.indicator import numpy_indicators as ni
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+DEFAULT_MAX_MB = 512
+
+_FEED_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _sma(columns: Dict[str, np.ndarray], period: int, source: str = "close") -> Dict[str, np.ndarray]:
+    return {"sma": ni.sma(columns[source], period)}
+
+
+def _ema(columns: Dict[str, np.ndarray], period: int, source: str = "close") -> Dict[str, np.ndarray]:
+    return {"ema": ni.ema(columns[source], period)}
+
+
+def _macd(columns: Dict[str, np.ndarray], fast: int, slow: int, signal: int) -> Dict[str, np.ndarray]:
+    macd, signal_line, histo = ni.macd(columns["close"], fast, slow, signal)
+    return {"macd": macd, "signal": signal_line, "histo": histo}
+
+
+def _rsi(columns: Dict[str, np.ndarray], period: int) -> Dict[str, np.ndarray]:
+    return {"rsi": ni.rsi(columns["close"], period)}
+
+
+def _bollinger_bands(columns: Dict[str, np.ndarray], period: int, devfactor: float) -> Dict[str, np.ndarray]:
+    top, mid, bot = ni.bollinger_bands(columns["close"], period, devfactor)
+    return {"mid": mid, "top": top, "bot": bot}
+
+
+def _atr(columns: Dict[str, np.ndarray], period: int) -> Dict[str, np.ndarray]:
+    return {"atr": ni.atr(columns["high"], columns["low"], columns["close"], period)}
+
+
+def _ichimoku(
+    columns: Dict[str, np.ndarray], tenkan: int, kijun: int, senkou: int, senkou_lead: int, chikou: int
+) -> Dict[str, np.ndarray]:
+    lines = ni.ichimoku(columns["high"], columns["low"], tenkan, kijun, senkou, senkou_lead)
+    # Backtrader's chikou span looks ``chikou`` bars ahead; the last bars have no value
+    chikou_span = np.full(len(columns["close"]), np.nan)
+    if chikou < len(chikou_span):
+        chikou_span[: len(chikou_span) - chikou] = columns["close"][chikou:]
+    lines["chikou_span"] = chikou_span
+    return lines
+
+
+def _supertrend(columns: Dict[str, np.ndarray], period: int, multiplier: float) -> Dict[str, np.ndarray]:
+    super_trend, direction = ni.supertrend(columns["high"], columns["low"], columns["close"], period, multiplier)
+    return {"super_trend": super_trend, "direction": direction}
+
+
+# name -> (line names in Backtrader order, fn(columns, **params) -> {line: array})
+INDICATORS: Dict[str, Tuple[Tuple[str, ...], Callable[..., Dict[str, np.ndarray]]]] = {
+    "sma": (("sma",), _sma),
+    "ema": (("ema",), _ema),
+    "macd": (("macd", "signal", "histo"), _macd),
+    "rsi": (("rsi",), _rsi),
+    "bollinger_bands": (("mid", "top", "bot"), _bollinger_bands),
+    "atr": (("atr",), _atr),
+    "ichimoku": (("tenkan_sen", "kijun_sen", "senkou_span_a", "senkou_span_b", "chikou_span"), _ichimoku),
+    "supertrend": (("super_trend", "direction"), _supertrend),
+}
+
+
+class IndicatorCache:
+    """
+    LRU cache of computed indicator lines.
+
+    Parameters:
+    -----------
+    max_bytes : int
+        Memory budget for the stored arrays; least recently used entries are evicted
+        beyond it
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(fingerprint: str, name: str, params: Dict[str, Any]) -> tuple:
+        """Cache key; integral floats are normalized so 14 and 14.0 share an entry"""
+        normalized = []
+        for key, value in sorted(params.items()):
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            normalized.append((key, value))
+        return fingerprint, name, tuple(normalized)
+
+    def get(
+        self, fingerprint: str, name: str, params: Dict[str, Any], columns: Callable[[], Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Lines of an indicator, computed on a miss
+
+        Args:
+            fingerprint: Content fingerprint of the data
+            name: Indicator name (key of INDICATORS)
+            params: Indicator parameters
+            columns: fn() -> OHLCV arrays, only called on a miss
+
+        Returns:
+            dict: Read-only line arrays by line name
+        """
+        key = self.make_key(fingerprint, name, params)
+        with self._lock:
+            lines = self._entries.get(key)
+            if lines is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return lines
+            self.misses += 1
+
+        _, compute = INDICATORS[name]
+        lines = compute(columns(), **params)
+        for values in lines.values():
+            values.setflags(write=False)
+        size = sum(values.nbytes for values in lines.values())
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = lines
+                self.nbytes += size
+                self._evict()
+            return self._entries.get(key, lines)
+
+    def _evict(self):
+        # Keep at least the newest entry so an oversized indicator is still usable once
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, lines = self._entries.popitem(last=False)
+            self.nbytes -= sum(values.nbytes for values in lines.values())
+
+    def resize(self, max_bytes: int):
+        """Change the memory budget, evicting entries if needed"""
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self._evict()
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+class PrecomputedIndicator(bt.Indicator):
+    """
+    Indicator whose lines are copied from precomputed arrays aligned with the data feed.
+    Its minimum period ends at the first bar where every line has a value.
+
+    Use ``precomputed_class`` to get a subclass with the required line names.
+    """
+
+    lines = ()
+    params = (("arrays", None),)
+
+    def __init__(self):
+        self._values = [np.asarray(self.p.arrays[name]) for name in self.lines.getlinealiases()]
+        # Warm-up like the indicator it replaces: the strategy gets prenext() until every
+        # line has a value (first non-NaN index + 1)
+        self.addminperiod(max((self._first_valid(values) for values in self._values), default=0) + 1)
+
+    @staticmethod
+    def _first_valid(values: np.ndarray) -> int:
+        valid = np.flatnonzero(~np.isnan(values))
+        return int(valid[0]) if len(valid) else len(values)
+
+    def next(self):
+        idx = len(self) - 1
+        for line, values in zip(self.lines, self._values):
+            line[0] = values[idx]
+
+    def once(self, start, end):
+        for line, values in zip(self.lines, self._values):
+            stop = min(end, len(values), len(line.array))
+            line.array[start:stop] = array("d", values[start:stop].tobytes())
+
+    # The warm-up bars carry the precomputed values too (lines that start earlier than
+    # the slowest one, and [-1] lookups on the first bar after the warm-up)
+    prenext = next
+    preonce = once
+
+
+_classes: Dict[Tuple[str, ...], type] = {}
+_classes_lock = threading.Lock()
+
+
+def precomputed_class(line_names: Tuple[str, ...]) -> type:
+    """PrecomputedIndicator subclass with the given lines"""
+    with _classes_lock:
+        cls = _classes.get(line_names)
+        if cls is None:
+            cls = type(
+                "Precomputed_" + "_".join(line_names),
+                (PrecomputedIndicator,),
+                {"lines": line_names, "plotinfo": dict(plot=False)},
+            )
+            _classes[line_names] = cls
+    return cls
+
+
+_cache = IndicatorCache()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Process-wide indicator cache"""
+    return _cache
+
+
+def configure_indicator_cache(max_mb: float):
+    """Set the memory budget (MB) of the process-wide cache"""
+    _cache.resize(int(max_mb * 1024 * 1024))
+
+
+def data_columns(data) -> Optional[Tuple[str, Callable[[], Dict[str, np.ndarray]]]]:
+    """
+    Fingerprint and column accessor of a preloaded data feed
+
+    The fingerprint hashes the loaded line buffers (so date filters and resampling are
+    covered) and is memoized on the feed, which the optimizer reuses across trials.
+
+    Returns:
+        tuple: (fingerprint, fn() -> OHLCV arrays), or None if the feed is not fully loaded
+    """
+    size = data.buflen()
+    if size <= 0 or len(data.close.array) != size:
+        return None
+
+    memo = getattr(data, "_indicator_fingerprint", None)
+    if memo is None or memo[0] != size:
+        digest = hashlib.sha1()
+        for name in ("datetime",) + _FEED_COLUMNS:
+            digest.update(name.encode("utf-8"))
+            digest.update(memoryview(getattr(data.lines, name).array).cast("B"))
+        memo = (size, digest.hexdigest())
+        data._indicator_fingerprint = memo
+
+    def columns() -> Dict[str, np.ndarray]:
+        return {name: np.array(getattr(data.lines, name).array, dtype=np.float64) for name in _FEED_COLUMNS}
+
+    return memo[1], columns
+
+
+def cached_indicator(strategy, name: str, fallback: Callable[[], Any], **params):
+    """
+    Indicator backed by the process-wide cache for the strategy's data
+
+    The cache is used when ``strategy.p.indicator_cache`` is set and the data is preloaded;
+    otherwise ``fallback`` creates the regular Backtrader indicator. Feeds over a window of
+    a cached dataset (``OHLCVDataset.window``) get the slice of the lines computed on the
+    full dataset, so overlapping windows share them.
+
+    Args:
+        strategy: Strategy instance
+        name: Indicator name (key of INDICATORS)
+        fallback: fn() -> Backtrader indicator with the same lines
+        **params: Indicator parameters
+
+    Returns:
+        PrecomputedIndicator or the fallback indicator
+    """
+    if not getattr(strategy.p, "indicator_cache", False) or not getattr(strategy.env, "_dopreload", False):
+        return fallback()
+    line_names, _ = INDICATORS[name]
+    dataset = getattr(strategy.data.p, "dataset", None)
+    if dataset is not None and strategy.data.buflen() == len(dataset):
+        # Keyed by the dataset fingerprint, which the vectorized engine and the indicator
+        # service (plotter, screener) use for the same data as well
+        root = dataset.parent if dataset.parent is not None else dataset
+        lines = _cache.get(root.fingerprint, name, params, lambda: dict(root.columns))
+        if dataset.parent is not None:
+            stop = dataset.offset + len(dataset)
+            lines = {line: values[dataset.offset : stop] for line, values in lines.items()}
+        return precomputed_class(line_names)(strategy.data, arrays=lines)
+
+    source = data_columns(strategy.data)
+    if source is None:
+        return fallback()
+    fingerprint, columns = source
+    lines = _cache.get(fingerprint, name, params, columns)
+    return precomputed_class(line_names)(strategy.data, arrays=lines)
@@ -0,0 +1,79 @@
+"""
+Indicator Service Module
+-----------------------
+
+This module is the single entry point for indicator values computed on pandas DataFrames
+outside of Backtrader: the result plotter, the Telegram screener technicals and the ticker
+analyzer. The values come from ``numpy_indicators`` (the formulas the mixins use) and are
+stored in the process-wide indicator cache under the content fingerprint of the data, the
+same key used by the optimizer's vectorized engine and the cached mixin indicators. A plot
+made after an optimization in the same process, or a second screener pass over unchanged
+data, reuses the series computed before instead of recomputing them.
+
+DataFrames may use lower or capitalized OHLCV column names (yfinance) and single level
+column MultiIndexes (``yf.download`` for one ticker). The returned series share the index of
+the given DataFrame.
+
+Main Features:
+- One implementation of every indicator for backtests, plots and screeners
+- Content addressed caching (the same data gives the same key, whatever its source)
+- Results as pandas Series aligned with the input DataFrame
+
+Functions:
+- ohlcv_frame: DataFrame with lower case OHLCV float columns
+- compute_indicator: All lines of an indicator as Series
+- indicator_series: One line of an indicator as Series
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from src.data.dataset_cache import OHLCV_COLUMNS, frame_fingerprint
+from src.indicator.indicator_cache import INDICATORS, get_indicator_cache
+
+
+def ohlcv_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    OHLCV columns of a DataFrame with lower case names as float64
+
+    Columns that are missing (e.g. no volume) are left out; a column MultiIndex is reduced
+    to its first level.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(list(range(1, df.columns.nlevels)), axis=1)
+    renamed = {column: str(column).lower() for column in df.columns if str(column).lower() in OHLCV_COLUMNS}
+    frame = df[list(renamed)].rename(columns=renamed)
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    return frame.astype(np.float64)
+
+
+def compute_indicator(df: pd.DataFrame, name: str, **params: Any) -> Dict[str, pd.Series]:
+    """
+    Lines of an indicator computed on a DataFrame, from the cache when already known
+
+    Args:
+        df: OHLCV DataFrame (oldest bar first)
+        name: Indicator name (key of indicator_cache.INDICATORS)
+        **params: Indicator parameters
+
+    Returns:
+        dict: Series by line name, indexed like ``df``
+    """
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator '{name}', expected one of {sorted(INDICATORS)}")
+    frame = ohlcv_frame(df)
+    columns = {column: frame[column].to_numpy() for column in frame.columns}
+    lines = get_indicator_cache().get(frame_fingerprint(frame), name, params, lambda: columns)
+    return {line: pd.Series(values, index=df.index, name=line) for line, values in lines.items()}
+
+
+def indicator_series(df: pd.DataFrame, name: str, line: Optional[str] = None, **params: Any) -> pd.Series:
+    """
+    One line of an indicator (default: the first line) as a Series indexed like ``df``
+
+    Example:
+        rsi = indicator_series(df, "rsi", period=14)
+    """
+    lines = compute_indicator(df, name, **params)
+    return lines[line or INDICATORS[name][0][0]]
@@ -0,0 +1,241 @@
+"""
+NumPy Indicator Module
+---------------------
+
+This module implements the technical indicators used by the entry/exit mixins as plain
+NumPy functions operating on whole OHLCV arrays. The formulas follow the Backtrader
+implementations (Wilder smoothing for RSI/ATR, population standard deviation for
+Bollinger Bands, Highest/Lowest midpoints for Ichimoku) so that the values line up with
+what the mixins see inside Cerebro. Leading values that Backtrader would not have
+produced yet (the indicator warm-up) are NaN.
+
+Main Features:
+- Whole-array computation without stepping bar by bar in Python
+- Output aligned 1:1 with the input arrays
+- No Backtrader dependency, usable from the optimizer, plotter and screener
+
+Functions:
+- sma: Simple moving average
+- smma: Wilder's smoothed moving average seeded with an SMA
+- ema: Exponential moving average seeded with an SMA
+- macd: MACD line, signal and histogram
+- rsi: Relative Strength Index (Wilder)
+- bollinger_bands: Bollinger Bands (top, mid, bot)
+- true_range / atr: True Range and Average True Range (Wilder)
+- ichimoku: Tenkan-sen, Kijun-sen and Senkou span lines
+- supertrend / supertrend_bands: SuperTrend line and direction (and the final bands)
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average, NaN for the first period - 1 values"""
+    values = _as_float_array(values)
+    return pd.Series(values).rolling(window=int(period)).mean().to_numpy()
+
+
+def _seeded_ewm(values, period: int, alpha: float, offset: int = 0) -> np.ndarray:
+    """Exponential smoothing seeded with the SMA of the first ``period`` values from ``offset``"""
+    values = _as_float_array(values)
+    period = int(period)
+    result = np.full(values.shape, np.nan)
+    seed_idx = offset + period - 1
+    if period <= 0 or seed_idx >= len(values):
+        return result
+
+    tail = values[seed_idx:].copy()
+    tail[0] = values[offset : seed_idx + 1].mean()
+    result[seed_idx:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+
+def smma(values, period: int, offset: int = 0) -> np.ndarray:
+    """
+    Wilder's smoothed moving average (Backtrader's SmoothedMovingAverage)
+
+    The first value is the SMA of the first ``period`` values starting at ``offset``, the
+    following ones use alpha = 1 / period.
+
+    Args:
+        values: Input series
+        period: Smoothing period
+        offset: Index of the first meaningful input value (e.g. 1 for diff based inputs)
+    """
+    period = int(period)
+    return _seeded_ewm(values, period, 1.0 / period if period > 0 else 1.0, offset)
+
+
+def ema(values, period: int, offset: int = 0) -> np.ndarray:
+    """Exponential moving average (Backtrader's EMA): SMA seed, then alpha = 2 / (period + 1)"""
+    return _seeded_ewm(values, period, 2.0 / (int(period) + 1), offset)
+
+
+def macd(
+    close, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram (Backtrader's MACDHisto)
+
+    Returns:
+        Tuple of (macd, signal, histo) arrays
+    """
+    close = _as_float_array(close)
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal, offset=max(int(fast), int(slow)) - 1)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing, first value at index ``period``"""
+    close = _as_float_array(close)
+    delta = np.diff(close, prepend=np.nan)
+    up = np.where(delta > 0, delta, 0.0)
+    down = np.where(delta < 0, -delta, 0.0)
+    up[0] = down[0] = np.nan
+
+    ma_up = smma(up, period, offset=1)
+    ma_down = smma(down, period, offset=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = ma_up / ma_down
+        result = 100.0 - 100.0 / (1.0 + rs)
+    return result
+
+
+def bollinger_bands(
+    close, period: int = 20, devfactor: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands using the population standard deviation, as Backtrader does
+
+    Returns:
+        Tuple of (top, mid, bot) arrays
+    """
+    series = pd.Series(_as_float_array(close))
+    rolling = series.rolling(window=int(period))
+    mid = rolling.mean().to_numpy()
+    std = rolling.std(ddof=0).to_numpy()
+    return mid + devfactor * std, mid, mid - devfactor * std
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True Range, NaN on the first bar because it needs the previous close"""
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    prev_close = np.roll(_as_float_array(close), 1)
+    tr = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    tr[0] = np.nan
+    return tr
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing, first value at index ``period``"""
+    return smma(true_range(high, low, close), period, offset=1)
+
+
+def _midpoint(high, low, period: int) -> np.ndarray:
+    hh = pd.Series(_as_float_array(high)).rolling(window=int(period)).max()
+    ll = pd.Series(_as_float_array(low)).rolling(window=int(period)).min()
+    return ((hh + ll) / 2.0).to_numpy()
+
+
+def ichimoku(
+    high, low, tenkan: int = 9, kijun: int = 26, senkou: int = 52, senkou_lead: int = 26
+) -> Dict[str, np.ndarray]:
+    """
+    Ichimoku Cloud lines
+
+    The senkou spans are pushed ``senkou_lead`` bars forward like in Backtrader, so they are
+    NaN until index ``senkou + senkou_lead - 1``.
+
+    Returns:
+        Dictionary with tenkan_sen, kijun_sen, senkou_span_a and senkou_span_b arrays
+    """
+    tenkan_sen = _midpoint(high, low, tenkan)
+    kijun_sen = _midpoint(high, low, kijun)
+    senkou_span_a = np.roll((tenkan_sen + kijun_sen) / 2.0, senkou_lead)
+    senkou_span_b = np.roll(_midpoint(high, low, senkou), senkou_lead)
+    senkou_span_a[:senkou_lead] = np.nan
+    senkou_span_b[:senkou_lead] = np.nan
+    return {
+        "tenkan_sen": tenkan_sen,
+        "kijun_sen": kijun_sen,
+        "senkou_span_a": senkou_span_a,
+        "senkou_span_b": senkou_span_b,
+    }
+
+
+def supertrend(
+    high, low, close, period: int = 10, multiplier: float = 3.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    SuperTrend line and direction (1 = uptrend, -1 = downtrend)
+
+    Returns:
+        Tuple of (super_trend, direction) arrays
+    """
+    super_trend, direction, _, _ = supertrend_bands(high, low, close, period, multiplier)
+    return super_trend, direction
+
+
+def supertrend_bands(
+    high, low, close, period: int = 10, multiplier: float = 3.0, atr_values=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    SuperTrend line, direction and the final upper/lower bands
+
+    The band recursion is inherently sequential, so it runs as a single tight loop over
+    precomputed band arrays; everything else is vectorized.
+
+    Args:
+        atr_values: Precomputed ATR (e.g. from TA-Lib); default is ``atr(high, low, close, period)``
+
+    Returns:
+        Tuple of (super_trend, direction, upper_band, lower_band) arrays
+    """
+    high = _as_float_array(high)
+    low = _as_float_array(low)
+    close = _as_float_array(close)
+    if atr_values is None:
+        atr_values = atr(high, low, close, period)
+    hl2 = (high + low) / 2.0
+    basic_ub = (hl2 + multiplier * _as_float_array(atr_values)).tolist()
+    basic_lb = (hl2 - multiplier * _as_float_array(atr_values)).tolist()
+    closes = close.tolist()
+
+    n = len(closes)
+    st = np.full(n, np.nan)
+    direction = np.full(n, np.nan)
+    upper_band = np.full(n, np.nan)
+    lower_band = np.full(n, np.nan)
+    start = int(period)
+    if start >= n:
+        return st, direction, upper_band, lower_band
+
+    upper = basic_ub[start]
+    lower = basic_lb[start]
+    trend = 1
+    st[start] = upper
+    direction[start] = trend
+    upper_band[start] = upper
+    lower_band[start] = lower
+    for i in range(start + 1, n):
+        prev_upper, prev_lower, prev_close = upper, lower, closes[i - 1]
+        upper = basic_ub[i] if basic_ub[i] < prev_upper or prev_close > prev_upper else prev_upper
+        lower = basic_lb[i] if basic_lb[i] > prev_lower or prev_close < prev_lower else prev_lower
+        if trend == 1:
+            trend = -1 if closes[i] < lower else 1
+        else:
+            trend = 1 if closes[i] > upper else -1
+        st[i] = lower if trend == 1 else upper
+        direction[i] = trend
+        upper_band[i] = upper
+        lower_band[i] = lower
+    return st, direction, upper_band, lower_band
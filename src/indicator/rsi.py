@@ -4,17 +4,24 @@ TA-Lib RSI Indicator Wrapper
 This module provides a Backtrader-compatible wrapper for TA-Lib's RSI indicator.
 It allows using TA-Lib's optimized RSI calculation while maintaining Backtrader's
 indicator interface for compatibility with other components.
+
+The RSI is computed on the whole close array (see array_indicator), so in runonce mode it
+is a single TA-Lib / pandas-ta / NumPy call instead of a Python step per bar. In next mode
+(live feeds) each bar updates streaming_indicators.RSI, the Backtrader formula, in O(1).
 """
 
-import backtrader as bt
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
+from src.indicator import numpy_indicators as ni
+from src.indicator import streaming_indicators as si
+from src.indicator.array_indicator import ArrayIndicator
 from src.notification.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
-class RSI(bt.Indicator):
+class RSI(ArrayIndicator):
     """
     TA-Lib RSI indicator wrapper for Backtrader.
 
@@ -26,7 +33,9 @@ class RSI(bt.Indicator):
     period : int
         The period for RSI calculation (default: 14)
     indicator_type : str
-        The type of indicator to use (default: 'bt', values: 'bt', 'bt-talib', 'pandas-ta' or 'talib')
+        The type of indicator to use (default: 'bt', values: 'bt', 'bt-talib', 'pandas-ta' or 'talib').
+        'bt' uses the NumPy implementation of Backtrader's RSI (Wilder smoothing), 'bt-talib'
+        and 'talib' use TA-Lib
     """
 
     lines = ("rsi",)
@@ -34,34 +43,26 @@ class RSI(bt.Indicator):
         ("period", 14),
         ("indicator_type", "bt"),
     )
+    inputs = ("close",)
 
     def __init__(self):
         super(RSI, self).__init__()
-        self.lines.rsi = bt.LineNum(0)  # Initialize with 0
-        self.addminperiod(self.p.period)  # Ensure we have enough data
+        self.addminperiod(self.p.period + 1)  # Ensure we have enough data
 
+    def compute(self, close: np.ndarray):
         try:
-            if self.p.indicator_type == "bt":
-                self.rsi = bt.indicators.RSI(self.data.close, period=self.p.period)
-            elif self.p.indicator_type == "bt-talib":
-                self.rsi = bt.talib.RSI(self.data.close, timeperiod=self.p.period)
-            elif self.p.indicator_type == "pandas-ta":
-                # For pandas-ta, we'll calculate in next()
-                raise ValueError("pandas-ta indicator type is not supported for RSI")
-            elif self.p.indicator_type == "talib":
+            if self.p.indicator_type in ("bt-talib", "talib"):
                 import talib
 
-                self.rsi = talib.RSI(self.data.close, timeperiod=self.p.period)
+                return [talib.RSI(close, timeperiod=self.p.period)]
+            if self.p.indicator_type == "pandas-ta":
+                return [ta.rsi(pd.Series(close), length=self.p.period).to_numpy(dtype=np.float64)]
         except Exception as e:
             logger.error(
-                f"Error initializing RSI indicator: {e}. Falling back to bt.indicators.RSI",
+                f"Error calculating {self.p.indicator_type} RSI: {e}. Falling back to the Backtrader formula",
                 exc_info=e,
             )
-            self.rsi = bt.indicators.RSI(self.data.close, period=self.p.period)
+        return [ni.rsi(close, self.p.period)]
 
-    def next(self):
-        """Update the indicator values for the current bar"""
-        if self.p.indicator_type in ["bt", "bt-talib"]:
-            self.lines.rsi[0] = self.rsi[0]
-        elif self.p.indicator_type == "talib":
-            self.lines.rsi[0] = self.rsi[len(self.data) - 1]
+    def streaming(self):
+        return si.RSI(self.p.period)
@@ -0,0 +1,593 @@
+"""
+Streaming Indicator Module
+-------------------------
+
+This module implements the indicators used by the entry/exit mixins as incremental
+calculators for live trading: each new bar updates the state in O(1) and the memory used
+is bounded by the indicator period, no matter how long the session runs. Live feeds no
+longer need to re-run indicators over an ever growing DataFrame.
+
+The updates reproduce the arithmetic of the batch versions in ``numpy_indicators``
+operation by operation, so a streaming indicator fed bar by bar yields the same floats as
+the batch function over the whole history:
+
+- Wilder/EMA smoothing follows pandas' ``ewm(adjust=False)`` recurrence, seeded with the
+  NumPy mean of the first ``period`` values
+- Rolling means and variances follow pandas' rolling algorithms (Kahan compensated sums,
+  Welford's method for the variance)
+- Rolling highs/lows (Ichimoku) use monotonic deques
+
+Only closed bars should be fed; an indicator cannot take back a bar once it is updated.
+
+Main Features:
+- O(1) update per bar with constant memory
+- Same values as the batch (backtest) implementations
+- ``IndicatorSet`` usable as BaseLiveDataFeed ``on_new_bar`` callback
+- Backtrader adapter for use inside strategies and mixins
+
+Classes:
+- StreamingIndicator: Base class (update / update_bar / values)
+- SMA, EMA, SMMA, VolumeMA: Moving averages
+- RSI: Relative Strength Index (Wilder)
+- BollingerBands: Bollinger Bands (top, mid, bot)
+- ATR: Average True Range (Wilder)
+- SuperTrend: SuperTrend line, direction and bands
+- Ichimoku: Tenkan-sen, Kijun-sen and Senkou spans
+- IndicatorSet: Named streaming indicators updated together
+
+Functions:
+- backtrader_indicator: Backtrader indicator driven by a streaming indicator
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple, Union
+
+import backtrader as bt
+import numpy as np
+
+NAN = float("nan")
+
+
+def _bar_value(bar: Any, name: str) -> float:
+    """Field of a bar given as mapping (dict, pandas Series) or object with attributes"""
+    try:
+        return float(bar[name])
+    except (KeyError, IndexError, TypeError):
+        return float(getattr(bar, name))
+
+
+class StreamingIndicator:
+    """
+    Base class of the streaming indicators.
+
+    Subclasses declare ``lines`` (output names) and ``inputs`` (bar fields passed to
+    ``update``) and set ``warmup``, the number of bars until the first value.
+    """
+
+    lines: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = ("close",)
+
+    def __init__(self):
+        self.warmup = 1
+        self.count = 0
+        self._last: Tuple[float, ...] = tuple(NAN for _ in self.lines)
+
+    def update(self, *values: float) -> Union[float, Tuple[float, ...]]:
+        """
+        Add one closed bar
+
+        Args:
+            values: Values of the ``inputs`` fields of the bar
+
+        Returns:
+            The current value (single line) or a tuple in ``lines`` order; NaN while warming up
+        """
+        self.count += 1
+        self._last = self._update(*values)
+        return self._last[0] if len(self._last) == 1 else self._last
+
+    def _update(self, *values: float) -> Tuple[float, ...]:
+        raise NotImplementedError
+
+    def update_bar(self, bar: Any) -> Union[float, Tuple[float, ...]]:
+        """Add one closed bar given as mapping or object with the ``inputs`` fields"""
+        return self.update(*(_bar_value(bar, name) for name in self.inputs))
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.warmup
+
+    @property
+    def value(self) -> Union[float, Tuple[float, ...]]:
+        """Current value, as returned by the last update"""
+        return self._last[0] if len(self._last) == 1 else self._last
+
+    @property
+    def values(self) -> Dict[str, float]:
+        """Current values by line name"""
+        return dict(zip(self.lines, self._last))
+
+
+def _pandas_alpha(alpha: float) -> float:
+    # pandas turns alpha into a center of mass and back, which can move the last bit
+    com = (1.0 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+class _SeededSmoothing:
+    """Exponential smoothing seeded with the mean of the first ``period`` values (numpy_indicators._seeded_ewm)"""
+
+    def __init__(self, period: int, alpha: float):
+        self.period = int(period)
+        alpha = _pandas_alpha(alpha)
+        self._old_wt = 1.0 - alpha
+        self._new_wt = alpha
+        self._seed = []
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if self._seed is not None:
+            self._seed.append(x)
+            if len(self._seed) == self.period:
+                self.value = float(np.array(self._seed, dtype=np.float64).mean())
+                self._seed = None
+            return self.value
+
+        # pandas ewm(adjust=False) recurrence, with its shortcut for an unchanged value
+        if self.value != x:
+            self.value = (self._old_wt * self.value + self._new_wt * x) / (self._old_wt + self._new_wt)
+        return self.value
+
+
+class _RollingMean:
+    """Rolling mean with pandas' Kahan compensated add/remove (min_periods = period)"""
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self._window = deque()
+        self._reset()
+
+    def _reset(self):
+        self._nobs = self._neg_ct = 0
+        self._sum = self._comp_add = self._comp_remove = 0.0
+        self._same = 0
+        self._prev = NAN
+
+    def _add(self, x: float):
+        if x != x:
+            return
+        self._nobs += 1
+        y = x - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct += 1
+        if x == self._prev:
+            self._same += 1
+        else:
+            self._same = 1
+        self._prev = x
+
+    def _remove(self, x: float):
+        if x != x:
+            return
+        self._nobs -= 1
+        y = -x - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct -= 1
+
+    def update(self, x: float) -> float:
+        if not self._window or self.period == 1:
+            # pandas restarts the sums when consecutive windows do not overlap
+            self._window.clear()
+            self._reset()
+            self._prev = x
+            self._same = 0
+        elif len(self._window) == self.period:
+            self._remove(self._window.popleft())
+        self._add(x)
+        self._window.append(x)
+
+        if self._nobs < self.period or self._nobs == 0:
+            return NAN
+        result = self._sum / self._nobs
+        if self._same >= self._nobs:
+            result = self._prev
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+
+class _RollingVariance:
+    """Rolling variance with pandas' Welford add/remove and Kahan compensation (min_periods = period)"""
+
+    def __init__(self, period: int, ddof: int = 0):
+        self.period = int(period)
+        self.ddof = ddof
+        self._window = deque()
+        self._reset()
+
+    def _reset(self):
+        self._nobs = 0.0
+        self._mean = self._ssqdm = self._comp_add = self._comp_remove = 0.0
+        self._same = 0
+        self._prev = NAN
+
+    def _add(self, x: float):
+        if x != x:
+            return
+        self._nobs += 1
+        if x == self._prev:
+            self._same += 1
+        else:
+            self._same = 1
+        self._prev = x
+        prev_mean = self._mean - self._comp_add
+        y = x - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        if self._nobs:
+            self._mean = self._mean + t / self._nobs
+        else:
+            self._mean = 0.0
+        self._ssqdm = self._ssqdm + (x - prev_mean) * (x - self._mean)
+
+    def _remove(self, x: float):
+        if x != x:
+            return
+        self._nobs -= 1
+        if self._nobs:
+            prev_mean = self._mean - self._comp_remove
+            y = x - self._comp_remove
+            t = y - self._mean
+            self._comp_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (x - prev_mean) * (x - self._mean)
+        else:
+            self._mean = self._ssqdm = 0.0
+
+    def update(self, x: float) -> float:
+        if not self._window or self.period == 1:
+            self._window.clear()
+            self._reset()
+            self._prev = x
+            self._same = 0
+        elif len(self._window) == self.period:
+            self._remove(self._window.popleft())
+        self._add(x)
+        self._window.append(x)
+
+        if self._nobs < self.period or self._nobs <= self.ddof:
+            return NAN
+        if self._nobs == 1 or self._same >= self._nobs:
+            return 0.0
+        return self._ssqdm / (self._nobs - self.ddof)
+
+
+class _RollingExtreme:
+    """Rolling max (or min) over ``period`` values with a monotonic deque"""
+
+    def __init__(self, period: int, maximum: bool = True):
+        self.period = int(period)
+        self.maximum = maximum
+        self._count = 0
+        self._deque = deque()  # (index, value), values monotonic from the left
+
+    def update(self, x: float) -> float:
+        idx = self._count
+        self._count += 1
+        if self.maximum:
+            while self._deque and self._deque[-1][1] <= x:
+                self._deque.pop()
+        else:
+            while self._deque and self._deque[-1][1] >= x:
+                self._deque.pop()
+        self._deque.append((idx, x))
+        if self._deque[0][0] <= idx - self.period:
+            self._deque.popleft()
+        return self._deque[0][1] if self._count >= self.period else NAN
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average (numpy_indicators.sma)"""
+
+    lines = ("sma",)
+
+    def __init__(self, period: int = 20, source: str = "close"):
+        super().__init__()
+        self.inputs = (source,)
+        self.warmup = int(period)
+        self._mean = _RollingMean(period)
+
+    def _update(self, x: float) -> Tuple[float, ...]:
+        return (self._mean.update(x),)
+
+
+class VolumeMA(SMA):
+    """Moving average of the volume"""
+
+    def __init__(self, period: int = 20):
+        super().__init__(period, source="volume")
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average (numpy_indicators.ema)"""
+
+    lines = ("ema",)
+
+    def __init__(self, period: int = 20, source: str = "close"):
+        super().__init__()
+        self.inputs = (source,)
+        self.warmup = int(period)
+        self._ema = _SeededSmoothing(period, 2.0 / (int(period) + 1))
+
+    def _update(self, x: float) -> Tuple[float, ...]:
+        return (self._ema.update(x),)
+
+
+class SMMA(StreamingIndicator):
+    """Wilder's smoothed moving average (numpy_indicators.smma)"""
+
+    lines = ("smma",)
+
+    def __init__(self, period: int = 14, source: str = "close"):
+        super().__init__()
+        self.inputs = (source,)
+        self.warmup = int(period)
+        self._smma = _SeededSmoothing(period, 1.0 / int(period))
+
+    def _update(self, x: float) -> Tuple[float, ...]:
+        return (self._smma.update(x),)
+
+
+class RSI(StreamingIndicator):
+    """Relative Strength Index with Wilder smoothing (numpy_indicators.rsi)"""
+
+    lines = ("rsi",)
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.warmup = int(period) + 1
+        self._up = _SeededSmoothing(period, 1.0 / int(period))
+        self._down = _SeededSmoothing(period, 1.0 / int(period))
+        self._prev_close: Optional[float] = None
+
+    def _update(self, close: float) -> Tuple[float, ...]:
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return (NAN,)
+        delta = close - prev_close
+        ma_up = self._up.update(delta if delta > 0 else 0.0)
+        ma_down = self._down.update(-delta if delta < 0 else 0.0)
+        if ma_down == 0:
+            rs = math.inf if ma_up > 0 else NAN
+        else:
+            rs = ma_up / ma_down
+        return (100.0 - 100.0 / (1.0 + rs),)
+
+
+class BollingerBands(StreamingIndicator):
+    """Bollinger Bands with population standard deviation (numpy_indicators.bollinger_bands)"""
+
+    lines = ("top", "mid", "bot")
+
+    def __init__(self, period: int = 20, devfactor: float = 2.0):
+        super().__init__()
+        self.warmup = int(period)
+        self.devfactor = devfactor
+        self._mean = _RollingMean(period)
+        self._var = _RollingVariance(period, ddof=0)
+
+    def _update(self, close: float) -> Tuple[float, ...]:
+        mid = self._mean.update(close)
+        var = self._var.update(close)
+        std = math.sqrt(var) if var > 0 else (0.0 if var == var else NAN)
+        return mid + self.devfactor * std, mid, mid - self.devfactor * std
+
+
+class ATR(StreamingIndicator):
+    """Average True Range with Wilder smoothing (numpy_indicators.atr)"""
+
+    lines = ("atr",)
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.warmup = int(period) + 1
+        self._smma = _SeededSmoothing(period, 1.0 / int(period))
+        self._prev_close: Optional[float] = None
+
+    def _update(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return (NAN,)
+        true_range = max(high, prev_close) - min(low, prev_close)
+        return (self._smma.update(true_range),)
+
+
+class SuperTrend(StreamingIndicator):
+    """SuperTrend line, direction (1 up, -1 down) and final bands (numpy_indicators.supertrend_bands)"""
+
+    lines = ("super_trend", "direction", "upper_band", "lower_band")
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0):
+        super().__init__()
+        self.warmup = int(period) + 1
+        self.multiplier = multiplier
+        self._atr = ATR(period)
+        self._upper = self._lower = NAN
+        self._trend = 1
+        self._prev_close = NAN
+
+    def _update(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        atr = self._atr.update(high, low, close)
+        prev_close, self._prev_close = self._prev_close, close
+        if atr != atr:
+            return NAN, NAN, NAN, NAN
+
+        hl2 = (high + low) / 2.0
+        basic_ub = hl2 + self.multiplier * atr
+        basic_lb = hl2 - self.multiplier * atr
+        if self._upper != self._upper:
+            self._upper, self._lower, self._trend = basic_ub, basic_lb, 1
+            return self._upper, 1.0, self._upper, self._lower
+
+        prev_upper, prev_lower = self._upper, self._lower
+        self._upper = basic_ub if basic_ub < prev_upper or prev_close > prev_upper else prev_upper
+        self._lower = basic_lb if basic_lb > prev_lower or prev_close < prev_lower else prev_lower
+        if self._trend == 1:
+            self._trend = -1 if close < self._lower else 1
+        else:
+            self._trend = 1 if close > self._upper else -1
+        line = self._lower if self._trend == 1 else self._upper
+        return line, float(self._trend), self._upper, self._lower
+
+
+class _Midpoint:
+    def __init__(self, period: int):
+        self._high = _RollingExtreme(period, maximum=True)
+        self._low = _RollingExtreme(period, maximum=False)
+
+    def update(self, high: float, low: float) -> float:
+        return (self._high.update(high) + self._low.update(low)) / 2.0
+
+
+class Ichimoku(StreamingIndicator):
+    """
+    Ichimoku lines without the look-ahead chikou span (numpy_indicators.ichimoku)
+
+    The senkou spans are the values of ``senkou_lead`` bars ago, like in Backtrader.
+    """
+
+    lines = ("tenkan_sen", "kijun_sen", "senkou_span_a", "senkou_span_b")
+    inputs = ("high", "low")
+
+    def __init__(self, tenkan: int = 9, kijun: int = 26, senkou: int = 52, senkou_lead: int = 26):
+        super().__init__()
+        self.warmup = max(int(tenkan), int(kijun), int(senkou)) + int(senkou_lead)
+        self.senkou_lead = int(senkou_lead)
+        self._tenkan = _Midpoint(tenkan)
+        self._kijun = _Midpoint(kijun)
+        self._senkou = _Midpoint(senkou)
+        self._span_a = deque(maxlen=self.senkou_lead + 1)
+        self._span_b = deque(maxlen=self.senkou_lead + 1)
+
+    def _update(self, high: float, low: float) -> Tuple[float, ...]:
+        tenkan_sen = self._tenkan.update(high, low)
+        kijun_sen = self._kijun.update(high, low)
+        self._span_a.append((tenkan_sen + kijun_sen) / 2.0)
+        self._span_b.append(self._senkou.update(high, low))
+        if len(self._span_a) <= self.senkou_lead:
+            return tenkan_sen, kijun_sen, NAN, NAN
+        return tenkan_sen, kijun_sen, self._span_a[0], self._span_b[0]
+
+
+class IndicatorSet:
+    """
+    Named streaming indicators updated from the same bars.
+
+    ``on_new_bar`` has the signature of the BaseLiveDataFeed callback, so a set can be
+    passed as ``on_new_bar=indicator_set.on_new_bar`` to a live feed.
+
+    Example:
+        indicators = IndicatorSet(rsi=RSI(14), bb=BollingerBands(20, 2.0), vol_ma=VolumeMA(20))
+        indicators.warm_up(historical_df)
+        feed = BinanceLiveDataFeed(..., on_new_bar=indicators.on_new_bar)
+    """
+
+    def __init__(self, **indicators: StreamingIndicator):
+        self.indicators = indicators
+        self.last_timestamp = None
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> StreamingIndicator:
+        return self.indicators[name]
+
+    def update_bar(self, bar: Any, timestamp: Any = None) -> Dict[str, Any]:
+        """Update every indicator with a closed bar; returns the current values by indicator name"""
+        with self._lock:
+            self.last_timestamp = timestamp
+            return {name: indicator.update_bar(bar) for name, indicator in self.indicators.items()}
+
+    def on_new_bar(self, symbol: str, timestamp: Any, bar: Dict[str, Any]):
+        """BaseLiveDataFeed callback"""
+        self.update_bar(bar, timestamp)
+
+    def warm_up(self, df) -> Dict[str, Any]:
+        """Feed the bars of an OHLCV DataFrame (oldest first), e.g. the historical lookback"""
+        values = {}
+        for timestamp, row in zip(df.index, df.to_dict("records")):
+            values = self.update_bar(row, timestamp)
+        return values
+
+    @property
+    def values(self) -> Dict[str, Dict[str, float]]:
+        """Current values by indicator and line name"""
+        with self._lock:
+            return {name: indicator.values for name, indicator in self.indicators.items()}
+
+
+class StreamingAdapter(bt.Indicator):
+    """
+    Backtrader indicator whose lines come from a streaming indicator updated bar by bar.
+
+    Use ``backtrader_indicator`` to get an instance with the streaming indicator's lines.
+    """
+
+    lines = ()
+    params = (("indicator", None),)
+
+    def __init__(self):
+        self._inputs = []
+        for name in self.p.indicator.inputs:
+            line = getattr(self.data.lines, name, None)
+            if line is None and self.data.lines.size() == 1:
+                line = self.data.lines[0]
+            self._inputs.append(line)
+        self.addminperiod(self.p.indicator.warmup)
+
+    def _step(self):
+        self.p.indicator.update(*(line[0] for line in self._inputs))
+        for line, value in zip(self.lines, self.p.indicator._last):
+            line[0] = value
+
+    def prenext(self):
+        # The streaming state must see every bar, including the warm-up
+        self._step()
+
+    def next(self):
+        self._step()
+
+
+_adapter_classes: Dict[Tuple[str, ...], type] = {}
+_adapter_classes_lock = threading.Lock()
+
+
+def backtrader_indicator(data, indicator: StreamingIndicator) -> StreamingAdapter:
+    """
+    Backtrader indicator over ``data`` driven by ``indicator`` (call inside a strategy or mixin)
+
+    The streaming indicator keeps its state, so use a new one for every run.
+
+    Example:
+        self.rsi = backtrader_indicator(self.strategy.data, RSI(14))
+    """
+    with _adapter_classes_lock:
+        cls = _adapter_classes.get(indicator.lines)
+        if cls is None:
+            cls = type(
+                "Streaming_" + "_".join(indicator.lines),
+                (StreamingAdapter,),
+                {"lines": indicator.lines, "plotinfo": dict(plot=False)},
+            )
+            _adapter_classes[indicator.lines] = cls
+    return cls(data, indicator=indicator)
@@ -0,0 +1,473 @@
+"""
+Benchmark Module
+----------------
+
+This module measures backtest throughput for the entry × exit mixin combinations of the
+registries on synthetic OHLCV data of configurable length. It complements the correctness
+tests in tests/test_strategies.py and tests/test_optimizers.py: the numbers it reports are
+meant to be stored as JSON per release and compared, so that slowdowns show up as
+regressions instead of as "the sweep feels slower".
+
+For every bar count the synthetic data is written to a temporary market data store once and
+loaded the way the optimizer loads data (``get_store_dataset``). For every combination one backtest with the
+default parameters is split into phases, then a few Optuna trials are run to measure the
+trial rate:
+
+- data_load: reading the store range into the cached dataset (per bar count)
+- indicator_init: creating the mixins and their indicators (CustomStrategy.start)
+- run: the rest of Cerebro.run (indicator calculation and the bar loop)
+- analyzer_extraction: get_analysis() of all analyzers of the profile
+
+The indicator cache is cleared before every combination so each one starts cold.
+
+Memory is reported twice. Each combination records ``peak_alloc_mb``, the peak of the
+memory allocated during one more default-parameter backtest traced with ``tracemalloc``
+(run after the timed phases, which tracing would slow down). The report records the
+process's peak RSS once, at the end of the run. ``ru_maxrss`` only ever grows, so per
+combination it would just be the maximum of all combinations before it.
+
+Main Features:
+- Deterministic synthetic OHLCV data (random walk) of any length
+- bars/sec, trials/min, traced peak allocation and per-phase timing per combination
+- Peak RSS of the whole run
+- Backtrader and vectorized engines
+- JSON report and comparison against a baseline report
+
+Functions:
+- synthetic_ohlcv: Deterministic random-walk OHLCV DataFrame
+- load_logic_config: Optimizer parameter space of an entry/exit mixin
+- benchmark_combination: Benchmark one entry/exit combination on a dataset
+- run_benchmark: Benchmark all requested combinations and bar counts
+- compare_reports: Combinations whose throughput dropped against a baseline report
+- peak_rss_mb: Peak resident set size of the current process
+- peak_allocated_mb: Peak memory allocated by a function call (tracemalloc)
+
+Usage:
+    python src/optimizer/benchmark.py --bars 10000 100000 --trials 5
+    python src/optimizer/benchmark.py --bars 10000 --entry RSIBBEntryMixin --baseline results/benchmarks/old.json
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime as dt
+from typing import Any, Dict, List, Optional, Sequence
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import backtrader as bt
+import numpy as np
+import optuna
+import pandas as pd
+from src.analyzer.analyzer_profiles import PROFILE_SEARCH, add_analyzers
+from src.data.dataset_cache import OHLCVDataset, clear_dataset_cache, get_store_dataset
+from src.data.market_data_store import MarketDataStore
+from src.entry.entry_mixin_factory import ENTRY_MIXIN_REGISTRY
+from src.exit.exit_mixin_factory import EXIT_MIXIN_REGISTRY
+from src.indicator.indicator_cache import get_indicator_cache
+from src.notification.logger import setup_logger
+from src.optimizer.custom_optimizer import CustomOptimizer
+from src.optimizer.vectorized_backtester import VectorizedBacktester
+from src.strategy.custom_strategy import CustomStrategy
+
+_logger = setup_logger(__name__)
+
+CONFIG_DIR = os.path.join("config", "optimizer")
+DEFAULT_BAR_COUNTS = (10_000, 100_000, 1_000_000)
+
+
+class _TimedStrategy(CustomStrategy):
+    """CustomStrategy recording how long the mixin/indicator setup in start() takes"""
+
+    def start(self):
+        started = time.perf_counter()
+        super().start()
+        self.init_seconds = time.perf_counter() - started
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MiB (current RSS where no peak is available)"""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def peak_allocated_mb(fn) -> float:
+    """Peak memory in MiB allocated by Python and NumPy while ``fn()`` runs (tracemalloc)"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def synthetic_ohlcv(length: int, seed: int = 42, freq: str = "15min") -> pd.DataFrame:
+    """
+    Deterministic random-walk OHLCV data
+
+    Args:
+        length: Number of bars
+        seed: Random seed, the same seed gives the same bars
+        freq: Bar interval (pandas frequency)
+
+    Returns:
+        pandas.DataFrame: open/high/low/close/volume indexed by UTC timestamps
+    """
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.004, length)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0.0, 0.002, length)) * close
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.lognormal(5.0, 0.5, length),
+        },
+        index=pd.date_range("2020-01-01", periods=length, freq=freq, tz="UTC"),
+    )
+
+
+def load_logic_config(kind: str, name: str, config_dir: str = CONFIG_DIR) -> Dict[str, Any]:
+    """
+    Optimizer parameter space of a mixin (config/optimizer/<kind>/<name>.json)
+
+    File names are matched case-insensitively since a few of them differ from the registry
+    names in capitalization. Mixins without a config file are run with their defaults.
+
+    Args:
+        kind: "entry" or "exit"
+        name: Registry name of the mixin
+        config_dir: Directory containing the entry/ and exit/ folders
+
+    Returns:
+        dict: Logic configuration with name and params
+    """
+    directory = os.path.join(config_dir, kind)
+    if os.path.isdir(directory):
+        for file_name in os.listdir(directory):
+            if file_name.lower() == f"{name}.json".lower():
+                with open(os.path.join(directory, file_name), "r") as f:
+                    config = json.load(f)
+                return dict(config, name=name)
+    _logger.warning(f"No optimizer config for {kind} mixin {name}, using its defaults")
+    return {"name": name, "params": {}}
+
+
+def _optimizer(dataset: OHLCVDataset, entry_logic: dict, exit_logic: dict, settings: dict) -> CustomOptimizer:
+    return CustomOptimizer(
+        {
+            "data": dataset.feed(name="BENCH"),
+            "entry_logic": entry_logic,
+            "exit_logic": exit_logic,
+            "optimizer_settings": settings,
+        }
+    )
+
+
+def _backtrader_phases(optimizer: CustomOptimizer, analyzer_profile: str) -> Dict[str, float]:
+    """One default-parameter Cerebro backtest split into phases (seconds)"""
+    strategy_params = optimizer._strategy_params(
+        optimizer._suggest_params(None, optimizer.entry_logic["params"]),
+        optimizer._suggest_params(None, optimizer.exit_logic["params"]),
+    )
+    cerebro = bt.Cerebro()
+    cerebro.adddata(optimizer.data)
+    cerebro.addstrategy(_TimedStrategy, strategy_config=strategy_params, indicator_cache=optimizer.indicator_cache)
+    cerebro.broker.setcash(optimizer.initial_capital)
+    cerebro.broker.setcommission(commission=optimizer.commission)
+    add_analyzers(cerebro, analyzer_profile, optimizer.risk_free_rate)
+
+    started = time.perf_counter()
+    strategy = cerebro.run(runonce=True, preload=True)[0]
+    total = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for name in strategy.analyzers._names:
+        optimizer.to_dict(getattr(strategy.analyzers, name).get_analysis())
+    extraction = time.perf_counter() - started
+
+    return {
+        "indicator_init": strategy.init_seconds,
+        "run": total - strategy.init_seconds,
+        "analyzer_extraction": extraction,
+    }
+
+
+def _vectorized_phases(optimizer: CustomOptimizer) -> Dict[str, float]:
+    """One default-parameter vectorized backtest; indicators are computed within the run"""
+    started = time.perf_counter()
+    optimizer.run_optimization(engine="vectorized")
+    return {"indicator_init": 0.0, "run": time.perf_counter() - started, "analyzer_extraction": 0.0}
+
+
+def benchmark_combination(
+    dataset: OHLCVDataset,
+    entry_logic: Dict[str, Any],
+    exit_logic: Dict[str, Any],
+    settings: Optional[Dict[str, Any]] = None,
+    trials: int = 5,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Benchmark one entry/exit combination
+
+    Args:
+        dataset: Data to backtest on
+        entry_logic: Entry mixin config (name and parameter space)
+        exit_logic: Exit mixin config (name and parameter space)
+        settings: optimizer_settings for CustomOptimizer (engine, analyzer_profile, ...)
+        trials: Number of Optuna trials for the trial rate (0 to skip)
+        seed: Seed of the trial sampler
+
+    Returns:
+        dict: Phase timings, bars/sec, trials/min and the traced peak allocation of one
+              backtest of the combination
+    """
+    settings = dict(settings or {})
+    settings.setdefault("output_dir", tempfile.gettempdir())
+    analyzer_profile = settings.get("analyzer_profile", PROFILE_SEARCH)
+    engine = settings.get("engine", "backtrader")
+    if engine == "vectorized" and not VectorizedBacktester.supports(entry_logic["name"], exit_logic["name"]):
+        engine = "backtrader"
+    settings["engine"] = engine
+
+    def backtest():
+        optimizer = _optimizer(dataset, entry_logic, exit_logic, settings)
+        if engine == "vectorized":
+            return _vectorized_phases(optimizer)
+        return _backtrader_phases(optimizer, analyzer_profile)
+
+    get_indicator_cache().clear()
+    phases = backtest()
+    backtest_seconds = sum(phases.values())
+
+    # Traced separately: tracemalloc slows down allocations and would skew the timings
+    get_indicator_cache().clear()
+    peak_alloc = peak_allocated_mb(backtest)
+
+    trial_seconds = None
+    if trials:
+        study = optuna.create_study(direction="maximize", sampler=optuna.samplers.RandomSampler(seed=seed))
+
+        def objective(trial):
+            # New feed per trial (feeds are stateful), as in run_optimizer
+            _, _, output = _optimizer(dataset, entry_logic, exit_logic, settings).run_optimization(trial)
+            return output["total_profit_with_commission"]
+
+        started = time.perf_counter()
+        study.optimize(objective, n_trials=trials)
+        trial_seconds = time.perf_counter() - started
+
+    return {
+        "entry": entry_logic["name"],
+        "exit": exit_logic["name"],
+        "engine": engine,
+        "bars": len(dataset),
+        "phases": phases,
+        "backtest_seconds": backtest_seconds,
+        "bars_per_sec": len(dataset) / backtest_seconds if backtest_seconds > 0 else None,
+        "trials": trials,
+        "trial_seconds": trial_seconds,
+        "trials_per_min": trials * 60.0 / trial_seconds if trial_seconds else None,
+        "peak_alloc_mb": peak_alloc,
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "backtrader": getattr(bt, "__version__", None),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "optuna": optuna.__version__,
+    }
+
+
+def run_benchmark(
+    bar_counts: Sequence[int] = DEFAULT_BAR_COUNTS,
+    entries: Optional[Sequence[str]] = None,
+    exits: Optional[Sequence[str]] = None,
+    settings: Optional[Dict[str, Any]] = None,
+    trials: int = 5,
+    seed: int = 42,
+    config_dir: str = CONFIG_DIR,
+    output_file: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark entry × exit combinations for each bar count
+
+    Args:
+        bar_counts: Lengths of the synthetic datasets
+        entries: Entry mixin names (default: all of ENTRY_MIXIN_REGISTRY)
+        exits: Exit mixin names (default: all of EXIT_MIXIN_REGISTRY)
+        settings: optimizer_settings for the backtests
+        trials: Optuna trials per combination for the trial rate
+        seed: Seed of the synthetic data and the trial sampler
+        config_dir: Directory with the entry/exit optimizer configs
+        output_file: Write the report as JSON to this file
+
+    Returns:
+        dict: Environment, settings, data load time per bar count, peak RSS of the run and
+              one result per bar count and combination (failed combinations carry an "error")
+    """
+    entries = list(entries or ENTRY_MIXIN_REGISTRY.keys())
+    exits = list(exits or EXIT_MIXIN_REGISTRY.keys())
+    entry_configs = {name: load_logic_config("entry", name, config_dir) for name in entries}
+    exit_configs = {name: load_logic_config("exit", name, config_dir) for name in exits}
+
+    report = {
+        "created_at": dt.now().isoformat(),
+        "environment": _environment(),
+        "settings": dict(settings or {}, trials=trials, seed=seed),
+        "data_load": {},
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for bars in bar_counts:
+            store = MarketDataStore(tmp_dir)
+            symbol = f"BENCH{bars}"
+            store.write("benchmark", symbol, "15m", synthetic_ohlcv(bars, seed=seed))
+
+            clear_dataset_cache()
+            started = time.perf_counter()
+            dataset = get_store_dataset(symbol, "15m", source="benchmark", store=store)
+            report["data_load"][str(bars)] = time.perf_counter() - started
+            _logger.info(f"Benchmark data: {bars} bars loaded in {report['data_load'][str(bars)]:.2f}s")
+
+            for entry_name in entries:
+                for exit_name in exits:
+                    try:
+                        result = benchmark_combination(
+                            dataset, entry_configs[entry_name], exit_configs[exit_name], settings, trials, seed
+                        )
+                        _logger.info(
+                            f"Benchmark {entry_name} + {exit_name} ({bars} bars): "
+                            f"{result['bars_per_sec'] or 0:,.0f} bars/s, "
+                            f"{result['trials_per_min'] or 0:.1f} trials/min, peak allocation {result['peak_alloc_mb']:.0f} MiB"
+                        )
+                    except Exception as e:
+                        _logger.error(f"Benchmark {entry_name} + {exit_name} ({bars} bars) failed: {e}", exc_info=e)
+                        result = {"entry": entry_name, "exit": exit_name, "bars": bars, "error": str(e)}
+                    report["results"].append(result)
+            clear_dataset_cache()
+
+    report["peak_rss_mb"] = peak_rss_mb()
+    _logger.info(f"Benchmark peak RSS: {report['peak_rss_mb']:.0f} MiB")
+    if output_file:
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        with open(output_file, "w") as f:
+            json.dump(report, f, indent=4, default=str)
+        _logger.info(f"Benchmark report saved to {output_file}")
+    return report
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.10, metric: str = "bars_per_sec"
+) -> List[Dict[str, Any]]:
+    """
+    Combinations whose throughput dropped by more than ``tolerance`` against a baseline
+
+    Results are matched by entry, exit, engine and bar count; results missing from either
+    report or carrying an error are skipped.
+
+    Args:
+        baseline: Earlier report of run_benchmark
+        current: New report of run_benchmark
+        tolerance: Accepted relative slowdown (0.10 = 10%)
+        metric: "bars_per_sec" or "trials_per_min"
+
+    Returns:
+        list: entry, exit, engine, bars, baseline and current values and the relative change
+    """
+
+    def key(result):
+        return result["entry"], result["exit"], result.get("engine"), result["bars"]
+
+    previous = {key(r): r for r in baseline.get("results", []) if r.get(metric)}
+    regressions = []
+    for result in current.get("results", []):
+        before = previous.get(key(result))
+        if before is None or not result.get(metric):
+            continue
+        change = result[metric] / before[metric] - 1.0
+        if change < -tolerance:
+            regressions.append(
+                {
+                    "entry": result["entry"],
+                    "exit": result["exit"],
+                    "engine": result.get("engine"),
+                    "bars": result["bars"],
+                    "baseline": before[metric],
+                    "current": result[metric],
+                    "change": change,
+                }
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark backtest throughput of entry/exit mixin combinations")
+    parser.add_argument("--bars", type=int, nargs="+", default=list(DEFAULT_BAR_COUNTS), help="Synthetic dataset lengths")
+    parser.add_argument("--entry", nargs="+", help="Entry mixins (default: all registered)")
+    parser.add_argument("--exit", nargs="+", help="Exit mixins (default: all registered)")
+    parser.add_argument("--engine", choices=["backtrader", "vectorized"], default="backtrader")
+    parser.add_argument("--profile", choices=["search", "full"], default=PROFILE_SEARCH, help="Analyzer profile")
+    parser.add_argument("--trials", type=int, default=5, help="Optuna trials per combination (0 to skip)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-indicator-cache", action="store_true", help="Disable the shared indicator cache")
+    parser.add_argument("--output", help="Report file (default: results/benchmarks/benchmark_<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Accepted relative slowdown")
+    args = parser.parse_args()
+
+    output_file = args.output or os.path.join(
+        "results", "benchmarks", f"benchmark_{dt.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    report = run_benchmark(
+        bar_counts=args.bars,
+        entries=args.entry,
+        exits=args.exit,
+        settings={
+            "engine": args.engine,
+            "analyzer_profile": args.profile,
+            "indicator_cache": not args.no_indicator_cache,
+        },
+        trials=args.trials,
+        seed=args.seed,
+        output_file=output_file,
+    )
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.tolerance)
+        for regression in regressions:
+            _logger.warning(
+                f"Regression {regression['entry']} + {regression['exit']} ({regression['bars']} bars): "
+                f"{regression['baseline']:,.0f} -> {regression['current']:,.0f} bars/s ({regression['change']:+.1%})"
+            )
+        if regressions:
+            sys.exit(1)
+        _logger.info(f"No regressions against {args.baseline}")
@@ -4,7 +4,7 @@ Custom Optimizer Module
 This module implements a custom optimization framework for trading strategies using Backtrader
 and Optuna. It provides functionality to:
 1. Run backtests with fixed parameters
-2. Optimize strategy parameters using Optuna
+2. Optimize strategy parameters using Optuna (with optional pruning of hopeless trials)
 3. Collect and analyze various performance metrics
 4. Support multiple entry and exit strategies
 
@@ -12,6 +12,10 @@ The optimizer supports:
 - Multiple entry and exit strategy combinations
 - Parameter optimization with different types (int, float, categorical)
 - Comprehensive performance analysis with multiple metrics
+- Analyzer profiles: a minimal "search" set for trials and the "full" set for reporting
+- Optional timing of analyzers (profile_analyzers) and strategy hooks (profile_hooks)
+- Memoization of trial results across trials and runs (trial_cache)
+- Indicator lines shared across trials (indicator_cache)
 - Custom analyzers for detailed strategy evaluation
 
 Parameters:
@@ -24,15 +28,18 @@ Parameters:
 
 import os
 import sys
+import time
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 import backtrader as bt
-from src.analyzer.bt_analyzers import (CAGR, CalmarRatio,
-                                       ConsecutiveWinsLosses,
-                                       PortfolioVolatility, ProfitFactor,
-                                       SortinoRatio, WinRate)
+import optuna
+from src.analyzer.analyzer_profiles import PROFILE_SEARCH, add_analyzers
+from src.data.dataset_cache import frame_fingerprint
+from src.indicator.indicator_cache import configure_indicator_cache
 from src.notification.logger import _logger
+from src.optimizer.trial_cache import get_trial_cache, trial_key
+from src.optimizer.vectorized_backtester import Bars, VectorizedBacktester
 from src.strategy.custom_strategy import CustomStrategy
 
 
@@ -61,8 +68,45 @@ class CustomOptimizer:
         self.risk_free_rate = self.optimizer_settings.get("risk_free_rate", 0.01)
         self.use_talib = self.optimizer_settings.get("use_talib", False)
         self.output_dir = self.optimizer_settings.get("output_dir", "output")
+        self.engine = self.optimizer_settings.get("engine", "backtrader")
+        self.analyzer_profile = self.optimizer_settings.get("analyzer_profile", PROFILE_SEARCH)
+        self.profile_analyzers = self.optimizer_settings.get("profile_analyzers", False)
+        self.profile_hooks = self.optimizer_settings.get("profile_hooks", False)
+        self.trial_cache_enabled = self.optimizer_settings.get("trial_cache", False)
+        self.trial_cache_path = self.optimizer_settings.get("trial_cache_path", os.path.join("results", "trial_cache.db"))
+        self._fingerprint = None
+        self.indicator_cache = self.optimizer_settings.get("indicator_cache", False)
+        if self.indicator_cache:
+            configure_indicator_cache(self.optimizer_settings.get("indicator_cache_mb", 512))
+        self.pruner = self.optimizer_settings.get("pruner")
+        self.pruning_checkpoints = self.optimizer_settings.get("pruning_checkpoints", 20)
+        self.pruning_metric = self.optimizer_settings.get("pruning_metric", "net_pnl")
         os.makedirs(self.output_dir, exist_ok=True)
 
+    @staticmethod
+    def create_pruner(optimizer_settings: dict):
+        """
+        Create the Optuna pruner configured in optimizer_settings
+
+        Steps reported by CustomStrategy are checkpoint numbers (1..pruning_checkpoints), so
+        the warm-up is given in checkpoints as well.
+
+        Returns:
+            optuna.pruners.BasePruner or None when pruning is disabled
+        """
+        name = optimizer_settings.get("pruner")
+        warmup = optimizer_settings.get("pruning_warmup_checkpoints", 2)
+        if not name:
+            return None
+        if name == "median":
+            return optuna.pruners.MedianPruner(
+                n_startup_trials=optimizer_settings.get("pruning_startup_trials", 5),
+                n_warmup_steps=warmup,
+            )
+        if name == "successive_halving":
+            return optuna.pruners.SuccessiveHalvingPruner(min_resource=max(1, warmup))
+        raise ValueError(f"Unknown pruner: {name}")
+
     def to_dict(self, obj):
         if isinstance(obj, dict):
             return {k: self.to_dict(v) for k, v in obj.items()}
@@ -73,62 +117,149 @@ class CustomOptimizer:
         else:
             return obj
 
-    def run_optimization(self, trial=None):
+    def _suggest_params(self, trial, params_config: dict) -> dict:
         """
-        Run optimization for a single trial or backtest with fixed parameters
+        Build mixin parameters from the trial, or from the defaults when there is no trial
 
         Args:
             trial: Optuna trial object (optional)
+            params_config: Parameter space from the mixin's optimizer JSON
 
         Returns:
-            dict: Dictionary containing metrics and trades
+            dict: Parameter values by name
         """
-        # Create cerebro instance
-        cerebro = bt.Cerebro()
-
-        # Add data
-        cerebro.adddata(self.data)
-
-        # Add entry logic parameters
-        entry_logic_params = {}
-        for param_name, param_config in self.entry_logic["params"].items():
+        params = {}
+        for param_name, param_config in params_config.items():
             if trial:
                 if param_config["type"] == "int":
-                    entry_logic_params[param_name] = trial.suggest_int(
+                    params[param_name] = trial.suggest_int(
                         param_name, param_config["low"], param_config["high"]
                     )
                 elif param_config["type"] == "float":
-                    entry_logic_params[param_name] = trial.suggest_float(
+                    params[param_name] = trial.suggest_float(
                         param_name, param_config["low"], param_config["high"]
                     )
                 elif param_config["type"] == "categorical":
-                    entry_logic_params[param_name] = trial.suggest_categorical(
+                    params[param_name] = trial.suggest_categorical(
                         param_name, param_config["choices"]
                     )
             else:
-                entry_logic_params[param_name] = param_config["default"]
+                params[param_name] = param_config["default"]
+        return params
 
-        # Add exit logic parameters
-        exit_logic_params = {}
-        for param_name, param_config in self.exit_logic["params"].items():
-            if trial:
-                if param_config["type"] == "int":
-                    exit_logic_params[param_name] = trial.suggest_int(
-                        param_name, param_config["low"], param_config["high"]
-                    )
-                elif param_config["type"] == "float":
-                    exit_logic_params[param_name] = trial.suggest_float(
-                        param_name, param_config["low"], param_config["high"]
-                    )
-                elif param_config["type"] == "categorical":
-                    exit_logic_params[param_name] = trial.suggest_categorical(
-                        param_name, param_config["choices"]
-                    )
-            else:
-                exit_logic_params[param_name] = param_config["default"]
+    def run_optimization(self, trial=None, engine=None, analyzer_profile=None):
+        """
+        Run optimization for a single trial or backtest with fixed parameters
+
+        Args:
+            trial: Optuna trial object (optional)
+            engine: "backtrader" or "vectorized", overrides optimizer_settings["engine"]
+            analyzer_profile: "search" or "full", overrides optimizer_settings["analyzer_profile"]
+
+        Returns:
+            tuple: (strategy, cerebro, output) where output is a dictionary containing
+                   metrics and trades. strategy and cerebro are None for the vectorized engine.
+        """
+        strategy_params = self._strategy_params(
+            self._suggest_params(trial, self.entry_logic["params"]),
+            self._suggest_params(trial, self.exit_logic["params"]),
+        )
+        engine = self._resolve_engine(engine)
+        analyzer_profile = analyzer_profile or self.analyzer_profile
+
+        # Memoized trials: only live search trials, the best-trial rerun always backtests
+        cache, cache_key, fingerprint = None, None, None
+        if self.trial_cache_enabled and isinstance(trial, optuna.trial.Trial):
+            fingerprint = self._data_fingerprint()
+            cache = get_trial_cache(self.trial_cache_path)
+            cache_key = self._trial_key(fingerprint, strategy_params, engine, analyzer_profile)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                trial.set_user_attr("memoized", True)
+                return None, None, {"best_params": strategy_params, **cached, "trades": [], "memoized": True}
+
+        if engine == "vectorized":
+            strategy, cerebro, output = None, None, self._run_vectorized(strategy_params)
+        else:
+            strategy, cerebro, output = self._run_backtrader(strategy_params, trial, analyzer_profile)
+
+        if cache is not None:
+            cache.put(cache_key, fingerprint, strategy_params, output)
+        return strategy, cerebro, output
+
+    def suggest_params(self, trial) -> dict:
+        """Suggest entry and exit parameters for a trial, as a flat dict like ``trial.params``"""
+        return {
+            **self._suggest_params(trial, self.entry_logic["params"]),
+            **self._suggest_params(trial, self.exit_logic["params"]),
+        }
+
+    def run_batch(self, param_sets: list, engine=None, analyzer_profile=None) -> list:
+        """
+        Evaluate several parameter sets in one call
 
-        # Prepare strategy parameters
-        strategy_params = {
+        With the vectorized engine all sets share one view of the bars and every distinct
+        indicator parameter is computed once for the batch. Used with Optuna's ask/tell
+        interface to evaluate a batch of asked trials together. Results come from the trial
+        cache when it is enabled (marked ``"memoized": True``).
+
+        Args:
+            param_sets: Flat parameter dicts (entry and exit names, e.g. ``trial.params``);
+                missing parameters use the config defaults
+            engine: "backtrader" or "vectorized", overrides optimizer_settings["engine"]
+            analyzer_profile: "search" or "full", overrides optimizer_settings["analyzer_profile"]
+
+        Returns:
+            list: One output dict per parameter set, in input order
+        """
+        engine = self._resolve_engine(engine)
+        analyzer_profile = analyzer_profile or self.analyzer_profile
+        defaults = {
+            name: cfg["default"]
+            for logic in (self.entry_logic, self.exit_logic)
+            for name, cfg in logic["params"].items()
+        }
+        batch = []
+        for params in param_sets:
+            # A FixedTrial gives exactly the parameter dicts a live trial with these values gets
+            fixed = optuna.trial.FixedTrial(dict(defaults, **params))
+            batch.append(
+                self._strategy_params(
+                    self._suggest_params(fixed, self.entry_logic["params"]),
+                    self._suggest_params(fixed, self.exit_logic["params"]),
+                )
+            )
+
+        outputs = [None] * len(batch)
+        keys = [None] * len(batch)
+        cache, fingerprint = None, None
+        if self.trial_cache_enabled:
+            fingerprint = self._data_fingerprint()
+            cache = get_trial_cache(self.trial_cache_path)
+            for i, strategy_params in enumerate(batch):
+                keys[i] = self._trial_key(fingerprint, strategy_params, engine, analyzer_profile)
+                cached = cache.get(keys[i])
+                if cached is not None:
+                    outputs[i] = {"best_params": strategy_params, **cached, "trades": [], "memoized": True}
+
+        pending = [i for i, output in enumerate(outputs) if output is None]
+        if engine == "vectorized":
+            backtester = self._vectorized_backtester()
+            results = backtester.run_batch([batch[i] for i in pending])
+            for i, result in zip(pending, results):
+                outputs[i] = self._vectorized_output(batch[i], result)
+        else:
+            for i in pending:
+                outputs[i] = self._run_backtrader(batch[i], None, analyzer_profile)[2]
+
+        if cache is not None:
+            for i in pending:
+                cache.put(keys[i], fingerprint, batch[i], outputs[i])
+        return outputs
+
+    def _strategy_params(self, entry_logic_params: dict, exit_logic_params: dict) -> dict:
+        """CustomStrategy configuration for entry/exit parameter values"""
+        return {
             "entry_logic": {
                 "name": self.entry_logic["name"],
                 "params": entry_logic_params,
@@ -141,31 +272,63 @@ class CustomOptimizer:
             "position_size": self.optimizer_settings.get("position_size", 0.10),
         }
 
-        # Add strategy with parameters
-        cerebro.addstrategy(CustomStrategy, strategy_config=strategy_params)
+    def _resolve_engine(self, engine=None) -> str:
+        """Requested engine, falling back to Backtrader for combinations without a vectorized version"""
+        engine = engine or self.engine
+        if engine == "vectorized" and not VectorizedBacktester.supports(
+            self.entry_logic["name"], self.exit_logic["name"]
+        ):
+            _logger.warning(
+                f"No vectorized implementation for {self.entry_logic['name']} + "
+                f"{self.exit_logic['name']}, falling back to Backtrader"
+            )
+            engine = "backtrader"
+        return engine
+
+    def _trial_key(self, fingerprint: str, strategy_params: dict, engine: str, analyzer_profile: str) -> str:
+        return trial_key(
+            fingerprint,
+            strategy_params,
+            dict(self.optimizer_settings, engine=engine, analyzer_profile=analyzer_profile),
+        )
+
+    def _run_backtrader(self, strategy_params: dict, trial, analyzer_profile: str):
+        """
+        Run the backtest through Cerebro
+
+        Returns:
+            tuple: (strategy, cerebro, output)
+        """
+        # Create cerebro instance
+        cerebro = bt.Cerebro()
+
+        # Add data
+        cerebro.adddata(self.data)
+
+        # Add strategy with parameters; live trials report intermediate values when pruning is on
+        pruning = {}
+        if self.pruner and self.pruning_checkpoints and isinstance(trial, optuna.trial.Trial):
+            pruning = {
+                "trial": trial,
+                "report_checkpoints": self.pruning_checkpoints,
+                "report_metric": self.pruning_metric,
+            }
+        cerebro.addstrategy(
+            CustomStrategy,
+            strategy_config=strategy_params,
+            indicator_cache=self.indicator_cache,
+            profile_hooks=self.profile_hooks,
+            close_at_end=self.optimizer_settings.get("close_open_positions", False),
+            **pruning,
+        )
 
         # Set broker parameters
         cerebro.broker.setcash(self.initial_capital)
         cerebro.broker.setcommission(commission=self.commission)
 
-        # Add analyzers
-        cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
-        cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
-        cerebro.addanalyzer(bt.analyzers.SQN, _name="sqn")
-        cerebro.addanalyzer(bt.analyzers.TimeDrawDown, _name="time_drawdown")
-        # cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="time_return")
-        cerebro.addanalyzer(bt.analyzers.VWR, _name="vwr")
-        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
-        cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe", riskfreerate=self.risk_free_rate)
-
-        # Add custom analyzers
-        cerebro.addanalyzer(ProfitFactor, _name="profit_factor")
-        cerebro.addanalyzer(WinRate, _name="winrate")
-        cerebro.addanalyzer(CalmarRatio, _name="calmar", riskfreerate=self.risk_free_rate)
-        cerebro.addanalyzer(CAGR, _name="cagr", timeframe=bt.TimeFrame.Years)
-        cerebro.addanalyzer(SortinoRatio, _name="sortino", riskfreerate=self.risk_free_rate)
-        cerebro.addanalyzer(ConsecutiveWinsLosses, _name="consecutivewinslosses")
-        cerebro.addanalyzer(PortfolioVolatility, _name="portfoliovolatility")
+        # Add analyzers of the requested profile
+        analyzer_timings = {} if self.profile_analyzers else None
+        add_analyzers(cerebro, analyzer_profile, self.risk_free_rate, timings=analyzer_timings)
 
         # Run backtest
         _logger.debug("Running backtest")
@@ -176,20 +339,26 @@ class CustomOptimizer:
         analyzers = {}
         for name in strategy.analyzers._names:
             analyzer = getattr(strategy.analyzers, name)
+            started = time.perf_counter()
             analysis = analyzer.get_analysis()
             analyzers[name] = self.to_dict(analysis)
-
-        # Get trade analysis
-        trades_analysis = analyzers.get("trades", {})
+            if analyzer_timings is not None:
+                analyzer_timings[name] = analyzer_timings.get(name, 0.0) + time.perf_counter() - started
 
         # Calculate metrics
         # Backtrader TradeAnalyzer provides:
         # - "pnl.net.total": Net profit (after commission)
         # - "pnl.comm.total": Total commission paid
         # - "pnl.gross.total": Gross profit (before commission)
-
-        gross_profit = trades_analysis.get("pnl", {}).get("gross", {}).get("total", 0.0)
-        net_profit = trades_analysis.get("pnl", {}).get("net", {}).get("total", 0.0)
+        # The "search" profile only has the NetProfit analyzer ("pnl") with the same totals.
+        if "trades" in analyzers:
+            trades_analysis = analyzers["trades"]
+            gross_profit = trades_analysis.get("pnl", {}).get("gross", {}).get("total", 0.0)
+            net_profit = trades_analysis.get("pnl", {}).get("net", {}).get("total", 0.0)
+        else:
+            pnl_analysis = analyzers.get("pnl", {})
+            gross_profit = pnl_analysis.get("gross", 0.0)
+            net_profit = pnl_analysis.get("net", 0.0)
         total_commission = gross_profit - net_profit
 
         # If gross profit is not available, calculate it from net profit + commission
@@ -204,5 +373,72 @@ class CustomOptimizer:
             "analyzers": analyzers,
             "trades": strategy.trades,
         }
+        if analyzer_timings is not None:
+            output["analyzer_timings"] = analyzer_timings
+            _logger.debug(
+                "Analyzer overhead: "
+                + ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in sorted(analyzer_timings.items(), key=lambda item: -item[1]))
+            )
+        hook_timings = strategy.hook_timings()
+        if hook_timings is not None:
+            output["hook_timings"] = hook_timings
+            _logger.debug(
+                "Hook timings: "
+                + ", ".join(f"{name}={timing['total_seconds'] * 1000:.1f}ms" for name, timing in hook_timings.items())
+            )
 
         return strategy, cerebro, output
+
+    def _data_fingerprint(self) -> str:
+        """Content fingerprint of the optimizer data (cached datasets carry their own)"""
+        if self._fingerprint is None:
+            dataset = getattr(getattr(self.data, "p", None), "dataset", None)
+            if dataset is not None:
+                self._fingerprint = dataset.fingerprint
+            elif isinstance(self.data, bt.feeds.PandasData):
+                self._fingerprint = frame_fingerprint(self.data.p.dataname)
+            else:
+                self._fingerprint = frame_fingerprint(self.data)
+        return self._fingerprint
+
+    def _run_vectorized(self, strategy_params: dict) -> dict:
+        """
+        Run the backtest with the vectorized NumPy engine
+
+        Args:
+            strategy_params: Strategy configuration (entry/exit logic with params)
+
+        Returns:
+            dict: Same structure as the Cerebro output
+        """
+        result = self._vectorized_backtester().run(strategy_params)
+        return self._vectorized_output(strategy_params, result)
+
+    def _vectorized_backtester(self) -> VectorizedBacktester:
+        name = getattr(self.data, "_name", None) or "UNKNOWN"
+        dataset = getattr(getattr(self.data, "p", None), "dataset", None)
+        if dataset is not None:
+            # Cached dataset feed: reuse the shared column arrays
+            data = dataset.bars(name)
+        else:
+            frame = self.data.p.dataname if isinstance(self.data, bt.feeds.PandasData) else self.data
+            data = Bars(frame, name=name, fingerprint=self._data_fingerprint())
+        return VectorizedBacktester(
+            data,
+            initial_capital=self.initial_capital,
+            commission=self.commission,
+            position_size=self.optimizer_settings.get("position_size", 0.10),
+            name=name,
+            close_at_end=self.optimizer_settings.get("close_open_positions", False),
+        )
+
+    @staticmethod
+    def _vectorized_output(strategy_params: dict, result: dict) -> dict:
+        return {
+            "best_params": strategy_params,
+            "total_profit": result["total_profit"],
+            "total_profit_with_commission": result["total_profit_with_commission"],
+            "total_commission": result["total_commission"],
+            "analyzers": result["analyzers"],
+            "trades": result["trades"],
+        }
@@ -0,0 +1,193 @@
+"""
+Result Manifest Module
+---------------------
+
+This module keeps an append-only index of optimizer results in a small SQLite database next
+to the result JSON files. ``save_results`` appends a row for every file it writes, so
+checking whether a combination has already been processed is a single indexed lookup
+instead of listing the results directory and parsing every matching JSON file.
+
+Rows are never updated or deleted; the newest row of a combination is its current state.
+Result directories created before the manifest existed are indexed once on first use.
+
+Main Features:
+- One row per saved result: combination key, status, file path, summary metrics
+- Indexed lookup of the latest state of a combination
+- Safe for concurrent writers (sweep worker processes)
+- One-time backfill from existing result JSON files
+
+Classes:
+- ResultManifest: SQLite backed result index
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime as dt
+from typing import Any, Dict, Optional
+
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+STATUS_COMPLETED = "completed"
+STATUS_EMPTY = "empty"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data_file TEXT NOT NULL,
+    entry_logic TEXT NOT NULL,
+    exit_logic TEXT NOT NULL,
+    status TEXT NOT NULL,
+    file_path TEXT,
+    total_trades INTEGER,
+    total_profit REAL,
+    total_profit_with_commission REAL,
+    total_commission REAL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_combination ON results (data_file, entry_logic, exit_logic, id);
+CREATE TABLE IF NOT EXISTS manifest_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ResultManifest:
+    """
+    Append-only SQLite index of saved optimizer results.
+
+    Parameters:
+    -----------
+    path : str
+        SQLite database file, created if missing
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread and process; connections inherited through fork are not reused
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record(
+        self,
+        data_file: str,
+        entry_logic_name: str,
+        exit_logic_name: str,
+        file_path: Optional[str],
+        total_trades: int,
+        total_profit: float = 0.0,
+        total_profit_with_commission: float = 0.0,
+        total_commission: float = 0.0,
+        created_at: Optional[str] = None,
+    ):
+        """Append a row for a saved result file"""
+        status = STATUS_COMPLETED if total_trades > 0 else STATUS_EMPTY
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO results (data_file, entry_logic, exit_logic, status, file_path, total_trades, "
+                "total_profit, total_profit_with_commission, total_commission, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    data_file,
+                    entry_logic_name,
+                    exit_logic_name,
+                    status,
+                    file_path,
+                    int(total_trades),
+                    float(total_profit),
+                    float(total_profit_with_commission),
+                    float(total_commission),
+                    created_at or dt.now().isoformat(),
+                ),
+            )
+
+    def latest(self, data_file: str, entry_logic_name: str, exit_logic_name: str) -> Optional[Dict[str, Any]]:
+        """Newest row of a combination, or None if it was never saved"""
+        conn = self._connect()
+        cursor = conn.execute(
+            "SELECT * FROM results WHERE data_file = ? AND entry_logic = ? AND exit_logic = ? "
+            "ORDER BY id DESC LIMIT 1",
+            (data_file, entry_logic_name, exit_logic_name),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], row))
+
+    def is_completed(self, data_file: str, entry_logic_name: str, exit_logic_name: str) -> bool:
+        """Whether the newest result of a combination is complete and its file still exists"""
+        row = self.latest(data_file, entry_logic_name, exit_logic_name)
+        return (
+            row is not None
+            and row["status"] == STATUS_COMPLETED
+            and bool(row["file_path"])
+            and os.path.exists(row["file_path"])
+        )
+
+    def backfill(self, results_dir: str, parse_filename) -> int:
+        """
+        Index result JSON files written before the manifest existed (runs once per manifest)
+
+        Args:
+            results_dir: Directory with result JSON files
+            parse_filename: fn(filename) -> (entry_logic_name, exit_logic_name) or None
+
+        Returns:
+            int: Number of files indexed
+        """
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM manifest_meta WHERE key = 'backfilled'").fetchone():
+            return 0
+
+        indexed = 0
+        if os.path.isdir(results_dir):
+            for filename in sorted(os.listdir(results_dir)):
+                if not filename.endswith(".json"):
+                    continue
+                file_path = os.path.join(results_dir, filename)
+                try:
+                    with open(file_path, "r") as f:
+                        result_data = json.load(f)
+                    best_params = result_data.get("best_params") or {}
+                    names = (
+                        best_params.get("entry_logic", {}).get("name"),
+                        best_params.get("exit_logic", {}).get("name"),
+                    )
+                    if not all(names):
+                        names = parse_filename(filename)
+                    if not names or not result_data.get("data_file") or result_data.get("analyzers") is None:
+                        continue
+                    self.record(
+                        result_data["data_file"],
+                        names[0],
+                        names[1],
+                        file_path,
+                        total_trades=len(result_data.get("trades") or []),
+                        total_profit=result_data.get("total_profit", 0.0),
+                        total_profit_with_commission=result_data.get("total_profit_with_commission", 0.0),
+                        total_commission=result_data.get("total_commission", 0.0),
+                    )
+                    indexed += 1
+                except Exception as e:
+                    _logger.warning(f"Could not index result file {filename}: {e}")
+
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO manifest_meta (key, value) VALUES ('backfilled', ?)", (dt.now().isoformat(),))
+        if indexed:
+            _logger.info(f"Indexed {indexed} existing result files into {self.path}")
+        return indexed
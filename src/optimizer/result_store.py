@@ -0,0 +1,281 @@
+"""
+Result Store Module
+------------------
+
+This module provides an optional columnar sink for optimizer results. Next to the JSON file
+written by ``save_results`` every run is appended to three Parquet datasets, all hive
+partitioned by symbol and interval:
+
+- summary: one row per run with the metrics of run_json2csv's summary CSV
+- params: one row per best parameter (long format, entry/exit side)
+- trades: one row per trade of the best-trial backtest
+
+Each run writes its own file into the matching partition, so writes are append-only and
+concurrent sweep workers never touch the same file. Queries go through ``pyarrow.dataset``:
+filters on symbol/interval prune whole partitions and other filters are pushed down to the
+Parquet row groups, so ranking results across thousands of runs does not open every JSON.
+
+Main Features:
+- Append-only Parquet datasets partitioned by symbol/interval
+- Fixed schemas so runs with missing metrics stay queryable
+- Predicate pushdown queries with sorting and limits
+- Import of existing result JSON files
+
+Classes:
+- ResultStore: Write and query the columnar result datasets
+
+Example:
+    store = ResultStore("results/store")
+    store.top_results("sharpe_ratio", limit=20, symbol="BTCUSDT", interval="1h")
+"""
+
+import json
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from src.notification.logger import setup_logger
+from src.optimizer.run_json2csv import summarize_result
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+_logger = setup_logger(__name__)
+
+SUMMARY_TABLE = "summary"
+PARAMS_TABLE = "params"
+TRADES_TABLE = "trades"
+
+PARTITION_COLUMNS = ["symbol", "interval"]
+
+SUMMARY_TEXT_COLUMNS = [
+    "run_id",
+    "json_filename",
+    "data_filename",
+    "data_start_date",
+    "data_end_date",
+    "entry_logic_name",
+    "exit_logic_name",
+]
+SUMMARY_METRIC_COLUMNS = [
+    "total_trades",
+    "total_profit",
+    "total_profit_with_commission",
+    "total_commission",
+    "position_size",
+    "win_rate",
+    "profit_factor",
+    "max_drawdown_pct",
+    "sharpe_ratio",
+    "sqn",
+    "cagr",
+    "calmar_ratio",
+    "sortino_ratio",
+    "volatility",
+    "vwr",
+    "max_consecutive_wins",
+    "max_consecutive_losses",
+    "avg_trade_length",
+    "total_return",
+    "avg_return",
+    "normalized_return",
+]
+PARAMS_TEXT_COLUMNS = ["run_id", "entry_logic_name", "exit_logic_name", "side", "name", "value"]
+TRADES_TEXT_COLUMNS = ["run_id", "entry_logic_name", "exit_logic_name", "trade_type", "exit_reason", "status"]
+TRADES_METRIC_COLUMNS = [
+    "entry_price",
+    "exit_price",
+    "size",
+    "commission",
+    "gross_pnl",
+    "net_pnl",
+    "pnl_percentage",
+]
+
+
+def _schema(text_columns: List[str], float_columns: List[str], time_columns: List[str] = ()) -> "pa.Schema":
+    fields = [pa.field(c, pa.string()) for c in text_columns]
+    fields += [pa.field(c, pa.float64()) for c in float_columns]
+    fields += [pa.field(c, pa.timestamp("us", tz="UTC")) for c in time_columns]
+    fields += [pa.field("created_at", pa.timestamp("us", tz="UTC"))]
+    fields += [pa.field(c, pa.string()) for c in PARTITION_COLUMNS]
+    return pa.schema(fields)
+
+
+class ResultStore:
+    """
+    Columnar (Parquet) store for optimizer results.
+
+    Parameters:
+    -----------
+    root : str
+        Directory holding the summary, params and trades datasets
+    """
+
+    def __init__(self, root: str = os.path.join("results", "store")):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the Parquet result store (pip install pyarrow)")
+        self.root = root
+        self.schemas = {
+            SUMMARY_TABLE: _schema(SUMMARY_TEXT_COLUMNS, SUMMARY_METRIC_COLUMNS),
+            PARAMS_TABLE: _schema(PARAMS_TEXT_COLUMNS, ["numeric_value"]),
+            TRADES_TABLE: _schema(TRADES_TEXT_COLUMNS, TRADES_METRIC_COLUMNS, ["entry_time", "exit_time"]),
+        }
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, result_dict: Dict[str, Any], json_file: str) -> Optional[str]:
+        """
+        Append one run (a save_results result dictionary) to the datasets
+
+        Args:
+            result_dict: Serializable result as written to the JSON file
+            json_file: Path of the JSON file; its name carries symbol/interval/dates
+
+        Returns:
+            str: run id, or None if the file name could not be parsed
+        """
+        summary = summarize_result(result_dict, json_file, include_params=False)
+        if summary is None:
+            return None
+
+        run_id = f"{os.path.splitext(os.path.basename(json_file))[0]}-{uuid.uuid4().hex[:8]}"
+        created_at = pd.Timestamp.now(tz="UTC")
+        common = {
+            "run_id": run_id,
+            "symbol": summary["symbol"],
+            "interval": summary["interval"],
+            "entry_logic_name": summary["entry_logic_name"],
+            "exit_logic_name": summary["exit_logic_name"],
+            "created_at": created_at,
+        }
+
+        summary_row = {**summary, **common}
+        self._append(SUMMARY_TABLE, run_id, pd.DataFrame([summary_row]))
+
+        param_rows = []
+        best_params = result_dict.get("best_params", {})
+        for side in ("entry", "exit"):
+            for name, value in (best_params.get(f"{side}_logic", {}).get("params") or {}).items():
+                numeric = value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+                param_rows.append(
+                    {**common, "side": side, "name": name, "value": json.dumps(value), "numeric_value": numeric}
+                )
+        if param_rows:
+            self._append(PARAMS_TABLE, run_id, pd.DataFrame(param_rows))
+
+        trades = result_dict.get("trades") or []
+        if trades:
+            trades_df = pd.DataFrame(trades)
+            for column, value in common.items():
+                trades_df[column] = value
+            for column in ("entry_time", "exit_time"):
+                trades_df[column] = pd.to_datetime(trades_df[column], utc=True, errors="coerce")
+            self._append(TRADES_TABLE, run_id, trades_df)
+
+        return run_id
+
+    def _append(self, table: str, run_id: str, df: pd.DataFrame):
+        schema = self.schemas[table]
+        for field in schema:
+            if field.name not in df.columns:
+                df[field.name] = None
+            elif pa.types.is_floating(field.type):
+                df[field.name] = pd.to_numeric(df[field.name], errors="coerce")
+            elif pa.types.is_string(field.type):
+                df[field.name] = df[field.name].map(lambda v: None if v is None else str(v))
+        arrow_table = pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+        ds.write_dataset(
+            arrow_table,
+            base_dir=os.path.join(self.root, table),
+            format="parquet",
+            partitioning=ds.partitioning(schema=pa.schema([schema.field(c) for c in PARTITION_COLUMNS]), flavor="hive"),
+            basename_template=f"{run_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def ingest_json_dir(self, results_dir: str = "results") -> int:
+        """Import existing result JSON files; returns the number of imported runs"""
+        imported = 0
+        for filename in sorted(os.listdir(results_dir)):
+            if not filename.endswith(".json"):
+                continue
+            file_path = os.path.join(results_dir, filename)
+            try:
+                with open(file_path, "r") as f:
+                    data = json.load(f)
+                if self.write(data, file_path):
+                    imported += 1
+            except Exception as e:
+                _logger.warning(f"Could not import {filename} into the result store: {e}")
+        return imported
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def dataset(self, table: str) -> "ds.Dataset":
+        """pyarrow dataset of a table (summary, params or trades)"""
+        schema = self.schemas[table]
+        return ds.dataset(
+            os.path.join(self.root, table),
+            schema=schema,
+            format="parquet",
+            partitioning=ds.partitioning(schema=pa.schema([schema.field(c) for c in PARTITION_COLUMNS]), flavor="hive"),
+        )
+
+    def query(
+        self,
+        table: str = SUMMARY_TABLE,
+        filter: Optional["pc.Expression"] = None,
+        columns: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        **equals,
+    ) -> pd.DataFrame:
+        """
+        Query a table with predicate pushdown
+
+        Args:
+            table: summary, params or trades
+            filter: Optional pyarrow expression, e.g. ``pc.field("total_trades") >= 10``
+            columns: Columns to read (default: all)
+            sort_by: Column to sort by
+            ascending: Sort order
+            limit: Maximum number of rows returned
+            **equals: Column equality filters, e.g. symbol="BTCUSDT", interval="1h"
+
+        Returns:
+            pandas.DataFrame
+        """
+        if not os.path.isdir(os.path.join(self.root, table)):
+            return pd.DataFrame(columns=columns or self.schemas[table].names)
+
+        expression = filter
+        for column, value in equals.items():
+            condition = pc.field(column) == value
+            expression = condition if expression is None else expression & condition
+
+        if sort_by is not None and columns is not None and sort_by not in columns:
+            columns = [*columns, sort_by]
+        result = self.dataset(table).to_table(filter=expression, columns=columns)
+        if sort_by is not None:
+            result = result.filter(pc.is_valid(result[sort_by]))
+            result = result.sort_by([(sort_by, "ascending" if ascending else "descending")])
+        if limit is not None:
+            result = result.slice(0, limit)
+        return result.to_pandas()
+
+    def top_results(self, metric: str = "sharpe_ratio", limit: int = 20, ascending: bool = False, **equals) -> pd.DataFrame:
+        """Best runs by a summary metric, e.g. top_results("sharpe_ratio", symbol="BTCUSDT", interval="1h")"""
+        return self.query(SUMMARY_TABLE, sort_by=metric, ascending=ascending, limit=limit, **equals)
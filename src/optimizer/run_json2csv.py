@@ -13,6 +13,7 @@ Main Features:
 Functions:
 - extract_symbol_interval_dates(filename): Extract metadata from result filenames
 - process_json_file(file_path): Parse and extract metrics from a single result file
+- summarize_result(data, file_path): Extract metrics from an already loaded result dictionary
 - main(): Process all result files and generate a summary CSV
 
 Output fields:
@@ -85,7 +86,11 @@ def process_json_file(file_path):
     """Process a single JSON file and extract relevant information"""
     with open(file_path, "r") as f:
         data = json.load(f)
-    
+    return summarize_result(data, file_path)
+
+
+def summarize_result(data, file_path, include_params=True):
+    """Flatten a result dictionary (as written by save_results) into a single summary row"""
     # Extract symbol, interval, start_date, end_date from filename
     symbol, interval, start_date, end_date = extract_symbol_interval_dates(file_path)
     if not all([symbol, interval, start_date, end_date]):
@@ -154,6 +159,9 @@ def process_json_file(file_path):
         "normalized_return": normalized_return,
     }
     
+    if not include_params:
+        return result
+
     # Add entry logic parameters
     entry_params = extract_nested_value(best_params, ["entry_logic", "params"], {})
     for param_name, param_value in entry_params.items():
@@ -3,11 +3,14 @@ Run Optimizer Module
 
 This module provides functionality to run optimizations for trading strategies.
 It handles:
-1. Loading and preparing data
+1. Loading and preparing data from the market data store (CSV files in data/ are imported)
 2. Running optimizations for different entry/exit strategy combinations
 3. Saving results and plots
 4. Managing visualization settings
-5. Resume functionality to skip already processed combinations
+5. Resume functionality to skip already processed combinations and continue
+   interrupted Optuna studies (see study_storage)
+6. Running combinations in parallel worker processes (see sweep_scheduler)
+7. Walk-forward validation of a combination (see walk_forward)
 """
 
 import os
@@ -19,110 +22,133 @@ import json
 from datetime import datetime as dt
 
 import backtrader as bt
-import optuna
 import pandas as pd
+from src.data.dataset_cache import get_store_dataset
+from src.data.market_data_store import get_market_data_store, parse_data_key
 from src.entry.entry_mixin_factory import ENTRY_MIXIN_REGISTRY
 from src.exit.exit_mixin_factory import EXIT_MIXIN_REGISTRY
 from src.notification.logger import setup_logger
 from src.optimizer.custom_optimizer import CustomOptimizer
+from src.optimizer.result_manifest import ResultManifest
+from src.optimizer.result_store import ResultStore
+from src.optimizer.study_storage import (create_storage, load_or_create_study,
+                                         run_study, run_study_batched)
+from src.optimizer.sweep_scheduler import STATUS_COMPLETED, SweepJob, SweepScheduler, usable_cpus
+from src.optimizer.walk_forward import WalkForwardOptimizer
 from src.plotter.base_plotter import BasePlotter
 
 _logger = setup_logger(__name__)
 
 
+RESULTS_DIR = "results"
+MANIFEST_FILE = "manifest.db"
+
+_manifest = None
+
+
+def get_manifest():
+    """Result manifest of the results directory, indexing pre-existing files on first use"""
+    global _manifest
+    if _manifest is None:
+        _manifest = ResultManifest(os.path.join(RESULTS_DIR, MANIFEST_FILE))
+        _manifest.backfill(RESULTS_DIR, parse_result_filename)
+    return _manifest
+
+
+def parse_result_filename(filename):
+    """Extract (entry_logic_name, exit_logic_name) from a result file name, or None"""
+    parts = filename.replace(".json", "").split("_")
+    # symbol_interval_start_end_entry_exit_date_time
+    if len(parts) >= 8:
+        return parts[4], parts[5]
+    return None
+
+
 def check_if_already_processed(data_file, entry_logic_name, exit_logic_name):
     """
     Check if this combination has already been processed.
-    
+
+    Looks up the newest manifest entry of the combination instead of scanning the
+    results directory.
+
     Args:
         data_file: Name of the data file
         entry_logic_name: Name of the entry logic mixin
         exit_logic_name: Name of the exit logic mixin
-        
+
     Returns:
         bool: True if already processed, False otherwise
     """
-    # Generate the base filename (without timestamp)
-    base_filename = get_result_filename(
-        data_file, 
-        entry_logic_name=entry_logic_name, 
-        exit_logic_name=exit_logic_name, 
-        suffix=""
-    )
-    
-    # Look for existing files in results directory
-    results_dir = "results"
-    if not os.path.exists(results_dir):
-        return False
-    
-    # Check if any file matches the pattern
-    for filename in os.listdir(results_dir):
-        if filename.startswith(base_filename) and filename.endswith('.json'):
-            # Found a matching file, check if it's valid
-            filepath = os.path.join(results_dir, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    result_data = json.load(f)
-                
-                # Check if the file has complete results
-                if (result_data.get('trades') is not None and 
-                    result_data.get('analyzers') is not None and 
-                    result_data.get('best_params') is not None and
-                    len(result_data.get('trades', [])) > 0):
-                    
-                    _logger.info(f"✅ Skipping {data_file} + {entry_logic_name} + {exit_logic_name} - already processed")
-                    _logger.info(f"   Found existing file: {filename}")
-                    return True
-                else:
-                    _logger.warning(f"⚠️  Found existing file {filename} but it appears incomplete, will reprocess")
-                    return False
-                    
-            except Exception as e:
-                _logger.warning(f"⚠️  Found existing file {filename} but it appears corrupted: {e}")
-                continue
-    
+    manifest = get_manifest()
+    if manifest.is_completed(data_file, entry_logic_name, exit_logic_name):
+        _logger.info(f"✅ Skipping {data_file} + {entry_logic_name} + {exit_logic_name} - already processed")
+        return True
+
+    latest = manifest.latest(data_file, entry_logic_name, exit_logic_name)
+    if latest is not None:
+        _logger.warning(
+            f"⚠️  Found existing result {latest['file_path']} but it appears incomplete or missing, will reprocess"
+        )
     return False
 
 
-def prepare_data(data_file):
-    """Load and prepare data from CSV file"""
-    # Load and prepare data
-    df = pd.read_csv(os.path.join("data", data_file))
-    print("Available columns:", df.columns.tolist())
+def get_data_files(store, data_dir="data"):
+    """
+    Data keys of the optimization jobs
 
-    # Find datetime column
-    df["datetime"] = pd.to_datetime(df["timestamp"], utc=True)
-    df = df.sort_values("datetime", ascending=True)
-    df.set_index("datetime", inplace=True)
+    CSV files of the data directory keep their file name (symbol_interval_start_end.csv)
+    as key, so manifest entries and study names of earlier runs still match; the ranges
+    saved by the downloaders are added with their data key. Both stay the same when bars
+    are appended to the store.
 
-    df = df[["open", "high", "low", "close", "volume"]]
+    Args:
+        store: Market data store the CSV files were imported into
+        data_dir: Directory of the CSV files
 
-    for col in ["open", "high", "low", "close", "volume"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    Returns:
+        list: Data keys, CSV file names first
+    """
+    csv_files = []
+    if os.path.isdir(data_dir):
+        csv_files = sorted(f for f in os.listdir(data_dir) if f.endswith(".csv") and not f.startswith("."))
+    imported = {f[: -len(".csv")] for f in csv_files}
+    return csv_files + [key for key in store.data_keys() if key not in imported]
+
+
+def load_dataset(data_file):
+    """
+    Dataset of a data key (symbol_interval_start_end, see src.data.market_data_store)
+
+    The range is read from the market data store once per process (see
+    src.data.dataset_cache) and shared by all trials. A legacy CSV file name is read
+    from the source it was imported into.
+    """
+    symbol, interval, start, end = parse_data_key(data_file)
+    source = get_market_data_store().key_source(data_file)
+    return get_store_dataset(symbol, interval, start, end, source=source)
 
-    df.ffill(inplace=True)
-    df.bfill(inplace=True)
 
-    # Extract symbol from data file name
+def prepare_data(data_file):
+    """
+    Create a Backtrader data feed for a data key
+
+    Every call returns a new lightweight feed over the shared read-only arrays of
+    ``load_dataset``, so it is safe to call per trial.
+    """
+    dataset = load_dataset(data_file)
+
+    # Create Backtrader data feed with symbol name
+    return dataset.feed(name=get_symbol(data_file))
+
+
+def get_symbol(data_file):
+    """Symbol part of a data file name (symbol_interval_startdate_enddate.csv)"""
     symbol = "UNKNOWN"
     if "_" in data_file:
         parts = data_file.replace(".csv", "").split("_")
         if len(parts) >= 1:
             symbol = parts[0]
-
-    # Create Backtrader data feed with symbol name
-    data = bt.feeds.PandasData(
-        dataname=df,
-        datetime=None,
-        open=df.columns.get_loc("open"),
-        high=df.columns.get_loc("high"),
-        low=df.columns.get_loc("low"),
-        close=df.columns.get_loc("close"),
-        volume=df.columns.get_loc("volume"),
-        openinterest=None,
-        name=symbol,  # Set the symbol as the data feed name
-    )
-    return data
+    return symbol
 
 
 def get_result_filename(
@@ -153,11 +179,16 @@ def get_result_filename(
     return f"{symbol}_{interval}_{start_date}_{end_date}{strategy_part}_{timestamp}{suffix}"
 
 
-def save_results(result, data_file):
-    """Save optimization results to a JSON file"""
+def save_results(result, data_file, optimizer_settings=None):
+    """
+    Save optimization results to a JSON file
+
+    With ``result_store: "parquet"`` in the optimizer settings the run is also appended to
+    the columnar result store (see result_store); the JSON file stays the export format.
+    """
     try:
         # Create results directory if it doesn't exist
-        os.makedirs("results", exist_ok=True)
+        os.makedirs(RESULTS_DIR, exist_ok=True)
 
         # Generate filename based on data file
         filename = get_result_filename(
@@ -279,14 +310,42 @@ def save_results(result, data_file):
             "analyzers": analyzers,
             "trades": trades,
         }
+        if "analyzer_timings" in result:
+            result_dict["analyzer_timings"] = {k: float(v) for k, v in result["analyzer_timings"].items()}
+        if "hook_timings" in result:
+            result_dict["hook_timings"] = result["hook_timings"]
 
         # Save to JSON file
-        json_file = os.path.join("results", f"{filename}.json")
+        json_file = os.path.join(RESULTS_DIR, f"{filename}.json")
         with open(json_file, "w") as f:
             json.dump(result_dict, f, indent=4)
 
         _logger.info(f"Results saved to {json_file}")
 
+        try:
+            get_manifest().record(
+                str(data_file),
+                result_dict["best_params"].get("entry_logic", {}).get("name", ""),
+                result_dict["best_params"].get("exit_logic", {}).get("name", ""),
+                json_file,
+                total_trades=result_dict["total_trades"],
+                total_profit=result_dict["total_profit"],
+                total_profit_with_commission=result_dict["total_profit_with_commission"],
+                total_commission=result_dict["total_commission"],
+            )
+        except Exception as e:
+            _logger.warning(f"Could not record {json_file} in the result manifest: {e}")
+
+        if (optimizer_settings or {}).get("result_store") == "parquet":
+            try:
+                ResultStore(optimizer_settings.get("result_store_dir", os.path.join(RESULTS_DIR, "store"))).write(
+                    result_dict, json_file
+                )
+            except Exception as e:
+                _logger.warning(f"Could not write {json_file} to the result store: {e}")
+
+        return json_file
+
     except Exception as e:
         _logger.error(f"Error saving results: {str(e)}")
         raise
@@ -308,121 +367,253 @@ def save_plot(cerebro, filename, vis_settings):
     cerebro.plot(**plot_args)
 
 
+def optimize_combination(data_file, entry_logic_name, exit_logic_name, optimizer_config):
+    """
+    Run the Optuna study for one data file / entry / exit combination and save the result
+
+    Module level so it can be executed in sweep worker processes.
+
+    Returns:
+        dict: Summary of the best trial (profit, trade count, result file)
+    """
+    # Load entry/exit logic configuration
+    with open(os.path.join("config", "optimizer", "entry", f"{entry_logic_name}.json"), "r") as f:
+        entry_logic_config = json.load(f)
+    with open(os.path.join("config", "optimizer", "exit", f"{exit_logic_name}.json"), "r") as f:
+        exit_logic_config = json.load(f)
+
+    optimizer_settings = optimizer_config.get("optimizer_settings", {})
+    visualization_settings = optimizer_config.get("visualization_settings", {})
+
+    if optimizer_settings.get("walk_forward", False):
+        return optimize_walk_forward(data_file, entry_logic_config, exit_logic_config, optimizer_settings)
+
+    def objective(trial):
+        """Objective function for optimization"""
+        # New feed per trial (feeds are stateful); the parsed data is shared
+        data = prepare_data(data_file)
+        _optimizer_config = {
+            "data": data,
+            "entry_logic": entry_logic_config,
+            "exit_logic": exit_logic_config,
+            "optimizer_settings": optimizer_settings,
+            "visualization_settings": visualization_settings,
+        }
+        optimizer = CustomOptimizer(_optimizer_config)
+        _, _, result = optimizer.run_optimization(trial)
+        return result["total_profit_with_commission"]
+
+    # Create (or resume) study
+    study = load_or_create_study(
+        data_file,
+        entry_logic_config,
+        exit_logic_config,
+        optimizer_settings,
+        pruner=CustomOptimizer.create_pruner(optimizer_settings),
+    )
+
+    def evaluate_batch(trials):
+        """Suggest parameters for a batch of asked trials and evaluate them together"""
+        data = prepare_data(data_file)
+        optimizer = CustomOptimizer(
+            {
+                "data": data,
+                "entry_logic": entry_logic_config,
+                "exit_logic": exit_logic_config,
+                "optimizer_settings": optimizer_settings,
+                "visualization_settings": visualization_settings,
+            }
+        )
+        results = optimizer.run_batch([optimizer.suggest_params(trial) for trial in trials])
+        for trial, result in zip(trials, results):
+            if result.get("memoized"):
+                trial.set_user_attr("memoized", True)
+        return [result["total_profit_with_commission"] for result in results]
+
+    # Run optimization
+    batch_size = optimizer_settings.get("batch_size", 1)
+    if batch_size > 1:
+        run_study_batched(
+            study, evaluate_batch, n_trials=optimizer_settings.get("n_trials", 100), batch_size=batch_size
+        )
+    else:
+        run_study(
+            study,
+            objective,
+            n_trials=optimizer_settings.get("n_trials", 100),
+            n_jobs=optimizer_settings.get("n_jobs", -1),
+        )
+
+    # Get best result
+    data = prepare_data(data_file)
+    _optimizer_config = {
+        "data": data,
+        "entry_logic": entry_logic_config,
+        "exit_logic": exit_logic_config,
+        "optimizer_settings": optimizer_settings,
+        "visualization_settings": visualization_settings,
+    }
+    best_trial = study.best_trial
+    best_optimizer = CustomOptimizer(_optimizer_config)
+
+    # Run full backtest with best parameters (always through Cerebro, with all analyzers)
+    _logger.info("Running full backtest with best parameters")
+    strategy, cerebro, best_result = best_optimizer.run_optimization(
+        best_trial, engine="backtrader", analyzer_profile="full"
+    )
+
+    # Save results
+    result_file = save_results(best_result, data_file, optimizer_settings)
+
+    # Create and save plot
+    # if optimizer_settings.get("plot", True):
+    #    plot_name = get_result_filename(
+    #        data_file,
+    #        entry_logic_name=strategy.entry_logic["name"],
+    #        exit_logic_name=strategy.exit_logic["name"],
+    #        suffix="_plot",
+    #    )
+    #    plot_path = os.path.join("results", f"{plot_name}.png")
+    #    save_plot(cerebro, plot_path, visualization_settings)
+
+    return {
+        "result_file": result_file,
+        "best_value": best_trial.value,
+        "total_trades": len(best_result.get("trades", [])),
+        "total_profit_with_commission": float(best_result.get("total_profit_with_commission", 0)),
+    }
+
+
+def optimize_walk_forward(data_file, entry_logic_config, exit_logic_config, optimizer_settings):
+    """
+    Walk-forward optimization of one combination (``walk_forward: true``)
+
+    Every train window gets its own (persistent) study, the out-of-sample test windows are
+    stitched into one trade list and equity curve and saved as ``*_walkforward.json``.
+
+    Returns:
+        dict: Summary of the stitched out-of-sample result
+    """
+    dataset = load_dataset(data_file)
+    optimizer = WalkForwardOptimizer(
+        dataset,
+        entry_logic_config,
+        exit_logic_config,
+        optimizer_settings,
+        name=get_symbol(data_file),
+        study_label=data_file,
+    )
+    result = optimizer.run()
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    filename = get_result_filename(
+        data_file,
+        entry_logic_name=entry_logic_config["name"],
+        exit_logic_name=exit_logic_config["name"],
+        suffix="_walkforward",
+    )
+    result_file = os.path.join(RESULTS_DIR, f"{filename}.json")
+    with open(result_file, "w") as f:
+        json.dump({"data_file": data_file, **result}, f, indent=4, default=str)
+    _logger.info(f"Walk-forward results saved to {result_file}")
+
+    return {
+        "result_file": result_file,
+        "best_value": result["total_profit_with_commission"],
+        "total_trades": len(result["trades"]),
+        "total_profit_with_commission": float(result["total_profit_with_commission"]),
+    }
+
+
 if __name__ == "__main__":
     """Run all optimizers with their respective configurations."""
 
     with open(os.path.join("config", "optimizer", "optimizer.json"), "r",) as f:
         optimizer_config = json.load(f)
+    optimizer_settings = optimizer_config.get("optimizer_settings", {})
 
     start_time = dt.now()
     _logger.info(f"Starting optimization at {start_time}")
 
-    # Get the data files
-    data_files = [f for f in os.listdir("data/") if f.endswith(".csv") and not f.startswith(".")]
+    # CSV files dropped into data/ are imported into the market data store, which is
+    # the only source the optimizer reads; one job per CSV file and per saved download
+    store = get_market_data_store()
+    store.import_directory("data")
+    data_files = get_data_files(store, "data")
 
     # Count total combinations for progress tracking
     total_combinations = len(data_files) * len(ENTRY_MIXIN_REGISTRY) * len(EXIT_MIXIN_REGISTRY)
     processed_combinations = 0
     skipped_combinations = 0
+    failed_combinations = 0
 
-    _logger.info(f"Found {len(data_files)} data files")
+    _logger.info(f"Found {len(data_files)} data ranges")
     _logger.info(f"Found {len(ENTRY_MIXIN_REGISTRY)} entry mixins")
     _logger.info(f"Found {len(EXIT_MIXIN_REGISTRY)} exit mixins")
     _logger.info(f"Total combinations to process: {total_combinations}")
 
+    jobs = []
     for data_file in data_files:
-        _logger.info(f"Processing data file: {data_file}")
-
         for entry_logic_name in ENTRY_MIXIN_REGISTRY.keys():
-            # Load entry logic configuration
-            with open(os.path.join("config", "optimizer", "entry", f"{entry_logic_name}.json"), "r") as f:
-                entry_logic_config = json.load(f)
-
             for exit_logic_name in EXIT_MIXIN_REGISTRY.keys():
-                processed_combinations += 1
-                
                 # Check if already processed
                 if check_if_already_processed(data_file, entry_logic_name, exit_logic_name):
                     skipped_combinations += 1
-                    _logger.info(f"Progress: {processed_combinations}/{total_combinations} (Skipped: {skipped_combinations})")
                     continue
-
-                # Load exit logic configuration
-                with open(os.path.join("config", "optimizer", "exit", f"{exit_logic_name}.json"), "r") as f:
-                    exit_logic_config = json.load(f)
-
-                _logger.info(f"🔄 Running optimization {processed_combinations}/{total_combinations}: {data_file} + {entry_logic_name} + {exit_logic_name}")
-
-                # Create optimizer configuration
-                try:
-
-                    def objective(trial):
-                        """Objective function for optimization"""
-                        # Create a new data feed for each trial (important for parallel jobs)
-                        data = prepare_data(data_file)
-                        _optimizer_config = {
-                            "data": data,
-                            "entry_logic": entry_logic_config,
-                            "exit_logic": exit_logic_config,
-                            "optimizer_settings": optimizer_config.get("optimizer_settings", {}),
-                            "visualization_settings": optimizer_config.get("visualization_settings", {}),
-                        }
-                        optimizer = CustomOptimizer(_optimizer_config)
-                        _, _, result = optimizer.run_optimization(trial)
-                        return result["total_profit_with_commission"]
-
-                    # Create study
-                    study = optuna.create_study(direction="maximize")
-
-                    # Run optimization
-                    study.optimize(
-                        objective,
-                        n_trials=optimizer_config.get("optimizer_settings", {}).get("n_trials", 100),
-                        n_jobs=optimizer_config.get("optimizer_settings", {}).get("n_jobs", -1),
-                    )
-
-                    # Get best result
-                    data = prepare_data(data_file)
-                    _optimizer_config = {
-                        "data": data,
-                        "entry_logic": entry_logic_config,
-                        "exit_logic": exit_logic_config,
-                        "optimizer_settings": optimizer_config.get("optimizer_settings", {}),
-                        "visualization_settings": optimizer_config.get("visualization_settings", {}),
-                    }
-                    best_trial = study.best_trial
-                    best_optimizer = CustomOptimizer(_optimizer_config)
-
-                    # Run full backtest with best parameters
-                    _logger.info("Running full backtest with best parameters")
-                    strategy, cerebro, best_result = best_optimizer.run_optimization(best_trial)
-
-                    # Save results
-                    save_results(best_result, data_file)
-
-                    # Create and save plot
-                    # if optimizer_config.get("optimizer_settings", {}).get("plot", True):
-                    #    plot_name = get_result_filename(
-                    #        data_file,
-                    #        entry_logic_name=strategy.entry_logic["name"],
-                    #        exit_logic_name=strategy.exit_logic["name"],
-                    #        suffix="_plot",
-                    #    )
-                    #    plot_path = os.path.join("results", f"{plot_name}.png")
-                    #    save_plot(cerebro, plot_path, optimizer_config.get("visualization_settings", {}))
-                    
-                    _logger.info(f"✅ Completed optimization {processed_combinations}/{total_combinations}")
-                    
-                except Exception as e:
-                    _logger.error(f"❌ Error for {entry_logic_name} + {exit_logic_name}: {e}", exc_info=e)
+                jobs.append(SweepJob(data_file, entry_logic_name, exit_logic_name))
+
+    _logger.info(f"Skipped (already processed): {skipped_combinations}, to run: {len(jobs)}")
+
+    sweep_workers = optimizer_settings.get("sweep_workers", 1)
+    if sweep_workers == "auto":
+        sweep_workers = len(usable_cpus())
+
+    if sweep_workers and int(sweep_workers) > 1:
+        # One combination per process; Optuna threads inside a pinned worker only add contention
+        worker_config = dict(optimizer_config)
+        worker_config["optimizer_settings"] = dict(optimizer_settings, n_jobs=1)
+
+        def on_result(job_result):
+            global processed_combinations, failed_combinations
+            processed_combinations += 1
+            if job_result.status != STATUS_COMPLETED:
+                failed_combinations += 1
+            _logger.info(f"Progress: {processed_combinations}/{len(jobs)} (Failed: {failed_combinations})")
+
+        if optimizer_settings.get("study_storage"):
+            # Create the shared storage once before workers open it concurrently
+            create_storage(optimizer_settings["study_storage"], optimizer_settings.get("study_dir", os.path.join("results", "studies")))
+
+        scheduler = SweepScheduler(
+            optimize_combination,
+            max_workers=int(sweep_workers),
+            cpu_affinity=optimizer_settings.get("sweep_cpu_affinity", True),
+            job_timeout=optimizer_settings.get("sweep_job_timeout"),
+            log_path=os.path.join(optimizer_settings.get("output_dir", "results"), "sweep_log.jsonl"),
+        )
+        scheduler.run(jobs, args=(worker_config,), on_result=on_result)
+    else:
+        for job in jobs:
+            processed_combinations += 1
+            _logger.info(
+                f"🔄 Running optimization {processed_combinations}/{len(jobs)}: "
+                f"{job.data_file} + {job.entry_logic_name} + {job.exit_logic_name}"
+            )
+            try:
+                optimize_combination(job.data_file, job.entry_logic_name, job.exit_logic_name, optimizer_config)
+                _logger.info(f"✅ Completed optimization {processed_combinations}/{len(jobs)}")
+            except Exception as e:
+                failed_combinations += 1
+                _logger.error(f"❌ Error for {job.entry_logic_name} + {job.exit_logic_name}: {e}", exc_info=e)
 
     end_time = dt.now()
     duration = end_time - start_time
-    
+
     _logger.info(f"🎉 Optimization completed at {end_time}")
     _logger.info(f"⏱️  Total duration: {duration}")
     _logger.info(f"📊 Summary:")
     _logger.info(f"   - Total combinations: {total_combinations}")
-    _logger.info(f"   - Processed: {processed_combinations - skipped_combinations}")
+    _logger.info(f"   - Processed: {processed_combinations}")
+    _logger.info(f"   - Failed: {failed_combinations}")
     _logger.info(f"   - Skipped (already processed): {skipped_combinations}")
     _logger.info(f"   - Time saved by resume: {skipped_combinations * 5} minutes (estimated)")
@@ -0,0 +1,260 @@
+"""
+Study Storage Module
+-------------------
+
+This module makes the optimizer's Optuna studies persistent. Every data file / entry mixin /
+exit mixin combination gets a named study in a local storage file, so trials completed
+before a crash are kept and a restarted sweep continues where it stopped. Several processes
+can work on the same study at once; the trial budget is shared through the storage.
+
+The study name contains a hash of everything that changes the objective (entry/exit
+parameter spaces and the optimizer settings that affect a backtest), so editing a config
+starts a fresh study instead of mixing incompatible trials.
+
+Main Features:
+- SQLite (``"sqlite"``) or append-only journal file (``"journal"``) storage
+- Study names keyed by (data file, entry mixin, exit mixin, config hash)
+- Heartbeats on SQLite so trials of a crashed process are failed instead of left running
+- Trial budget counted in finished (complete, pruned or failed) trials across all processes
+  sharing a study, so a resumed sweep runs as many trials as an uninterrupted one
+
+Functions:
+- config_hash: Stable hash of the objective-relevant configuration
+- get_study_name: Study name for a combination
+- create_storage: Storage object for the configured backend
+- load_or_create_study: Open (or create) the persistent study for a combination
+- count_budget_trials: Trials counted towards the budget
+- run_study: Optimize a study until it has the requested number of finished trials
+- run_study_batched: Same budget, evaluating asked trials in batches (ask/tell)
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+import optuna
+from optuna.study import MaxTrialsCallback
+from optuna.trial import TrialState
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+STORAGE_SQLITE = "sqlite"
+STORAGE_JOURNAL = "journal"
+
+# Optimizer settings that control how the sweep runs, not what a trial evaluates
+EXECUTION_SETTINGS = {
+    "n_trials",
+    "n_jobs",
+    "n_random_trials",
+    "sweep_workers",
+    "sweep_cpu_affinity",
+    "sweep_job_timeout",
+    "study_storage",
+    "study_dir",
+    "plot",
+    "save_trades",
+    "report_metrics",
+    "trades_csv_path",
+    "save_metrics",
+    "metrics_format",
+    "print_summary",
+    "report_params",
+    "report_filename_pattern",
+    "include_plots_in_report",
+    "output_dir",
+    "result_store",
+    "result_store_dir",
+    "pruner",
+    "pruning_checkpoints",
+    "pruning_warmup_checkpoints",
+    "pruning_startup_trials",
+    "pruning_metric",
+    "analyzer_profile",
+    "profile_analyzers",
+    "profile_hooks",
+    "trial_cache",
+    "trial_cache_path",
+    "indicator_cache",
+    "indicator_cache_mb",
+    "batch_size",
+    "walk_forward",
+    "wf_train_period",
+    "wf_test_period",
+    "wf_step_period",
+    "wf_anchored",
+    "wf_warm_start_trials",
+    "wf_seed",
+}
+
+# Heartbeat settings for SQLite storage (seconds)
+HEARTBEAT_INTERVAL = 60
+HEARTBEAT_GRACE_PERIOD = 180
+
+STORAGE_INIT_ATTEMPTS = 5
+
+# Trial states counted towards n_trials: a pruned or failed trial used its share of the
+# budget in an uninterrupted run too
+BUDGET_STATES = (TrialState.COMPLETE, TrialState.PRUNED, TrialState.FAIL)
+
+
+def config_hash(entry_logic_config: Dict[str, Any], exit_logic_config: Dict[str, Any], optimizer_settings: Dict[str, Any]) -> str:
+    """
+    Stable short hash of the configuration that determines a trial's result
+
+    Args:
+        entry_logic_config: Entry mixin config (name and parameter space)
+        exit_logic_config: Exit mixin config (name and parameter space)
+        optimizer_settings: optimizer_settings section of optimizer.json
+
+    Returns:
+        str: 12 character hex digest
+    """
+    relevant = {k: v for k, v in optimizer_settings.items() if k not in EXECUTION_SETTINGS}
+    payload = json.dumps(
+        {"entry": entry_logic_config, "exit": exit_logic_config, "settings": relevant},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def get_study_name(data_file: str, entry_logic_name: str, exit_logic_name: str, cfg_hash: str) -> str:
+    """Study name for a data file / entry / exit / config hash combination"""
+    return f"{data_file}|{entry_logic_name}|{exit_logic_name}|{cfg_hash}"
+
+
+def create_storage(backend: str, study_dir: str = os.path.join("results", "studies")):
+    """
+    Create the Optuna storage for the configured backend
+
+    Args:
+        backend: "sqlite" or "journal"
+        study_dir: Directory holding the storage file
+
+    Returns:
+        Optuna storage shared by all studies of the sweep
+    """
+    os.makedirs(study_dir, exist_ok=True)
+    if backend == STORAGE_SQLITE:
+        path = os.path.abspath(os.path.join(study_dir, "optuna.db"))
+        for attempt in range(STORAGE_INIT_ATTEMPTS):
+            try:
+                return optuna.storages.RDBStorage(
+                    url=f"sqlite:///{path}",
+                    engine_kwargs={"connect_args": {"timeout": 60}},
+                    heartbeat_interval=HEARTBEAT_INTERVAL,
+                    grace_period=HEARTBEAT_GRACE_PERIOD,
+                )
+            except Exception as e:
+                # Workers starting together may race on creating the schema of a new file
+                if attempt == STORAGE_INIT_ATTEMPTS - 1:
+                    raise
+                _logger.debug(f"Retrying study storage initialization: {e}")
+                time.sleep(0.5 * (attempt + 1))
+    if backend == STORAGE_JOURNAL:
+        from optuna.storages.journal import JournalFileBackend, JournalFileOpenLock
+
+        path = os.path.join(study_dir, "optuna_journal.log")
+        return optuna.storages.JournalStorage(JournalFileBackend(path, lock_obj=JournalFileOpenLock(path)))
+    raise ValueError(f"Unknown study storage backend: {backend}")
+
+
+def load_or_create_study(
+    data_file: str,
+    entry_logic_config: Dict[str, Any],
+    exit_logic_config: Dict[str, Any],
+    optimizer_settings: Dict[str, Any],
+    pruner: Optional["optuna.pruners.BasePruner"] = None,
+    sampler: Optional["optuna.samplers.BaseSampler"] = None,
+) -> optuna.Study:
+    """
+    Open the persistent study for a combination, creating it on first use
+
+    Falls back to an in-memory study when ``study_storage`` is not configured. The pruner and
+    the sampler are not persisted by Optuna and are attached again on every load (default
+    sampler: Optuna's TPE).
+
+    Returns:
+        optuna.Study
+    """
+    backend: Optional[str] = optimizer_settings.get("study_storage")
+    if not backend:
+        return optuna.create_study(direction="maximize", pruner=pruner, sampler=sampler)
+
+    cfg_hash = config_hash(entry_logic_config, exit_logic_config, optimizer_settings)
+    study_name = get_study_name(data_file, entry_logic_config["name"], exit_logic_config["name"], cfg_hash)
+    storage = create_storage(backend, optimizer_settings.get("study_dir", os.path.join("results", "studies")))
+    study = optuna.create_study(
+        storage=storage,
+        study_name=study_name,
+        direction="maximize",
+        load_if_exists=True,
+        pruner=pruner,
+        sampler=sampler,
+    )
+
+    finished = count_budget_trials(study)
+    if finished:
+        _logger.info(
+            f"Resuming study {study_name} with {finished} finished trials "
+            f"({count_completed_trials(study)} completed)"
+        )
+    return study
+
+
+def count_completed_trials(study: optuna.Study) -> int:
+    return len(study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,)))
+
+
+def count_budget_trials(study: optuna.Study) -> int:
+    """Number of complete, pruned and failed trials (the ones counted towards n_trials)"""
+    return len(study.get_trials(deepcopy=False, states=BUDGET_STATES))
+
+
+def run_study(study: optuna.Study, objective, n_trials: int, n_jobs: int = 1):
+    """
+    Optimize until the study holds ``n_trials`` finished trials
+
+    Complete, pruned and failed trials from earlier runs or from other processes sharing
+    the study count towards the budget, so a restarted sweep only runs the missing trials.
+    """
+    remaining = n_trials - count_budget_trials(study)
+    if remaining <= 0:
+        _logger.info(f"Study {study.study_name} already has {n_trials} finished trials")
+        return
+    study.optimize(
+        objective,
+        n_trials=remaining,
+        n_jobs=n_jobs,
+        callbacks=[MaxTrialsCallback(n_trials, states=BUDGET_STATES)],
+    )
+
+
+def run_study_batched(study: optuna.Study, evaluate_batch, n_trials: int, batch_size: int):
+    """
+    Optimize until the study holds ``n_trials`` finished trials, in batches of asked trials
+
+    Args:
+        study: Study to optimize
+        evaluate_batch: fn(list of trials) -> list of objective values; parameters are
+            suggested on the trials inside the function
+        n_trials: Trial budget (see BUDGET_STATES) shared with earlier runs and other processes
+        batch_size: Number of trials asked before they are evaluated together
+    """
+    while True:
+        remaining = n_trials - count_budget_trials(study)
+        if remaining <= 0:
+            break
+        trials = [study.ask() for _ in range(min(batch_size, remaining))]
+        try:
+            values = evaluate_batch(trials)
+        except Exception:
+            for trial in trials:
+                study.tell(trial, state=TrialState.FAIL)
+            raise
+        for trial, value in zip(trials, values):
+            study.tell(trial, value)
+        _logger.debug(f"Study {study.study_name}: evaluated a batch of {len(trials)} trials")
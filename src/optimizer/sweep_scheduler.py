@@ -0,0 +1,295 @@
+"""
+Sweep Scheduler Module
+---------------------
+
+This module fans the optimizer sweep (data file x entry mixin x exit mixin) out across
+worker processes. Backtrader is pure Python, so thread based parallelism inside a single
+Optuna study is limited by the GIL; running whole combinations in separate processes lets
+every core work on its own combination.
+
+Each job runs in its own child process. This keeps per-job timeouts enforceable (a job that
+overruns is terminated and its slot reused) and isolates crashes of a single combination.
+The parent is the only writer of the sweep log, so results and failures from all workers
+end up in one JSON-lines file.
+
+Main Features:
+- Configurable number of worker processes (defaults to the number of usable cores)
+- Optional CPU affinity: each worker slot is pinned to its own core
+- Per-job timeout with termination of the overrunning process
+- Central JSON-lines log of completed, failed and timed-out jobs
+
+Classes:
+- SweepJob: One data file / entry mixin / exit mixin combination
+- JobResult: Outcome of a job
+- SweepScheduler: Process pool running the jobs
+"""
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from datetime import datetime as dt
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+
+# How long the parent waits for a message from an exited child before declaring it failed
+_EXIT_GRACE = 2.0
+
+
+@dataclass(frozen=True)
+class SweepJob:
+    """One combination of the optimizer sweep"""
+
+    data_file: str
+    entry_logic_name: str
+    exit_logic_name: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.data_file}|{self.entry_logic_name}|{self.exit_logic_name}"
+
+
+@dataclass
+class JobResult:
+    """Outcome of a sweep job"""
+
+    job: SweepJob
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    worker_pid: Optional[int] = None
+    cpu: Optional[int] = None
+    finished_at: str = field(default_factory=lambda: dt.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record.update(record.pop("job"))
+        return record
+
+
+def usable_cpus() -> List[int]:
+    """CPU ids this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    try:
+        import psutil
+
+        return sorted(psutil.Process().cpu_affinity())
+    except Exception:
+        return list(range(os.cpu_count() or 1))
+
+
+def _pin_to_cpu(cpu: int):
+    """Pin the current process to a single CPU (best effort)"""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        else:
+            import psutil
+
+            psutil.Process().cpu_affinity([cpu])
+    except Exception as e:
+        _logger.warning(f"Could not pin worker {os.getpid()} to CPU {cpu}: {e}")
+
+
+def _worker_main(job_fn, job: SweepJob, args: tuple, cpu: Optional[int], result_queue):
+    """Child process entry point: run one job and report its outcome"""
+    if cpu is not None:
+        _pin_to_cpu(cpu)
+    try:
+        result = job_fn(job.data_file, job.entry_logic_name, job.exit_logic_name, *args)
+        result_queue.put((job.key, STATUS_COMPLETED, result, None))
+    except BaseException as e:
+        result_queue.put((job.key, STATUS_FAILED, None, f"{e!r}\n{traceback.format_exc()}"))
+
+
+class SweepScheduler:
+    """
+    Runs sweep jobs in a pool of worker processes.
+
+    Parameters:
+    -----------
+    job_fn : callable
+        Module level function ``job_fn(data_file, entry_logic_name, exit_logic_name, *args)``
+        returning a JSON serializable summary dict
+    max_workers : int, optional
+        Number of concurrent worker processes (default: number of usable CPUs)
+    cpu_affinity : bool
+        Pin each worker slot to its own CPU
+    job_timeout : float, optional
+        Seconds after which a job is terminated and recorded as timed out
+    log_path : str, optional
+        JSON-lines file every job outcome is appended to
+    """
+
+    def __init__(
+        self,
+        job_fn: Callable[..., Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        cpu_affinity: bool = True,
+        job_timeout: Optional[float] = None,
+        log_path: Optional[str] = None,
+    ):
+        self.job_fn = job_fn
+        self.cpus = usable_cpus()
+        self.max_workers = max(1, int(max_workers or len(self.cpus)))
+        self.cpu_affinity = cpu_affinity
+        self.job_timeout = float(job_timeout) if job_timeout else None
+        self.log_path = log_path
+        self.results: List[JobResult] = []
+
+    def run(
+        self,
+        jobs: Sequence[SweepJob],
+        args: tuple = (),
+        on_result: Optional[Callable[[JobResult], None]] = None,
+    ) -> List[JobResult]:
+        """
+        Run all jobs and wait for them to finish
+
+        Args:
+            jobs: Jobs to run, started in the given order
+            args: Extra positional arguments passed to job_fn (must be picklable)
+            on_result: Optional callback invoked in the parent for every finished job
+
+        Returns:
+            List of JobResult in completion order
+        """
+        ctx = mp.get_context()
+        result_queue = ctx.Queue()
+        pending = list(jobs)
+        pending.reverse()
+        free_slots = list(range(self.max_workers - 1, -1, -1))
+        running: Dict[str, Dict[str, Any]] = {}
+        messages: Dict[str, tuple] = {}
+
+        _logger.info(
+            f"Starting sweep of {len(jobs)} jobs on {self.max_workers} workers "
+            f"(affinity={'on' if self.cpu_affinity else 'off'}, timeout={self.job_timeout})"
+        )
+
+        try:
+            while pending or running:
+                while pending and free_slots:
+                    job = pending.pop()
+                    slot = free_slots.pop()
+                    cpu = self.cpus[slot % len(self.cpus)] if self.cpu_affinity else None
+                    process = ctx.Process(
+                        target=_worker_main,
+                        args=(self.job_fn, job, args, cpu, result_queue),
+                        name=f"sweep-{slot}",
+                        daemon=False,
+                    )
+                    process.start()
+                    running[job.key] = {
+                        "job": job,
+                        "slot": slot,
+                        "cpu": cpu,
+                        "process": process,
+                        "started": time.monotonic(),
+                        "exited": None,
+                    }
+
+                self._drain(result_queue, messages, timeout=0.2)
+
+                now = time.monotonic()
+                for key, state in list(running.items()):
+                    process = state["process"]
+                    job_result = None
+
+                    if key in messages:
+                        _, status, result, error = messages.pop(key)
+                        process.join()
+                        job_result = self._make_result(state, status, result=result, error=error)
+                    elif self.job_timeout and now - state["started"] > self.job_timeout:
+                        process.terminate()
+                        process.join()
+                        job_result = self._make_result(
+                            state, STATUS_TIMEOUT, error=f"Timed out after {self.job_timeout}s"
+                        )
+                    elif not process.is_alive():
+                        # Give the queue feeder of the exited child a moment to deliver
+                        state["exited"] = state["exited"] or now
+                        if now - state["exited"] > _EXIT_GRACE:
+                            job_result = self._make_result(
+                                state,
+                                STATUS_FAILED,
+                                error=f"Worker exited with code {process.exitcode} without a result",
+                            )
+
+                    if job_result is not None:
+                        del running[key]
+                        free_slots.append(state["slot"])
+                        self._record(job_result)
+                        if on_result is not None:
+                            on_result(job_result)
+        except KeyboardInterrupt:
+            _logger.warning(f"Sweep interrupted, terminating {len(running)} running jobs")
+            for state in running.values():
+                state["process"].terminate()
+            raise
+        finally:
+            for state in running.values():
+                state["process"].join()
+            result_queue.close()
+
+        return self.results
+
+    @staticmethod
+    def _drain(result_queue, messages: Dict[str, tuple], timeout: float):
+        try:
+            message = result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        messages[message[0]] = message
+        while True:
+            try:
+                message = result_queue.get_nowait()
+            except queue.Empty:
+                return
+            messages[message[0]] = message
+
+    @staticmethod
+    def _make_result(state: Dict[str, Any], status: str, result=None, error=None) -> JobResult:
+        return JobResult(
+            job=state["job"],
+            status=status,
+            result=result,
+            error=error,
+            duration=time.monotonic() - state["started"],
+            worker_pid=state["process"].pid,
+            cpu=state["cpu"],
+        )
+
+    def _record(self, job_result: JobResult):
+        self.results.append(job_result)
+        job = job_result.job
+        if job_result.status == STATUS_COMPLETED:
+            _logger.info(
+                f"✅ {job.data_file} + {job.entry_logic_name} + {job.exit_logic_name} "
+                f"finished in {job_result.duration:.1f}s"
+            )
+        else:
+            _logger.error(
+                f"❌ {job.data_file} + {job.entry_logic_name} + {job.exit_logic_name} "
+                f"{job_result.status}: {job_result.error}"
+            )
+
+        if self.log_path:
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(job_result.to_dict(), default=str) + "\n")
+            except Exception as e:
+                _logger.error(f"Could not write sweep log {self.log_path}: {e}")
@@ -0,0 +1,171 @@
+"""
+Trial Cache Module
+-----------------
+
+This module memoizes optimizer trial results. Most mixin parameters are small integer
+ranges, so the sampler regularly suggests a parameter set that was already evaluated, and
+repeated sweeps over the same data evaluate the same sets again. A trial result only
+depends on the data, the entry/exit parameters and the backtest settings, so it can be
+looked up instead of re-running the backtest.
+
+Keys combine the dataset content fingerprint (not the file name) with a canonical hash of
+the strategy parameters and the settings that change a backtest's outcome. Results are kept
+in memory and in a SQLite file, so the cache survives restarts and is shared by sweep
+worker processes.
+
+Main Features:
+- Canonical, order independent parameter hashing
+- In-memory front with persistent SQLite storage
+- Safe for concurrent processes (WAL, one connection per process and thread)
+
+Classes:
+- TrialCache: Persistent trial result cache
+
+Functions:
+- trial_key: Cache key for a dataset fingerprint, strategy parameters and settings
+- get_trial_cache: Process-wide TrialCache for a file
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime as dt
+from typing import Any, Dict, Optional
+
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+# Optimizer settings that change the result of a single backtest
+RESULT_SETTINGS = ("engine", "initial_capital", "commission", "risk_free_rate", "analyzer_profile", "use_talib")
+
+# Result fields stored in the cache; trade lists are not needed by the objective
+CACHED_FIELDS = ("total_profit", "total_profit_with_commission", "total_commission", "analyzers")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trial_cache (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    entry_logic TEXT NOT NULL,
+    exit_logic TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at TEXT NOT NULL
+)
+"""
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize numbers so that e.g. 14 and 14.0 hash the same"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def trial_key(fingerprint: str, strategy_params: Dict[str, Any], optimizer_settings: Dict[str, Any]) -> str:
+    """
+    Cache key of a trial
+
+    Args:
+        fingerprint: Dataset content fingerprint
+        strategy_params: CustomStrategy config (entry/exit logic with params, position size)
+        optimizer_settings: Optimizer settings; only RESULT_SETTINGS are part of the key
+
+    Returns:
+        str: Hex digest
+    """
+    payload = {
+        "fingerprint": fingerprint,
+        "strategy": _canonical(strategy_params),
+        "settings": _canonical({k: optimizer_settings.get(k) for k in RESULT_SETTINGS}),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class TrialCache:
+    """
+    Persistent cache of trial results.
+
+    Parameters:
+    -----------
+    path : str
+        SQLite database file, created if missing
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread and process; connections inherited through fork are not reused
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a key, or None"""
+        result = self._memory.get(key)
+        if result is None:
+            row = self._connect().execute("SELECT result FROM trial_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                result = json.loads(row[0])
+                self._memory[key] = result
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, fingerprint: str, strategy_params: Dict[str, Any], output: Dict[str, Any]):
+        """Store the cacheable fields of a trial output"""
+        result = json.loads(json.dumps({k: output.get(k) for k in CACHED_FIELDS}, default=str))
+        self._memory[key] = result
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO trial_cache (key, fingerprint, entry_logic, exit_logic, params, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        fingerprint,
+                        strategy_params["entry_logic"]["name"],
+                        strategy_params["exit_logic"]["name"],
+                        json.dumps(_canonical(strategy_params), sort_keys=True, default=str),
+                        json.dumps(result),
+                        dt.now().isoformat(),
+                    ),
+                )
+        except sqlite3.Error as e:
+            _logger.warning(f"Could not persist trial result in {self.path}: {e}")
+
+
+_caches: Dict[str, TrialCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_trial_cache(path: str) -> TrialCache:
+    """Process-wide TrialCache instance for a file"""
+    path = os.path.abspath(path)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = TrialCache(path)
+    return cache
@@ -0,0 +1,596 @@
+"""
+Vectorized Backtester Module
+
+This module implements a NumPy based backtest engine for the entry/exit mixin combinations
+used by the optimizer. Instead of stepping ``CustomStrategy.next()`` bar by bar inside
+Cerebro, every registered mixin is expressed as signal arrays computed over the whole
+OHLCV block:
+
+1. Entry mixins produce a boolean entry signal array
+2. Exit mixins produce exit conditions that are scanned forward from each entry fill
+3. Fills, position sizing and commission follow Backtrader's default broker semantics
+   (market orders fill at the next bar's open, commission charged on both legs)
+
+The result has the same ``trades``/metrics shape that ``CustomOptimizer.run_optimization``
+returns, so it can be used as a drop-in objective during the Optuna search while the
+final best-trial rerun still goes through Cerebro.
+
+Indicator arrays come from the shared indicator cache, keyed by the dataset fingerprint.
+``run_batch`` evaluates many parameter sets over the same bars: each distinct indicator
+parameter value is computed once for the whole batch and every parameter set is then
+simulated on its own signal arrays.
+
+Notes on mixin semantics:
+- SuperTrend based entries use the trend direction line
+- TimeBasedExitMixin counts bars from the entry fill
+- TrailingStopExitMixin tracks the highest close of the current trade only
+- With ``close_at_end`` a position still open at the end is closed at the last close,
+  like CustomStrategy's ``close_at_end`` (Close order placed on the bar before)
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from src.data.dataset_cache import frame_fingerprint
+from src.entry.entry_mixin_factory import ENTRY_MIXIN_REGISTRY
+from src.exit.exit_mixin_factory import EXIT_MIXIN_REGISTRY
+from src.indicator.indicator_cache import get_indicator_cache
+from src.notification.logger import setup_logger
+
+_logger = setup_logger(__name__)
+
+# Initial number of bars scanned for an exit; doubled until an exit is found
+_SCAN_CHUNK = 256
+
+
+class Bars:
+    """
+    Read-only OHLCV column arrays for a single dataset
+
+    A window of a longer series (``parent`` with the window's ``offset``) takes its
+    indicators from the parent's full-history arrays, so overlapping windows share them and
+    indicators are already warmed up at the first bar of the window.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        name: str = "UNKNOWN",
+        fingerprint: Optional[str] = None,
+        parent: Optional["Bars"] = None,
+        offset: int = 0,
+    ):
+        # df may also be an OHLCVDataset, whose float64 arrays are used without copying
+        self.name = name
+        self._source = df
+        self._fingerprint = fingerprint
+        self.parent = parent
+        self.offset = offset
+        self.index = df.index
+        self.open = np.ascontiguousarray(df["open"], dtype=np.float64)
+        self.high = np.ascontiguousarray(df["high"], dtype=np.float64)
+        self.low = np.ascontiguousarray(df["low"], dtype=np.float64)
+        self.close = np.ascontiguousarray(df["close"], dtype=np.float64)
+        self.volume = np.ascontiguousarray(df["volume"], dtype=np.float64)
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        self.datetime = index
+        self.timestamps = index.asi8
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content fingerprint of the bars (key of the shared indicator cache)"""
+        if self._fingerprint is None:
+            fingerprint = getattr(self._source, "fingerprint", None)
+            self._fingerprint = fingerprint if isinstance(fingerprint, str) else frame_fingerprint(self._source)
+        return self._fingerprint
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {"open": self.open, "high": self.high, "low": self.low, "close": self.close, "volume": self.volume}
+
+    def indicator(self, name: str, line: str, **params) -> np.ndarray:
+        """One line of a cached indicator (see src.indicator.indicator_cache.INDICATORS)"""
+        if self.parent is not None:
+            return self.parent.indicator(name, line, **params)[self.offset : self.offset + len(self)]
+        return get_indicator_cache().get(self.fingerprint, name, params, self.columns)[line]
+
+
+def _first_valid(*arrays: np.ndarray) -> int:
+    """Index of the first bar where all arrays hold a value (Backtrader's minperiod - 1)"""
+    start = 0
+    for array in arrays:
+        valid = np.flatnonzero(~np.isnan(array))
+        start = max(start, int(valid[0]) if len(valid) else len(array))
+    return start
+
+
+def _chunks(start: int, stop: int):
+    """Yield growing (lo, hi) windows covering [start, stop)"""
+    size = _SCAN_CHUNK
+    lo = start
+    while lo < stop:
+        hi = min(stop, lo + size)
+        yield lo, hi
+        lo = hi
+        size *= 2
+
+
+def _first_true_from(condition: np.ndarray, start: int, stop: int) -> Optional[int]:
+    """First index in [start, stop) where a precomputed boolean array is True"""
+    for lo, hi in _chunks(start, stop):
+        hits = np.flatnonzero(condition[lo:hi])
+        if len(hits):
+            return lo + int(hits[0])
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Entry signals: fn(bars, params) -> (signal array, warm-up index)
+# ---------------------------------------------------------------------------
+
+
+def _rsi_condition(bars: Bars, p: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    rsi = bars.indicator("rsi", "rsi", period=p["e_rsi_period"])
+    return rsi <= p["e_rsi_oversold"], rsi
+
+
+def _bb_condition(bars: Bars, p: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    bot = bars.indicator("bollinger_bands", "bot", period=p["e_bb_period"], devfactor=p["e_bb_dev"])
+    if p.get("e_use_bb_touch", True):
+        return bars.close <= bot, bot
+    return bars.close < bot, bot
+
+
+def _volume_condition(bars: Bars, p: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    vol_ma = bars.indicator("sma", "sma", period=p["e_vol_ma_period"], source="volume")
+    return bars.volume > vol_ma * p["e_min_volume_ratio"], vol_ma
+
+
+def _supertrend_condition(bars: Bars, p: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    direction = bars.indicator("supertrend", "direction", period=p["e_st_period"], multiplier=p["e_st_multiplier"])
+    return direction == 1, direction
+
+
+def _rsi_bb_entry(bars: Bars, p: Dict[str, Any]):
+    rsi_ok, rsi = _rsi_condition(bars, p)
+    bb_ok, bot = _bb_condition(bars, p)
+    return rsi_ok & bb_ok, _first_valid(rsi, bot)
+
+
+def _rsi_ichimoku_entry(bars: Bars, p: Dict[str, Any]):
+    rsi_ok, rsi = _rsi_condition(bars, p)
+    ichimoku = {
+        "tenkan": p["e_tenkan"],
+        "kijun": p["e_kijun"],
+        "senkou": p["e_senkou"],
+        "senkou_lead": p["e_senkou_lead"],
+        "chikou": p.get("e_chikou", 26),
+    }
+    tenkan = bars.indicator("ichimoku", "tenkan_sen", **ichimoku)
+    kijun = bars.indicator("ichimoku", "kijun_sen", **ichimoku)
+    crossed = np.zeros(len(bars), dtype=bool)
+    crossed[1:] = (tenkan[1:] > kijun[1:]) & (tenkan[:-1] <= kijun[:-1])
+    return rsi_ok & crossed, _first_valid(rsi, bars.indicator("ichimoku", "senkou_span_b", **ichimoku))
+
+
+def _rsi_bb_volume_entry(bars: Bars, p: Dict[str, Any]):
+    rsi_ok, rsi = _rsi_condition(bars, p)
+    bb_ok, bot = _bb_condition(bars, p)
+    vol_ok, vol_ma = _volume_condition(bars, p)
+    return rsi_ok & bb_ok & vol_ok, _first_valid(rsi, bot, vol_ma)
+
+
+def _rsi_volume_supertrend_entry(bars: Bars, p: Dict[str, Any]):
+    rsi_ok, rsi = _rsi_condition(bars, p)
+    vol_ok, vol_ma = _volume_condition(bars, p)
+    st_ok, direction = _supertrend_condition(bars, p)
+    return rsi_ok & vol_ok & st_ok, _first_valid(rsi, vol_ma, direction)
+
+
+def _bb_volume_supertrend_entry(bars: Bars, p: Dict[str, Any]):
+    bb_ok, bot = _bb_condition(bars, p)
+    vol_ok, vol_ma = _volume_condition(bars, p)
+    st_ok, direction = _supertrend_condition(bars, p)
+    return bb_ok & vol_ok & st_ok, _first_valid(bot, vol_ma, direction)
+
+
+ENTRY_SIGNAL_REGISTRY: Dict[str, Callable] = {
+    "RSIBBEntryMixin": _rsi_bb_entry,
+    "RSIIchimokuEntryMixin": _rsi_ichimoku_entry,
+    "RSIBBVolumeEntryMixin": _rsi_bb_volume_entry,
+    "RSIVolumeSupertrendEntryMixin": _rsi_volume_supertrend_entry,
+    "BBVolumeSuperTrendEntryMixin": _bb_volume_supertrend_entry,
+}
+
+
+# ---------------------------------------------------------------------------
+# Exit rules: fn(bars, params) -> (rule, warm-up index)
+# rule(start, entry_price) -> (exit signal index or None, exit reason)
+# ---------------------------------------------------------------------------
+
+
+def _atr_exit(bars: Bars, p: Dict[str, Any]):
+    atr = bars.indicator("atr", "atr", period=p["x_atr_period"])
+    stop_hit = bars.close < bars.high - atr * p["x_sl_multiplier"]
+    n = len(bars)
+
+    def rule(start: int, entry_price: float):
+        take_profit = entry_price + entry_price * p["x_tp_multiplier"]
+        for lo, hi in _chunks(start, n):
+            sl = stop_hit[lo:hi]
+            tp = bars.close[lo:hi] > take_profit
+            hits = np.flatnonzero(sl | tp)
+            if len(hits):
+                i = int(hits[0])
+                return lo + i, "stop_loss" if sl[i] else "take_profit"
+        return None, None
+
+    return rule, _first_valid(atr)
+
+
+def _fixed_ratio_exit(bars: Bars, p: Dict[str, Any]):
+    n = len(bars)
+
+    def rule(start: int, entry_price: float):
+        for lo, hi in _chunks(start, n):
+            ratio = (bars.close[lo:hi] - entry_price) / entry_price
+            tp = ratio >= p["x_take_profit"]
+            hits = np.flatnonzero(tp | (ratio <= -p["x_stop_loss"]))
+            if len(hits):
+                i = int(hits[0])
+                return lo + i, "take_profit" if tp[i] else "stop_loss"
+        return None, None
+
+    return rule, 0
+
+
+def _ma_crossover_exit(bars: Bars, p: Dict[str, Any]):
+    # Mirrors MACrossoverExitMixin, which compares moving averages of volume
+    fast = bars.indicator("sma", "sma", period=p["x_fast_period"], source="volume")
+    slow = bars.indicator("sma", "sma", period=p["x_slow_period"], source="volume")
+    crossed = np.zeros(len(bars), dtype=bool)
+    crossed[1:] = (fast[:-1] > slow[:-1]) & (fast[1:] < slow[1:])
+    reason = f"{str(p.get('x_ma_type', 'sma')).lower()}_crossover"
+
+    def rule(start: int, entry_price: float):
+        return _first_true_from(crossed, start, len(bars)), reason
+
+    return rule, _first_valid(fast, slow)
+
+
+def _rsi_bb_exit(bars: Bars, p: Dict[str, Any]):
+    rsi = bars.indicator("rsi", "rsi", period=p["x_rsi_period"])
+    top = bars.indicator("bollinger_bands", "top", period=p["x_bb_period"], devfactor=p["x_bb_dev"])
+    if p.get("x_use_bb_touch", True):
+        bb_hit = bars.close >= top * 0.99
+    else:
+        bb_hit = bars.close >= top
+    condition = (rsi >= p["x_rsi_overbought"]) | bb_hit
+
+    def rule(start: int, entry_price: float):
+        return _first_true_from(condition, start, len(bars)), "rsi_bb_overbought"
+
+    return rule, _first_valid(rsi, top)
+
+
+def _time_based_exit(bars: Bars, p: Dict[str, Any]):
+    n = len(bars)
+    use_time = p.get("x_use_time", False)
+    max_ns = int(p["x_max_minutes"]) * 60 * 1_000_000_000
+
+    def rule(start: int, entry_price: float):
+        if use_time:
+            target = bars.timestamps[start] + max_ns
+            idx = int(np.searchsorted(bars.timestamps, target, side="left"))
+            return (idx if idx < n else None), "time_limit_minutes"
+        idx = start + int(p["x_max_bars"])
+        return (idx if idx < n else None), "time_limit_bars"
+
+    return rule, 0
+
+
+def _trailing_stop_exit(bars: Bars, p: Dict[str, Any]):
+    # TrailingStopExitMixin always builds its ATR, so it counts towards the warm-up
+    atr = bars.indicator("atr", "atr", period=p["x_atr_period"])
+    use_atr = p.get("x_use_atr", False)
+    activation = p.get("x_activation_pct", 0.0)
+    n = len(bars)
+
+    def rule(start: int, entry_price: float):
+        highest = -np.inf
+        for lo, hi in _chunks(start, n):
+            close = bars.close[lo:hi]
+            running_high = np.maximum(np.maximum.accumulate(close), highest)
+            highest = running_high[-1]
+            if use_atr:
+                stop = running_high - atr[lo:hi] * p["x_atr_multiplier"]
+            else:
+                stop = running_high * (1 - p["x_trail_pct"])
+            hit = close < stop
+            if activation > 0:
+                hit &= (close - entry_price) / entry_price >= activation
+            hits = np.flatnonzero(hit)
+            if len(hits):
+                return lo + int(hits[0]), "trailing_stop"
+        return None, None
+
+    return rule, _first_valid(atr)
+
+
+EXIT_RULE_REGISTRY: Dict[str, Callable] = {
+    "ATRExitMixin": _atr_exit,
+    "FixedRatioExitMixin": _fixed_ratio_exit,
+    "MACrossoverExitMixin": _ma_crossover_exit,
+    "RSIBBExitMixin": _rsi_bb_exit,
+    "TimeBasedExitMixin": _time_based_exit,
+    "TrailingStopExitMixin": _trailing_stop_exit,
+}
+
+
+def _with_defaults(registry: Dict[str, Any], name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(registry[name].get_default_params()) if name in registry else {}
+    merged.update(params or {})
+    return merged
+
+
+class VectorizedBacktester:
+    """
+    Vectorized backtest engine for a single OHLCV dataset.
+
+    Parameters:
+    -----------
+    data : pandas.DataFrame
+        OHLCV data indexed by datetime
+    initial_capital : float
+        Starting cash
+    commission : float
+        Commission rate applied to the value of each fill
+    position_size : float
+        Fraction of available cash used for each entry
+    name : str
+        Symbol name recorded in the trades
+    close_at_end : bool
+        Close a position still open at the end of the data at the last close (trade with
+        exit reason "end_of_data") instead of leaving it out of the trades
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        initial_capital: float = 1000.0,
+        commission: float = 0.001,
+        position_size: float = 0.10,
+        name: str = "UNKNOWN",
+        close_at_end: bool = False,
+    ):
+        self.bars = data if isinstance(data, Bars) else Bars(data, name=name)
+        self.initial_capital = float(initial_capital)
+        self.commission = float(commission)
+        self.position_size = float(position_size)
+        self.close_at_end = close_at_end
+
+    @staticmethod
+    def supports(entry_name: str, exit_name: str) -> bool:
+        """Whether both mixins have a vectorized implementation"""
+        return entry_name in ENTRY_SIGNAL_REGISTRY and exit_name in EXIT_RULE_REGISTRY
+
+    def run(self, strategy_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the backtest for a strategy configuration
+
+        Args:
+            strategy_params: Same structure CustomStrategy receives as strategy_config
+                (entry_logic/exit_logic with name and params)
+
+        Returns:
+            dict: total_profit, total_profit_with_commission, total_commission,
+                  analyzers, trades and the equity curve array
+        """
+        entry_name, exit_name, entry_params, exit_params = self._resolve(strategy_params)
+        signal, entry_warmup = ENTRY_SIGNAL_REGISTRY[entry_name](self.bars, entry_params)
+        exit_rule, exit_warmup = EXIT_RULE_REGISTRY[exit_name](self.bars, exit_params)
+        start = max(entry_warmup, exit_warmup)
+
+        trades, equity = self._simulate(signal, exit_rule, start)
+        return self._build_output(trades, equity)
+
+    def run_batch(self, strategy_params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run the backtest for many strategy configurations over the same bars
+
+        All configurations are validated first. Indicators are shared through the indicator
+        cache, so each distinct indicator parameter value of the batch is computed once;
+        positions are then simulated per configuration.
+
+        Args:
+            strategy_params_list: Strategy configurations as accepted by ``run``
+
+        Returns:
+            list: One ``run`` result per configuration, in input order
+        """
+        for strategy_params in strategy_params_list:
+            self._resolve(strategy_params)
+        return [self.run(strategy_params) for strategy_params in strategy_params_list]
+
+    def _resolve(self, strategy_params: Dict[str, Any]):
+        entry_name = strategy_params["entry_logic"]["name"]
+        exit_name = strategy_params["exit_logic"]["name"]
+        if not self.supports(entry_name, exit_name):
+            raise ValueError(
+                f"No vectorized implementation for {entry_name} + {exit_name}"
+            )
+
+        entry_params = _with_defaults(
+            ENTRY_MIXIN_REGISTRY, entry_name, strategy_params["entry_logic"].get("params")
+        )
+        exit_params = _with_defaults(
+            EXIT_MIXIN_REGISTRY, exit_name, strategy_params["exit_logic"].get("params")
+        )
+        return entry_name, exit_name, entry_params, exit_params
+
+    def _simulate(self, signal: np.ndarray, exit_rule: Callable, start: int):
+        bars = self.bars
+        n = len(bars)
+        entries = np.flatnonzero(signal)
+        cash = self.initial_capital
+        cash_delta = np.zeros(n)
+        size_delta = np.zeros(n)
+        trades: List[Dict[str, Any]] = []
+
+        # Last bar whose signal is traded; with close_at_end the bar before the last one
+        # places the closing order instead
+        last_signal = n - 3 if self.close_at_end else n - 2
+        i = start
+        while True:
+            k = int(np.searchsorted(entries, i, side="left"))
+            if k >= len(entries) or entries[k] > last_signal:
+                break
+            signal_bar = int(entries[k])
+            fill_bar = signal_bar + 1
+            size = (cash * self.position_size) / bars.close[signal_bar]
+            if size <= 0:
+                break
+
+            entry_price = bars.open[fill_bar]
+            entry_value = entry_price * size
+            entry_comm = entry_value * self.commission
+
+            exit_signal, reason = exit_rule(fill_bar, entry_price)
+            if exit_signal is not None and exit_signal <= last_signal:
+                exit_bar = exit_signal + 1
+                exit_price = bars.open[exit_bar]
+            elif self.close_at_end:
+                # Marked to market: closed at the last close
+                exit_bar = n - 1
+                exit_price = bars.close[exit_bar]
+                reason = "end_of_data"
+            else:
+                # Position still open at the end of the data, like an unclosed Cerebro trade
+                cash_delta[fill_bar] -= entry_value + entry_comm
+                size_delta[fill_bar] += size
+                break
+
+            exit_value = exit_price * size
+            exit_comm = exit_value * self.commission
+            commission = entry_comm + exit_comm
+            gross_pnl = exit_value - entry_value
+            net_pnl = gross_pnl - commission
+
+            cash_delta[fill_bar] -= entry_value + entry_comm
+            cash_delta[exit_bar] += exit_value - exit_comm
+            size_delta[fill_bar] += size
+            size_delta[exit_bar] -= size
+            cash += net_pnl
+
+            entry_time = bars.datetime[fill_bar].to_pydatetime()
+            exit_time = bars.datetime[exit_bar].to_pydatetime()
+            trades.append(
+                {
+                    "entry_time": entry_time,
+                    "entry_price": entry_price,
+                    "entry_value": entry_value,
+                    "size": size,
+                    "symbol": bars.name,
+                    "commission": commission,
+                    "exit_time": exit_time,
+                    "exit_price": exit_price,
+                    "exit_value": exit_value,
+                    "exit_reason": reason or "unknown",
+                    "duration_minutes": (exit_time - entry_time).total_seconds() / 60,
+                    "gross_pnl": gross_pnl,
+                    "net_pnl": net_pnl,
+                    "pnl_percentage": (net_pnl / entry_value) * 100 if entry_value != 0 else 0,
+                    "trade_type": "long",
+                    "status": "closed",
+                }
+            )
+            i = exit_bar
+
+        equity = self.initial_capital + np.cumsum(cash_delta) + np.cumsum(size_delta) * bars.close
+        return trades, equity
+
+    def _build_output(self, trades: List[Dict[str, Any]], equity: np.ndarray) -> Dict[str, Any]:
+        gross = np.array([t["gross_pnl"] for t in trades], dtype=np.float64)
+        net = np.array([t["net_pnl"] for t in trades], dtype=np.float64)
+        gross_profit = float(gross.sum())
+        net_profit = float(net.sum())
+
+        wins = gross[gross > 0]
+        losses = np.abs(gross[gross <= 0])
+        won = len(wins)
+        closed = len(trades)
+
+        # Longest winning/losing streaks
+        max_wins = max_losses = 0
+        if closed:
+            is_win = gross > 0
+            change = np.flatnonzero(np.diff(is_win.astype(np.int8))) + 1
+            bounds = np.r_[0, change, closed]
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                if is_win[lo]:
+                    max_wins = max(max_wins, int(hi - lo))
+                else:
+                    max_losses = max(max_losses, int(hi - lo))
+
+        peak = np.maximum.accumulate(equity) if len(equity) else equity
+        moneydown = peak - equity
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, moneydown / peak * 100.0, 0.0)
+        final_value = float(equity[-1]) if len(equity) else self.initial_capital
+
+        analyzers = {
+            "trades": {
+                "total": {"total": closed, "open": 0, "closed": closed},
+                "won": {"total": won},
+                "lost": {"total": closed - won},
+                "pnl": {
+                    "gross": {
+                        "total": gross_profit,
+                        "average": gross_profit / closed if closed else 0.0,
+                    },
+                    "net": {
+                        "total": net_profit,
+                        "average": net_profit / closed if closed else 0.0,
+                    },
+                },
+            },
+            "drawdown": {
+                "max": {
+                    "drawdown": float(drawdown.max()) if len(drawdown) else 0.0,
+                    "moneydown": float(moneydown.max()) if len(moneydown) else 0.0,
+                }
+            },
+            "returns": {
+                "rtot": float(np.log(final_value / self.initial_capital))
+                if final_value > 0
+                else float("-inf")
+            },
+            "profit_factor": {
+                "profit_factor": float(wins.sum() / losses.sum())
+                if losses.sum() != 0
+                else float("inf")
+            },
+            "winrate": {
+                "win_rate": won / closed * 100 if closed else 0.0,
+                "avg_win": float(wins.mean()) if won else 0.0,
+                "avg_loss": float(losses.mean()) if len(losses) else 0.0,
+            },
+            "consecutivewinslosses": {
+                "max_consecutive_wins": max_wins,
+                "max_consecutive_losses": max_losses,
+            },
+        }
+
+        return {
+            "total_profit": gross_profit,
+            "total_profit_with_commission": net_profit,
+            "total_commission": gross_profit - net_profit,
+            "analyzers": analyzers,
+            "trades": trades,
+            "equity_curve": equity,
+        }
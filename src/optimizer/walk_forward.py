@@ -0,0 +1,277 @@
+"""
+Walk-Forward Module
+------------------
+
+This module implements walk-forward validation for an entry/exit mixin combination. The
+cached dataset is cut into rolling (or anchored) train/test windows; each train window is
+optimized with Optuna and the best parameters are then traded on the following, unseen
+test window. The out-of-sample results of all test windows are stitched into one trade
+list and one equity curve, with every test window starting from the equity the previous
+one ended with. A position still open at the end of a test window is closed at the
+window's last close, so its PnL is part of the out-of-sample equity.
+
+Windows are zero-copy views of the cached dataset (``OHLCVDataset.window``). Indicators
+are computed once on the full history and sliced for each window (vectorized engine, and
+the Backtrader engine with the indicator cache), so overlapping windows reuse the same
+arrays and indicators are warmed up at the first bar of every window. Each window's study
+is warm-started with the best trials of the previous window, and studies are persisted
+like regular optimizer studies when ``study_storage`` is configured.
+
+Main Features:
+- Rolling or anchored train windows with configurable train/test/step periods
+- Warm start of each window's study from the previous window's best trials
+- Indicator arrays shared between overlapping windows
+- Stitched out-of-sample trade list and equity curve
+
+Classes:
+- WalkForwardWindow: Bar positions and dates of one train/test window
+- WalkForwardOptimizer: Run the walk-forward optimization for one combination
+
+Functions:
+- make_windows: Cut a datetime index into train/test windows
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import optuna
+import pandas as pd
+from optuna.trial import TrialState
+from src.data.dataset_cache import OHLCVDataset
+from src.notification.logger import setup_logger
+from src.optimizer.custom_optimizer import CustomOptimizer
+from src.optimizer.study_storage import load_or_create_study, run_study
+
+_logger = setup_logger(__name__)
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Bar positions [start, stop) of one train window and the test window after it"""
+
+    number: int
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+    def to_dict(self, index: pd.DatetimeIndex) -> Dict[str, Any]:
+        return {
+            "window": self.number,
+            "train_start": index[self.train_start].isoformat(),
+            "train_end": index[self.train_stop - 1].isoformat(),
+            "test_start": index[self.test_start].isoformat(),
+            "test_end": index[self.test_stop - 1].isoformat(),
+        }
+
+
+def make_windows(
+    index: pd.DatetimeIndex,
+    train_period: str,
+    test_period: str,
+    step_period: Optional[str] = None,
+    anchored: bool = False,
+) -> List[WalkForwardWindow]:
+    """
+    Cut a datetime index into consecutive train/test windows
+
+    Args:
+        index: Sorted bar timestamps
+        train_period: Length of a train window as a pandas offset (e.g. "365D")
+        test_period: Length of a test window (e.g. "90D")
+        step_period: Shift between windows (default: test_period, non-overlapping tests)
+        anchored: Keep every train window starting at the first bar (expanding window)
+
+    Returns:
+        list: Windows whose test window has at least one bar
+    """
+    train = pd.Timedelta(train_period)
+    test = pd.Timedelta(test_period)
+    step = pd.Timedelta(step_period) if step_period else test
+    if train <= pd.Timedelta(0) or test <= pd.Timedelta(0) or step <= pd.Timedelta(0):
+        raise ValueError("Walk-forward periods must be positive")
+
+    windows = []
+    first = index[0]
+    start = first
+    while True:
+        train_start = first if anchored else start
+        test_start = start + train
+        test_end = test_start + test
+        i0, i1, i2 = index.searchsorted([train_start, test_start, test_end])
+        if i1 >= len(index):
+            break
+        if i1 > i0:
+            windows.append(WalkForwardWindow(len(windows), int(i0), int(i1), int(i1), int(i2)))
+        start += step
+    return windows
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward optimization of one entry/exit combination.
+
+    Parameters:
+    -----------
+    dataset : OHLCVDataset
+        Full cached dataset
+    entry_logic : dict
+        Entry mixin config (name and parameter space)
+    exit_logic : dict
+        Exit mixin config (name and parameter space)
+    optimizer_settings : dict
+        optimizer_settings section of optimizer.json; uses the wf_* settings, n_trials,
+        n_jobs, initial_capital and the usual engine/cache settings. ``wf_seed`` seeds the
+        TPE sampler of each window's study (window number added) for reproducible runs
+    name : str
+        Symbol name of the data feeds
+    study_label : str
+        Prefix of the per-window study names (usually the data file name)
+    """
+
+    def __init__(
+        self,
+        dataset: OHLCVDataset,
+        entry_logic: Dict[str, Any],
+        exit_logic: Dict[str, Any],
+        optimizer_settings: Dict[str, Any],
+        name: str = "UNKNOWN",
+        study_label: str = "",
+    ):
+        self.dataset = dataset
+        self.entry_logic = entry_logic
+        self.exit_logic = exit_logic
+        self.optimizer_settings = optimizer_settings
+        self.name = name
+        self.study_label = study_label or os.path.basename(dataset.path)
+        self.initial_capital = optimizer_settings.get("initial_capital", 1000.0)
+        self.warm_start_trials = optimizer_settings.get("wf_warm_start_trials", 5)
+        self.seed: Optional[int] = optimizer_settings.get("wf_seed")
+        self.windows = make_windows(
+            dataset.index,
+            optimizer_settings.get("wf_train_period", "365D"),
+            optimizer_settings.get("wf_test_period", "90D"),
+            optimizer_settings.get("wf_step_period"),
+            optimizer_settings.get("wf_anchored", False),
+        )
+
+    def _optimizer(self, window: OHLCVDataset, settings: Dict[str, Any]) -> CustomOptimizer:
+        return CustomOptimizer(
+            {
+                "data": window.feed(name=self.name),
+                "entry_logic": self.entry_logic,
+                "exit_logic": self.exit_logic,
+                "optimizer_settings": settings,
+            }
+        )
+
+    def _sampler(self, window: WalkForwardWindow) -> Optional[optuna.samplers.BaseSampler]:
+        """Seeded TPE sampler of a window's study, None (Optuna's default) without ``wf_seed``"""
+        if self.seed is None:
+            return None
+        return optuna.samplers.TPESampler(seed=self.seed + window.number)
+
+    def optimize_window(self, window: WalkForwardWindow, warm_start: List[Dict[str, Any]]) -> optuna.Study:
+        """Optimize the train part of a window, enqueueing the warm start parameters first"""
+        train = self.dataset.window(window.train_start, window.train_stop)
+        label = f"{self.study_label}@{train.index[0].isoformat()}/{train.index[-1].isoformat()}"
+        study = load_or_create_study(
+            label,
+            self.entry_logic,
+            self.exit_logic,
+            self.optimizer_settings,
+            pruner=CustomOptimizer.create_pruner(self.optimizer_settings),
+            sampler=self._sampler(window),
+        )
+        for params in warm_start:
+            study.enqueue_trial(params, skip_if_exists=True)
+
+        def objective(trial):
+            # New feed per trial (feeds are stateful); the window arrays are shared
+            _, _, result = self._optimizer(train, self.optimizer_settings).run_optimization(trial)
+            return result["total_profit_with_commission"]
+
+        run_study(
+            study,
+            objective,
+            n_trials=self.optimizer_settings.get("n_trials", 100),
+            n_jobs=self.optimizer_settings.get("n_jobs", 1),
+        )
+        return study
+
+    def best_params(self, study: optuna.Study, limit: int) -> List[Dict[str, Any]]:
+        """Parameters of the best completed trials, best first"""
+        trials = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+        trials = sorted(trials, key=lambda t: t.value, reverse=True)[:limit]
+        return [dict(t.params) for t in trials]
+
+    def test_window(self, window: WalkForwardWindow, params: Dict[str, Any], capital: float) -> Dict[str, Any]:
+        """
+        Trade the test part of a window with fixed parameters, starting with ``capital``
+
+        A position open at the end of the window is closed at its last close.
+        """
+        test = self.dataset.window(window.test_start, window.test_stop)
+        # Memoized results carry no trade list, which the stitched result needs
+        settings = dict(
+            self.optimizer_settings, initial_capital=capital, trial_cache=False, close_open_positions=True
+        )
+        return self._optimizer(test, settings).run_batch([params])[0]
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all windows
+
+        Returns:
+            dict: Per-window summaries, stitched out-of-sample trades and equity curve and
+                  the total out-of-sample profit
+        """
+        if not self.windows:
+            raise ValueError(f"Not enough data in {self.study_label} for a single walk-forward window")
+
+        capital = self.initial_capital
+        equity_curve = [{"time": self.dataset.index[self.windows[0].test_start].isoformat(), "equity": capital}]
+        trades: List[Dict[str, Any]] = []
+        summaries = []
+        warm_start: List[Dict[str, Any]] = []
+
+        for window in self.windows:
+            study = self.optimize_window(window, warm_start)
+            best = study.best_trial
+            result = self.test_window(window, best.params, capital)
+
+            window_trades = sorted(result["trades"], key=lambda t: t["exit_time"])
+            for trade in window_trades:
+                capital += trade["net_pnl"]
+                trades.append({**trade, "window": window.number})
+                equity_curve.append({"time": pd.Timestamp(trade["exit_time"]).isoformat(), "equity": capital})
+
+            summary = window.to_dict(self.dataset.index)
+            summary.update(
+                {
+                    "best_params": best.params,
+                    "train_profit": best.value,
+                    "test_profit": result["total_profit_with_commission"],
+                    "test_trades": len(window_trades),
+                    "warm_start_trials": len(warm_start),
+                    "equity": capital,
+                }
+            )
+            summaries.append(summary)
+            _logger.info(
+                f"Walk-forward window {window.number + 1}/{len(self.windows)}: "
+                f"train profit {best.value:.2f}, test profit {result['total_profit_with_commission']:.2f}"
+            )
+            warm_start = self.best_params(study, self.warm_start_trials)
+
+        return {
+            "entry_logic": self.entry_logic["name"],
+            "exit_logic": self.exit_logic["name"],
+            "initial_capital": self.initial_capital,
+            "final_equity": capital,
+            "total_profit_with_commission": capital - self.initial_capital,
+            "windows": summaries,
+            "trades": trades,
+            "equity_curve": equity_curve,
+        }
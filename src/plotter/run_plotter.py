@@ -4,12 +4,13 @@ Run Plotter Module
 This module provides functionality to create plots from optimization results.
 It handles:
 1. Reading JSON files from results folder
-2. Loading corresponding data files
+2. Loading the corresponding data from the market data store
 3. Creating plots with indicators and trades
 4. Saving plots as PNG files
 
 Features:
 - Dynamic indicator selection based on strategy mixins
+- Indicator values from the shared indicator service (same formulas as the strategies, cached)
 - Configurable subplot layout
 - Trade visualization with buy/sell markers
 - Equity curve calculation from trades
@@ -29,6 +30,8 @@ import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from src.data.market_data_store import get_market_data_store, parse_data_key
+from src.indicator.indicator_service import compute_indicator, indicator_series
 from src.notification.logger import setup_logger
 from src.plotter.indicators.bollinger_bands_plotter import \
     BollingerBandsPlotter
@@ -91,27 +94,16 @@ class ResultPlotter:
             return {}
 
     def load_price_data(self, data_file: str) -> pd.DataFrame:
-        """Load price data from CSV file"""
+        """Load price data of a data key (symbol_interval_start_end) from the market data store"""
         try:
-            csv_path = os.path.join("data", data_file)
-            df = pd.read_csv(csv_path)
-
-            # Convert timestamp to datetime
-            df["datetime"] = pd.to_datetime(df["timestamp"], utc=True)
-            df = df.sort_values("datetime", ascending=True)
-            df.set_index("datetime", inplace=True)
-
-            # Select OHLCV columns
-            df = df[["open", "high", "low", "close", "volume"]]
-
-            # Convert to numeric
-            for col in ["open", "high", "low", "close", "volume"]:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+            symbol, interval, start, end = parse_data_key(data_file)
+            store = get_market_data_store()
+            df = store.read(store.key_source(data_file), symbol, interval, start, end)
 
             df.ffill(inplace=True)
             df.bfill(inplace=True)
 
-            _logger.debug(f"Loaded price data from {csv_path}")
+            _logger.debug(f"Loaded price data for {data_file}")
             return df
 
         except Exception as e:
@@ -170,15 +162,13 @@ class ResultPlotter:
             try:
                 if indicator == "rsi":
                     period = self._get_param_value(strategy_params, "rsi_period", 14)
-                    calculated_indicators["rsi"] = self._calculate_rsi(
-                        df["close"], period
-                    )
+                    calculated_indicators["rsi"] = self._calculate_rsi(df, period)
 
                 elif indicator == "bollinger_bands":
                     period = self._get_param_value(strategy_params, "bb_period", 20)
                     std_dev = self._get_param_value(strategy_params, "bb_std", 2)
                     calculated_indicators["bollinger_bands"] = (
-                        self._calculate_bollinger_bands(df["close"], period, std_dev)
+                        self._calculate_bollinger_bands(df, period, std_dev)
                     )
 
                 elif indicator == "ichimoku":
@@ -234,24 +224,18 @@ class ResultPlotter:
 
         return default
 
-    def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
+    def _calculate_rsi(self, df: pd.DataFrame, period: int) -> pd.Series:
         """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return indicator_series(df, "rsi", period=int(period))
 
     def _calculate_bollinger_bands(
-        self, prices: pd.Series, period: int, std_dev: float
+        self, df: pd.DataFrame, period: int, std_dev: float
     ) -> Dict:
         """Calculate Bollinger Bands"""
-        sma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper_band = sma + (std * std_dev)
-        lower_band = sma - (std * std_dev)
-        return {"upper": upper_band, "middle": sma, "lower": lower_band}
+        lines = compute_indicator(
+            df, "bollinger_bands", period=int(period), devfactor=float(std_dev)
+        )
+        return {"upper": lines["top"], "middle": lines["mid"], "lower": lines["bot"]}
 
     def _calculate_ichimoku(
         self,
@@ -261,89 +245,33 @@ class ResultPlotter:
         senkou_span_b_period: int,
     ) -> Dict:
         """Calculate Ichimoku Cloud indicators"""
-        high = df["high"]
-        low = df["low"]
-
-        tenkan = (
-            high.rolling(window=tenkan_period).max()
-            + low.rolling(window=tenkan_period).min()
-        ) / 2
-        kijun = (
-            high.rolling(window=kijun_period).max()
-            + low.rolling(window=kijun_period).min()
-        ) / 2
-        senkou_span_a = ((tenkan + kijun) / 2).shift(kijun_period)
-        senkou_span_b = (
-            (
-                high.rolling(window=senkou_span_b_period).max()
-                + low.rolling(window=senkou_span_b_period).min()
-            )
-            / 2
-        ).shift(kijun_period)
-
+        lines = compute_indicator(
+            df,
+            "ichimoku",
+            tenkan=int(tenkan_period),
+            kijun=int(kijun_period),
+            senkou=int(senkou_span_b_period),
+            senkou_lead=int(kijun_period),
+            chikou=int(kijun_period),
+        )
         return {
-            "tenkan": tenkan,
-            "kijun": kijun,
-            "senkou_span_a": senkou_span_a,
-            "senkou_span_b": senkou_span_b,
+            "tenkan": lines["tenkan_sen"],
+            "kijun": lines["kijun_sen"],
+            "senkou_span_a": lines["senkou_span_a"],
+            "senkou_span_b": lines["senkou_span_b"],
         }
 
     def _calculate_supertrend(
         self, df: pd.DataFrame, period: int, multiplier: float
     ) -> pd.Series:
         """Calculate SuperTrend indicator"""
-        high = df["high"]
-        low = df["low"]
-        close = df["close"]
-
-        # Calculate ATR
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-
-        # Calculate SuperTrend
-        hl2 = (high + low) / 2
-        upper_band = hl2 + (multiplier * atr)
-        lower_band = hl2 - (multiplier * atr)
-
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int)
-
-        for i in range(1, len(df)):
-            if close.iloc[i] > upper_band.iloc[i - 1]:
-                direction.iloc[i] = 1
-            elif close.iloc[i] < lower_band.iloc[i - 1]:
-                direction.iloc[i] = -1
-            else:
-                direction.iloc[i] = direction.iloc[i - 1]
-
-            if direction.iloc[i] == 1 and lower_band.iloc[i] < lower_band.iloc[i - 1]:
-                lower_band.iloc[i] = lower_band.iloc[i - 1]
-            if direction.iloc[i] == -1 and upper_band.iloc[i] > upper_band.iloc[i - 1]:
-                upper_band.iloc[i] = upper_band.iloc[i - 1]
-
-            if direction.iloc[i] == 1:
-                supertrend.iloc[i] = lower_band.iloc[i]
-            else:
-                supertrend.iloc[i] = upper_band.iloc[i]
-
-        return supertrend
+        return indicator_series(
+            df, "supertrend", period=int(period), multiplier=float(multiplier)
+        )
 
     def _calculate_atr(self, df: pd.DataFrame, period: int) -> pd.Series:
         """Calculate Average True Range"""
-        high = df["high"]
-        low = df["low"]
-        close = df["close"]
-
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-
-        return atr
+        return indicator_series(df, "atr", period=int(period))
 
     def calculate_equity_curve(
         self, trades: List[Dict], initial_capital: float = 1000.0
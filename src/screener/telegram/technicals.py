@@ -1,5 +1,5 @@
-import numpy as np
 import yfinance as yf
+from src.indicator.indicator_service import compute_indicator, indicator_series, ohlcv_frame
 from src.notification.logger import setup_logger
 
 logger = setup_logger("telegram_bot")
@@ -17,34 +17,30 @@ def calculate_technicals(ticker: str) -> dict:
 
         df.dropna(inplace=True)
 
-        # SMA
-        df["SMA_50"] = df["Close"].rolling(window=50).mean()
-        df["SMA_200"] = df["Close"].rolling(window=200).mean()
+        # Indicators from the shared indicator service (cached by data content)
+        close = ohlcv_frame(df)["close"]
+        df["SMA_50"] = indicator_series(df, "sma", period=50)
+        df["SMA_200"] = indicator_series(df, "sma", period=200)
 
         # Bollinger Bands
         bb_period = 20
         bb_std = 2
-        df["BB_Middle"] = df["Close"].rolling(window=bb_period).mean()
-        df["BB_Std"] = df["Close"].rolling(window=bb_period).std()
-        df["BB_Upper"] = df["BB_Middle"] + (df["BB_Std"] * bb_std)
-        df["BB_Lower"] = df["BB_Middle"] - (df["BB_Std"] * bb_std)
-        df["BB_Width"] = (df["BB_Upper"] - df["BB_Lower"]) / df["BB_Middle"]
+        bb = compute_indicator(df, "bollinger_bands", period=bb_period, devfactor=bb_std)
+        df["BB_Middle"] = bb["mid"]
+        df["BB_Upper"] = bb["top"]
+        df["BB_Lower"] = bb["bot"]
+        df["BB_Width"] = (bb["top"] - bb["bot"]) / bb["mid"]
 
         # RSI (14)
-        delta = df["Close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["RSI"] = 100 - (100 / (1 + rs))
+        df["RSI"] = indicator_series(df, "rsi", period=14)
 
         # MACD
-        exp1 = df["Close"].ewm(span=12, adjust=False).mean()
-        exp2 = df["Close"].ewm(span=26, adjust=False).mean()
-        df["MACD"] = exp1 - exp2
-        df["Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
+        macd = compute_indicator(df, "macd", fast=12, slow=26, signal=9)
+        df["MACD"] = macd["macd"]
+        df["Signal"] = macd["signal"]
 
         # Get latest values
-        last_close = df["Close"].iloc[-1]
+        last_close = close.iloc[-1]
         sma50 = df["SMA_50"].iloc[-1]
         sma200 = df["SMA_200"].iloc[-1]
         rsi = df["RSI"].iloc[-1]
@@ -2,15 +2,16 @@ import datetime
 from typing import Any, Dict, Optional
 
 import pandas as pd
-import ta
 import yfinance as yf
+from src.indicator.indicator_service import compute_indicator, indicator_series
 
 
 class TickerAnalyzer:
     """
     Analyzes a ticker symbol and provides fundamental and technical analysis.
 
-    This class uses yfinance to download stock data and ta to calculate technical indicators.
+    This class uses yfinance to download stock data and the shared indicator service
+    (src.indicator.indicator_service) to calculate technical indicators.
     """
 
     def analyze_ticker(ticker_symbol):
@@ -52,13 +53,13 @@ class TickerAnalyzer:
 
             # Clean and add indicators
             df = df.dropna()
-            df["RSI"] = ta.momentum.RSIIndicator(df["Close"]).rsi()
-            df["MACD"] = ta.trend.MACD(df["Close"]).macd()
-            df["SMA_20"] = ta.trend.SMAIndicator(df["Close"], window=20).sma_indicator()
-            df["EMA_20"] = ta.trend.EMAIndicator(df["Close"], window=20).ema_indicator()
-            bb = ta.volatility.BollingerBands(df["Close"])
-            df["BB_High"] = bb.bollinger_hband()
-            df["BB_Low"] = bb.bollinger_lband()
+            df["RSI"] = indicator_series(df, "rsi", period=14)
+            df["MACD"] = indicator_series(df, "macd", fast=12, slow=26, signal=9)
+            df["SMA_20"] = indicator_series(df, "sma", period=20)
+            df["EMA_20"] = indicator_series(df, "ema", period=20)
+            bb = compute_indicator(df, "bollinger_bands", period=20, devfactor=2.0)
+            df["BB_High"] = bb["top"]
+            df["BB_Low"] = bb["bot"]
 
             latest = df.iloc[-1]
             print(f"Latest Close: {latest['Close']:.2f}")
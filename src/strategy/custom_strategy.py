@@ -7,6 +7,8 @@ It provides:
 2. Position and trade tracking
 3. Equity curve tracking
 4. Performance metrics collection
+5. Optional intermediate objective reporting to an Optuna trial (for pruning)
+6. Optional timing of the mixin hooks, indicators and broker calls (see hook_profiler)
 """
 
 from typing import Any, Dict
@@ -19,6 +21,13 @@ from src.entry.entry_mixin_factory import (ENTRY_MIXIN_REGISTRY,
 from src.exit.exit_mixin_factory import (EXIT_MIXIN_REGISTRY, get_exit_mixin,
                                          get_exit_mixin_from_config)
 from src.notification.logger import setup_logger
+from src.strategy.hook_profiler import HookProfiler
+
+try:
+    from optuna import TrialPruned
+except ImportError:
+    # Optuna is only needed when the strategy reports to a trial
+    TrialPruned = None
 
 _logger = setup_logger(__name__)
 
@@ -35,11 +44,34 @@ class CustomStrategy(bt.Strategy):
         - exit_logic: Exit mixin configuration
         - position_size: Position size as fraction of capital (default: 0.1)
         - use_talib: Whether to use TA-Lib for indicator calculations
+    trial : optuna.trial.Trial, optional
+        Trial that receives intermediate objective values; a pruned trial stops the backtest
+        by raising optuna.TrialPruned
+    report_checkpoints : int
+        Number of evenly spaced bar checkpoints at which the trial is reported to (0 = off)
+    report_metric : str
+        Intermediate value to report: "net_pnl" (portfolio value minus starting cash) or
+        "drawdown" (negative maximum drawdown in percent so far)
+    indicator_cache : bool
+        Serve mixin indicators from the process-wide indicator cache (preloaded data only),
+        so trials sharing indicator parameters reuse the computed lines
+    profile_hooks : bool
+        Time every call of the mixin hooks, the indicators and the broker (see
+        hook_timings); off by default, in which case nothing is wrapped
+    close_at_end : bool
+        Close a position still open at the end of the (preloaded) data at the last close
+        (exit reason "end_of_data"), so its PnL is part of the recorded trades
     """
 
     params = (
         ("strategy_config", None),  # Strategy configuration
         ("position_size", 1.0),  # Default position size
+        ("trial", None),  # Optuna trial for intermediate reporting
+        ("report_checkpoints", 0),  # Number of reporting checkpoints (0 = disabled)
+        ("report_metric", "net_pnl"),  # "net_pnl" or "drawdown"
+        ("indicator_cache", False),  # Serve mixin indicators from the shared indicator cache
+        ("profile_hooks", False),  # Time mixin hooks, indicators and broker calls
+        ("close_at_end", False),  # Close an open position at the last close of the data
     )
 
     def __init__(self):
@@ -67,6 +99,17 @@ class CustomStrategy(bt.Strategy):
 
         self.trade = None
 
+        # Intermediate reporting state (see _report_progress)
+        self._report_interval = 0
+        self._next_report_bar = 0
+        self._report_step = 0
+        self._start_value = 0.0
+        self._peak_value = 0.0
+        self._max_drawdown = 0.0
+
+        # Hook timing (see _install_hook_profiler)
+        self.hook_profiler = None
+
         _logger.debug("CustomStrategy.__init__ completed")
 
     def start(self):
@@ -105,22 +148,74 @@ class CustomStrategy(bt.Strategy):
                     _logger.debug(
                         f"Exit mixin created with params: {self.exit_logic['params']}"
                     )
+
+            if self.p.trial is not None and self.p.report_checkpoints:
+                total_bars = self.data.buflen()
+                self._report_interval = max(1, -(-total_bars // int(self.p.report_checkpoints)))
+                self._next_report_bar = self._report_interval
+                self._start_value = self._peak_value = self.broker.getvalue()
+
+            if self.p.profile_hooks:
+                self._install_hook_profiler()
         except Exception as e:
             _logger.error(f"Error in start: {e}", exc_info=e)
             raise
 
+    def _install_hook_profiler(self):
+        """Wrap the mixin hooks, the indicators and the broker calls of this run with timers"""
+        profiler = HookProfiler()
+        for prefix, mixin, hooks in (
+            ("entry", self.entry_mixin, ("next", "should_enter", "notify_trade")),
+            ("exit", self.exit_mixin, ("next", "should_exit", "notify_trade")),
+        ):
+            if mixin is not None:
+                for hook in hooks:
+                    profiler.wrap(mixin, hook, f"{prefix}.{hook}")
+
+        # Registered indicators by name, any other strategy level indicator by class
+        names = {id(indicator): name for name, indicator in getattr(self, "indicators", {}).items()}
+        wrapped = set()
+        for indicator in list(getattr(self, "indicators", {}).values()) + list(self.getindicators()):
+            if id(indicator) in wrapped:
+                continue
+            wrapped.add(id(indicator))
+            name = f"indicator.{names.get(id(indicator), type(indicator).__name__)}"
+            profiler.wrap(indicator, "_next", name)
+            profiler.wrap(indicator, "_once", name)
+
+        profiler.wrap(self, "notify_trade", "strategy.notify_trade")
+        profiler.wrap(self, "buy", "broker.buy")
+        profiler.wrap(self, "sell", "broker.sell")
+        profiler.wrap(self.broker, "next", "broker.next")
+        self.hook_profiler = profiler
+
+    def hook_timings(self):
+        """Hook timings of the run (see HookProfiler.summary), None unless profile_hooks is set"""
+        return self.hook_profiler.summary() if self.hook_profiler is not None else None
+
     def prenext(self):
         """Skip bars until we have enough data"""
         pass
 
     def next(self):
         """Called for each bar"""
+        if self._report_interval:
+            self._report_progress()
+
         # Call mixins' next method to check for indicator reinitialization
         if self.entry_mixin:
             self.entry_mixin.next()
         if self.exit_mixin:
             self.exit_mixin.next()
 
+        if self.p.close_at_end and len(self.data) >= self.data.buflen() - 1:
+            # A Close order placed on the bar before the last one fills at the last close;
+            # no trade is opened that could not be closed anymore
+            if self.current_trade is not None and len(self.data) == self.data.buflen() - 1:
+                self.current_exit_reason = "end_of_data"
+                self.close(exectype=bt.Order.Close)
+            return
+
         # Check for entry signals
         if (
             self.current_trade is None
@@ -144,6 +239,28 @@ class CustomStrategy(bt.Strategy):
         ):
             self.sell(size=self.current_trade["size"])
 
+    def _report_progress(self):
+        """Report the running objective to the trial at checkpoints and stop if it is pruned"""
+        value = self.broker.getvalue()
+        if self.p.report_metric == "drawdown":
+            self._peak_value = max(self._peak_value, value)
+            if self._peak_value > 0:
+                self._max_drawdown = max(self._max_drawdown, (self._peak_value - value) / self._peak_value * 100.0)
+
+        if len(self.data) < self._next_report_bar:
+            return
+        self._next_report_bar += self._report_interval
+        self._report_step += 1
+
+        if self.p.report_metric == "drawdown":
+            intermediate = -self._max_drawdown
+        else:
+            intermediate = value - self._start_value
+        self.p.trial.report(intermediate, self._report_step)
+        if self.p.trial.should_prune():
+            _logger.debug(f"Trial {self.p.trial.number} pruned at checkpoint {self._report_step}")
+            raise TrialPruned()
+
     def notify_trade(self, trade):
         """Record trade information"""
         self.trade = trade
@@ -0,0 +1,60 @@
+"""
+Tests for optimizer analyzer profiles.
+
+- The "search" profile yields the same profit figures as the "full" profile
+- The "full" profile keeps all analyzers of the result JSON
+- Analyzer timing reports one entry per attached analyzer
+
+How to run:
+    pytest tests/test_analyzer_profiles.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer.analyzer_profiles import ANALYZER_PROFILES
+from src.optimizer.custom_optimizer import CustomOptimizer
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def run(settings, tmp_path, **kwargs):
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(1500) * 0.01))
+    df = pd.DataFrame(
+        {"open": close, "high": close * 1.004, "low": close * 0.996, "close": close, "volume": 1000.0},
+        index=pd.date_range("2023-01-01", periods=len(close), freq="h"),
+    )
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "FixedRatioExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    config = {
+        "data": bt.feeds.PandasData(dataname=df, name="TEST"),
+        "entry_logic": entry_logic,
+        "exit_logic": exit_logic,
+        "optimizer_settings": dict(settings, output_dir=str(tmp_path)),
+    }
+    return CustomOptimizer(config).run_optimization(**kwargs)[2]
+
+
+def test_search_profile_matches_full_profile(tmp_path):
+    search = run({}, tmp_path)
+    full = run({}, tmp_path, analyzer_profile="full")
+
+    assert set(search["analyzers"]) == {"pnl"}
+    assert set(full["analyzers"]) == set(ANALYZER_PROFILES["full"])
+    assert len(search["trades"]) == len(full["trades"]) > 0
+    for key in ["total_profit", "total_profit_with_commission", "total_commission"]:
+        assert search[key] == pytest.approx(full[key])
+
+
+def test_analyzer_timings(tmp_path):
+    result = run({"analyzer_profile": "full", "profile_analyzers": True}, tmp_path)
+    assert set(result["analyzer_timings"]) == set(ANALYZER_PROFILES["full"])
+    assert all(seconds > 0 for seconds in result["analyzer_timings"].values())
+    assert "analyzer_timings" not in run({}, tmp_path)
@@ -0,0 +1,127 @@
+"""
+Tests for array computed Backtrader indicators.
+
+- ArrayIndicator gives the same lines in runonce and next mode and honours the warm-up
+- Next mode updates the streaming counterpart per bar and never recomputes the arrays
+- SuperTrend matches the NumPy implementation used by the vectorized engine
+- The RSI wrapper matches Backtrader's RSI
+
+How to run:
+    pytest tests/test_array_indicator.py
+"""
+
+from collections import deque
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+from src.indicator import numpy_indicators as ni
+from src.indicator.array_indicator import ArrayIndicator
+from src.indicator.rsi import RSI
+from src.indicator.streaming_indicators import NAN, StreamingIndicator
+from src.indicator.super_trend import SuperTrend
+
+
+class StreamingRange(StreamingIndicator):
+    lines = ("range",)
+    inputs = ("high", "low")
+
+    def __init__(self, period):
+        super().__init__()
+        self.warmup = period
+        self._bars = deque(maxlen=period)
+
+    def _update(self, high, low):
+        self._bars.append((high, low))
+        if len(self._bars) < self.warmup:
+            return (NAN,)
+        return (max(bar[0] for bar in self._bars) - min(bar[1] for bar in self._bars),)
+
+
+class RollingRange(ArrayIndicator):
+    lines = ("range",)
+    params = (("period", 5),)
+    inputs = ("high", "low")
+    computations = 0
+
+    def __init__(self):
+        super().__init__()
+        self.addminperiod(self.p.period)
+
+    def compute(self, high, low):
+        RollingRange.computations += 1
+        return {"range": pd.Series(high).rolling(self.p.period).max().to_numpy() - pd.Series(low).rolling(self.p.period).min().to_numpy()}
+
+    def streaming(self):
+        return StreamingRange(self.p.period)
+
+
+class IndicatorStrategy(bt.Strategy):
+    def __init__(self):
+        self.ind = {
+            "range": RollingRange(self.data, period=7),
+            "supertrend": SuperTrend(self.data, period=10, multiplier=3.0),
+            "rsi": RSI(self.data, period=14),
+            "rsi_line": RSI(self.data.close, period=14),
+            "bt_rsi": bt.indicators.RSI(self.data.close, period=14),
+        }
+        self.first_bar = None
+
+    def next(self):
+        if self.first_bar is None:
+            self.first_bar = len(self)
+
+
+def make_df(length=600, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(length) * 0.01))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.005, "low": close * 0.995, "close": close, "volume": 1000.0},
+        index=pd.date_range("2023-01-01", periods=length, freq="h"),
+    )
+
+
+def run(df, runonce):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(IndicatorStrategy)
+    return cerebro.run(runonce=runonce, preload=True)[0]
+
+
+def values(indicator, line, n):
+    return np.array(getattr(indicator.lines, line).array[:n])
+
+
+def test_runonce_and_next_mode_agree():
+    df = make_df()
+    RollingRange.computations = 0
+    once = run(df, runonce=True)
+    assert RollingRange.computations == 1
+    stepped = run(df, runonce=False)
+    # Next mode only updates the streaming state
+    assert RollingRange.computations == 1
+    for key, lines in {"range": ["range"], "supertrend": ["super_trend", "direction", "upper_band", "lower_band"], "rsi": ["rsi"]}.items():
+        for line in lines:
+            np.testing.assert_array_equal(values(once.ind[key], line, len(df)), values(stepped.ind[key], line, len(df)))
+
+    expected = df["high"].rolling(7).max() - df["low"].rolling(7).min()
+    np.testing.assert_allclose(values(once.ind["range"], "range", len(df))[6:], expected.to_numpy()[6:])
+    # Warm-up of the slowest indicator (RSI/ATR need period + 1 bars)
+    assert once.first_bar == stepped.first_bar == 15
+
+
+def test_supertrend_matches_numpy_engine():
+    df = make_df()
+    strategy = run(df, runonce=True)
+    st, direction = ni.supertrend(df["high"], df["low"], df["close"], 10, 3.0)
+    np.testing.assert_array_equal(values(strategy.ind["supertrend"], "super_trend", len(df))[10:], st[10:])
+    np.testing.assert_array_equal(values(strategy.ind["supertrend"], "direction", len(df))[10:], direction[10:])
+    assert set(direction[10:]) == {1.0, -1.0}
+
+
+def test_rsi_matches_backtrader():
+    df = make_df()
+    strategy = run(df, runonce=True)
+    reference = values(strategy.ind["bt_rsi"], "rsi", len(df))[14:]
+    np.testing.assert_allclose(values(strategy.ind["rsi"], "rsi", len(df))[14:], reference, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(values(strategy.ind["rsi_line"], "rsi", len(df))[14:], reference, rtol=0, atol=1e-9)
@@ -0,0 +1,91 @@
+"""
+Tests for the live feed bar ring buffer.
+
+- Append, in-place update and wrap-around at capacity
+- Array views share the buffer memory, DataFrames are snapshots
+- A full buffer overwrites the oldest row of earlier views on the next append
+- Timezone of the input timestamps is preserved
+
+How to run:
+    pytest tests/test_bar_buffer.py
+"""
+
+import numpy as np
+import pandas as pd
+from src.data.bar_buffer import BarRingBuffer
+
+
+def make_bars(periods, start="2024-01-01", tz=None):
+    index = pd.date_range(start, periods=periods, freq="h", tz=tz)
+    close = np.arange(periods, dtype=float)
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10.0}, index=index
+    )
+
+
+def as_stored(bars):
+    """Bars with the buffer's datetime64[ns] index (pandas 3 infers other units)"""
+    return bars.set_axis(bars.index.as_unit("ns"))
+
+
+def test_append_update_and_wrap_around():
+    buffer = BarRingBuffer(capacity=5)
+    assert len(buffer) == 0 and buffer.last() is None and buffer.last_timestamp is None
+    assert buffer.extend(make_bars(3)) == 3
+    assert len(buffer) == 3
+
+    # The forming bar is updated in place
+    last = buffer.last_timestamp
+    assert buffer.append(last, 2, 9, 1, 8, 20) == "update"
+    assert buffer.last() == {"open": 2.0, "high": 9.0, "low": 1.0, "close": 8.0, "volume": 20.0}
+    assert len(buffer) == 3
+
+    # Beyond the capacity the oldest bars are dropped
+    bars = make_bars(12)
+    assert buffer.extend(bars) == 9
+    assert len(buffer) == 5
+    pd.testing.assert_frame_equal(buffer.frame(), as_stored(bars.iloc[-5:]), check_freq=False)
+
+    # Bars older than the buffer are ignored, buffered ones are updated
+    assert buffer.append(bars.index[0], 0, 0, 0, 0, 0) is None
+    assert buffer.append(bars.index[8], 1, 1, 1, 1, 1) == "update"
+    assert buffer.frame()["close"].iloc[1] == 1.0
+    assert list(pd.DatetimeIndex(buffer.timestamps())) == list(bars.index[-5:])
+
+
+def test_views_share_memory():
+    buffer = BarRingBuffer(capacity=4)
+    buffer.extend(make_bars(6))
+    values = buffer.values()
+    assert not np.shares_memory(values, buffer.frame().to_numpy())
+    arrays = buffer.arrays()
+    assert np.shares_memory(arrays["close"], values)
+    np.testing.assert_array_equal(arrays["close"], [2.0, 3.0, 4.0, 5.0])
+
+    buffer.append(buffer.last_timestamp, 0, 0, 0, 42, 0)
+    assert values[-1, 3] == 42
+
+
+def test_append_to_full_buffer_invalidates_views():
+    buffer = BarRingBuffer(capacity=4)
+    bars = make_bars(5)
+    buffer.extend(bars.iloc[:4])
+    values = buffer.values()
+    frame = buffer.frame()
+    np.testing.assert_array_equal(values[:, 3], [0.0, 1.0, 2.0, 3.0])
+
+    buffer.append(bars.index[4], *bars.iloc[4])
+    # The new bar is written over the oldest row of the earlier view
+    assert values[0, 3] == 4.0
+    # The DataFrame snapshot is unchanged and the new views hold the latest bars
+    pd.testing.assert_frame_equal(frame, as_stored(bars.iloc[:4]), check_freq=False)
+    np.testing.assert_array_equal(buffer.values()[:, 3], [1.0, 2.0, 3.0, 4.0])
+
+
+def test_timezone_is_preserved():
+    buffer = BarRingBuffer(capacity=10)
+    bars = make_bars(3, tz="America/New_York")
+    buffer.extend(bars)
+    assert buffer.last_timestamp == bars.index[-1]
+    assert str(buffer.frame().index.tz) == "America/New_York"
+    assert buffer.append(bars.index[-1] + pd.Timedelta(hours=1), 1, 1, 1, 1, 1) == "new"
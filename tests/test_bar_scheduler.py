@@ -0,0 +1,136 @@
+"""
+Tests for the bar close scheduler of polling live feeds.
+
+- Next bar close and current bar open on the UTC interval grid, on a bar anchor, for weeks and months
+- Feeds due at the same instant are polled in one batch per source
+- Feeds whose bar is late are retried, then wait for their next close
+
+Feeds are stand-ins recording their polls; the clock is injected.
+
+How to run:
+    pytest tests/test_bar_scheduler.py
+"""
+
+import pandas as pd
+from src.data.bar_scheduler import BarCloseScheduler, bar_open, next_bar_close
+
+
+def epoch(value):
+    return pd.Timestamp(value, tz="UTC").timestamp()
+
+
+class InlineExecutor:
+    """Runs submitted batches immediately"""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+class StubFeed:
+    """Polling feed recording the batches it was polled in"""
+
+    poll_source = "stub"
+    batches = []
+    new_bar = True
+
+    def __init__(self, symbol, interval):
+        self.symbol = symbol
+        self.interval = interval
+
+    def next_bar_close(self, now):
+        return next_bar_close(self.interval, now)
+
+    @classmethod
+    def poll_batch(cls, feeds):
+        cls.batches.append(sorted(feed.symbol for feed in feeds))
+        return {feed: cls.new_bar for feed in feeds}
+
+
+class OtherFeed(StubFeed):
+    poll_source = "other"
+    batches = []
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(clock):
+    StubFeed.batches, OtherFeed.batches, StubFeed.new_bar = [], [], True
+    return BarCloseScheduler(grace=2.0, retry_delay=10.0, max_retries=2, clock=clock, executor=InlineExecutor())
+
+
+def test_next_bar_close():
+    now = epoch("2024-03-06 10:07:30")
+    assert next_bar_close("15m", now) == epoch("2024-03-06 10:15")
+    assert next_bar_close("4h", now) == epoch("2024-03-06 12:00")
+    assert next_bar_close("1d", now) == epoch("2024-03-07")
+    # Weekly bars open on Monday
+    assert next_bar_close("1w", now) == epoch("2024-03-11")
+    assert next_bar_close("1mo", now) == epoch("2024-04-01")
+    # Exactly on a close: the next one
+    assert next_bar_close("15m", epoch("2024-03-06 10:15")) == epoch("2024-03-06 10:30")
+    # Hourly bars opening at :30
+    assert next_bar_close("1h", now, anchor=epoch("2024-03-05 14:30")) == epoch("2024-03-06 10:30")
+
+
+def test_bar_open():
+    now = epoch("2024-03-06 10:07:30")
+    assert bar_open("15m", now) == epoch("2024-03-06 10:00")
+    assert bar_open("1w", now) == epoch("2024-03-04")
+    assert bar_open("1mo", now) == epoch("2024-03-01")
+    assert bar_open("15m", epoch("2024-03-06 10:15")) == epoch("2024-03-06 10:15")
+    assert bar_open("1h", now, anchor=epoch("2024-03-05 14:30")) == epoch("2024-03-06 09:30")
+
+
+def test_due_feeds_are_batched_per_source():
+    clock = Clock(epoch("2024-03-06 10:07:30"))
+    scheduler = make_scheduler(clock)
+    feeds = [StubFeed("AAPL", "15m"), StubFeed("MSFT", "15m"), StubFeed("SPY", "1h"), OtherFeed("BTC", "15m")]
+    for feed in feeds:
+        scheduler.register(feed)
+    assert scheduler.next_due() == epoch("2024-03-06 10:15:02")
+
+    # Not due during the grace delay
+    assert scheduler.run_pending(epoch("2024-03-06 10:15:01")) == 0
+
+    clock.now = epoch("2024-03-06 10:15:02")
+    assert scheduler.run_pending() == 2
+    assert StubFeed.batches == [["AAPL", "MSFT"]]
+    assert OtherFeed.batches == [["BTC"]]
+    assert scheduler.next_due() == epoch("2024-03-06 10:30:02")
+
+    # At the hour the 15m and 1h feeds of a source share one batch
+    clock.now = epoch("2024-03-06 11:00:02")
+    scheduler.run_pending()
+    assert StubFeed.batches[-1] == ["AAPL", "MSFT", "SPY"]
+
+    for feed in feeds:
+        scheduler.unregister(feed)
+    assert scheduler.next_due() is None
+
+
+def test_late_bars_are_retried():
+    clock = Clock(epoch("2024-03-06 10:07:30"))
+    scheduler = make_scheduler(clock)
+    feed = StubFeed("AAPL", "15m")
+    scheduler.register(feed)
+    StubFeed.new_bar = False
+
+    clock.now = epoch("2024-03-06 10:15:02")
+    scheduler.run_pending()
+    assert scheduler.next_due() == epoch("2024-03-06 10:15:12")
+    clock.now = epoch("2024-03-06 10:15:12")
+    scheduler.run_pending()
+    assert scheduler.next_due() == epoch("2024-03-06 10:15:22")
+
+    # After max_retries the feed waits for its next close
+    clock.now = epoch("2024-03-06 10:15:22")
+    scheduler.run_pending()
+    assert len(StubFeed.batches) == 3
+    assert scheduler.next_due() == epoch("2024-03-06 10:30:02")
+    scheduler.unregister(feed)
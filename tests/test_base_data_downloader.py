@@ -1,8 +1,10 @@
 """
 Unit and integration tests for BaseDataDownloader, BinanceDataDownloader, and YahooDataDownloader.
 
-- Tests saving and loading data to CSV.
+- Tests saving data to the market data store and CSV export/import.
 - Tests downloading data for multiple symbols.
+- Tests incremental sync (only missing ranges are fetched, open bars are not stored).
+- Tests the open bar of weekly (Monday) and monthly bars.
 - Mocks Binance and Yahoo downloaders to avoid real API calls.
 - Uses temporary directories for file operations.
 
@@ -17,10 +19,12 @@ import os
 import shutil
 import tempfile
 
+import numpy as np
 import pandas as pd
 import pytest
 from src.data.base_data_downloader import BaseDataDownloader
 from src.data.binance_data_downloader import BinanceDataDownloader
+from src.data.market_data_store import MarketDataStore
 from src.data.yahoo_data_downloader import YahooDataDownloader
 
 
@@ -37,16 +41,45 @@ class DummyDownloader(BaseDataDownloader):
         }
         return pd.DataFrame(data)
 
+    def fetch_range(self, symbol, interval, start, end):
+        # Hourly bars of [start, end), recording the requested ranges
+        self.requests.append((start, end))
+        timestamps = pd.date_range(start=start, end=end, freq="h", inclusive="left")
+        return pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 10.0,
+            }
+        )
+
+
+def _dummy_downloader(temp_dir, interval="1d"):
+    store = MarketDataStore(os.path.join(temp_dir, "store"))
+    downloader = DummyDownloader(data_dir=temp_dir, interval=interval, store=store)
+    downloader.requests = []
+    return downloader
+
 
 def test_save_and_load_data():
     temp_dir = tempfile.mkdtemp()
     try:
-        downloader = DummyDownloader(data_dir=temp_dir, interval="1d")
+        store = MarketDataStore(os.path.join(temp_dir, "store"))
+        downloader = DummyDownloader(data_dir=temp_dir, interval="1d", store=store)
         df = downloader.download_data("TEST", "2023-01-01", "2023-01-02")
-        filepath = downloader.save_data(df, "TEST", "2023-01-01", "2023-01-02")
-        assert os.path.exists(filepath)
+        key = downloader.save_data(df, "TEST", "2023-01-01", "2023-01-02")
+        assert key == "TEST_1d_20230101_20230102"
+        assert store.data_keys() == [key] and store.key_source(key) == "local"
+        stored = store.read("local", "TEST", "1d")
+        assert list(stored["close"]) == [1.5, 2.5]
+
+        filepath = downloader.export_csv("TEST")
+        assert os.path.basename(filepath) == "TEST_1d_20230101_20230102.csv"
         loaded_df = downloader.load_data(filepath)
-        pd.testing.assert_frame_equal(df, loaded_df)
+        pd.testing.assert_frame_equal(df.astype({c: float for c in ["open", "high", "low", "close", "volume"]}), loaded_df)
     finally:
         shutil.rmtree(temp_dir)
 
@@ -54,14 +87,104 @@ def test_save_and_load_data():
 def test_download_multiple_symbols():
     temp_dir = tempfile.mkdtemp()
     try:
-        downloader = DummyDownloader(data_dir=temp_dir, interval="1d")
+        store = MarketDataStore(os.path.join(temp_dir, "store"))
+        downloader = DummyDownloader(data_dir=temp_dir, interval="1d", store=store)
         symbols = ["AAA", "BBB"]
         results = downloader.download_multiple_symbols(
             symbols, downloader.download_data, "2023-01-01", "2023-01-02"
         )
         assert set(results.keys()) == set(symbols)
-        for path in results.values():
-            assert os.path.exists(path)
+        assert results["AAA"] == "AAA_1d_20230101_20230102"
+        assert store.series() == [("local", "AAA", "1d"), ("local", "BBB", "1d")]
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_sync_downloads_only_missing_ranges():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        downloader = _dummy_downloader(temp_dir, interval="1h")
+        result = downloader.sync("TEST", "2023-01-01 00:00", "2023-01-02 00:00")
+        assert result["requests"] == 1
+        assert result["added"] == 24
+        assert result["key"] == "TEST_1h_20230101_20230101"
+
+        # Everything is stored: nothing to download
+        result = downloader.sync("TEST", "2023-01-01 00:00", "2023-01-02 00:00")
+        assert result["requests"] == 0
+
+        # Deleted bars stay covered by the fetched ledger
+        downloader.store.delete("local", "TEST", "1h", "2023-01-01 10:00", "2023-01-01 12:00")
+        assert downloader.store.missing_ranges("local", "TEST", "1h", "2023-01-01", "2023-01-02") == []
+
+        # Without the ledger the interior gap is fetched along with both ends
+        os.remove(os.path.join(downloader.store.series_dir("local", "TEST", "1h"), "fetched.json"))
+        downloader.requests.clear()
+        result = downloader.sync("TEST", "2022-12-31 22:00", "2023-01-02 02:00")
+        assert [(str(a), str(b)) for a, b in downloader.requests] == [
+            ("2022-12-31 22:00:00+00:00", "2023-01-01 00:00:00+00:00"),
+            ("2023-01-01 10:00:00+00:00", "2023-01-01 12:00:00+00:00"),
+            ("2023-01-02 00:00:00+00:00", "2023-01-02 02:00:00+00:00"),
+        ]
+        assert result["added"] == 6
+        assert len(downloader.store.read("local", "TEST", "1h")) == 28
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_sync_merges_close_gaps_and_skips_open_bar():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        downloader = _dummy_downloader(temp_dir, interval="1h")
+        downloader.merge_gap_bars = 5
+        downloader.store.write_arrays(
+            "local",
+            "TEST",
+            "1h",
+            np.array([pd.Timestamp("2023-01-01 03:00", tz="UTC").value // 1_000_000], dtype=np.int64),
+            {column: np.ones(1) for column in ["open", "high", "low", "close", "volume"]},
+        )
+        result = downloader.sync("TEST", "2023-01-01 00:00", "2023-01-01 06:00")
+        assert result["requests"] == 1
+        assert downloader.requests[0][0] == pd.Timestamp("2023-01-01 00:00", tz="UTC")
+        assert downloader.requests[0][1] == pd.Timestamp("2023-01-01 06:00", tz="UTC")
+
+        # The bar that is still open is neither stored nor marked as fetched
+        open_bar = pd.Timestamp.now(tz="UTC").floor("h")
+        start = open_bar - pd.Timedelta(hours=3)
+        downloader.requests.clear()
+        downloader.sync("TEST", start)
+        assert downloader.requests == [(start, open_bar)]
+        stored = downloader.store.timestamps("local", "TEST", "1h", start)
+        assert len(stored) == 3
+        assert stored.max() < open_bar.value // 1_000_000
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_open_bar_start():
+    now = pd.Timestamp("2024-03-06 10:07:30", tz="UTC")
+    assert BaseDataDownloader._open_bar_start("1h", now) == pd.Timestamp("2024-03-06 10:00", tz="UTC")
+    # Weekly bars open on Monday, monthly bars on the 1st
+    assert BaseDataDownloader._open_bar_start("1w", now) == pd.Timestamp("2024-03-04", tz="UTC")
+    assert BaseDataDownloader._open_bar_start("1wk", now) == pd.Timestamp("2024-03-04", tz="UTC")
+    assert BaseDataDownloader._open_bar_start("1M", now) == pd.Timestamp("2024-03-01", tz="UTC")
+    assert BaseDataDownloader._open_bar_start("1mo", now) == pd.Timestamp("2024-03-01", tz="UTC")
+
+
+def test_sync_failure_stores_nothing():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        downloader = _dummy_downloader(temp_dir, interval="1h")
+
+        def failing_fetch(symbol, interval, start, end):
+            raise ConnectionError("network down")
+
+        downloader.fetch_range = failing_fetch
+        with pytest.raises(ConnectionError):
+            downloader.sync("TEST", "2023-01-01", "2023-01-02")
+        assert downloader.store.series() == []
+        assert downloader.store.fetched_ranges("local", "TEST", "1h") == []
     finally:
         shutil.rmtree(temp_dir)
 
@@ -74,13 +197,12 @@ def test_binance_data_downloader_integration(monkeypatch):
     temp_dir = tempfile.mkdtemp()
     try:
         # Patch BinanceDataDownloader to not call real API
+        store = MarketDataStore(os.path.join(temp_dir, "store"))
         bdd = BinanceDataDownloader(
-            api_key="fake", api_secret="fake", data_dir=temp_dir, interval="1d"
+            api_key="fake", api_secret="fake", data_dir=temp_dir, interval="1d", store=store
         )
 
-        def fake_download(
-            symbol, interval, start_date, end_date=None, save_to_csv=True
-        ):
+        def fake_download(symbol, interval, start_date, end_date=None, save=True):
             data = {
                 "timestamp": pd.date_range(start=start_date, periods=2, freq="D"),
                 "open": [1, 2],
@@ -96,18 +218,18 @@ def test_binance_data_downloader_integration(monkeypatch):
                 "ignore": [0, 0],
             }
             df = pd.DataFrame(data)
-            if save_to_csv:
-                bdd.save_data(df, symbol, start_date, end_date)
+            if save:
+                bdd.save_data(df, symbol, start_date, end_date, interval=interval)
             return df
 
         bdd.download_historical_data = fake_download
         symbols = ["BTCUSDT", "ETHUSDT"]
         results = bdd.download_multiple_symbols(
-            symbols, "1d", "2023-01-01", "2023-01-02"
+            symbols, "1d", "2023-01-01", "2023-01-02", incremental=False
         )
         assert set(results.keys()) == set(symbols)
-        for path in results.values():
-            assert os.path.exists(path)
+        assert results["BTCUSDT"] == "BTCUSDT_1d_20230101_20230102"
+        assert len(store.read("binance", "ETHUSDT", "1d")) == 2
     finally:
         shutil.rmtree(temp_dir)
 
@@ -115,9 +237,10 @@ def test_binance_data_downloader_integration(monkeypatch):
 def test_yahoo_data_downloader_integration(monkeypatch):
     temp_dir = tempfile.mkdtemp()
     try:
-        ydd = YahooDataDownloader(data_dir=temp_dir, interval="1d")
+        store = MarketDataStore(os.path.join(temp_dir, "store"))
+        ydd = YahooDataDownloader(data_dir=temp_dir, interval="1d", store=store)
 
-        def fake_download(symbol, start_date, end_date=None, interval=None):
+        def fake_download(symbol, interval, start_date, end_date=None):
             data = {
                 "timestamp": pd.date_range(start=start_date, periods=2, freq="D"),
                 "open": [1, 2],
@@ -130,9 +253,10 @@ def test_yahoo_data_downloader_integration(monkeypatch):
 
         ydd.download_data = fake_download
         symbols = ["AAPL", "MSFT"]
-        results = ydd.download_multiple_symbols(symbols, "2023-01-01", "2023-01-02")
+        results = ydd.download_multiple_symbols(
+            symbols, "1d", "2023-01-01", "2023-01-02", incremental=False
+        )
         assert set(results.keys()) == set(symbols)
-        for path in results.values():
-            assert os.path.exists(path)
+        assert [series[0] for series in store.series()] == ["yahoo", "yahoo"]
     finally:
         shutil.rmtree(temp_dir)
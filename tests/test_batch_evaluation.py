@@ -0,0 +1,98 @@
+"""
+Tests for batched parameter evaluation.
+
+- CustomOptimizer.run_batch returns the same results as evaluating each set on its own
+- Indicators are computed once per distinct parameter value of a batch
+- run_study_batched evaluates asked trials in batches up to the completed-trial budget
+
+How to run:
+    pytest tests/test_batch_evaluation.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import optuna
+import pandas as pd
+from src.indicator.indicator_cache import get_indicator_cache
+from src.optimizer.custom_optimizer import CustomOptimizer
+from src.optimizer.study_storage import count_completed_trials, run_study_batched
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def make_optimizer(tmp_path, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(2000) * 0.01))
+    df = pd.DataFrame(
+        {"open": close, "high": close * 1.004, "low": close * 0.996, "close": close, "volume": rng.uniform(100, 200, 2000)},
+        index=pd.date_range("2023-01-01", periods=2000, freq="h"),
+    )
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "RSIBBExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    return CustomOptimizer(
+        {
+            "data": bt.feeds.PandasData(dataname=df, name="TEST"),
+            "entry_logic": entry_logic,
+            "exit_logic": exit_logic,
+            "optimizer_settings": {"output_dir": str(tmp_path), "engine": "vectorized"},
+        }
+    )
+
+
+def param_sets():
+    sets = []
+    for rsi_period in (10, 14, 21):
+        for oversold in (30, 40):
+            sets.append({"e_rsi_period": rsi_period, "e_rsi_oversold": oversold, "e_bb_period": 20, "e_bb_dev": 2.0})
+    return sets
+
+
+def test_batch_matches_single_runs(tmp_path):
+    optimizer = make_optimizer(tmp_path)
+    cache = get_indicator_cache()
+    cache.clear()
+    misses = cache.misses
+
+    batch = optimizer.run_batch(param_sets())
+
+    # RSI 10/14/21 and BB(20, 2.0) for six sets; the exit defaults reuse RSI 14 and the bands
+    assert cache.misses - misses == 4
+    assert len(batch) == 6
+    for params, result in zip(param_sets(), batch):
+        assert result["best_params"]["entry_logic"]["params"]["e_rsi_period"] == params["e_rsi_period"]
+        _, _, single = optimizer.run_optimization(optuna.trial.FixedTrial(dict(defaults(optimizer), **params)))
+        assert result["total_profit_with_commission"] == single["total_profit_with_commission"]
+        assert len(result["trades"]) == len(single["trades"])
+
+
+def defaults(optimizer):
+    return {
+        name: cfg["default"]
+        for logic in (optimizer.entry_logic, optimizer.exit_logic)
+        for name, cfg in logic["params"].items()
+    }
+
+
+def test_run_study_batched(tmp_path):
+    optimizer = make_optimizer(tmp_path)
+    study = optuna.create_study(direction="maximize")
+    batches = []
+
+    def evaluate(trials):
+        batches.append(len(trials))
+        results = optimizer.run_batch([optimizer.suggest_params(trial) for trial in trials])
+        return [result["total_profit_with_commission"] for result in results]
+
+    run_study_batched(study, evaluate, n_trials=10, batch_size=4)
+    assert batches == [4, 4, 2]
+    assert count_completed_trials(study) == 10
+    assert set(study.best_trial.params) == set(optimizer.suggest_params(study.best_trial))
+
+    # Budget already reached: nothing is evaluated
+    run_study_batched(study, evaluate, n_trials=10, batch_size=4)
+    assert batches == [4, 4, 2]
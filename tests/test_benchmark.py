@@ -0,0 +1,82 @@
+"""
+Tests for the backtest benchmark suite.
+
+- Synthetic data is deterministic and well-formed OHLCV
+- Mixin configs are found regardless of file name capitalization
+- A small benchmark run reports phases, throughput and memory and writes the JSON report
+- compare_reports flags throughput drops beyond the tolerance
+
+How to run:
+    pytest tests/test_benchmark.py
+"""
+
+import json
+import os
+
+import pandas as pd
+from src.optimizer.benchmark import (compare_reports, load_logic_config,
+                                     run_benchmark, synthetic_ohlcv)
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def test_synthetic_ohlcv_is_deterministic():
+    df = synthetic_ohlcv(1000, seed=7)
+    pd.testing.assert_frame_equal(df, synthetic_ohlcv(1000, seed=7))
+    assert len(df) == 1000
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert (df["volume"] > 0).all()
+
+
+def test_load_logic_config_ignores_case():
+    config = load_logic_config("entry", "RSIVolumeSupertrendEntryMixin", CONFIG_DIR)
+    assert config["name"] == "RSIVolumeSupertrendEntryMixin"
+    assert config["params"]
+
+    assert load_logic_config("exit", "NoSuchExitMixin", CONFIG_DIR) == {"name": "NoSuchExitMixin", "params": {}}
+
+
+def test_run_benchmark_writes_report(tmp_path):
+    output_file = str(tmp_path / "benchmark.json")
+    report = run_benchmark(
+        bar_counts=[600],
+        entries=["RSIBBEntryMixin"],
+        exits=["RSIBBExitMixin", "FixedRatioExitMixin"],
+        settings={"output_dir": str(tmp_path)},
+        trials=2,
+        config_dir=CONFIG_DIR,
+        output_file=output_file,
+    )
+
+    assert report["data_load"]["600"] > 0
+    assert len(report["results"]) == 2
+    for result in report["results"]:
+        assert "error" not in result
+        assert result["bars"] == 600
+        assert set(result["phases"]) == {"indicator_init", "run", "analyzer_extraction"}
+        assert result["bars_per_sec"] > 0
+        assert result["trials_per_min"] > 0
+        assert result["peak_alloc_mb"] > 0
+    assert report["peak_rss_mb"] > 0
+
+    with open(output_file) as f:
+        saved = json.load(f)
+    assert saved["results"][0]["entry"] == "RSIBBEntryMixin"
+    assert saved["settings"]["trials"] == 2
+
+
+def test_compare_reports():
+    def report(**rates):
+        return {
+            "results": [
+                {"entry": "E", "exit": name, "engine": "backtrader", "bars": 1000, "bars_per_sec": rate}
+                for name, rate in rates.items()
+            ]
+        }
+
+    baseline = report(A=1000.0, B=1000.0, C=1000.0)
+    current = report(A=950.0, B=500.0, D=10.0)
+    regressions = compare_reports(baseline, current, tolerance=0.10)
+    assert [r["exit"] for r in regressions] == ["B"]
+    assert regressions[0]["change"] == -0.5
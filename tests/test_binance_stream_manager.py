@@ -0,0 +1,176 @@
+"""
+Tests for the multiplexed Binance kline stream manager.
+
+- Streams share combined-stream connections, new ones are opened only when full
+- Kline messages are parsed and routed to the queues of their stream only
+- Subscriptions are reference counted and unsubscribed at runtime
+- Dropped connections reconnect and resubscribe their streams
+
+A local stub WebSocket server plays the Binance combined-stream endpoint.
+
+How to run:
+    pytest tests/test_binance_stream_manager.py
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+from src.data.binance_stream_manager import BinanceStreamManager, kline_stream, parse_kline
+from websockets.asyncio.server import serve
+
+
+class StubStreamServer:
+    """Combined-stream endpoint recording control messages and pushing klines to subscribers"""
+
+    def __init__(self):
+        self.messages = []
+        self.subscriptions = {}  # connection -> set of streams
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = self._call(self._start())
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _start(self):
+        # serve() needs the running loop of the server thread; a short close_timeout keeps drops quick
+        return await serve(self._handler, "127.0.0.1", 0, close_timeout=1)
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout=5)
+
+    async def _handler(self, connection):
+        assert connection.request.path == "/stream"
+        self.subscriptions[connection] = set()
+        try:
+            async for raw in connection:
+                message = json.loads(raw)
+                self.messages.append(message)
+                if message["method"] == "SUBSCRIBE":
+                    self.subscriptions[connection].update(message["params"])
+                elif message["method"] == "UNSUBSCRIBE":
+                    self.subscriptions[connection].difference_update(message["params"])
+                await connection.send(json.dumps({"result": None, "id": message["id"]}))
+        finally:
+            self.subscriptions.pop(connection, None)
+
+    def push_kline(self, symbol, interval, open_time, close, closed=True):
+        stream = kline_stream(symbol, interval)
+        message = json.dumps(
+            {
+                "stream": stream,
+                "data": {
+                    "e": "kline",
+                    "s": symbol,
+                    "k": {"t": open_time, "s": symbol, "i": interval, "o": "1.0", "h": "2.0", "l": "0.5",
+                          "c": str(close), "v": "10.0", "x": closed},
+                },
+            }
+        )
+
+        async def send():
+            for connection, streams in list(self.subscriptions.items()):
+                if stream in streams:
+                    await connection.send(message)
+
+        self._call(send())
+
+    def drop_connections(self):
+        async def close():
+            for connection in list(self.subscriptions):
+                await connection.close()
+
+        self._call(close())
+
+    def subscribed(self):
+        return sorted(stream for streams in self.subscriptions.values() for stream in streams)
+
+    def stop(self):
+        self.server.close()
+        self._call(self.server.wait_closed())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def stub():
+    server = StubStreamServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def manager(stub):
+    manager = BinanceStreamManager(
+        stub.url, max_streams_per_connection=2, min_message_interval=0.01, reconnect_delay=0.1
+    )
+    yield manager
+    manager.close()
+
+
+def test_parse_kline():
+    event = parse_kline(
+        {
+            "stream": "btcusdt@kline_1m",
+            "data": {"k": {"t": 0, "s": "BTCUSDT", "i": "1m", "o": "1", "h": "2", "l": "0.5", "c": "1.5", "v": "3", "x": False}},
+        }
+    )
+    assert event["timestamp"] == pd.Timestamp("1970-01-01")
+    assert event["close"] == 1.5 and event["closed"] is False
+    assert parse_kline({"result": None, "id": 1}) is None
+
+
+def test_streams_share_connections_and_are_routed(stub, manager):
+    btc = manager.subscribe("BTCUSDT", "1m")
+    eth = manager.subscribe("ETHUSDT", "1m")
+    sol = manager.subscribe("SOLUSDT", "1m")
+    assert wait_for(lambda: stub.subscribed() == ["btcusdt@kline_1m", "ethusdt@kline_1m", "solusdt@kline_1m"])
+    assert len(stub.subscriptions) == 2
+    assert [len(connection["streams"]) for connection in manager.get_status()["connections"]] == [2, 1]
+
+    stub.push_kline("ETHUSDT", "1m", 60_000, 2.5)
+    event = eth.get(timeout=5)
+    assert event["symbol"] == "ETHUSDT" and event["close"] == 2.5 and event["closed"]
+    assert btc.empty() and sol.empty()
+
+
+def test_reference_counted_unsubscribe(stub, manager):
+    first = manager.subscribe("BTCUSDT", "1m")
+    second = manager.subscribe("BTCUSDT", "1m")
+    assert wait_for(lambda: stub.subscribed() == ["btcusdt@kline_1m"])
+
+    stub.push_kline("BTCUSDT", "1m", 0, 1.5)
+    assert first.get(timeout=5)["close"] == 1.5
+    assert second.get(timeout=5)["close"] == 1.5
+
+    manager.unsubscribe("BTCUSDT", "1m", first)
+    time.sleep(0.2)
+    assert stub.subscribed() == ["btcusdt@kline_1m"]
+    manager.unsubscribe("BTCUSDT", "1m", second)
+    assert wait_for(lambda: stub.subscribed() == [])
+    assert [message["method"] for message in stub.messages] == ["SUBSCRIBE", "UNSUBSCRIBE"]
+
+
+def test_reconnect_resubscribes(stub, manager):
+    events = manager.subscribe("BTCUSDT", "1m")
+    manager.subscribe("ETHUSDT", "1m")
+    assert wait_for(lambda: len(stub.subscribed()) == 2)
+
+    stub.drop_connections()
+    assert wait_for(lambda: stub.subscribed() == ["btcusdt@kline_1m", "ethusdt@kline_1m"])
+    assert stub.messages[-1]["params"] == ["btcusdt@kline_1m", "ethusdt@kline_1m"]
+    assert wait_for(lambda: manager.is_connected("BTCUSDT", "1m"))
+
+    stub.push_kline("BTCUSDT", "1m", 0, 3.0)
+    assert events.get(timeout=5)["close"] == 3.0
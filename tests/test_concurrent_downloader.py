@@ -0,0 +1,207 @@
+"""
+Tests for the concurrent, rate-limit aware downloader.
+
+- WeightBudget waits for the next window when the weight limit is reached
+- BinanceKlinesClient pages klines, reports used weight and backs off on 429/418
+- ConcurrentDownloader syncs symbols in parallel, reports progress and resumes from checkpoints
+
+A local stub HTTP server plays the Binance klines endpoint, no real API calls are made.
+
+How to run:
+    pytest tests/test_concurrent_downloader.py
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+from src.data.binance_data_downloader import BinanceDataDownloader, BinanceKlinesClient
+from src.data.concurrent_downloader import ConcurrentDownloader, RateLimitError, WeightBudget
+from src.data.market_data_store import MarketDataStore
+
+HOUR_MS = 3600 * 1000
+
+
+class StubBinance:
+    """Klines endpoint serving hourly bars; can answer with rate-limit or error responses"""
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []  # queued (status, headers) answered before the bars
+        self.failing_symbols = set()
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                with stub.lock:
+                    stub.requests.append(query)
+                    queued = stub.responses.pop(0) if stub.responses else None
+                    used = len(stub.requests) * 2
+                if queued is not None:
+                    status, headers = queued
+                    body = {"code": -1003, "msg": "Too many requests"}
+                elif query["symbol"] in stub.failing_symbols:
+                    status, headers, body = 400, {}, {"code": -1121, "msg": "Invalid symbol."}
+                else:
+                    status, headers, body = 200, {}, stub.klines(query)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("X-MBX-USED-WEIGHT-1M", str(used))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @staticmethod
+    def klines(query):
+        start = -(-int(query["startTime"]) // HOUR_MS) * HOUR_MS
+        end = int(query["endTime"])
+        opens = list(range(start, end + 1, HOUR_MS))[: int(query["limit"])]
+        return [
+            [t, "1.0", "2.0", "0.5", str(1.0 + t / HOUR_MS % 10), "10.0", t + HOUR_MS - 1, "0", 1, "0", "0", "0"]
+            for t in opens
+        ]
+
+    def klines_requests(self, symbol):
+        return [query for query in self.requests if query["symbol"] == symbol]
+
+
+@pytest.fixture
+def stub():
+    server = StubBinance()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def make_client(stub, **kwargs):
+    kwargs.setdefault("budget", WeightBudget(limit=1000))
+    kwargs.setdefault("backoff", 0.01)
+    return BinanceKlinesClient(base_url=stub.url, **kwargs)
+
+
+def make_downloader(stub, tmp_path, **kwargs):
+    return BinanceDataDownloader(
+        data_dir=str(tmp_path), interval="1h", store=MarketDataStore(str(tmp_path / "store")), rest=make_client(stub, **kwargs)
+    )
+
+
+def ms(value):
+    return pd.Timestamp(value, tz="UTC").value // 1_000_000
+
+
+def test_weight_budget_waits_for_next_window():
+    budget = WeightBudget(limit=4, window=0.5)
+    # Start right after a window boundary
+    time.sleep(0.5 - time.time() % 0.5 + 0.01)
+    budget.acquire(2)
+    budget.acquire(2)
+    started = time.monotonic()
+    budget.acquire(2)
+    assert time.monotonic() - started >= 0.3
+    assert budget.used == 2
+
+    budget.update_used(4)
+    assert budget.used == 4
+    with pytest.raises(ValueError):
+        budget.acquire(5)
+
+
+def test_weight_budget_pause_holds_requests():
+    budget = WeightBudget(limit=100)
+    budget.pause(0.2)
+    started = time.monotonic()
+    budget.acquire(1)
+    assert time.monotonic() - started >= 0.15
+
+
+def test_klines_are_paged(stub):
+    client = make_client(stub, page_size=40)
+    klines = client.klines("BTCUSDT", "1h", ms("2023-01-01"), ms("2023-01-05"))
+    assert len(klines) == 96
+    assert klines[0][0] == ms("2023-01-01") and klines[-1][0] == ms("2023-01-04 23:00")
+    assert len(stub.requests) == 3
+    # The end time of the endpoint is inclusive
+    assert int(stub.requests[0]["endTime"]) == ms("2023-01-05") - 1
+    # Used weight reported by the server is merged into the budget
+    assert client.budget.used >= 6
+
+
+@pytest.mark.parametrize("status", [429, 418])
+def test_rate_limit_responses_are_retried(stub, status):
+    stub.responses = [(status, {"Retry-After": "0"}), (status, {})]
+    client = make_client(stub)
+    klines = client.klines("BTCUSDT", "1h", ms("2023-01-01"), ms("2023-01-02"))
+    assert len(klines) == 24
+    assert len(stub.requests) == 3
+
+
+def test_rate_limit_error_after_retries(stub):
+    stub.responses = [(429, {"Retry-After": "0"})] * 3
+    client = make_client(stub, max_retries=2)
+    with pytest.raises(RateLimitError) as error:
+        client.klines("BTCUSDT", "1h", ms("2023-01-01"), ms("2023-01-02"))
+    assert error.value.status == 429
+
+
+def test_concurrent_download_with_progress(stub, tmp_path):
+    downloader = make_downloader(stub, tmp_path)
+    events = []
+    runner = ConcurrentDownloader(
+        downloader, max_workers=3, chunk_bars=50, on_progress=lambda symbol, state: events.append((symbol, state))
+    )
+    symbols = ["BTCUSDT", "ETHUSDT", "BNBUSDT"]
+    results = runner.run(symbols, "2023-01-01", "2023-01-05", interval="1h")
+
+    for symbol in symbols:
+        assert results[symbol]["status"] == "done"
+        assert results[symbol]["key"] == f"{symbol}_1h_20230101_20230104"
+        assert results[symbol]["bars"] == 96
+        assert results[symbol]["requests"] == 2
+        assert len(downloader.store.read("binance", symbol, "1h")) == 96
+    # One data key per symbol, not per chunk
+    assert downloader.store.data_keys() == sorted(results[symbol]["key"] for symbol in symbols)
+    assert {symbol for symbol, _ in events} == set(symbols)
+    assert [state["status"] for symbol, state in events if symbol == "BTCUSDT"][-1] == "done"
+
+
+def test_checkpoint_resumes_failed_symbols(stub, tmp_path):
+    downloader = make_downloader(stub, tmp_path)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    stub.failing_symbols = {"ETHUSDT"}
+    results = ConcurrentDownloader(downloader, max_workers=2, chunk_bars=50, checkpoint_path=checkpoint).run(
+        ["BTCUSDT", "ETHUSDT"], "2023-01-01", "2023-01-05", interval="1h"
+    )
+    assert results["BTCUSDT"]["status"] == "done"
+    assert results["ETHUSDT"]["status"] == "failed"
+    with open(checkpoint) as f:
+        saved = json.load(f)
+    assert saved["symbols"]["BTCUSDT"]["synced_until"] == ms("2023-01-05")
+    assert saved["symbols"]["ETHUSDT"]["synced_until"] is None
+
+    # The second run only downloads the symbol that failed
+    stub.failing_symbols = set()
+    stub.requests.clear()
+    results = downloader.sync_multiple_symbols(
+        ["BTCUSDT", "ETHUSDT"], "2023-01-01", "2023-01-05", interval="1h", checkpoint_path=checkpoint
+    )
+    assert set(results) == {"BTCUSDT", "ETHUSDT"}
+    assert stub.klines_requests("BTCUSDT") == []
+    assert len(stub.klines_requests("ETHUSDT")) == 1
+    assert len(downloader.store.read("binance", "ETHUSDT", "1h")) == 96
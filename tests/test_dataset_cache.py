@@ -0,0 +1,93 @@
+"""
+Tests for the process-wide OHLCV dataset cache.
+
+- A file is parsed once and every call returns the same read-only dataset
+- Rewriting the file (new mtime) invalidates the cached entry
+- DatasetFeed produces exactly the bars a plain PandasData feed produces
+
+How to run:
+    pytest tests/test_dataset_cache.py
+"""
+
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.dataset_cache import clear_dataset_cache, get_dataset
+
+
+def write_csv(path, length=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(length))
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=length, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+            "open": close + rng.standard_normal(length) * 0.1,
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": rng.random(length) * 100,
+        }
+    )
+    # Unsorted rows, like files merged from several downloads
+    df.iloc[::-1].to_csv(path, index=False)
+    return df
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_dataset_cache()
+    yield
+    clear_dataset_cache()
+
+
+def test_dataset_is_parsed_once_and_read_only(tmp_path):
+    path = tmp_path / "BTCUSDT_1h.csv"
+    write_csv(path)
+
+    dataset = get_dataset(str(path))
+    assert get_dataset(str(path)) is dataset
+    assert dataset.index.is_monotonic_increasing
+    with pytest.raises(ValueError):
+        dataset["close"][0] = 0.0
+
+
+def test_rewritten_file_is_reparsed(tmp_path):
+    path = tmp_path / "BTCUSDT_1h.csv"
+    write_csv(path, seed=0)
+    first = get_dataset(str(path))
+
+    write_csv(path, seed=1)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = get_dataset(str(path))
+    assert second is not first
+    assert not np.array_equal(first["close"], second["close"])
+
+
+def test_dataset_feed_matches_pandas_feed(tmp_path):
+    path = tmp_path / "BTCUSDT_1h.csv"
+    write_csv(path)
+    df = pd.read_csv(path)
+    df.index = pd.to_datetime(df.pop("timestamp"), utc=True)
+    df = df.sort_index()
+
+    def collect(feed):
+        class Collector(bt.Strategy):
+            def __init__(self):
+                self.rows = []
+
+            def next(self):
+                d = self.data
+                self.rows.append((d.datetime[0], d.open[0], d.high[0], d.low[0], d.close[0], d.volume[0]))
+
+        cerebro = bt.Cerebro()
+        cerebro.adddata(feed)
+        cerebro.addstrategy(Collector)
+        return cerebro.run()[0].rows
+
+    dataset = get_dataset(str(path))
+    assert collect(dataset.feed(name="BTCUSDT")) == collect(bt.feeds.PandasData(dataname=df))
@@ -0,0 +1,79 @@
+"""
+Tests for strategy hook profiling.
+
+- HookProfiler counts and times calls of wrapped instance methods only
+- profile_hooks reports mixin, indicator and broker timings without changing the result
+- Nothing is wrapped when profiling is off
+
+How to run:
+    pytest tests/test_hook_profiler.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+from src.optimizer.custom_optimizer import CustomOptimizer
+from src.strategy.hook_profiler import HookProfiler
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def run(settings, tmp_path):
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(1500) * 0.01))
+    df = pd.DataFrame(
+        {"open": close, "high": close * 1.004, "low": close * 0.996, "close": close, "volume": 1000.0},
+        index=pd.date_range("2023-01-01", periods=len(close), freq="h"),
+    )
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "FixedRatioExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    config = {
+        "data": bt.feeds.PandasData(dataname=df, name="TEST"),
+        "entry_logic": entry_logic,
+        "exit_logic": exit_logic,
+        "optimizer_settings": dict(settings, output_dir=str(tmp_path)),
+    }
+    return CustomOptimizer(config).run_optimization()
+
+
+def test_hook_profiler_wraps_instances_only():
+    class Counter:
+        def step(self, n=1):
+            return n * 2
+
+    profiler = HookProfiler()
+    counter, other = Counter(), Counter()
+    profiler.wrap(counter, "step", "counter.step")
+    profiler.wrap(counter, "missing", "counter.missing")
+
+    assert counter.step(3) == 6
+    counter.step()
+    other.step()
+
+    summary = profiler.summary()
+    assert list(summary) == ["counter.step"]
+    assert summary["counter.step"]["calls"] == 2
+    assert summary["counter.step"]["total_seconds"] > 0
+    assert "step" not in vars(other)
+
+
+def test_profile_hooks_reports_timings(tmp_path):
+    strategy, _, profiled = run({"profile_hooks": True}, tmp_path)
+    _, _, plain = run({}, tmp_path)
+
+    timings = profiled["hook_timings"]
+    for name in ["entry.next", "entry.should_enter", "exit.should_exit", "broker.next", "strategy.notify_trade"]:
+        assert timings[name]["calls"] > 0
+    assert any(name.startswith("indicator.") for name in timings)
+    assert timings["entry.next"]["calls"] == timings["exit.next"]["calls"]
+    assert strategy.hook_timings() == timings
+
+    assert "hook_timings" not in plain
+    assert profiled["total_profit_with_commission"] == pytest.approx(plain["total_profit_with_commission"])
+    assert len(profiled["trades"]) == len(plain["trades"])
@@ -0,0 +1,194 @@
+"""
+Tests for the cross-trial indicator cache.
+
+- Cached lines match the Backtrader indicators they replace inside a strategy
+- Cached indicators keep the warm-up (minimum period) of the indicators they replace
+- Mixin strategies trade the same with cached and native indicators
+- Repeated requests are served from the cache; the memory budget evicts LRU entries
+- Without the cache flag (or without preloaded data) regular indicators are created
+
+How to run:
+    pytest tests/test_indicator_cache.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+from src.indicator.indicator_cache import (IndicatorCache,
+                                           PrecomputedIndicator,
+                                           cached_indicator,
+                                           get_indicator_cache,
+                                           precomputed_class)
+from src.optimizer.custom_optimizer import CustomOptimizer
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+ICHIMOKU = {"tenkan": 9, "kijun": 26, "senkou": 52, "senkou_lead": 26, "chikou": 26}
+
+
+def make_df(n=400):
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(n) * 0.01))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.01, "low": close * 0.99, "close": close, "volume": rng.uniform(100, 200, n)},
+        index=pd.date_range("2023-01-01", periods=n, freq="h"),
+    )
+
+
+class IndicatorStrategy(bt.Strategy):
+    params = (("indicator_cache", False),)
+
+    def start(self):
+        data = self.data
+        self.ind = {
+            "rsi": cached_indicator(self, "rsi", lambda: bt.indicators.RSI(data.close, period=14), period=14),
+            "bb": cached_indicator(
+                self,
+                "bollinger_bands",
+                lambda: bt.indicators.BollingerBands(data.close, period=20, devfactor=2.0),
+                period=20,
+                devfactor=2.0,
+            ),
+            "atr": cached_indicator(self, "atr", lambda: bt.indicators.AverageTrueRange(data, period=14), period=14),
+            "sma": cached_indicator(
+                self, "sma", lambda: bt.indicators.SMA(data.volume, period=10), period=10, source="volume"
+            ),
+            "ichimoku": cached_indicator(self, "ichimoku", lambda: bt.indicators.Ichimoku(data, **ICHIMOKU), **ICHIMOKU),
+        }
+        self.rsi_seen = []
+
+    def next(self):
+        self.rsi_seen.append(self.ind["rsi"][0])
+
+
+def run(df, indicator_cache, runonce=True):
+    cerebro = bt.Cerebro(stdstats=False, runonce=runonce)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(IndicatorStrategy, indicator_cache=indicator_cache)
+    return cerebro.run()[0]
+
+
+def line_values(indicator, name, n):
+    return np.array(getattr(indicator.lines, name).array[:n])
+
+
+def test_cached_lines_match_backtrader():
+    df = make_df()
+    cache = get_indicator_cache()
+    cache.clear()
+    hits, misses = cache.hits, cache.misses
+    reference = run(df, indicator_cache=False)
+
+    for runonce in (True, False):
+        cached = run(df, indicator_cache=True, runonce=runonce)
+        assert isinstance(cached.ind["rsi"], PrecomputedIndicator)
+        assert not isinstance(reference.ind["rsi"], PrecomputedIndicator)
+        for key, names in {
+            "rsi": ["rsi"],
+            "bb": ["top", "mid", "bot"],
+            "atr": ["atr"],
+            "sma": ["sma"],
+            "ichimoku": ["tenkan_sen", "kijun_sen", "senkou_span_a", "senkou_span_b", "chikou_span"],
+        }.items():
+            for name in names:
+                # The look-ahead tail of the chikou span differs between Backtrader run modes
+                n = len(df) - ICHIMOKU["chikou"] if name == "chikou_span" else len(df)
+                np.testing.assert_allclose(
+                    line_values(cached.ind[key], name, n),
+                    line_values(reference.ind[key], name, n),
+                    rtol=0,
+                    atol=1e-9,
+                    err_msg=f"{key}.{name}",
+                )
+        # next() starts on the same bar: no calls on NaN values during the warm-up
+        assert cached._minperiod == reference._minperiod
+        assert len(cached.rsi_seen) == len(reference.rsi_seen)
+        np.testing.assert_allclose(cached.rsi_seen, reference.rsi_seen, rtol=0, atol=1e-9)
+
+    # Second and third run reused every entry of the first cached run
+    assert cache.misses - misses == 5
+    assert cache.hits - hits == 5
+
+
+def test_precomputed_minperiod():
+    values = np.full(50, np.nan)
+    values[19:] = 1.0
+    upper = np.full(50, np.nan)
+    upper[24:] = 2.0
+
+    class Strategy(bt.Strategy):
+        def __init__(self):
+            self.ind = precomputed_class(("mid", "top"))(self.data, arrays={"mid": values, "top": upper})
+            self.seen = []
+
+        def next(self):
+            self.seen.append(self.ind.top[0])
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=make_df(50)))
+    cerebro.addstrategy(Strategy)
+    strategy = cerebro.run()[0]
+    assert strategy.ind._minperiod == 25
+    assert len(strategy.seen) == 26 and not np.isnan(strategy.seen).any()
+
+
+def test_mixin_trades_match_native_indicators(tmp_path):
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "ATRExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    defaults = {
+        name: cfg["default"] for logic in (entry_logic, exit_logic) for name, cfg in logic["params"].items()
+    }
+
+    outputs = []
+    for indicator_cache in (False, True):
+        optimizer = CustomOptimizer(
+            {
+                "data": bt.feeds.PandasData(dataname=make_df(2000), name="TEST"),
+                "entry_logic": entry_logic,
+                "exit_logic": exit_logic,
+                "optimizer_settings": {
+                    "output_dir": str(tmp_path),
+                    "engine": "backtrader",
+                    "indicator_cache": indicator_cache,
+                },
+            }
+        )
+        _, _, output = optimizer.run_optimization(optuna.trial.FixedTrial(defaults))
+        outputs.append(output)
+
+    native, cached = outputs
+    assert len(cached["trades"]) == len(native["trades"])
+    assert cached["total_profit_with_commission"] == pytest.approx(native["total_profit_with_commission"], rel=1e-9, abs=1e-9)
+
+
+def test_lru_eviction_by_memory_budget():
+    columns = {name: np.arange(1000, dtype=np.float64) for name in ("open", "high", "low", "close", "volume")}
+    computed = []
+
+    def source():
+        computed.append(1)
+        return columns
+
+    # Each SMA entry holds one 8000 byte array; the budget fits two
+    cache = IndicatorCache(max_bytes=16000)
+    cache.get("fp", "sma", {"period": 5}, source)
+    cache.get("fp", "sma", {"period": 10}, source)
+    cache.get("fp", "sma", {"period": 5.0}, source)  # hit, becomes most recently used
+    cache.get("fp", "sma", {"period": 20}, source)  # evicts period 10
+
+    assert len(computed) == 3
+    assert len(cache) == 2 and cache.nbytes == 16000
+    cache.get("fp", "sma", {"period": 5}, source)
+    assert len(computed) == 3
+    cache.get("fp", "sma", {"period": 10}, source)
+    assert len(computed) == 4
+
+    lines = cache.get("other", "sma", {"period": 5}, source)
+    assert not lines["sma"].flags.writeable
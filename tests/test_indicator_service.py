@@ -0,0 +1,88 @@
+"""
+Tests for the shared indicator service.
+
+- Service values are the numpy_indicators values the strategies use
+- Repeated requests for the same data content hit the cache, whatever the column naming
+- Series computed for a cached dataset (optimizer) are reused for its DataFrame (plotter)
+- Plotter and screener helpers return the expected structures
+
+How to run:
+    pytest tests/test_indicator_service.py
+"""
+
+import numpy as np
+import pandas as pd
+from src.data.dataset_cache import OHLCVDataset
+from src.indicator import numpy_indicators as ni
+from src.indicator.indicator_cache import get_indicator_cache
+from src.indicator.indicator_service import compute_indicator, indicator_series, ohlcv_frame
+from src.plotter.run_plotter import ResultPlotter
+
+
+def make_df(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(n) * 0.01))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.01, "low": close * 0.99, "close": close, "volume": rng.uniform(100, 200, n)},
+        index=pd.date_range("2023-01-01", periods=n, freq="D", tz="UTC"),
+    )
+
+
+def test_values_and_alignment():
+    df = make_df()
+    rsi = indicator_series(df, "rsi", period=14)
+    assert rsi.index.equals(df.index)
+    np.testing.assert_array_equal(rsi.to_numpy(), ni.rsi(df["close"], 14))
+
+    macd = compute_indicator(df, "macd", fast=12, slow=26, signal=9)
+    expected = ni.macd(df["close"], 12, 26, 9)
+    for line, values in zip(("macd", "signal", "histo"), expected):
+        np.testing.assert_array_equal(macd[line].to_numpy(), values)
+    # Signal line seeded once the MACD line exists
+    assert np.isnan(macd["signal"].iloc[25 + 8 - 1]) and not np.isnan(macd["signal"].iloc[25 + 8])
+
+
+def test_cache_is_content_addressed():
+    cache = get_indicator_cache()
+    cache.clear()
+    df = make_df()
+    indicator_series(df, "sma", period=20)
+    hits = cache.hits
+
+    # yfinance style: capitalized names, ticker level, extra columns
+    yf_df = df.rename(columns=str.capitalize)
+    yf_df["Adj Close"] = yf_df["Close"]
+    yf_df.columns = pd.MultiIndex.from_product([yf_df.columns, ["AAPL"]])
+    assert list(ohlcv_frame(yf_df).columns) == ["open", "high", "low", "close", "volume"]
+    np.testing.assert_array_equal(indicator_series(yf_df, "sma", period=20.0), indicator_series(df, "sma", period=20))
+    assert cache.hits == hits + 2
+
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("close")] += 1
+    indicator_series(changed, "sma", period=20)
+    assert cache.hits == hits + 2
+
+
+def test_dataset_lines_are_reused_for_its_frame():
+    cache = get_indicator_cache()
+    cache.clear()
+    df = make_df()
+    dataset = OHLCVDataset(df.index, {name: df[name].to_numpy() for name in df.columns})
+    cache.get(dataset.fingerprint, "rsi", {"period": 14}, lambda: dict(dataset.columns))
+    misses = cache.misses
+    indicator_series(dataset.frame, "rsi", period=14)
+    assert cache.misses == misses
+
+
+def test_plotter_helpers():
+    df = make_df()
+    plotter = ResultPlotter.__new__(ResultPlotter)
+    indicators = plotter.calculate_indicators(
+        df, ["rsi", "bollinger_bands", "ichimoku", "supertrend", "atr"], {"entry_logic": {"params": {"rsi_period": 10}}}
+    )
+    np.testing.assert_array_equal(indicators["rsi"].to_numpy(), ni.rsi(df["close"], 10))
+    assert set(indicators["bollinger_bands"]) == {"upper", "middle", "lower"}
+    assert set(indicators["ichimoku"]) == {"tenkan", "kijun", "senkou_span_a", "senkou_span_b"}
+    st, _ = ni.supertrend(df["high"], df["low"], df["close"], 10, 3.0)
+    np.testing.assert_array_equal(indicators["supertrend"].to_numpy(), st)
+    np.testing.assert_array_equal(indicators["atr"].to_numpy(), ni.atr(df["high"], df["low"], df["close"], 14))
@@ -0,0 +1,216 @@
+"""
+Tests for the market data hub that shares live feeds between bots.
+
+- One upstream feed (one history load) per source, symbol, interval and connection
+- A larger requested lookback replaces the upstream with a larger one
+- A slow upstream creation does not block subscriptions of other keys
+- New and updated upstream bars are published to every subscriber feed
+- Reference counting stops the upstream feed with its last subscriber
+
+The upstream feed is a stand-in live feed without network access.
+
+How to run:
+    pytest tests/test_market_data_hub.py
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+from src.data.base_live_data_feed import BaseLiveDataFeed
+from src.data.market_data_hub import MarketDataHub
+
+
+class StubLiveFeed(BaseLiveDataFeed):
+    """Live feed serving synthetic history; bars are pushed by the test"""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.history_loads = 0
+        self.stopped = False
+        StubLiveFeed.created.append(self)
+        super().__init__(**kwargs)
+
+    def _load_historical_data(self):
+        self.history_loads += 1
+        index = pd.date_range("2024-01-01", periods=self.lookback_bars, freq="15min")
+        return pd.DataFrame(
+            {"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}, index=index
+        )
+
+    def _connect_realtime(self):
+        return True
+
+    def _disconnect_realtime(self):
+        self.stopped = True
+
+    def _get_latest_data(self):
+        return None
+
+    def _get_update_interval(self):
+        return 0.05
+
+
+def create_upstream(config):
+    return StubLiveFeed(symbol=config["symbol"], interval=config["interval"], lookback_bars=config["lookback_bars"])
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture(autouse=True)
+def reset_stub():
+    StubLiveFeed.created = []
+    yield
+
+
+def config(symbol="BTCUSDT", **kwargs):
+    return dict({"data_source": "binance", "symbol": symbol, "interval": "15m", "lookback_bars": 50}, **kwargs)
+
+
+def test_history_is_loaded_once_per_key():
+    hub = MarketDataHub()
+    first = hub.subscribe(config(), create_upstream)
+    second = hub.subscribe(config(lookback_bars=20), create_upstream)
+    other = hub.subscribe(config("ETHUSDT"), create_upstream)
+    try:
+        assert len(StubLiveFeed.created) == 2
+        assert StubLiveFeed.created[0].history_loads == 1
+        assert len(first.df) == 50 and len(second.df) == 20
+        assert second.df.index[-1] == first.df.index[-1]
+        assert hub.get_status()[hub.key(config())]["subscribers"] == 2
+    finally:
+        for feed in (first, second, other):
+            feed.stop()
+
+
+def test_connections_are_not_shared():
+    hub = MarketDataHub()
+    feeds = [
+        hub.subscribe(config(), create_upstream),
+        hub.subscribe(config(testnet=True), create_upstream),
+        hub.subscribe(config(api_key="key-a", api_secret="secret-a"), create_upstream),
+        hub.subscribe(config(api_key="key-b", api_secret="secret-b"), create_upstream),
+        hub.subscribe(config(testnet=False), create_upstream),
+        hub.subscribe(config(data_source="ibkr", symbol="SPY"), create_upstream),
+        hub.subscribe(config(data_source="ibkr", symbol="SPY", client_id=2), create_upstream),
+    ]
+    try:
+        # testnet=False is the default connection
+        assert len(StubLiveFeed.created) == 6
+        # Credentials are kept as a digest only
+        assert "secret-a" not in repr(hub.key(config(api_key="key-a", api_secret="secret-a")))
+    finally:
+        for feed in feeds:
+            feed.stop()
+
+
+def test_larger_lookback_replaces_upstream():
+    hub = MarketDataHub()
+    first = hub.subscribe(config(lookback_bars=20), create_upstream)
+    second = hub.subscribe(config(lookback_bars=50), create_upstream)
+    try:
+        small, large = StubLiveFeed.created
+        assert small.stopped and not large.stopped
+        assert len(first.df) == 20 and len(second.df) == 50
+
+        # Both subscribers receive the bars of the new upstream
+        new_time = second.df.index[-1] + pd.Timedelta(minutes=15)
+        large._process_new_data(
+            pd.DataFrame({"open": [2.0], "high": [3.0], "low": [1.0], "close": [2.5], "volume": [5.0]}, index=[new_time])
+        )
+        for feed in (first, second):
+            assert wait_for(lambda: feed.bars.last_timestamp == new_time)
+
+        # Smaller lookbacks reuse the larger upstream
+        third = hub.subscribe(config(lookback_bars=30), create_upstream)
+        third.stop()
+        assert len(StubLiveFeed.created) == 2
+    finally:
+        first.stop()
+        second.stop()
+    assert StubLiveFeed.created[1].stopped
+
+
+def test_upstream_is_created_outside_the_hub_lock():
+    hub = MarketDataHub()
+    release = threading.Event()
+
+    def slow_upstream(upstream_config):
+        if upstream_config["symbol"] == "BTCUSDT":
+            release.wait(5)
+        return create_upstream(upstream_config)
+
+    subscribed = []
+    thread = threading.Thread(target=lambda: subscribed.append(hub.subscribe(config(), slow_upstream)))
+    thread.start()
+    try:
+        assert wait_for(lambda: hub.get_status())
+        # Another key subscribes while the first history download is still running
+        other = hub.subscribe(config("ETHUSDT"), slow_upstream)
+        assert not release.is_set() and not subscribed
+        other.stop()
+    finally:
+        release.set()
+        thread.join()
+        for feed in subscribed:
+            feed.stop()
+
+
+def test_bars_are_published_to_all_subscribers():
+    hub = MarketDataHub()
+    received = []
+    first = hub.subscribe(config(on_new_bar=lambda symbol, timestamp, bar: received.append(timestamp)), create_upstream)
+    second = hub.subscribe(config(), create_upstream)
+    upstream = StubLiveFeed.created[0]
+    try:
+        last = first.df.index[-1]
+        new_time = last + pd.Timedelta(minutes=15)
+        upstream._process_new_data(
+            pd.DataFrame({"open": [2.0], "high": [3.0], "low": [1.0], "close": [2.5], "volume": [5.0]}, index=[new_time])
+        )
+        for feed in (first, second):
+            assert wait_for(lambda: feed.bars.last_timestamp == new_time)
+        assert received == [new_time]
+        # The upstream callback is not shared with the subscribers
+        assert upstream.on_new_bar is None
+
+        # A revised bar updates the subscribers in place
+        upstream._process_new_data(
+            pd.DataFrame({"open": [2.0], "high": [3.5], "low": [1.0], "close": [3.0], "volume": [7.0]}, index=[new_time])
+        )
+        for feed in (first, second):
+            assert wait_for(lambda: feed.bars.last()["close"] == 3.0)
+            assert len(feed.bars) == 51
+        assert received == [new_time]
+    finally:
+        first.stop()
+        second.stop()
+
+
+def test_upstream_stops_with_last_subscriber():
+    hub = MarketDataHub()
+    first = hub.subscribe(config(), create_upstream)
+    second = hub.subscribe(config(), create_upstream)
+    upstream = StubLiveFeed.created[0]
+
+    first.stop()
+    assert not upstream.stopped
+    second.stop()
+    assert upstream.stopped
+    assert hub.get_status() == {}
+
+    # A new subscriber creates a new upstream feed
+    third = hub.subscribe(config(), create_upstream)
+    try:
+        assert len(StubLiveFeed.created) == 2
+    finally:
+        third.stop()
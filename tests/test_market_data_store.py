@@ -0,0 +1,192 @@
+"""
+Tests for the partitioned market data store.
+
+- Bars are stored per source/symbol/interval/month as int64 epoch ms and float64 columns
+- Range reads only return bars in [start, end) and span partitions
+- Writes append and de-duplicate by timestamp (newest values win)
+- Inventory, data keys, CSV import/export and the store backed dataset cache
+- Registered data keys stay the same when bars are appended and keep their source
+- Missing ranges (head, tail and interior gaps) and the fetched-range ledger
+
+How to run:
+    pytest tests/test_market_data_store.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.dataset_cache import clear_dataset_cache, get_store_dataset
+from src.data.market_data_store import MarketDataStore, data_key, parse_data_key
+
+
+def make_bars(start="2024-01-30", periods=96, freq="h", offset=0.0):
+    index = pd.date_range(start, periods=periods, freq=freq)
+    close = 100 + np.arange(periods, dtype=float) + offset
+    return pd.DataFrame(
+        {"timestamp": index, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10.0}
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_dataset_cache()
+    yield
+    clear_dataset_cache()
+
+
+def test_partitions_and_dtypes(tmp_path):
+    store = MarketDataStore(str(tmp_path))
+    assert store.write("binance", "BTCUSDT", "1h", make_bars()) == 96
+
+    assert store.partitions("binance", "BTCUSDT", "1h") == ["2024-01", "2024-02"]
+    with np.load(store.partition_path("binance", "BTCUSDT", "1h", "2024-01")) as npz:
+        assert npz["timestamp"].dtype == np.int64
+        assert npz["close"].dtype == np.float64
+        assert npz["timestamp"][0] == pd.Timestamp("2024-01-30", tz="UTC").value // 1_000_000
+        assert len(npz["timestamp"]) == 48
+
+    df = store.read("binance", "BTCUSDT", "1h")
+    assert str(df.index.tz) == "UTC" and len(df) == 96
+    np.testing.assert_array_equal(df["close"].to_numpy(), make_bars()["close"].to_numpy())
+
+
+def test_range_reads(tmp_path):
+    store = MarketDataStore(str(tmp_path))
+    store.write("binance", "BTCUSDT", "1h", make_bars())
+
+    df = store.read("binance", "BTCUSDT", "1h", start="2024-01-31 12:00", end="2024-02-01 03:00")
+    assert df.index[0] == pd.Timestamp("2024-01-31 12:00", tz="UTC")
+    assert df.index[-1] == pd.Timestamp("2024-02-01 02:00", tz="UTC")
+    assert len(df) == 15
+
+    # Range in a single month only, and an empty range
+    assert len(store.read(None, "BTCUSDT", "1h", start="2024-02-01")) == 48
+    assert store.read("binance", "BTCUSDT", "1h", start="2025-01-01").empty
+    timestamps = store.timestamps("binance", "BTCUSDT", "1h", end="2024-01-31")
+    assert len(timestamps) == 24 and timestamps.dtype == np.int64
+
+
+def test_append_and_deduplicate(tmp_path):
+    store = MarketDataStore(str(tmp_path))
+    store.write("binance", "BTCUSDT", "1h", make_bars(periods=48))
+    # Overlaps the last 24 stored bars with new values and adds 24 bars
+    added = store.write("binance", "BTCUSDT", "1h", make_bars(start="2024-01-31", periods=48, offset=1000.0))
+    assert added == 24
+
+    df = store.read("binance", "BTCUSDT", "1h")
+    assert len(df) == 72
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    assert df["close"].iloc[23] == 123.0
+    assert df["close"].iloc[24] == 1100.0  # newest download wins
+
+    assert store.delete("binance", "BTCUSDT", "1h", start="2024-02-01") == 24
+    assert store.coverage("binance", "BTCUSDT", "1h")["end"] == pd.Timestamp("2024-01-31 23:00", tz="UTC")
+
+
+def test_inventory_and_data_keys(tmp_path):
+    store = MarketDataStore(str(tmp_path))
+    store.write("binance", "BTCUSDT", "1h", make_bars())
+    store.write("yahoo", "AAPL", "1d", make_bars(start="2023-01-01", periods=10, freq="D"))
+
+    assert store.series() == [("binance", "BTCUSDT", "1h"), ("yahoo", "AAPL", "1d")]
+    assert store.resolve_source("AAPL", "1d") == "yahoo"
+    coverage = store.coverage(None, "BTCUSDT", "1h")
+    assert coverage["rows"] == 96
+
+    symbol, interval, start, end = parse_data_key("BTCUSDT_1h_20240130_20240202.csv")
+    assert (symbol, interval) == ("BTCUSDT", "1h")
+    assert len(store.read(None, symbol, interval, start, end)) == 96
+    assert data_key(symbol, interval, start, end - pd.Timedelta(days=1)) == "BTCUSDT_1h_20240130_20240202"
+    with pytest.raises(FileNotFoundError):
+        store.resolve_source("ETHUSDT", "1h")
+
+
+def test_missing_ranges(tmp_path):
+    store = MarketDataStore(str(tmp_path))
+    bars = make_bars(periods=48)
+    store.write("binance", "BTCUSDT", "1h", bars.drop(index=range(10, 14)))
+
+    def ts(value):
+        return pd.Timestamp(value, tz="UTC")
+
+    missing = store.missing_ranges("binance", "BTCUSDT", "1h", "2024-01-29 22:00", "2024-02-01 02:00")
+    assert missing == [
+        (ts("2024-01-29 22:00"), ts("2024-01-30 00:00")),
+        (ts("2024-01-30 10:00"), ts("2024-01-30 14:00")),
+        (ts("2024-02-01 00:00"), ts("2024-02-01 02:00")),
+    ]
+    assert store.missing_ranges("binance", "BTCUSDT", "1h", "2024-01-30 00:00", "2024-01-30 10:00") == []
+
+    # Close ranges are joined into one download
+    merged = store.missing_ranges(
+        "binance", "BTCUSDT", "1h", "2024-01-29 22:00", "2024-01-30 12:00", merge_within=12 * 3600 * 1000
+    )
+    assert merged == [(ts("2024-01-29 22:00"), ts("2024-01-30 12:00"))]
+
+    # Ranges fetched without bars (e.g. exchange downtime) are not missing any more
+    store.mark_fetched("binance", "BTCUSDT", "1h", "2024-01-30 10:00", "2024-01-30 14:00")
+    assert store.fetched_ranges("binance", "BTCUSDT", "1h") == [
+        (ts("2024-01-30 10:00").value // 1_000_000, ts("2024-01-30 14:00").value // 1_000_000)
+    ]
+    assert store.missing_ranges("binance", "BTCUSDT", "1h", "2024-01-30", "2024-02-01") == []
+    assert store.missing_ranges("binance", "ETHUSDT", "1h", "2024-01-30", "2024-01-31") == [
+        (ts("2024-01-30"), ts("2024-01-31"))
+    ]
+
+
+def test_csv_import_export(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    make_bars().to_csv(csv_dir / "BTCUSDT_1h_20240130_20240202.csv", index=False)
+
+    store = MarketDataStore(str(tmp_path / "store"))
+    assert store.import_directory(str(csv_dir)) == {"BTCUSDT_1h_20240130_20240202.csv": 96}
+    # Unchanged files are not imported again
+    assert store.import_directory(str(csv_dir)) == {}
+    assert store.series() == [("import", "BTCUSDT", "1h")]
+
+    path = store.export_csv(None, "BTCUSDT", "1h", str(tmp_path / "out.csv"), start="2024-02-01")
+    exported = pd.read_csv(path)
+    assert len(exported) == 48 and exported["timestamp"].iloc[0] == "2024-02-01 00:00:00"
+
+
+def test_registered_data_keys(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    make_bars(periods=24).to_csv(csv_dir / "BTCUSDT_1h_20240130_20240130.csv", index=False)
+    make_bars(start="2024-01-31", periods=24).to_csv(csv_dir / "BTCUSDT_1h_20240131_20240131.csv", index=False)
+
+    store = MarketDataStore(str(tmp_path / "store"))
+    store.import_directory(str(csv_dir))
+    store.write("binance", "BTCUSDT", "1h", make_bars(start="2024-02-01", periods=24))
+    store.register_keys({"BTCUSDT_1h_20240201_20240201": "binance"})
+
+    # One key per imported file and saved range, unchanged by appended bars
+    keys = ["BTCUSDT_1h_20240130_20240130", "BTCUSDT_1h_20240131_20240131", "BTCUSDT_1h_20240201_20240201"]
+    assert store.data_keys() == keys
+    store.write("import", "BTCUSDT", "1h", make_bars(start="2024-02-05", periods=24))
+    assert store.data_keys() == keys
+
+    # Keys are read from their own source, legacy file names included
+    assert store.key_source("BTCUSDT_1h_20240130_20240130.csv") == "import"
+    assert store.key_source("BTCUSDT_1h_20240201_20240201") == "binance"
+    assert store.key_source("ETHUSDT_1h_20240201_20240201") is None
+
+
+def test_store_dataset_is_cached_and_invalidated(tmp_path):
+    store = MarketDataStore(str(tmp_path))
+    store.write("binance", "BTCUSDT", "1h", make_bars(periods=48))
+
+    dataset = get_store_dataset("BTCUSDT", "1h", store=store)
+    assert get_store_dataset("BTCUSDT", "1h", store=store) is dataset
+    assert len(dataset) == 48 and not dataset["close"].flags.writeable
+
+    store.write("binance", "BTCUSDT", "1h", make_bars(start="2024-02-01", periods=24))
+    updated = get_store_dataset("BTCUSDT", "1h", store=store)
+    assert updated is not dataset and len(updated) == 72
+
+    window = get_store_dataset("BTCUSDT", "1h", start="2024-01-31", end="2024-02-01", store=store)
+    assert len(window) == 24
+    assert window.fingerprint != updated.fingerprint
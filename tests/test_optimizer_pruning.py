@@ -0,0 +1,83 @@
+"""
+Tests for Optuna pruning through intermediate reports from CustomStrategy.
+
+- A live trial receives one report per checkpoint
+- A pruned trial stops the backtest with optuna.TrialPruned
+- The best-trial rerun (FrozenTrial) does not report
+
+How to run:
+    pytest tests/test_optimizer_pruning.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+from src.optimizer.custom_optimizer import CustomOptimizer
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def make_config(settings, tmp_path, length=1000):
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(length) * 0.01))
+    df = pd.DataFrame(
+        {"open": close, "high": close * 1.003, "low": close * 0.997, "close": close, "volume": 1000.0},
+        index=pd.date_range("2023-01-01", periods=length, freq="h"),
+    )
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "ATRExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    return {
+        "data": bt.feeds.PandasData(dataname=df, name="TEST"),
+        "entry_logic": entry_logic,
+        "exit_logic": exit_logic,
+        "optimizer_settings": dict(settings, output_dir=str(tmp_path)),
+    }
+
+
+def test_trial_reports_each_checkpoint(tmp_path):
+    settings = {"pruner": "median", "pruning_checkpoints": 10}
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.NopPruner())
+    trial = study.ask()
+
+    CustomOptimizer(make_config(settings, tmp_path)).run_optimization(trial)
+
+    steps = sorted(study._storage.get_trial(trial._trial_id).intermediate_values)
+    assert steps == list(range(1, 11))
+
+
+def test_pruned_trial_stops_backtest(tmp_path):
+    settings = {"pruner": "median", "pruning_checkpoints": 10}
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.ThresholdPruner(lower=1e9))
+
+    def objective(trial):
+        _, _, result = CustomOptimizer(make_config(settings, tmp_path)).run_optimization(trial)
+        return result["total_profit_with_commission"]
+
+    study.optimize(objective, n_trials=1)
+
+    trial = study.trials[0]
+    assert trial.state == optuna.trial.TrialState.PRUNED
+    assert list(trial.intermediate_values) == [1]
+
+
+def test_rerun_with_frozen_trial_does_not_report(tmp_path):
+    settings = {"pruner": "median", "pruning_checkpoints": 10}
+    config = make_config(settings, tmp_path)
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.NopPruner())
+    study.optimize(lambda trial: CustomOptimizer(config).run_optimization(trial)[2]["total_profit_with_commission"], n_trials=1)
+
+    strategy, _, _ = CustomOptimizer(make_config(settings, tmp_path)).run_optimization(study.best_trial)
+    assert strategy._report_step == 0
+
+
+@pytest.mark.parametrize("name, pruner_class", [("median", optuna.pruners.MedianPruner), ("successive_halving", optuna.pruners.SuccessiveHalvingPruner)])
+def test_create_pruner(name, pruner_class):
+    assert isinstance(CustomOptimizer.create_pruner({"pruner": name}), pruner_class)
+    assert CustomOptimizer.create_pruner({}) is None
@@ -0,0 +1,86 @@
+"""
+Tests for the optimizer result manifest.
+
+- save_results appends a manifest row and check_if_already_processed finds it
+- Results without trades or with a deleted file are reprocessed
+- Result files written before the manifest existed are indexed once
+
+How to run:
+    pytest tests/test_result_manifest.py
+"""
+
+import json
+import os
+
+import pytest
+from src.optimizer import run_optimizer
+from src.optimizer.result_manifest import ResultManifest
+
+DATA_FILE = "BTCUSDT_1h_20240101_20240201.csv"
+
+
+def make_result(n_trades):
+    trade = {
+        "entry_time": "2024-01-01T00:00:00",
+        "exit_time": "2024-01-02T00:00:00",
+        "entry_price": 100.0,
+        "exit_price": 110.0,
+        "size": 1.0,
+        "symbol": "BTCUSDT",
+        "trade_type": "long",
+        "commission": 0.2,
+        "gross_pnl": 10.0,
+        "net_pnl": 9.8,
+        "pnl_percentage": 10.0,
+        "exit_reason": "tp",
+        "status": "closed",
+    }
+    return {
+        "best_params": {"entry_logic": {"name": "RSIBBEntryMixin"}, "exit_logic": {"name": "ATRExitMixin"}},
+        "total_profit": 10.0 * n_trades,
+        "total_profit_with_commission": 9.8 * n_trades,
+        "total_commission": 0.2 * n_trades,
+        "analyzers": {},
+        "trades": [trade] * n_trades,
+    }
+
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_optimizer, "RESULTS_DIR", str(tmp_path))
+    monkeypatch.setattr(run_optimizer, "_manifest", None)
+    return tmp_path
+
+
+def test_saved_result_is_skipped(results_dir):
+    assert not run_optimizer.check_if_already_processed(DATA_FILE, "RSIBBEntryMixin", "ATRExitMixin")
+
+    json_file = run_optimizer.save_results(make_result(2), DATA_FILE)
+
+    assert run_optimizer.check_if_already_processed(DATA_FILE, "RSIBBEntryMixin", "ATRExitMixin")
+    assert not run_optimizer.check_if_already_processed(DATA_FILE, "RSIBBEntryMixin", "FixedRatioExitMixin")
+    row = run_optimizer.get_manifest().latest(DATA_FILE, "RSIBBEntryMixin", "ATRExitMixin")
+    assert row["file_path"] == json_file
+    assert row["total_trades"] == 2
+    assert row["total_profit_with_commission"] == pytest.approx(19.6)
+
+    os.remove(json_file)
+    assert not run_optimizer.check_if_already_processed(DATA_FILE, "RSIBBEntryMixin", "ATRExitMixin")
+
+
+def test_result_without_trades_is_reprocessed(results_dir):
+    run_optimizer.save_results(make_result(0), DATA_FILE)
+    assert not run_optimizer.check_if_already_processed(DATA_FILE, "RSIBBEntryMixin", "ATRExitMixin")
+
+
+def test_existing_files_are_backfilled(results_dir):
+    legacy = dict(make_result(1), data_file=DATA_FILE)
+    name = "BTCUSDT_1h_20240101_20240201_RSIBBEntryMixin_ATRExitMixin_20240301_120000.json"
+    with open(results_dir / name, "w") as f:
+        json.dump(legacy, f)
+
+    assert run_optimizer.check_if_already_processed(DATA_FILE, "RSIBBEntryMixin", "ATRExitMixin")
+
+    # The backfill runs only once per manifest
+    manifest = ResultManifest(str(results_dir / run_optimizer.MANIFEST_FILE))
+    assert manifest.backfill(str(results_dir), run_optimizer.parse_result_filename) == 0
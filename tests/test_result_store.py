@@ -0,0 +1,96 @@
+"""
+Tests for the columnar (Parquet) optimizer result store.
+
+- Runs are appended to summary/params/trades datasets partitioned by symbol/interval
+- Queries filter by partition and metrics and return the top rows
+- save_results writes to the store when result_store is "parquet"
+
+How to run:
+    pytest tests/test_result_store.py
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pyarrow.compute as pc
+from src.optimizer import run_optimizer
+from src.optimizer.result_store import ResultStore
+
+
+def make_result(sharpe, exit_name="ATRExitMixin", n_trades=2):
+    trade = {
+        "entry_time": "2024-01-01T00:00:00",
+        "exit_time": "2024-01-02T00:00:00",
+        "entry_price": 100.0,
+        "exit_price": 110.0,
+        "size": 1.0,
+        "symbol": "BTCUSDT",
+        "trade_type": "long",
+        "commission": 0.2,
+        "gross_pnl": 10.0,
+        "net_pnl": 9.8,
+        "pnl_percentage": 10.0,
+        "exit_reason": "tp",
+        "status": "closed",
+    }
+    return {
+        "data_file": "BTCUSDT_1h_20240101_20240201.csv",
+        "total_trades": n_trades,
+        "total_profit": 10.0,
+        "total_profit_with_commission": 9.8,
+        "total_commission": 0.2,
+        "best_params": {
+            "entry_logic": {"name": "RSIBBEntryMixin", "params": {"e_rsi_period": 14, "e_use_bb_touch": True}},
+            "exit_logic": {"name": exit_name, "params": {"x_atr_period": 10}},
+            "position_size": 0.1,
+        },
+        "analyzers": {"sharpe": {"sharperatio": sharpe}, "winrate": {"win_rate": "n/a"}},
+        "trades": [trade] * n_trades,
+    }
+
+
+def json_name(symbol, interval, exit_name, i):
+    return f"results/{symbol}_{interval}_20240101_20240201_RSIBBEntryMixin_{exit_name}_20240301_12000{i}.json"
+
+
+def test_write_and_query(tmp_path):
+    store = ResultStore(str(tmp_path))
+    exits = ["ATRExitMixin", "FixedRatioExitMixin", "RSIBBExitMixin"]
+    for i, exit_name in enumerate(exits):
+        store.write(make_result(0.5 + i, exit_name), json_name("BTCUSDT", "1h", exit_name, i))
+    store.write(make_result(9.0), json_name("BTCUSDT", "4h", "ATRExitMixin", 0))
+    store.write(make_result(8.0), json_name("ETHUSDT", "1h", "ATRExitMixin", 0))
+    store.write(make_result(None, n_trades=0), json_name("BTCUSDT", "1h", "TimeBasedExitMixin", 0))
+
+    assert os.path.isdir(tmp_path / "summary" / "symbol=BTCUSDT" / "interval=1h")
+
+    top = store.top_results("sharpe_ratio", limit=2, symbol="BTCUSDT", interval="1h")
+    assert list(top["exit_logic_name"]) == ["RSIBBExitMixin", "FixedRatioExitMixin"]
+    assert list(top["sharpe_ratio"]) == [2.5, 1.5]
+
+    filtered = store.query(filter=pc.field("sharpe_ratio") > 5, columns=["symbol", "interval"])
+    assert sorted(map(tuple, filtered[["symbol", "interval"]].values)) == [("BTCUSDT", "4h"), ("ETHUSDT", "1h")]
+
+    params = store.query("params", symbol="BTCUSDT", interval="1h", name="e_rsi_period")
+    assert len(params) == 4 and set(params["numeric_value"]) == {14.0}
+
+    trades = store.query("trades", symbol="ETHUSDT")
+    assert len(trades) == 2 and str(trades["entry_time"].dt.tz) == "UTC"
+
+
+def test_save_results_writes_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_optimizer, "RESULTS_DIR", str(tmp_path))
+    monkeypatch.setattr(run_optimizer, "_manifest", None)
+    store_dir = tmp_path / "store"
+
+    json_file = run_optimizer.save_results(
+        make_result(1.0), "BTCUSDT_1h_20240101_20240201.csv", {"result_store": "parquet", "result_store_dir": str(store_dir)}
+    )
+
+    summary = ResultStore(str(store_dir)).query()
+    assert os.path.exists(json_file)
+    assert list(summary["json_filename"]) == [os.path.basename(json_file)]
+    assert summary["sharpe_ratio"].iloc[0] == 1.0
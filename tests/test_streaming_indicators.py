@@ -0,0 +1,120 @@
+"""
+Tests for the streaming (incremental) indicators.
+
+- Wilder/EMA based indicators (RSI, ATR, SuperTrend, EMA, SMMA) give exactly the batch values
+- Rolling indicators (SMA, Bollinger Bands, Ichimoku, volume MA) match the batch values
+- IndicatorSet works as BaseLiveDataFeed callback
+- The Backtrader adapter gives the same lines in runonce and next mode
+
+How to run:
+    pytest tests/test_streaming_indicators.py
+"""
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+from src.indicator import numpy_indicators as ni
+from src.indicator import streaming_indicators as si
+
+
+def make_df(length=800, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(length) * 0.01))
+    high = close * (1 + rng.uniform(0, 0.01, length))
+    low = close * (1 - rng.uniform(0, 0.01, length))
+    # Flat stretch exercises the equal-value handling of the rolling algorithms
+    # (bars 300-330 of the default 800, scaled to shorter frames)
+    flat = 3 * length // 8
+    close[flat:flat + 3 * length // 80] = close[flat]
+    return pd.DataFrame(
+        {"open": close, "high": np.maximum(high, close), "low": np.minimum(low, close), "close": close,
+         "volume": rng.uniform(100, 1000, length)},
+        index=pd.date_range("2023-01-01", periods=length, freq="h"),
+    )
+
+
+def stream(indicator, df):
+    results = [indicator.update_bar(row) for row in df.to_dict("records")]
+    return np.array(results, dtype=np.float64)
+
+
+def test_wilder_and_ema_indicators_are_exact():
+    df = make_df()
+    np.testing.assert_array_equal(stream(si.RSI(14), df), ni.rsi(df["close"], 14))
+    np.testing.assert_array_equal(stream(si.ATR(14), df), ni.atr(df["high"], df["low"], df["close"], 14))
+    np.testing.assert_array_equal(stream(si.EMA(21), df), ni.ema(df["close"], 21))
+    np.testing.assert_array_equal(stream(si.SMMA(10), df), ni.smma(df["close"], 10))
+
+    streamed = stream(si.SuperTrend(10, 3.0), df)
+    for column, expected in enumerate(ni.supertrend_bands(df["high"], df["low"], df["close"], 10, 3.0)):
+        np.testing.assert_array_equal(streamed[:, column], expected)
+
+
+def test_rolling_indicators_match_batch():
+    df = make_df()
+    np.testing.assert_allclose(stream(si.SMA(20), df), ni.sma(df["close"], 20), rtol=1e-12, atol=0)
+    np.testing.assert_allclose(stream(si.VolumeMA(20), df), ni.sma(df["volume"], 20), rtol=1e-12, atol=0)
+    np.testing.assert_array_equal(stream(si.SMA(1), df), df["close"].to_numpy())
+
+    streamed = stream(si.BollingerBands(20, 2.0), df)
+    for column, expected in enumerate(ni.bollinger_bands(df["close"], 20, 2.0)):
+        np.testing.assert_allclose(streamed[:, column], expected, rtol=1e-12, atol=1e-9)
+    # Flat window: zero deviation, bands collapse onto the mean
+    assert streamed[329, 0] == streamed[329, 1] == streamed[329, 2] == df["close"].iloc[329]
+
+    streamed = stream(si.Ichimoku(9, 26, 52, 26), df)
+    expected = ni.ichimoku(df["high"], df["low"], 9, 26, 52, 26)
+    for column, line in enumerate(si.Ichimoku.lines):
+        np.testing.assert_array_equal(streamed[:, column], expected[line])
+
+
+def test_memory_is_bounded_by_period():
+    df = make_df(length=2000)
+    indicator = si.BollingerBands(20)
+    stream(indicator, df)
+    assert len(indicator._mean._window) == len(indicator._var._window) == 20
+    assert indicator.ready and indicator.count == 2000
+
+
+def test_indicator_set_as_live_feed_callback():
+    df = make_df(length=200)
+    indicators = si.IndicatorSet(rsi=si.RSI(14), bb=si.BollingerBands(20, 2.0), vol_ma=si.VolumeMA(20))
+    indicators.warm_up(df.iloc[:150])
+    for timestamp, row in df.iloc[150:].iterrows():
+        indicators.on_new_bar("BTCUSDT", timestamp, row.to_dict())
+
+    assert indicators.last_timestamp == df.index[-1]
+    assert indicators["rsi"].value == ni.rsi(df["close"], 14)[-1]
+    values = indicators.values
+    assert set(values["bb"]) == {"top", "mid", "bot"}
+    np.testing.assert_allclose(values["vol_ma"]["sma"], df["volume"].iloc[-20:].mean(), rtol=1e-12)
+
+
+class AdapterStrategy(bt.Strategy):
+    def __init__(self):
+        self.rsi = si.backtrader_indicator(self.data, si.RSI(14))
+        self.st = si.backtrader_indicator(self.data, si.SuperTrend(10, 3.0))
+        self.first_bar = None
+
+    def next(self):
+        if self.first_bar is None:
+            self.first_bar = len(self)
+
+
+def run(df, runonce):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(AdapterStrategy)
+    return cerebro.run(runonce=runonce, preload=True)[0]
+
+
+def test_backtrader_adapter():
+    df = make_df(length=300)
+    once = run(df, runonce=True)
+    stepped = run(df, runonce=False)
+    expected = ni.rsi(df["close"], 14)
+    for strategy in (once, stepped):
+        np.testing.assert_array_equal(np.array(strategy.rsi.lines.rsi.array[14:300]), expected[14:])
+        st, _ = ni.supertrend(df["high"], df["low"], df["close"], 10, 3.0)
+        np.testing.assert_array_equal(np.array(strategy.st.lines.super_trend.array[10:300]), st[10:])
+    assert once.first_bar == stepped.first_bar == 15
@@ -0,0 +1,85 @@
+"""
+Tests for persistent optimizer studies.
+
+- A re-opened study keeps its completed trials and only runs the missing ones
+- Pruned and failed trials count towards the trial budget of a resumed study
+- Changing the parameter space changes the study key
+- Execution-only settings (n_jobs, output_dir, ...) do not change the study key
+
+How to run:
+    pytest tests/test_study_storage.py
+"""
+
+import optuna
+import pytest
+from src.optimizer.study_storage import (config_hash, count_budget_trials,
+                                         count_completed_trials, load_or_create_study,
+                                         run_study)
+
+ENTRY = {"name": "RSIBBEntryMixin", "params": {"e_rsi_period": {"type": "int", "low": 5, "high": 30}}}
+EXIT = {"name": "ATRExitMixin", "params": {"x_atr_period": {"type": "int", "low": 5, "high": 30}}}
+
+
+def objective(trial):
+    return trial.suggest_int("x", 0, 10)
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "journal"])
+def test_study_resumes_completed_trials(backend, tmp_path):
+    settings = {"study_storage": backend, "study_dir": str(tmp_path), "commission": 0.001}
+
+    study = load_or_create_study("BTCUSDT_1h.csv", ENTRY, EXIT, settings)
+    run_study(study, objective, n_trials=3)
+    assert count_completed_trials(study) == 3
+
+    # Simulated restart with a larger budget: the three trials are kept
+    calls = []
+
+    def counting_objective(trial):
+        calls.append(trial.number)
+        return objective(trial)
+
+    resumed = load_or_create_study("BTCUSDT_1h.csv", ENTRY, EXIT, settings)
+    run_study(resumed, counting_objective, n_trials=5)
+    assert len(calls) == 2
+    assert count_completed_trials(resumed) == 5
+
+    # Nothing left to do
+    run_study(resumed, counting_objective, n_trials=5)
+    assert len(calls) == 2
+
+
+def test_pruned_and_failed_trials_count_towards_budget(tmp_path):
+    settings = {"study_storage": "sqlite", "study_dir": str(tmp_path), "commission": 0.001}
+    calls = []
+
+    def pruning_objective(trial):
+        calls.append(trial.number)
+        if trial.number % 2:
+            raise optuna.TrialPruned()
+        return objective(trial)
+
+    study = load_or_create_study("BTCUSDT_1h.csv", ENTRY, EXIT, settings)
+    run_study(study, pruning_objective, n_trials=4)
+    assert count_completed_trials(study) == 2
+    assert count_budget_trials(study) == 4
+
+    # A failed trial (e.g. of a crashed run) is counted as well
+    trial = study.ask()
+    study.tell(trial, state=optuna.trial.TrialState.FAIL)
+
+    # The restarted sweep only runs the missing trial, like an uninterrupted one
+    resumed = load_or_create_study("BTCUSDT_1h.csv", ENTRY, EXIT, settings)
+    run_study(resumed, pruning_objective, n_trials=6)
+    assert len(calls) == 5
+    assert count_budget_trials(resumed) == 6
+
+
+def test_config_hash():
+    settings = {"commission": 0.001, "n_jobs": 1, "output_dir": "results"}
+    base = config_hash(ENTRY, EXIT, settings)
+
+    assert config_hash(ENTRY, EXIT, dict(settings, n_jobs=-1, output_dir="other")) == base
+    assert config_hash(ENTRY, EXIT, dict(settings, commission=0.002)) != base
+    wider = {"name": "ATRExitMixin", "params": {"x_atr_period": {"type": "int", "low": 5, "high": 50}}}
+    assert config_hash(ENTRY, wider, settings) != base
@@ -0,0 +1,54 @@
+"""
+Tests for the optimizer sweep scheduler.
+
+- Jobs run in worker processes and their results are collected in the parent
+- Failing jobs and jobs exceeding the timeout are recorded instead of aborting the sweep
+- Every outcome is appended to the central JSON-lines log
+
+How to run:
+    pytest tests/test_sweep_scheduler.py
+"""
+
+import json
+import os
+import time
+
+from src.optimizer.sweep_scheduler import (STATUS_COMPLETED, STATUS_FAILED,
+                                           STATUS_TIMEOUT, SweepJob,
+                                           SweepScheduler)
+
+
+def fake_optimize(data_file, entry_logic_name, exit_logic_name, delay):
+    if entry_logic_name == "Broken":
+        raise RuntimeError("boom")
+    if entry_logic_name == "Slow":
+        time.sleep(30)
+    time.sleep(delay)
+    return {"pid": os.getpid(), "key": f"{data_file}:{entry_logic_name}:{exit_logic_name}"}
+
+
+def test_runs_jobs_and_records_outcomes(tmp_path):
+    log_path = tmp_path / "sweep_log.jsonl"
+    jobs = [
+        SweepJob("a.csv", "Entry", "Exit1"),
+        SweepJob("a.csv", "Entry", "Exit2"),
+        SweepJob("a.csv", "Broken", "Exit1"),
+        SweepJob("a.csv", "Slow", "Exit1"),
+    ]
+    seen = []
+    scheduler = SweepScheduler(fake_optimize, max_workers=2, job_timeout=3, log_path=str(log_path))
+
+    results = scheduler.run(jobs, args=(0.1,), on_result=seen.append)
+
+    by_key = {r.job.key: r for r in results}
+    assert len(results) == len(seen) == 4
+    assert by_key["a.csv|Entry|Exit1"].status == STATUS_COMPLETED
+    assert by_key["a.csv|Entry|Exit1"].result["key"] == "a.csv:Entry:Exit1"
+    assert by_key["a.csv|Entry|Exit1"].result["pid"] != os.getpid()
+    assert by_key["a.csv|Broken|Exit1"].status == STATUS_FAILED
+    assert "boom" in by_key["a.csv|Broken|Exit1"].error
+    assert by_key["a.csv|Slow|Exit1"].status == STATUS_TIMEOUT
+
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert sorted(r["status"] for r in records) == ["completed", "completed", "failed", "timeout"]
+    assert {r["entry_logic_name"] for r in records} == {"Entry", "Broken", "Slow"}
@@ -0,0 +1,99 @@
+"""
+Tests for optimizer trial memoization.
+
+- A repeated parameter set is answered from the cache with the same objective value
+- The cache persists across processes/runs (new TrialCache on the same file)
+- Keys depend on data content and result-relevant settings only
+
+How to run:
+    pytest tests/test_trial_cache.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import optuna
+import pandas as pd
+from src.optimizer import trial_cache
+from src.optimizer.custom_optimizer import CustomOptimizer
+from src.optimizer.trial_cache import TrialCache, trial_key
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+PARAMS = {"e_rsi_period": 14, "e_rsi_oversold": 35, "e_bb_period": 20, "e_bb_dev": 2.0, "e_use_bb_touch": True,
+          "x_take_profit": 0.05, "x_stop_loss": 0.03}
+
+
+def make_config(tmp_path):
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(1200) * 0.01))
+    df = pd.DataFrame(
+        {"open": close, "high": close * 1.004, "low": close * 0.996, "close": close, "volume": 1000.0},
+        index=pd.date_range("2023-01-01", periods=len(close), freq="h"),
+    )
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "FixedRatioExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    return {
+        "data": bt.feeds.PandasData(dataname=df, name="TEST"),
+        "entry_logic": entry_logic,
+        "exit_logic": exit_logic,
+        "optimizer_settings": {
+            "output_dir": str(tmp_path),
+            "trial_cache": True,
+            "trial_cache_path": str(tmp_path / "trial_cache.db"),
+        },
+    }
+
+
+def run_trials(tmp_path, n_trials):
+    study = optuna.create_study(direction="maximize")
+    results = []
+
+    def objective(trial):
+        _, _, result = CustomOptimizer(make_config(tmp_path)).run_optimization(trial)
+        results.append(result)
+        return result["total_profit_with_commission"]
+
+    for _ in range(n_trials):
+        study.enqueue_trial(PARAMS, skip_if_exists=False)
+    study.optimize(objective, n_trials=n_trials)
+    return study, results
+
+
+def test_repeated_params_are_memoized(tmp_path, monkeypatch):
+    monkeypatch.setattr(trial_cache, "_caches", {})
+    study, results = run_trials(tmp_path, 2)
+
+    assert "memoized" not in results[0]
+    assert results[1]["memoized"] is True
+    assert study.trials[1].user_attrs["memoized"] is True
+    assert study.trials[0].value == study.trials[1].value
+
+    # New process: the in-memory caches are gone, the SQLite file remains
+    monkeypatch.setattr(trial_cache, "_caches", {})
+    _, results = run_trials(tmp_path, 1)
+    assert results[0]["memoized"] is True
+
+
+def test_trial_key():
+    params = {"entry_logic": {"name": "A", "params": {"p": 14}}, "exit_logic": {"name": "B", "params": {}}}
+    same = {"exit_logic": {"params": {}, "name": "B"}, "entry_logic": {"params": {"p": 14.0}, "name": "A"}}
+    settings = {"commission": 0.001, "n_jobs": 1}
+
+    key = trial_key("abc", params, settings)
+    assert trial_key("abc", same, dict(settings, n_jobs=-1)) == key
+    assert trial_key("abd", params, settings) != key
+    assert trial_key("abc", params, dict(settings, commission=0.002)) != key
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = TrialCache(str(tmp_path / "cache.db"))
+    params = {"entry_logic": {"name": "A", "params": {}}, "exit_logic": {"name": "B", "params": {}}}
+    cache.put("k", "fp", params, {"total_profit_with_commission": 1.5, "analyzers": {"pnl": {"net": 1.5}}, "trades": [1]})
+
+    stored = TrialCache(str(tmp_path / "cache.db")).get("k")
+    assert stored["total_profit_with_commission"] == 1.5
+    assert "trades" not in stored
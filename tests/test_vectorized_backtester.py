@@ -0,0 +1,126 @@
+"""
+Tests for the vectorized backtest engine.
+
+- Checks that the NumPy indicators match the Backtrader indicators.
+- Checks that the vectorized engine reproduces Cerebro's trades and net profit for
+  mixin combinations whose semantics are identical in both engines.
+- Checks that the output has the same shape as CustomOptimizer's Cerebro output.
+
+How to run:
+    pytest tests/test_vectorized_backtester.py
+"""
+
+import json
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+from src.indicator import numpy_indicators as ni
+from src.optimizer.custom_optimizer import CustomOptimizer
+from src.optimizer.vectorized_backtester import VectorizedBacktester
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def make_ohlcv(length=1500, seed=1):
+    """Generate a random walk OHLCV DataFrame"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(length) * 0.01))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.standard_normal(length) * 0.001)
+    high = np.maximum(open_, close) * (1 + rng.random(length) * 0.005)
+    low = np.minimum(open_, close) * (1 - rng.random(length) * 0.005)
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": rng.random(length) * 1000 + 100,
+        },
+        index=pd.date_range("2023-01-01", periods=length, freq="h", tz="UTC"),
+    )
+
+
+def load_logic(kind, name):
+    with open(os.path.join(CONFIG_DIR, kind, f"{name}.json"), "r") as f:
+        return json.load(f)
+
+
+def run_engine(df, entry_name, exit_name, engine, tmp_path):
+    config = {
+        "data": bt.feeds.PandasData(dataname=df, name="TEST"),
+        "entry_logic": load_logic("entry", entry_name),
+        "exit_logic": load_logic("exit", exit_name),
+        "optimizer_settings": {"output_dir": str(tmp_path), "engine": engine},
+    }
+    return CustomOptimizer(config).run_optimization()
+
+
+def test_numpy_indicators_match_backtrader():
+    df = make_ohlcv(300)
+
+    class IndicatorStrategy(bt.Strategy):
+        def __init__(self):
+            self.rsi = bt.indicators.RSI(self.data.close, period=14)
+            self.atr = bt.indicators.ATR(self.data, period=14)
+            self.bb = bt.indicators.BollingerBands(self.data.close, period=20, devfactor=2.0)
+
+    cerebro = bt.Cerebro()
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(IndicatorStrategy)
+    strategy = cerebro.run()[0]
+
+    top, _, bot = ni.bollinger_bands(df["close"], 20, 2.0)
+    np.testing.assert_allclose(np.array(strategy.rsi.array), ni.rsi(df["close"], 14))
+    np.testing.assert_allclose(
+        np.array(strategy.atr.array), ni.atr(df["high"], df["low"], df["close"], 14)
+    )
+    np.testing.assert_allclose(np.array(strategy.bb.top.array), top)
+    np.testing.assert_allclose(np.array(strategy.bb.bot.array), bot)
+
+
+@pytest.mark.parametrize(
+    "exit_name", ["ATRExitMixin", "FixedRatioExitMixin", "RSIBBExitMixin"]
+)
+def test_vectorized_matches_cerebro(exit_name, tmp_path):
+    df = make_ohlcv()
+    _, _, expected = run_engine(df, "RSIBBEntryMixin", exit_name, "backtrader", tmp_path)
+    strategy, cerebro, result = run_engine(
+        df, "RSIBBEntryMixin", exit_name, "vectorized", tmp_path
+    )
+
+    assert strategy is None and cerebro is None
+    assert len(result["trades"]) == len(expected["trades"])
+    assert result["total_profit_with_commission"] == pytest.approx(
+        expected["total_profit_with_commission"]
+    )
+    for got, want in zip(result["trades"], expected["trades"]):
+        assert got["entry_price"] == pytest.approx(want["entry_price"])
+        assert got["exit_reason"] == want["exit_reason"]
+
+
+def test_vectorized_output_shape(tmp_path):
+    df = make_ohlcv()
+    _, _, result = run_engine(df, "RSIBBVolumeEntryMixin", "TimeBasedExitMixin", "vectorized", tmp_path)
+
+    for key in ["best_params", "total_profit", "total_profit_with_commission", "total_commission", "analyzers", "trades"]:
+        assert key in result
+    assert result["analyzers"]["trades"]["total"]["closed"] == len(result["trades"])
+    for trade in result["trades"]:
+        assert trade["status"] == "closed"
+        assert trade["symbol"] == "TEST"
+        assert trade["exit_time"] > trade["entry_time"]
+
+
+def test_unsupported_combination_raises():
+    backtester = VectorizedBacktester(make_ohlcv(100))
+    with pytest.raises(ValueError):
+        backtester.run(
+            {
+                "entry_logic": {"name": "UnknownEntryMixin", "params": {}},
+                "exit_logic": {"name": "ATRExitMixin", "params": {}},
+                "position_size": 0.1,
+            }
+        )
@@ -0,0 +1,158 @@
+"""
+Tests for walk-forward optimization.
+
+- Train/test windows follow the configured periods (rolling and anchored)
+- Dataset windows slice the parent's indicators instead of recomputing them
+- A walk-forward run stitches the out-of-sample trades and equity curve and
+  warm-starts every window after the first
+- Positions open at the end of a test window are closed at its last close
+
+How to run:
+    pytest tests/test_walk_forward.py
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.dataset_cache import OHLCVDataset
+from src.indicator.indicator_cache import get_indicator_cache
+from src.optimizer.walk_forward import WalkForwardOptimizer, make_windows
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "optimizer")
+
+
+def make_dataset(length=24 * 120, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(length) * 0.01))
+    index = pd.date_range("2024-01-01", periods=length, freq="h")
+    columns = {
+        "open": close,
+        "high": close * 1.004,
+        "low": close * 0.996,
+        "close": close,
+        "volume": rng.uniform(100, 200, length),
+    }
+    return OHLCVDataset(index, columns, path="TEST_1h_20240101_20240430.csv")
+
+
+def test_make_windows():
+    index = pd.date_range("2024-01-01", periods=24 * 100, freq="h")
+
+    windows = make_windows(index, "30D", "10D")
+    assert [w.number for w in windows] == list(range(len(windows)))
+    assert len(windows) == 7
+    for window in windows:
+        assert window.train_stop == window.test_start
+        assert index[window.test_start] - index[window.train_start] == pd.Timedelta("30D")
+        assert window.test_stop - window.test_start <= 24 * 10
+    assert windows[1].train_start - windows[0].train_start == 24 * 10
+    assert windows[-1].test_stop == len(index)
+
+    anchored = make_windows(index, "30D", "10D", step_period="20D", anchored=True)
+    assert all(w.train_start == 0 for w in anchored)
+    assert anchored[1].test_start - anchored[0].test_start == 24 * 20
+
+    with pytest.raises(ValueError):
+        make_windows(index, "30D", "0D")
+
+
+def test_window_indicators_are_slices_of_the_parent():
+    dataset = make_dataset()
+    cache = get_indicator_cache()
+    parent = dataset.bars("TEST").indicator("rsi", "rsi", period=14)
+
+    misses = cache.misses
+    for start in (0, 500, 1000):
+        window = dataset.window(start, start + 700)
+        values = window.bars("TEST").indicator("rsi", "rsi", period=14)
+        np.testing.assert_array_equal(values, parent[start : start + 700])
+        # Warm at the first bar of later windows
+        if start:
+            assert not np.isnan(values[0])
+        nested = window.window(100, 200)
+        assert nested.parent is dataset and nested.offset == start + 100
+        np.testing.assert_array_equal(nested.bars("TEST").indicator("rsi", "rsi", period=14), parent[start + 100 : start + 200])
+    assert cache.misses == misses
+
+
+def test_walk_forward_run_stitches_out_of_sample_results():
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "exit", "RSIBBExitMixin.json")) as f:
+        exit_logic = json.load(f)
+    settings = {
+        "engine": "vectorized",
+        "n_trials": 4,
+        "n_jobs": 1,
+        "initial_capital": 1000.0,
+        "wf_train_period": "40D",
+        "wf_test_period": "20D",
+        "wf_warm_start_trials": 2,
+        "wf_seed": 7,
+    }
+
+    optimizer = WalkForwardOptimizer(make_dataset(), entry_logic, exit_logic, settings, name="TEST")
+    result = optimizer.run()
+
+    windows = result["windows"]
+    assert len(windows) == len(optimizer.windows) == 4
+    assert windows[0]["warm_start_trials"] == 0
+    assert all(w["warm_start_trials"] == 2 for w in windows[1:])
+
+    # Trades only come from the test windows and compound into one equity curve
+    assert sum(w["test_trades"] for w in windows) == len(result["trades"])
+    for trade in result["trades"]:
+        window = windows[trade["window"]]
+        assert window["test_start"] <= pd.Timestamp(trade["exit_time"]).isoformat() <= window["test_end"]
+    times = [point["time"] for point in result["equity_curve"]]
+    assert times == sorted(times)
+    assert result["equity_curve"][-1]["equity"] == pytest.approx(result["final_equity"])
+    assert result["total_profit_with_commission"] == pytest.approx(
+        sum(t["net_pnl"] for t in result["trades"])
+    )
+
+
+def test_open_positions_are_closed_at_the_end_of_test_windows():
+    with open(os.path.join(CONFIG_DIR, "entry", "RSIBBEntryMixin.json")) as f:
+        entry_logic = json.load(f)
+    # Exits after 1000 bars only: every test window (480 bars) ends with an open position
+    exit_logic = {
+        "name": "TimeBasedExitMixin",
+        "params": {
+            "x_max_bars": {"type": "int", "low": 1000, "high": 1000, "default": 1000},
+            "x_max_minutes": {"type": "int", "low": 5, "high": 100, "default": 20},
+            "x_use_time": {"type": "bool", "default": False},
+        },
+    }
+    settings = {
+        "engine": "vectorized",
+        "n_trials": 2,
+        "n_jobs": 1,
+        "initial_capital": 1000.0,
+        "wf_train_period": "40D",
+        "wf_test_period": "20D",
+        "wf_warm_start_trials": 0,
+        "wf_seed": 7,
+    }
+    dataset = make_dataset()
+    optimizer = WalkForwardOptimizer(dataset, entry_logic, exit_logic, settings, name="TEST")
+    result = optimizer.run()
+
+    closed = [t for t in result["trades"] if t["exit_reason"] == "end_of_data"]
+    assert closed
+    for trade in closed:
+        window = optimizer.windows[trade["window"]]
+        last_bar = window.test_stop - 1
+        assert pd.Timestamp(trade["exit_time"]) == dataset.index[last_bar]
+        assert trade["exit_price"] == dataset.columns["close"][last_bar]
+    # Every test window ends flat, so its PnL is in the stitched equity
+    for summary in result["windows"]:
+        window_trades = [t for t in result["trades"] if t["window"] == summary["window"]]
+        if window_trades:
+            assert window_trades[-1]["exit_reason"] == "end_of_data"
+    assert result["total_profit_with_commission"] == pytest.approx(
+        sum(t["net_pnl"] for t in result["trades"])
+    )
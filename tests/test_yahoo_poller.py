@@ -0,0 +1,129 @@
+"""
+Tests for the batched Yahoo poller.
+
+- One multi-ticker download per chunk of symbols, split into per-symbol frames
+- Responses are served from the cache until they expire
+- Rate limits pause the requests with an exponential backoff
+
+Downloads are served by a stand-in replaying a recorded multi-ticker response; the clock
+is injected.
+
+How to run:
+    pytest tests/test_yahoo_poller.py
+"""
+
+import numpy as np
+import pandas as pd
+from src.data.concurrent_downloader import RateLimitError
+from src.data.yahoo_poller import YahooBatchPoller, split_by_symbol
+
+INDEX = pd.date_range("2024-03-06 09:30", periods=4, freq="15min", tz="America/New_York")
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def recorded_response(symbols):
+    """Frame shaped like yf.download(group_by="ticker"); XYZ misses its first bar"""
+    columns = pd.MultiIndex.from_product([symbols, FIELDS])
+    data = pd.DataFrame(1.0, index=INDEX, columns=columns)
+    for n, symbol in enumerate(symbols):
+        data[(symbol, "Close")] = np.arange(len(INDEX)) + 100.0 * n
+        if symbol == "XYZ":
+            data.loc[INDEX[0], symbol] = np.nan
+    return data
+
+
+class RecordedDownload:
+    """Replays the recorded response for the requested symbols and records the calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.rate_limited = False
+
+    def __call__(self, symbols, interval, period):
+        self.calls.append((list(symbols), interval, period))
+        if self.rate_limited:
+            raise RateLimitError(429)
+        return recorded_response([symbol for symbol in symbols if symbol != "GONE"])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_poller(**kwargs):
+    download, clock = RecordedDownload(), Clock()
+    poller = YahooBatchPoller(download=download, clock=clock, cache_ttl=5.0, backoff=30.0, max_backoff=100.0, **kwargs)
+    return poller, download, clock
+
+
+def test_split_by_symbol():
+    frames = split_by_symbol(recorded_response(["AAPL", "XYZ"]), ["AAPL", "XYZ", "GONE"])
+    assert sorted(frames) == ["AAPL", "XYZ"]
+    assert list(frames["AAPL"].columns) == ["open", "high", "low", "close", "volume"]
+    assert len(frames["AAPL"]) == 4 and len(frames["XYZ"]) == 3
+    assert frames["XYZ"]["close"].iloc[-1] == 103.0
+
+    # A single ticker may come back with flat columns
+    flat = recorded_response(["AAPL"])["AAPL"]
+    assert len(split_by_symbol(flat, ["AAPL"])["AAPL"]) == 4
+
+
+def test_one_download_per_chunk():
+    poller, download, _ = make_poller(max_tickers=2)
+    frames = poller.bars(["AAPL", "MSFT", "XYZ", "GONE"], "15m")
+    assert sorted(frames) == ["AAPL", "MSFT", "XYZ"]
+    assert [call[0] for call in download.calls] == [["AAPL", "MSFT"], ["XYZ", "GONE"]]
+    assert download.calls[0][1:] == ("15m", "1d")
+    assert poller.get_status()["requests"] == 2
+
+
+def test_responses_are_cached():
+    poller, download, clock = make_poller()
+    poller.bars(["AAPL", "MSFT"], "15m")
+
+    # Cached symbols cost no request, the others are fetched alone
+    clock.now += 2
+    frames = poller.bars(["AAPL", "MSFT", "XYZ"], "15m")
+    assert len(frames) == 3
+    assert [call[0] for call in download.calls] == [["AAPL", "MSFT"], ["XYZ"]]
+
+    # Cached per interval
+    poller.bars(["AAPL"], "1h")
+    assert download.calls[-1][:2] == (["AAPL"], "1h")
+
+    clock.now += 5
+    poller.bars(["AAPL", "MSFT"], "15m")
+    assert download.calls[-1][0] == ["AAPL", "MSFT"]
+
+
+def test_rate_limit_backoff():
+    poller, download, clock = make_poller()
+    download.rate_limited = True
+    assert poller.bars(["AAPL"], "15m") == {}
+    assert poller.get_status()["backoff_remaining"] == 30.0
+
+    # No requests during the backoff
+    clock.now += 20
+    assert poller.bars(["AAPL"], "15m") == {}
+    assert len(download.calls) == 1
+
+    # Consecutive rate limits double the backoff, up to max_backoff
+    clock.now += 10
+    poller.bars(["AAPL"], "15m")
+    assert poller.get_status()["backoff_remaining"] == 60.0
+    clock.now += 60
+    poller.bars(["AAPL"], "15m")
+    assert poller.get_status()["backoff_remaining"] == 100.0
+
+    # A successful request resets the backoff
+    download.rate_limited = False
+    clock.now += 100
+    assert "AAPL" in poller.bars(["AAPL"], "15m")
+    download.rate_limited = True
+    clock.now += 10
+    poller.bars(["AAPL"], "15m")
+    assert poller.get_status()["backoff_remaining"] == 30.0